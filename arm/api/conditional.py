@@ -0,0 +1,218 @@
+"""Conditional GET (ETag / If-None-Match) for the endpoints the UI polls.
+
+``ConditionalGetMiddleware`` buffers the JSON body of each polled
+endpoint, tags it with a content-hash ``ETag`` and answers a matching
+``If-None-Match`` with ``304 Not Modified``, so an idle dashboard
+downloads nothing.
+
+For endpoints whose response depends only on the database, the ETag is
+also remembered against ``db_version()``.  While that version has not
+moved, a matching ``If-None-Match`` is answered straight from memory
+without running the endpoint (no DB query, no serialisation).  The
+version combines:
+
+- a counter bumped when this process commits writes, and
+- the size/mtime of the SQLite file and its WAL, which every commit
+  from any process (the ripper, the dispatcher) changes.
+
+A remembered version is only trusted for ``_TRUST_SECONDS``; after that
+the endpoint runs again and the content hash decides, which bounds
+staleness if a filesystem timestamp ever fails to move.  Non-SQLite
+databases get the content hash only.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+import time
+from itertools import chain
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from arm.database import db
+
+_TRUST_SECONDS = 30
+_MAX_ENTRIES = 512
+
+# (path pattern, response depends only on the DB)
+_POLLED = (
+    (re.compile(r"^/api/v1/jobs/active$"), True),
+    (re.compile(r"^/api/v1/jobs/stats$"), True),
+    (re.compile(r"^/api/v1/drives/with-jobs$"), True),
+    (re.compile(r"^/api/v1/jobs/\d+/progress-state$"), False),  # + progress files
+    (re.compile(r"^/api/v1/jobs/active/progress$"), False),
+    (re.compile(r"^/api/v1/system/stats$"), False),  # live psutil metrics
+)
+_TRACKED_TABLES = {"job", "track", "config", "system_drives"}
+
+_lock = threading.Lock()
+_local_version = 0
+_etags: dict[tuple, tuple] = {}  # (path, query) -> (version, etag, stored_at)
+
+
+def _bump() -> None:
+    global _local_version
+    with _lock:
+        _local_version += 1
+
+
+@event.listens_for(Session, "after_flush")
+def _note_tracked_writes(session, flush_context):
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if getattr(obj, "__tablename__", None) in _TRACKED_TABLES:
+            session.info["etag_dirty"] = True
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_bulk_writes(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["etag_dirty"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session):
+    if session.info.pop("etag_dirty", False):
+        _bump()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_on_rollback(session):
+    session.info.pop("etag_dirty", None)
+
+
+def _file_stamp(path: str) -> tuple:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return (0, 0)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def db_version() -> tuple | None:
+    """Cheap token that changes whenever the job/track/drive data may have.
+
+    None when no such token exists (non-SQLite engine, or no engine).
+    """
+    engine = db._engine
+    if engine is None or engine.dialect.name != "sqlite":
+        return None
+    path = engine.url.database
+    if not path or path == ":memory:":
+        # In-memory databases are private to this process.
+        return (_local_version,)
+    return (_local_version, _file_stamp(path), _file_stamp(f"{path}-wal"))
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison per RFC 9110 §13.1.2."""
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == bare
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _polled(path: str):
+    for pattern, db_only in _POLLED:
+        if pattern.match(path):
+            return db_only
+    return None
+
+
+def _remember(key, version, etag) -> None:
+    with _lock:
+        if len(_etags) >= _MAX_ENTRIES:
+            _etags.clear()
+        _etags[key] = (version, etag, time.monotonic())
+
+
+def _trusted_etag(key, version) -> str | None:
+    entry = _etags.get(key)
+    if entry is None or version is None:
+        return None
+    stored_version, etag, stored_at = entry
+    if stored_version != version or time.monotonic() - stored_at > _TRUST_SECONDS:
+        return None
+    return etag
+
+
+def invalidate() -> None:
+    """Forget every remembered ETag (tests, or after out-of-band DB edits)."""
+    with _lock:
+        _etags.clear()
+
+
+class ConditionalGetMiddleware:
+    """ASGI middleware adding ETag / 304 handling to the ``_POLLED`` paths."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        db_only = _polled(scope["path"])
+        if db_only is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        if_none_match = headers.get(b"if-none-match", b"").decode("latin-1")
+        key = (scope["path"], scope.get("query_string", b""))
+        # Read the version before the endpoint runs: a write landing
+        # mid-request then leaves the stored version already stale.
+        version = db_version() if db_only else None
+
+        if if_none_match:
+            etag = _trusted_etag(key, version)
+            if etag and _etag_matches(if_none_match, etag):
+                await self._not_modified(send, etag)
+                return
+
+        start = None
+        body = []
+
+        async def capture(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        payload = b"".join(body)
+        if start is None or start["status"] != 200:
+            if start is not None:
+                await send(start)
+            await send({"type": "http.response.body", "body": payload})
+            return
+
+        etag = '"' + hashlib.blake2b(payload, digest_size=12).hexdigest() + '"'
+        if version is not None:
+            _remember(key, version, etag)
+        if if_none_match and _etag_matches(if_none_match, etag):
+            await self._not_modified(send, etag)
+            return
+        start["headers"] = [
+            *start["headers"],
+            (b"etag", etag.encode()),
+            (b"cache-control", b"no-cache"),
+        ]
+        await send(start)
+        await send({"type": "http.response.body", "body": payload})
+
+    @staticmethod
+    async def _not_modified(send, etag):
+        await send({
+            "type": "http.response.start",
+            "status": 304,
+            "headers": [(b"etag", etag.encode()), (b"cache-control", b"no-cache")],
+        })
+        await send({"type": "http.response.body", "body": b""})
@@ -69,12 +69,16 @@ def list_drives(include_stale: bool = False):
 
 
 @router.get('/drives/with-jobs')
-def list_drives_with_jobs():
+async def list_drives_with_jobs():
     """List non-stale drives with current job details attached."""
+    return await db.run_read(_drives_with_jobs)
+
+
+def _drives_with_jobs(session):
     from arm.models.job import Job
 
     drives = (
-        SystemDrives.query
+        session.query(SystemDrives)
         .filter(SystemDrives.stale == False)  # noqa: E712
         .all()
     )
@@ -82,7 +86,7 @@ def list_drives_with_jobs():
     def _job_summary(job_id):
         if not job_id:
             return None
-        job = Job.query.get(job_id)
+        job = session.get(Job, job_id)
         if not job:
             return None
         summary = JobSummary.model_validate(job).model_dump(mode="json")
@@ -8,10 +8,12 @@ recursive os.walk + chown).
 Request bodies use Pydantic BaseModel instead of raw Request objects,
 which eliminates the need for async def + await request.json().
 """
+import json
 import logging
+from typing import Annotated
 
 from fastapi import APIRouter, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from arm.services import file_browser
@@ -49,20 +51,73 @@ def get_roots():
     return file_browser.get_roots()
 
 
-@router.get('/files/list')
-def list_directory(path: str = Query(..., description="Directory path to list")):
-    """List contents of a directory."""
-    try:
-        return file_browser.list_directory(path)
-    except ValueError:
+def _listing_error(path: str, exc: Exception) -> JSONResponse:
+    if isinstance(exc, file_browser.ListingQueryError):
+        return JSONResponse({"success": False, "error": str(exc)}, status_code=400)
+    if isinstance(exc, ValueError):
         return JSONResponse({"success": False, "error": _ACCESS_DENIED}, status_code=403)
-    except FileNotFoundError:
+    if isinstance(exc, FileNotFoundError):
         return JSONResponse({"success": False, "error": _PATH_NOT_FOUND}, status_code=404)
-    except NotADirectoryError:
+    if isinstance(exc, NotADirectoryError):
         return JSONResponse({"success": False, "error": "Not a directory"}, status_code=400)
-    except OSError as exc:
-        log.error("Error listing directory %s: %s", path, exc)
-        return JSONResponse({"success": False, "error": "Failed to list directory"}, status_code=500)
+    log.error("Error listing directory %s: %s", path, exc)
+    return JSONResponse({"success": False, "error": "Failed to list directory"}, status_code=500)
+
+
+@router.get('/files/list')
+def list_directory(
+    path: str = Query(..., description="Directory path to list"),
+    sort: Annotated[str, Query(pattern="^(name|size|modified)$")] = "name",
+    order: Annotated[str, Query(pattern="^(asc|desc)$")] = "asc",
+    glob: Annotated[str | None, Query(max_length=255)] = None,
+    type: Annotated[str | None, Query(pattern="^(file|directory)$")] = None,
+    category: str | None = None,
+    cursor: str | None = None,
+    limit: Annotated[int | None, Query(ge=1, le=5000)] = None,
+):
+    """List contents of a directory, optionally filtered and paged.
+
+    Pass the response's ``next_cursor`` back as ``cursor`` for the next
+    page; it is null on the last one.
+    """
+    try:
+        return file_browser.list_directory(
+            path, sort=sort, order=order, glob=glob, type=type,
+            category=category, cursor=cursor, limit=limit)
+    except (ValueError, OSError) as exc:
+        return _listing_error(path, exc)
+
+
+@router.get('/files/list/stream')
+def stream_directory(
+    path: str = Query(..., description="Directory path to list"),
+    sort: Annotated[str, Query(pattern="^(name|size|modified)$")] = "name",
+    order: Annotated[str, Query(pattern="^(asc|desc)$")] = "asc",
+    glob: Annotated[str | None, Query(max_length=255)] = None,
+    type: Annotated[str | None, Query(pattern="^(file|directory)$")] = None,
+    category: str | None = None,
+    cursor: str | None = None,
+    limit: Annotated[int | None, Query(ge=1)] = None,
+):
+    """Stream a directory listing as NDJSON.
+
+    Same query as ``/files/list``. The first line is the header (path,
+    parent, readonly, total, next_cursor), then one entry per line, so
+    the client can render a large folder as it arrives.
+    """
+    try:
+        header, entries = file_browser.stream_directory(
+            path, sort=sort, order=order, glob=glob, type=type,
+            category=category, cursor=cursor, limit=limit)
+    except (ValueError, OSError) as exc:
+        return _listing_error(path, exc)
+
+    def lines():
+        yield json.dumps(header) + "\n"
+        for entry in entries:
+            yield json.dumps(entry) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.post('/files/rename')
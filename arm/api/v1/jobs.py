@@ -5,9 +5,11 @@ Heavy I/O endpoints (fix-permissions, remote DB send) use async def
 with asyncio.to_thread to avoid blocking the event loop.
 """
 import asyncio
+import base64
 import json
 import math
 import threading
+import time
 from datetime import datetime, timedelta
 from typing import Annotated
 
@@ -23,7 +25,9 @@ from arm_contracts.enums import SkipReason, SourceType, TrackStatus
 from fastapi import APIRouter, Depends, Query
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
-from sqlalchemy import func, or_
+from sqlalchemy import event, false, func, literal, null, or_, true, tuple_, union_all
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from arm.api.dependencies import require_api_version
 import arm.config.config as cfg
@@ -31,14 +35,20 @@ from arm.constants import SINGLE_TRACK_VIDEO_TYPES
 from arm.database import db
 from arm.enums import AudioFormat, RipMethod, SpeedProfile
 from arm_contracts.enums import Disctype
+from arm.models.expected_title import ExpectedTitle
 from arm.models.job import Job, JobState
+from arm.models.job_archive import JobArchive
 from arm.models.track import Track
 from arm.models.notifications import Notifications
 from arm.ripper.folder_ripper import rip_folder
 from arm.ripper.iso_ripper import rip_iso
 from arm.services import jobs as svc_jobs
+from arm.services import job_archive
+from arm.services import job_changes as svc_job_changes
+from arm.services import job_search
 from arm.services import files as svc_files
 from arm.services import progress_reader
+from arm.services.episode_claims import sync_job_claims
 
 _JOB_NOT_FOUND = "Job not found"
 _NOT_WAITING = "Job is not in waiting state"
@@ -114,6 +124,8 @@ _WAITING_STATUSES = {
     JobState.TRANSCODE_WAITING.value,
 }
 
+_STATUS_VALUES = {state.value for state in JobState}
+
 _SORTABLE_COLUMNS = {
     "title": Job.title,
     "year": Job.year,
@@ -184,36 +196,144 @@ def list_jobs(status: str = None, q: str = None):
 
 
 @router.get('/jobs/active')
-def get_active_jobs():
+async def get_active_jobs():
     """Return jobs with active statuses, including track counts.
 
     Used by the dashboard to show currently running/waiting jobs.
     Track counts reflect only rippable tracks (enabled and above
     MINLENGTH), matching the UI's progress semantics.
     """
-    jobs = Job.query.filter(Job.status.in_(_ACTIVE_STATUSES)).all()
-    result = []
-    for job in jobs:
-        job_data = _job_to_dict(job)
-        job_data["track_counts"] = svc_jobs.track_counts(job)
-        result.append(job_data)
-    return {"jobs": result}
+    return await db.run_read(_active_jobs, build=_active_jobs_out)
+
+
+def _active_jobs(session):
+    rows = session.query(*_JOB_COLUMNS).filter(Job.status.in_(_ACTIVE_STATUSES)).all()
+    return _job_entries(session, rows)
+
+
+def _active_jobs_out(entries):
+    return {"jobs": [_entry_to_dict(entry) for entry in entries]}
+
+
+# Read endpoints on the async engine fetch plain rows on the event loop
+# (see db.run_read); ORM instances and JobContract validation for them
+# are built in a worker thread by _entry_to_dict.
+_JOB_COLUMNS = tuple(Job.__table__.columns)
+
+
+def _job_entries(session, rows):
+    """Plain data for :func:`_entry_to_dict` from full ``job`` *rows*:
+    the columns, expected-title rows and track counts of each job."""
+    job_ids = [row.job_id for row in rows]
+    counts = svc_jobs.track_counts_by_job(job_ids, session=session)
+    titles = {}
+    if job_ids:
+        for title in (
+            session.query(*ExpectedTitle.__table__.columns)
+            .filter(ExpectedTitle.job_id.in_(job_ids))
+        ):
+            titles.setdefault(title.job_id, []).append(title._asdict())
+    return [
+        {"values": row._asdict(), "titles": titles.get(row.job_id, []),
+         "track_counts": counts[row.job_id]}
+        for row in rows
+    ]
+
+
+def _detached(model, values):
+    """A transient *model* instance carrying column *values*."""
+    obj = model.__mapper__.class_manager.new_instance()
+    for key, value in values.items():
+        set_committed_value(obj, key, value)
+    return obj
+
+
+def _entry_to_dict(entry):
+    """:func:`_job_to_dict` for an entry from :func:`_job_entries`, or
+    ``{"payload", "track_counts"}`` for an archived job."""
+    if "payload" in entry:
+        data = _job_to_dict(job_archive.archived_job(entry["payload"]))
+        data["track_counts"] = entry["track_counts"]
+        data["archived"] = True
+        return data
+    job = _detached(Job, entry["values"])
+    set_committed_value(job, "expected_titles",
+                        [_detached(ExpectedTitle, title) for title in entry["titles"]])
+    data = _job_to_dict(job)
+    data["track_counts"] = entry["track_counts"]
+    return data
+
+
+@router.get('/jobs/active/progress')
+def get_active_jobs_progress():
+    """Return ``/jobs/{id}/progress-state`` for every active job at once.
+
+    One query for the active jobs' progress fields, one grouped
+    track-count query, and a single listing of the progress directory,
+    instead of a request (and three file probes) per drive.  Each job's
+    entry is reused for ``_PROGRESS_TTL`` seconds, so several dashboards
+    polling together only rebuild it once per window.
+    """
+    rows = (
+        db.session.query(Job.job_id, Job.disctype, Job.logfile, Job.no_of_titles)
+        .filter(Job.status.in_(_ACTIVE_STATUSES))
+        .order_by(Job.job_id)
+        .all()
+    )
+    now = time.monotonic()
+    with _progress_lock:
+        # Keep only jobs that are still active; finished ones drop out.
+        for job_id in set(_progress_cache) - {row.job_id for row in rows}:
+            del _progress_cache[job_id]
+        fresh = {
+            row.job_id: _progress_cache[row.job_id][1]
+            for row in rows
+            if row.job_id in _progress_cache
+            and _progress_cache[row.job_id][0] == tuple(row)
+            and now - _progress_cache[row.job_id][2] < _PROGRESS_TTL
+        }
+    stale = [row for row in rows if row.job_id not in fresh]
+    if stale:
+        counts = svc_jobs.track_counts_by_job(row.job_id for row in stale)
+        progress = progress_reader.get_progress_for_jobs(
+            (row.job_id, row.logfile, row.no_of_titles or 0) for row in stale
+        )
+        built = {
+            row.job_id: _progress_state(row, counts[row.job_id], **progress[row.job_id])
+            for row in stale
+        }
+        with _progress_lock:
+            for row in stale:
+                _progress_cache[row.job_id] = (tuple(row), built[row.job_id], now)
+        fresh.update(built)
+    return {"jobs": [{"job_id": row.job_id, **fresh[row.job_id]} for row in rows]}
+
+
+# Per-job entries for /jobs/active/progress: job_id -> (job fields, state,
+# built_at).  Sub-second, so progress still moves on every UI poll.
+_PROGRESS_TTL = 0.5
+_progress_cache: dict[int, tuple[tuple, dict, float]] = {}
+_progress_lock = threading.Lock()
 
 
 def _apply_job_filters(query, status, search, video_type, disctype, days):
     """Apply the shared filter set used by /jobs/paginated and /jobs/stats.
 
     Status accepts the grouped values 'active' and 'waiting' (which expand
-    to multiple raw statuses) as well as any raw status value.
+    to multiple raw statuses) as well as any raw status value.  Stored
+    statuses are always lowercase enum values, so the column is compared
+    directly (no lower()) and ix_job_status_start_time stays usable.
     """
     if status:
         s = status.lower()
         if s == "active":
-            query = query.filter(func.lower(Job.status).in_(list(_ACTIVE_STATUSES - _WAITING_STATUSES)))
+            query = query.filter(Job.status.in_(list(_ACTIVE_STATUSES - _WAITING_STATUSES)))
         elif s == "waiting":
-            query = query.filter(func.lower(Job.status).in_(list(_WAITING_STATUSES)))
+            query = query.filter(Job.status.in_(list(_WAITING_STATUSES)))
+        elif s in _STATUS_VALUES:
+            query = query.filter(Job.status == s)
         else:
-            query = query.filter(func.lower(Job.status) == s)
+            query = query.filter(false())
     if video_type:
         query = query.filter(func.lower(Job.video_type) == video_type.lower())
     if disctype:
@@ -221,21 +341,87 @@ def _apply_job_filters(query, status, search, video_type, disctype, days):
     if days:
         cutoff = datetime.now() - timedelta(days=days)
         query = query.filter(Job.start_time >= cutoff)
+    if search:
+        query = query.filter(job_search.search_clause(search, session=query.session))
+    return query
+
+
+def _apply_archive_filters(query, status, search, video_type, disctype, days):
+    """:func:`_apply_job_filters` for the ``job_archive`` summary rows.
+
+    Only finished jobs are archived, so the grouped 'active' / 'waiting'
+    statuses match nothing.  Search is a substring match on title and
+    label (the archive has no FTS index).
+    """
+    if status:
+        s = status.lower()
+        query = query.filter(JobArchive.status == s if s in _STATUS_VALUES else false())
+    if video_type:
+        query = query.filter(func.lower(JobArchive.video_type) == video_type.lower())
+    if disctype:
+        query = query.filter(func.lower(JobArchive.disctype) == disctype.lower())
+    if days:
+        cutoff = datetime.now() - timedelta(days=days)
+        query = query.filter(JobArchive.start_time >= cutoff)
     if search:
         pattern = f"%{search}%"
-        query = query.filter(
-            or_(
-                Job.title.ilike(pattern),
-                Job.title_auto.ilike(pattern),
-                Job.title_manual.ilike(pattern),
-                Job.label.ilike(pattern),
-            )
-        )
+        query = query.filter(or_(JobArchive.title.ilike(pattern), JobArchive.label.ilike(pattern)))
     return query
 
 
+def _encode_cursor(job, direction):
+    """Opaque keyset cursor for the row *after* ``job`` in start_time order."""
+    start = job.start_time.isoformat() if job.start_time else None
+    raw = json.dumps([start, job.job_id, direction], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor):
+    """Return ``(start_time, job_id, direction)``; raise ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        start, job_id, direction = json.loads(base64.urlsafe_b64decode(padded))
+        start = datetime.fromisoformat(start) if start is not None else None
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(job_id, int) or direction not in ("asc", "desc"):
+        raise ValueError("Invalid cursor")
+    return start, job_id, direction
+
+
+def _keyset_page(query, start, job_id, direction, limit,
+                 start_col=Job.start_time, id_col=Job.job_id):
+    """Up to *limit* rows strictly after (start, job_id) in start_time order.
+
+    NULL start_times sort last in both directions (matching the offset
+    path's ``nulls_last``) and are then ordered by job_id alone.  Dated
+    and undated rows are fetched separately: an OR across the two, or a
+    NULLS LAST sort, would stop SQLite using ix_job_start_time as a range.
+    *start_col* / *id_col* let the archive-inclusive history page run
+    the same walk over its union.
+    """
+    asc = direction == "asc"
+    after_id = id_col > job_id if asc else id_col < job_id
+    by_id = id_col.asc() if asc else id_col.desc()
+    rows = []
+    if start is not None:
+        key, bound = tuple_(start_col, id_col), tuple_(start, job_id)
+        rows = (
+            query.filter(key > bound if asc else key < bound)
+            .order_by(start_col.asc() if asc else start_col.desc(), by_id)
+            .limit(limit).all()
+        )
+        after_id = true()  # every undated row follows the dated ones
+    if len(rows) < limit:
+        rows += (
+            query.filter(start_col.is_(None), after_id)
+            .order_by(by_id).limit(limit - len(rows)).all()
+        )
+    return rows
+
+
 @router.get('/jobs/paginated')
-def get_jobs_paginated(
+async def get_jobs_paginated(
     page: Annotated[int, Query(ge=1)] = 1,
     per_page: Annotated[int, Query(ge=1, le=100)] = 25,
     status: str | None = None,
@@ -245,48 +431,147 @@ def get_jobs_paginated(
     days: Annotated[int | None, Query(ge=1)] = None,
     sort_by: str | None = None,
     sort_dir: Annotated[str | None, Query(pattern="^(asc|desc)$")] = None,
+    cursor: str | None = None,
 ):
     """Paginated job list with filtering and sorting.
 
     Supports status grouping (active = active+ripping+transcoding,
     waiting = waiting+waiting_transcode), text search across title fields,
     and sorting by title/year/status/video_type/disctype/start_time.
+
+    When sorted by start_time (the default) the response carries a
+    ``next_cursor``; passing it back as ``cursor`` fetches the following
+    page by keyset on (start_time, job_id) instead of OFFSET, so deep
+    pages cost the same as the first and rows inserted meanwhile do not
+    shift the results.  ``page`` is ignored (and returned as null) when a
+    cursor is given.
+
+    Archived jobs (see :mod:`arm.services.job_archive`) are merged into
+    the results and carry ``"archived": true``.
     """
-    query = _apply_job_filters(
-        db.session.query(Job), status, search, video_type, disctype, days,
+    # Sorting; job_id breaks ties so the order is stable across pages.
+    col = _SORTABLE_COLUMNS.get(sort_by, Job.start_time)
+    direction = "asc" if sort_dir == "asc" else "desc"
+    start = after_id = None
+    if cursor is not None:
+        if col is not Job.start_time:
+            return JSONResponse(
+                {"detail": "cursor pagination requires sort_by=start_time"},
+                status_code=400,
+            )
+        try:
+            start, after_id, direction = _decode_cursor(cursor)
+        except ValueError as exc:
+            return JSONResponse({"detail": str(exc)}, status_code=400)
+    return await db.run_read(
+        _jobs_page, page, per_page, (status, search, video_type, disctype, days),
+        col, direction, cursor is not None, start, after_id,
+        build=_jobs_page_out,
     )
-    total = query.count()
 
-    # Sorting
-    col = _SORTABLE_COLUMNS.get(sort_by, Job.start_time)
-    if sort_dir == "asc":
-        query = query.order_by(col.asc().nulls_last())
+
+def _jobs_page(session, page, per_page, filters, col, direction, by_cursor, start, after_id):
+    archived = _apply_archive_filters(session.query(JobArchive), *filters)
+    if archived.count():
+        return _history_page(session, archived, page, per_page, filters, col,
+                             direction, by_cursor, start, after_id)
+    query = _apply_job_filters(session.query(*_JOB_COLUMNS), *filters)
+    total = query.count()
+    keyset = col is Job.start_time
+    if direction == "asc":
+        order = (col.asc().nulls_last(), Job.job_id.asc())
     else:
-        query = query.order_by(col.desc().nulls_last())
+        order = (col.desc().nulls_last(), Job.job_id.desc())
 
-    jobs = query.offset((page - 1) * per_page).limit(per_page).all()
+    if not by_cursor:
+        jobs = (
+            query.order_by(*order)
+            .offset((page - 1) * per_page).limit(per_page + 1).all()
+        )
+    else:
+        jobs = _keyset_page(query, start, after_id, direction, per_page + 1)
+    has_more = len(jobs) > per_page
+    jobs = jobs[:per_page]
     pages = max(1, math.ceil(total / per_page)) if total else 1
 
-    job_dicts = []
-    for j in jobs:
-        d = _job_to_dict(j)
-        # Surface rippable-subset counts so the list UI can render
-        # "ripped/total" without a per-row roundtrip. Matches the shape
-        # /jobs/active and /jobs/{id}/detail emit.
-        d["track_counts"] = svc_jobs.track_counts(j)
-        job_dicts.append(d)
-
+    # Surface rippable-subset counts so the list UI can render
+    # "ripped/total" without a per-row roundtrip. Matches the shape
+    # /jobs/active and /jobs/{id}/detail emit.
     return {
-        "jobs": job_dicts,
+        "jobs": _job_entries(session, jobs),
         "total": total,
-        "page": page,
+        "page": None if by_cursor else page,
         "per_page": per_page,
         "pages": pages,
+        "next_cursor": _encode_cursor(jobs[-1], direction) if keyset and has_more else None,
+    }
+
+
+def _jobs_page_out(page):
+    return {**page, "jobs": [_entry_to_dict(entry) for entry in page["jobs"]]}
+
+
+def _history_page(session, archived, page, per_page, filters, col, direction,
+                  by_cursor, start, after_id):
+    """:func:`_jobs_page` over a UNION of hot and archived jobs.
+
+    Only (job_id, sort key) pairs go through the union; the page's hot
+    jobs are then fetched as rows and its archived jobs as their stored
+    payloads, both built by :func:`_jobs_page_out`.
+    """
+    hot = _apply_job_filters(session.query(Job), *filters)
+    total = hot.count() + archived.count()
+    history = union_all(
+        hot.with_entities(
+            Job.job_id.label("job_id"), col.label("sort_key"),
+            Job.start_time.label("start_time"), literal(False).label("archived"),
+            null().label("tracks_total"), null().label("tracks_ripped"),
+        ).statement,
+        archived.with_entities(
+            JobArchive.job_id, getattr(JobArchive, col.key), JobArchive.start_time,
+            literal(True), JobArchive.tracks_total, JobArchive.tracks_ripped,
+        ).statement,
+    ).subquery("history")
+    keys = session.query(history)
+    if not by_cursor:
+        if direction == "asc":
+            order = (history.c.sort_key.asc().nulls_last(), history.c.job_id.asc())
+        else:
+            order = (history.c.sort_key.desc().nulls_last(), history.c.job_id.desc())
+        rows = keys.order_by(*order).offset((page - 1) * per_page).limit(per_page + 1).all()
+    else:
+        rows = _keyset_page(keys, start, after_id, direction, per_page + 1,
+                            history.c.start_time, history.c.job_id)
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    hot_ids = [row.job_id for row in rows if not row.archived]
+    hot = {
+        entry["values"]["job_id"]: entry for entry in _job_entries(
+            session, session.query(*_JOB_COLUMNS).filter(Job.job_id.in_(hot_ids)).all())
+    }
+    payloads = job_archive.archived_payloads(
+        (row.job_id for row in rows if row.archived), session=session)
+    entries = [
+        {"payload": payloads[row.job_id],
+         "track_counts": {"total": row.tracks_total, "ripped": row.tracks_ripped}}
+        if row.archived else hot[row.job_id]
+        for row in rows
+    ]
+
+    return {
+        "jobs": entries,
+        "total": total,
+        "page": None if by_cursor else page,
+        "per_page": per_page,
+        "pages": max(1, math.ceil(total / per_page)) if total else 1,
+        "next_cursor": (_encode_cursor(rows[-1], direction)
+                        if col is Job.start_time and has_more else None),
     }
 
 
 @router.get('/jobs/stats')
-def get_jobs_stats(
+async def get_jobs_stats(
     search: str | None = None,
     video_type: str | None = None,
     disctype: str | None = None,
@@ -304,19 +589,155 @@ def get_jobs_stats(
 
     Used by the dashboard's filter-aware count tiles. Status filter is
     intentionally omitted - the endpoint exists to count by status.
+    All buckets come from one ``GROUP BY status`` query (a handful of
+    rows, folded into buckets here), cached briefly per filter set.
     """
+    key = (search, video_type, disctype, days)
+    now = time.monotonic()
+    with _stats_lock:
+        cached = _stats_cache.get(key)
+        if cached and now - cached[0] < _STATS_TTL:
+            return dict(cached[1])
+
+    rows = await db.run_read(_status_counts, search, video_type, disctype, days)
+    active_set = _ACTIVE_STATUSES - _WAITING_STATUSES
+    result = {"total": 0, "active": 0, "waiting": 0, "success": 0, "fail": 0}
+    for status, count in rows:
+        status = (status or "").lower()
+        result["total"] += count
+        if status in active_set:
+            result["active"] += count
+        elif status in _WAITING_STATUSES:
+            result["waiting"] += count
+        elif status in ("success", "fail"):
+            result[status] += count
+
+    with _stats_lock:
+        _stats_cache[key] = (now, dict(result))
+    return result
+
+
+def _status_counts(session, search, video_type, disctype, days):
     base = _apply_job_filters(
-        db.session.query(Job), None, search, video_type, disctype, days,
+        session.query(Job), None, search, video_type, disctype, days,
     )
-    total = base.count()
-    active_set = list(_ACTIVE_STATUSES - _WAITING_STATUSES)
-    return {
-        "total": total,
-        "active": base.filter(func.lower(Job.status).in_(active_set)).count(),
-        "waiting": base.filter(func.lower(Job.status).in_(list(_WAITING_STATUSES))).count(),
-        "success": base.filter(func.lower(Job.status) == "success").count(),
-        "fail": base.filter(func.lower(Job.status) == "fail").count(),
-    }
+    archived = _apply_archive_filters(
+        session.query(JobArchive), None, search, video_type, disctype, days,
+    )
+    # One statement: hot and archived counts per status, summed by the caller.
+    counts = union_all(
+        base.with_entities(Job.status, func.count()).group_by(Job.status).statement,
+        archived.with_entities(JobArchive.status, func.count())
+        .group_by(JobArchive.status).statement,
+    )
+    return [tuple(row) for row in session.execute(counts).all()]
+
+
+# /jobs/stats is polled by the dashboard. Cache per filter set for a few
+# seconds; status changes, inserts and deletes made in this process clear
+# it immediately, changes from other processes show up after the TTL.
+_STATS_TTL = 5.0
+_stats_cache: dict[tuple, tuple[float, dict]] = {}
+_stats_lock = threading.Lock()
+
+
+def _invalidate_stats(*_args) -> None:
+    with _stats_lock:
+        _stats_cache.clear()
+
+
+@event.listens_for(Job.status, "set")
+def _on_job_status_set(target, value, oldvalue, initiator):
+    if value != oldvalue:
+        _invalidate_stats()
+
+
+event.listen(Job, "after_insert", _invalidate_stats)
+event.listen(Job, "after_delete", _invalidate_stats)
+
+
+_CHANGES_POLL_SECONDS = 0.5
+
+
+def _job_changes_payload(since, limit):
+    """One read of the change feed, with changed rows serialised."""
+    if since is None:
+        return {
+            "cursor": svc_job_changes.current_cursor(), "more": False, "reset": False,
+            "jobs": [], "tracks": [], "deleted_jobs": [], "deleted_tracks": [],
+        }
+    changes = svc_job_changes.changes_since(since, limit)
+    jobs = []
+    if changes["jobs"]:
+        found = {
+            j.job_id: j
+            for j in Job.query.filter(Job.job_id.in_(changes["jobs"]))
+            .options(selectinload(Job.expected_titles))
+        }
+        counts = svc_jobs.track_counts_by_job(found)
+        for job_id in changes["jobs"]:
+            job = found.get(job_id)
+            if job is None:  # deleted after this batch's last entry for it
+                changes["deleted_jobs"].append(job_id)
+                continue
+            job_data = _job_to_dict(job)
+            job_data["track_counts"] = counts[job_id]
+            jobs.append(job_data)
+    tracks = []
+    if changes["tracks"]:
+        found = {
+            t.track_id: t
+            for t in Track.query.filter(Track.track_id.in_(changes["tracks"]))
+        }
+        for track_id in changes["tracks"]:
+            track = found.get(track_id)
+            if track is None:
+                changes["deleted_tracks"].append(track_id)
+                continue
+            tracks.append(_track_to_dict(track))
+    changes["jobs"] = jobs
+    changes["tracks"] = tracks
+    return changes
+
+
+def _has_changes(payload):
+    return payload["reset"] or any(
+        payload[k] for k in ("jobs", "tracks", "deleted_jobs", "deleted_tracks")
+    )
+
+
+@router.get('/jobs/changes')
+async def get_job_changes(
+    since: Annotated[int | None, Query(ge=0)] = None,
+    wait: Annotated[float, Query(ge=0, le=60)] = 0,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 500,
+):
+    """Jobs and tracks changed since a cursor, for clients that stay in sync.
+
+    Call without ``since`` to get the current ``cursor`` (after an
+    initial full fetch), then pass it back each time.  Returns changed
+    jobs (as in /jobs/active) and tracks, ids of deleted ones, the next
+    ``cursor``, ``more`` when ``limit`` cut the batch short, and
+    ``reset`` when the cursor is older than the retained log and the
+    client must re-fetch everything.  With ``wait`` the request
+    long-polls for up to that many seconds until something changes.
+
+    Answers 501 when the database keeps no change log (anything but
+    SQLite); clients then fall back to polling the full lists.
+    """
+    if not svc_job_changes.feed_supported():
+        return JSONResponse(
+            {"detail": "Job change feed requires SQLite; re-fetch job lists instead"},
+            status_code=501,
+        )
+    deadline = time.monotonic() + wait
+    while True:
+        payload = await asyncio.to_thread(
+            _with_session_cleanup, _job_changes_payload, since, limit,
+        )
+        if since is None or _has_changes(payload) or time.monotonic() >= deadline:
+            return payload
+        await asyncio.sleep(min(_CHANGES_POLL_SECONDS, max(0.0, deadline - time.monotonic())))
 
 
 @router.delete('/jobs/{job_id}')
@@ -581,6 +1002,8 @@ _FIELD_MAP = {
 _METADATA_FIELDS = frozenset(('artist', 'album', 'poster_url'))
 _DIRECT_FIELDS = ('path', 'label', 'disctype', 'disc_number', 'disc_total')
 _STRUCTURED_KEYS = frozenset(('artist', 'album', 'season', 'episode'))
+# Fields the episode-claim ledger copies from the job.
+_CLAIM_KEYS = frozenset(('season', 'disc_number'))
 _VALID_DISCTYPES = ('dvd', 'bluray', 'bluray4k', 'music', 'data')
 
 
@@ -677,6 +1100,11 @@ def update_job_title(job_id: int, body: dict):
         else:
             merged = MediaMetadata(**metadata_overrides)
         args['media_metadata_manual'] = merged.model_dump_json()
+    if _CLAIM_KEYS.intersection(updated):
+        # Rewrite the claims from the edited job in the same commit.
+        for key, value in args.items():
+            setattr(job, key, value)
+        sync_job_claims(job)
     svc_files.database_updater(args, job)
 
     if structured_changed and 'title' not in updated:
@@ -1009,10 +1437,25 @@ def _job_config_masked(job_config):
 
 @router.get('/jobs/{job_id}/detail')
 def get_job_detail(job_id: int):
-    """Return job with config (masked), tracks, and track counts."""
+    """Return job with config (masked), tracks, and track counts.
+
+    Archived jobs are rebuilt from their stored rows and flagged with
+    ``"archived": true``.
+    """
     job = Job.query.get(job_id)
     if not job:
-        return JSONResponse({"success": False, "error": _JOB_NOT_FOUND}, status_code=404)
+        archived = job_archive.load_archived(job_id)
+        if archived is None:
+            return JSONResponse({"success": False, "error": _JOB_NOT_FOUND}, status_code=404)
+        job, config, tracks = archived
+        summary = db.session.get(JobArchive, job_id)
+        return {
+            "job": _job_to_dict(job),
+            "config": _job_config_masked(config),
+            "tracks": [_track_to_dict(t) for t in tracks],
+            "track_counts": {"total": summary.tracks_total, "ripped": summary.tracks_ripped},
+            "archived": True,
+        }
 
     return {
         "job": _job_to_dict(job),
@@ -1051,7 +1494,10 @@ def get_job_progress_state(job_id: int):
     rip = progress_reader.get_rip_progress(job_id)
     music = progress_reader.get_music_progress(job.logfile, job.no_of_titles or 0)
     copy = progress_reader.get_copy_progress(job_id)
+    return _progress_state(job, counts, rip, music, copy)
 
+
+def _progress_state(job, counts, rip, music, copy) -> dict:
     return JobProgressState(
         track_counts=TrackCounts(**counts),
         disctype=job.disctype,
@@ -1352,10 +1798,14 @@ def tvdb_match(job_id: int, body: dict):
 
     result = match_episodes_for_api(job, season=season, tolerance=tolerance, apply=apply)
 
-    # Restore originals if not applying (preview mode)
+    # Restore originals if not applying (preview mode).  The match may
+    # have committed a newly resolved tvdb_id alongside the overrides,
+    # so commit the restore and the claims that follow from it.
     if not apply:
         job.disc_number = saved_disc_number
         job.disc_total = saved_disc_total
+        sync_job_claims(job)
+        db.session.commit()
     else:
         # Persist disc overrides and enable multi_title when applying
         # (matched episodes imply distinct per-track names for transcoder)
@@ -1364,13 +1814,58 @@ def tvdb_match(job_id: int, body: dict):
     return result
 
 
+@router.post('/jobs/tvdb-match/box-set')
+def tvdb_match_box_set(body: dict):
+    """Match every disc of a TV box set jointly.
+
+    Body: {"job_ids": [int, ...], "season": int|null, "tolerance": int|null,
+           "apply": bool}
+    Returns a per-disc proposal with confidence; apply=true writes all
+    discs in one transaction (all or nothing).
+    """
+    from arm.services.tvdb_sync import match_box_set_for_api
+
+    job_ids = body.get("job_ids")
+    if not isinstance(job_ids, list) or not job_ids:
+        return JSONResponse(
+            {"success": False, "error": "job_ids must be a non-empty list"},
+            status_code=400,
+        )
+    try:
+        job_ids = sorted({int(j) for j in job_ids})
+    except (TypeError, ValueError):
+        return JSONResponse(
+            {"success": False, "error": "job_ids must be integers"},
+            status_code=400,
+        )
+    jobs = Job.query.filter(Job.job_id.in_(job_ids)).all()
+    missing = sorted(set(job_ids) - {j.job_id for j in jobs})
+    if missing:
+        return JSONResponse(
+            {"success": False, "error": f"{_JOB_NOT_FOUND}: {missing}"},
+            status_code=404,
+        )
+
+    season = body.get("season")
+    tolerance = body.get("tolerance")
+    result = match_box_set_for_api(
+        jobs,
+        season=int(season) if season is not None else None,
+        tolerance=int(tolerance) if tolerance is not None else None,
+        apply=bool(body.get("apply", False)),
+    )
+    if not result["success"] and "discs" not in result:
+        return JSONResponse(result, status_code=400)
+    return result
+
+
 @router.get('/jobs/{job_id}/tvdb-episodes')
 def tvdb_episodes(job_id: int, season: int = 1):
     """Fetch TVDB episodes for a job's series.
 
     Query: ?season=2
     """
-    from arm.services import tvdb
+    from arm.services import tvdb_cache
     from arm.services.matching._async_compat import run_async as _run_async
 
     job = Job.query.get(job_id)
@@ -1384,7 +1879,7 @@ def tvdb_episodes(job_id: int, season: int = 1):
             status_code=400,
         )
 
-    episodes = _run_async(tvdb.get_season_episodes(tvdb_id, season))
+    episodes = _run_async(tvdb_cache.get_season_episodes(tvdb_id, season))
     return {"episodes": episodes, "tvdb_id": tvdb_id, "season": season}
 
 
@@ -1437,6 +1932,8 @@ def update_track_fields(job_id: int, track_id: int, body: dict):
     # the filename, so it must reflect the current episode_name when set.
     if "episode_name" in clean and clean["episode_name"]:
         track.title = clean["episode_name"]
+    if "episode_number" in clean:
+        sync_job_claims(Job.query.get(job_id))
     db.session.commit()
     return {"success": True, "job_id": job_id, "track_id": track_id, "updated": clean}
 
@@ -1473,5 +1970,6 @@ def auto_number_episodes(job_id: int, body: dict = None):
         numbered.append({"track_id": t.track_id, "track_number": t.track_number, "episode": ep})
         ep += 1
 
+    sync_job_claims(job)
     db.session.commit()
     return {"success": True, "job_id": job_id, "start": start, "count": len(numbered), "tracks": numbered}
@@ -5,7 +5,9 @@ from pathlib import Path
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from arm.services import job_archive
 from arm.services import maintenance as svc
+from arm.services import maintenance_scan
 
 router = APIRouter(prefix="/api/v1", tags=["maintenance"])
 
@@ -18,28 +20,64 @@ class BulkPathRequest(BaseModel):
     paths: list[str]
 
 
+class ArchiveRequest(BaseModel):
+    days: int | None = None
+
+
+# The orphan endpoints serve the last background scan; only before the
+# first one has finished do they wait for it, this long at most.
+_FIRST_SCAN_WAIT = 5.0
+
+
+def _scan_meta(result: dict) -> dict:
+    return {"scanned_at": result["scanned_at"], "scanning": result["scanning"]}
+
+
 @router.get("/maintenance/counts")
 def get_counts():
-    """Return orphan counts for summary display."""
-    return svc.get_counts()
+    """Return orphan counts for summary display (from the last scan)."""
+    result = maintenance_scan.last_result(wait=_FIRST_SCAN_WAIT)
+    return {
+        "orphan_logs": len(result["orphan_logs"]["files"]),
+        "orphan_folders": len(result["orphan_folders"]["folders"]),
+        **_scan_meta(result),
+    }
 
 
 @router.get("/maintenance/orphan-logs")
 def get_orphan_logs():
-    """List log files not referenced by any job."""
-    return svc.get_orphan_logs()
+    """List log files not referenced by any job (from the last scan)."""
+    result = maintenance_scan.last_result(wait=_FIRST_SCAN_WAIT)
+    return {**result["orphan_logs"], **_scan_meta(result)}
 
 
 @router.get("/maintenance/orphan-folders")
 def get_orphan_folders():
-    """List folders in RAW_PATH/COMPLETED_PATH not matching any job."""
-    return svc.get_orphan_folders()
+    """List folders in RAW_PATH/COMPLETED_PATH not matching any job (from the last scan)."""
+    result = maintenance_scan.last_result(wait=_FIRST_SCAN_WAIT)
+    return {**result["orphan_folders"], **_scan_meta(result)}
+
+
+@router.get("/maintenance/scan")
+def get_scan_status():
+    """Progress of the orphan scan and the time of its last result."""
+    return maintenance_scan.status()
+
+
+@router.post("/maintenance/scan")
+def start_scan():
+    """Rescan for orphans in the background; ``started`` is false if a
+    scan was already running."""
+    started = maintenance_scan.refresh()
+    return {"started": started, **maintenance_scan.status()}
 
 
 @router.post("/maintenance/delete-log")
 async def delete_log(req: PathRequest):
     result = await asyncio.to_thread(svc.delete_log, req.path)
-    if not result["success"]:
+    if result["success"]:
+        maintenance_scan.discard([req.path])
+    else:
         error = result.get("error", "")
         if "outside" in error:
             raise HTTPException(status_code=403, detail="Access denied")
@@ -51,7 +89,9 @@ async def delete_log(req: PathRequest):
 @router.post("/maintenance/delete-folder")
 async def delete_folder(req: PathRequest):
     result = await asyncio.to_thread(svc.delete_folder, req.path)
-    if not result["success"]:
+    if result["success"]:
+        maintenance_scan.discard([req.path])
+    else:
         error = result.get("error", "")
         if "outside" in error:
             raise HTTPException(status_code=403, detail="Access denied")
@@ -63,6 +103,7 @@ async def delete_folder(req: PathRequest):
 @router.post("/maintenance/bulk-delete-logs")
 async def bulk_delete_logs(req: BulkPathRequest):
     result = await asyncio.to_thread(svc.bulk_delete_logs, req.paths)
+    maintenance_scan.discard(result["removed"])
     # Sanitize error messages - don't expose internal paths
     result["errors"] = [
         f"{Path(e.split(':')[0]).name}: operation failed" if ':' in e else e
@@ -74,6 +115,7 @@ async def bulk_delete_logs(req: BulkPathRequest):
 @router.post("/maintenance/bulk-delete-folders")
 async def bulk_delete_folders(req: BulkPathRequest):
     result = await asyncio.to_thread(svc.bulk_delete_folders, req.paths)
+    maintenance_scan.discard(result["removed"])
     result["errors"] = [
         f"{Path(e.split(':')[0]).name}: operation failed" if ':' in e else e
         for e in result.get("errors", [])
@@ -87,4 +129,14 @@ async def clear_raw():
     result = await asyncio.to_thread(svc.clear_raw_directories)
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result.get("error", "Failed"))
+    maintenance_scan.discard([result["path"]])
     return result
+
+
+@router.post("/maintenance/archive-jobs")
+async def archive_jobs(req: ArchiveRequest | None = None):
+    """Archive finished jobs older than ``days`` (default JOB_ARCHIVE_DAYS) now."""
+    days = req.days if req is not None else None
+    if days is not None and days < 1:
+        raise HTTPException(status_code=400, detail="days must be at least 1")
+    return await asyncio.to_thread(job_archive.run_archival, days)
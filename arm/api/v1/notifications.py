@@ -91,6 +91,7 @@ def read_notification(notify_id: int):
 from typing import Any  # noqa: E402
 
 from fastapi import HTTPException  # noqa: E402
+from pydantic import BaseModel, Field  # noqa: E402
 
 from arm_contracts import (  # noqa: E402
     ChannelCreate,
@@ -101,6 +102,7 @@ from arm.notifications.models import (  # noqa: E402
     NotificationOutbox,
 )
 from arm.notifications import catalog as catalog_module  # noqa: E402
+from arm.notifications import digest as digest_module  # noqa: E402
 from arm.notifications.url_composer import compose_apprise_url  # noqa: E402
 
 _HIDDEN_LITERAL = "<hidden>"
@@ -220,6 +222,7 @@ def _channel_to_out_dict(ch: NotificationChannel) -> dict:
         "config": _mask_config(ch.config),
         "subscribed_events": ch.subscribed_events or [],
         "templates": ch.templates or {},
+        "digest": ch.digest,
         "last_fired_at": ch.last_fired_at.isoformat() if ch.last_fired_at else None,
         "last_success_at": ch.last_success_at.isoformat() if ch.last_success_at else None,
         "last_error": ch.last_error,
@@ -312,6 +315,32 @@ def patch_channel(channel_id: int, payload: ChannelUpdate):
     return _channel_to_out_dict(ch)
 
 
+class DigestSettings(BaseModel):
+    """Coalescing window for a channel; ``window_seconds=0`` turns it off."""
+    window_seconds: int = Field(ge=0, le=digest_module.MAX_WINDOW_SECONDS)
+    max_batch: int = Field(default=digest_module.DEFAULT_MAX_BATCH,
+                           ge=2, le=digest_module.MAX_BATCH_LIMIT)
+
+
+@router.put("/notifications/channels/{channel_id}/digest")
+def put_channel_digest(channel_id: int, payload: DigestSettings):
+    """Merge a channel's routine events into digest messages sent at
+    most ``window_seconds`` after the first one, or once ``max_batch``
+    are waiting. Failures and manual-wait events are always sent at
+    once."""
+    ch = NotificationChannel.query.get(channel_id)
+    if ch is None:
+        raise HTTPException(404, "channel not found")
+    if payload.window_seconds == 0:
+        ch.digest = None
+    elif ch.type not in digest_module.DIGEST_CHANNEL_TYPES:
+        raise HTTPException(422, f"{ch.type} channels receive one event per call")
+    else:
+        ch.digest = payload.model_dump()
+    db.session.commit()
+    return _channel_to_out_dict(ch)
+
+
 @router.delete("/notifications/channels/{channel_id}", status_code=204)
 def delete_channel(channel_id: int):
     ch = NotificationChannel.query.get(channel_id)
@@ -11,7 +11,7 @@ from fastapi.responses import JSONResponse
 from sqlalchemy import create_engine, inspect, text
 
 import arm.config.config as cfg
-from arm.database import db
+from arm.database import db, sqlite_tuning
 from arm.models.app_state import AppState
 from arm.services import jobs as svc_jobs
 
@@ -52,7 +52,10 @@ def restart(background_tasks: BackgroundTasks):
 
 @router.get('/system/stats')
 def get_system_stats():
-    """Return live system metrics: CPU, memory, and disk usage."""
+    """Return live system metrics: CPU, memory, disk usage and SQLite WAL state.
+
+    ``database`` is None unless the WAL checkpointer runs (SQLite only).
+    """
     cpu_percent = psutil.cpu_percent()
     cpu_temp = 0.0
     try:
@@ -99,6 +102,7 @@ def get_system_stats():
         "cpu_temp": cpu_temp,
         "memory": memory,
         "storage": storage,
+        "database": sqlite_tuning.wal_stats(),
     }
 
 
@@ -9,6 +9,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 import arm.config.config as cfg
+from arm.api.conditional import ConditionalGetMiddleware
 from arm.database import db
 
 log = logging.getLogger(__name__)
@@ -103,7 +104,7 @@ def _install_session_cleanup(app: FastAPI) -> None:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup / shutdown lifecycle."""
-    db.init_engine(cfg.get_db_uri())
+    db.init_engine(cfg.get_db_uri(), **cfg.get_sqlite_tuning())
 
     # Start cached disk usage - never blocks on NFS stalls
     from arm.services.disk_usage_cache import register_paths, start_background_refresh
@@ -117,12 +118,31 @@ async def lifespan(app: FastAPI):
     ])
     start_background_refresh()
 
+    # Directory sizes for the file browser, walked off the request path.
+    # The ingress root is listed shallow (NFS) and not indexed.
+    from arm.services import dir_size_index
+    from arm.services.file_browser import get_allowed_roots
+    size_roots = get_allowed_roots()
+    size_roots.pop("ingress", None)
+    dir_size_index.start_background_walker(list(size_roots.values()))
+
+    # Managed WAL checkpoints (SQLite only; no-op otherwise).
+    from arm.database import sqlite_tuning
+    sqlite_tuning.start_checkpointer(
+        db.engine, cfg.arm_config.get("SQLITE_CHECKPOINT_INTERVAL", 10))
+
+    # Move old finished jobs out of the hot tables (JOB_ARCHIVE_DAYS).
+    from arm.services.job_archive import start_background_archival
+    start_background_archival()
+
     # Notification dispatcher (drains outbox, runs forever).
     import asyncio
     from arm.notifications.dispatcher import run_dispatcher_loop
+    from arm.notifications.wake import socket_path
     dispatcher_stop = asyncio.Event()
     dispatcher_task = asyncio.create_task(
-        run_dispatcher_loop(stop_event=dispatcher_stop),
+        run_dispatcher_loop(stop_event=dispatcher_stop,
+                            wake_socket=socket_path()),
         name="notification-dispatcher",
     )
 
@@ -137,10 +157,15 @@ async def lifespan(app: FastAPI):
         except asyncio.TimeoutError:
             log.warning("dispatcher did not stop within 10s; cancelling")
             dispatcher_task.cancel()
+        sqlite_tuning.stop_checkpointer()
+        dir_size_index.stop_background_walker()
 
 
 app = FastAPI(title="ARM API", lifespan=lifespan)
 
+# ETag / 304 for the polled dashboard endpoints; added first so CORS
+# headers are still applied to 304 responses.
+app.add_middleware(ConditionalGetMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -99,3 +99,16 @@ def get_db_uri() -> str:
     if explicit:
         return explicit
     return 'sqlite:///' + arm_config['DBFILE']
+
+
+def get_sqlite_tuning() -> dict:
+    """Return the SQLite tuning keyword arguments for ``db.init_engine``.
+
+    ``SQLITE_PROFILE`` names a profile in
+    :data:`arm.database.sqlite_tuning.PROFILES`; ``SQLITE_PRAGMAS`` is a
+    ``"name=value, ..."`` string of pragmas that override it.
+    """
+    return {
+        'sqlite_profile': arm_config.get('SQLITE_PROFILE') or None,
+        'sqlite_pragmas': arm_config.get('SQLITE_PRAGMAS') or None,
+    }
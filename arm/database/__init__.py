@@ -9,22 +9,38 @@ Includes a custom :class:`RetrySession` that automatically retries
 exponential backoff, and rolls back on all other failures.  This
 makes every ``db.session.commit()`` in the codebase safe without
 requiring per-call-site exception handling.
+
+Alongside the sync engine, an async engine (aiosqlite, or asyncpg for
+PostgreSQL) is created when its driver is installed.  Hot read-only API
+endpoints go through :meth:`_DB.run_read`, which uses it so slow reads
+wait on the event loop instead of holding a threadpool worker.  The
+ripper and all writes keep using the sync ``db.session``.
+
+SQLite connections also get the pragmas of a tuning profile; see
+:mod:`arm.database.sqlite_tuning`, which also runs the WAL checkpointer.
 """
+import asyncio
 import re
 import logging
 from time import sleep
 
+import anyio
+
 from sqlalchemy import (
     BigInteger, Column, Integer, String, Boolean, Float, Text,
     DateTime, SmallInteger, Unicode, Enum, ForeignKey, JSON, Index,
     create_engine, text, event,
 )
+from sqlalchemy.engine.url import make_url
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import (
     DeclarativeBase, relationship, backref,
     scoped_session, sessionmaker, Session,
 )
 
+from arm.database import sqlite_tuning
+
 log = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -201,6 +217,35 @@ class RetrySession(Session):
                 raise
 
 
+# ---------------------------------------------------------------------------
+# Async read engine
+# ---------------------------------------------------------------------------
+
+# Sync driver name -> async driver for the read-only engine.
+_ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'sqlite+pysqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'postgresql+psycopg2': 'postgresql+asyncpg',
+    'postgresql+psycopg': 'postgresql+asyncpg',
+}
+
+
+def _async_url(db_uri):
+    """Async equivalent of *db_uri*, or None when there isn't a usable one.
+
+    In-memory SQLite is excluded: a second engine would open a second,
+    empty database.
+    """
+    url = make_url(db_uri)
+    driver = _ASYNC_DRIVERS.get(url.drivername)
+    if driver is None:
+        return None
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return None
+    return url.set(drivername=driver)
+
+
 # ---------------------------------------------------------------------------
 # DB singleton — drop-in for Flask-SQLAlchemy's db object
 # ---------------------------------------------------------------------------
@@ -237,11 +282,18 @@ class _DB:
     def __init__(self):
         self._engine = None
         self._session_factory = None
+        self._async_engine = None
+        self._async_session_factory = None
 
     # --- Engine lifecycle ---
 
-    def init_engine(self, db_uri, **engine_kw):
-        """Create engine and scoped session.  No-op if already initialised."""
+    def init_engine(self, db_uri, sqlite_profile=None, sqlite_pragmas=None, **engine_kw):
+        """Create engine and scoped session.  No-op if already initialised.
+
+        *sqlite_profile* / *sqlite_pragmas* pick the SQLite tuning profile
+        and per-pragma overrides (``SQLITE_PROFILE`` / ``SQLITE_PRAGMAS``
+        in arm.yaml); ignored for other databases.
+        """
         if self._engine is not None:
             log.debug("Database engine already initialised — skipping.")
             return
@@ -260,6 +312,7 @@ class _DB:
             connect_args.setdefault('timeout', 30)
             engine_kw['connect_args'] = connect_args
         self._engine = create_engine(db_uri, **engine_kw)
+        pragmas = sqlite_tuning.resolve_pragmas(sqlite_profile, sqlite_pragmas)
         if db_uri.startswith('sqlite'):
             # Take full control of SQLite transaction handling.
             #
@@ -293,27 +346,99 @@ class _DB:
                 cursor.execute("PRAGMA journal_mode=WAL")
                 cursor.execute("PRAGMA busy_timeout=30000")
                 cursor.close()
+                sqlite_tuning.apply_pragmas(dbapi_conn, pragmas)
 
         factory = sessionmaker(bind=self._engine, class_=RetrySession)
         self._session_factory = scoped_session(factory)
+        # Tests pass their own poolclass (StaticPool over :memory:); only
+        # real databases get the async read engine.
+        if 'poolclass' not in engine_kw:
+            self._init_async_engine(db_uri, pragmas)
         # Mask credentials in the log message to avoid leaking the DB
         # password (postgres DSNs include user:password@host). For sqlite
         # the masked output is identical to the input.
         try:
-            from sqlalchemy.engine.url import make_url
             safe_uri = make_url(db_uri).render_as_string(hide_password=True)
         except Exception:
             safe_uri = '<unparseable>'
         log.info("Database engine initialised: %s", safe_uri)
 
+    def _init_async_engine(self, db_uri, pragmas):
+        url = _async_url(db_uri)
+        if url is None:
+            return
+        kw = {'pool_pre_ping': True, 'pool_size': 20, 'max_overflow': 10}
+        if url.get_backend_name() == 'sqlite':
+            kw['connect_args'] = {'timeout': 30}
+        try:
+            engine = create_async_engine(url, **kw)
+        except ImportError:
+            log.info("%s driver not installed; API reads stay on the threadpool",
+                     url.drivername)
+            return
+        if url.get_backend_name() == 'sqlite':
+            @event.listens_for(engine.sync_engine, "connect")
+            def _read_only_pragmas(dbapi_conn, connection_record):
+                cursor = dbapi_conn.cursor()
+                cursor.execute("PRAGMA busy_timeout=30000")
+                # This engine only serves reads; refuse writes outright.
+                cursor.execute("PRAGMA query_only=1")
+                cursor.close()
+                sqlite_tuning.apply_pragmas(dbapi_conn, pragmas)
+
+        self._async_engine = engine
+        self._async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
     def dispose(self):
         """Tear down engine and session — used by test fixtures."""
         if self._session_factory is not None:
             self._session_factory.remove()
         if self._engine is not None:
             self._engine.dispose()
+        if self._async_engine is not None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                asyncio.run(self._async_engine.dispose())
+            else:
+                # Inside a running loop: drop the pool without awaiting closes.
+                self._async_engine.sync_engine.dispose(close=False)
         self._engine = None
         self._session_factory = None
+        self._async_engine = None
+        self._async_session_factory = None
+
+    async def run_read(self, fn, *args, build=None):
+        """Run ``fn(session, *args)`` for a read-only endpoint and return its result.
+
+        With an async engine the function runs via ``AsyncSession.run_sync``:
+        ordinary ORM code, but every query is awaited on the event loop, so
+        no threadpool worker is held while SQLite works.  Without one (no
+        async driver, in-memory test database) it runs in a worker thread on
+        the scoped session, which is removed afterwards.  *fn* must use the
+        session it is given, not ``db.session`` / ``Model.query``, and must
+        return plain data (not ORM objects).
+
+        ``run_sync`` keeps *fn*'s Python work on the event-loop thread, so
+        *fn* should only fetch rows.  Per-row work (ORM instances, pydantic
+        validation) goes in *build*, which is called with *fn*'s result in a
+        worker thread and returns the endpoint's result.
+        """
+        if self._async_session_factory is None:
+            # Same AnyIO threadpool that FastAPI runs sync endpoints in.
+            return await anyio.to_thread.run_sync(self._run_read_sync, fn, build, *args)
+        async with self._async_session_factory() as session:
+            result = await session.run_sync(fn, *args)
+        if build is None:
+            return result
+        return await anyio.to_thread.run_sync(build, result)
+
+    def _run_read_sync(self, fn, build, *args):
+        try:
+            result = fn(self.session, *args)
+        finally:
+            self.session.remove()
+        return result if build is None else build(result)
 
     @property
     def engine(self):
@@ -327,6 +452,11 @@ class _DB:
             raise RuntimeError("Database not initialised — call db.init_engine() first")
         return self._session_factory
 
+    @property
+    def async_engine(self):
+        """The async read engine, or None when unavailable."""
+        return self._async_engine
+
     @property
     def metadata(self):
         return Base.metadata
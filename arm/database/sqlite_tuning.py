@@ -0,0 +1,235 @@
+"""SQLite tuning profiles and a managed WAL checkpointer.
+
+Every SQLite connection gets ``journal_mode=WAL`` and ``busy_timeout``
+(see :meth:`arm.database._DB.init_engine`) plus the pragmas of a tuning
+profile, selected with ``SQLITE_PROFILE`` in arm.yaml and adjusted per
+pragma with ``SQLITE_PRAGMAS`` (``"cache_size=-32000, mmap_size=0"``):
+
+- ``balanced`` (default): ``synchronous=NORMAL`` (durable across
+  crashes in WAL mode; a power cut can lose the last commits), a 16 MiB
+  page cache, 64 MiB of memory-mapped I/O, in-memory temp tables and a
+  cap on the WAL file size after it is reset.
+- ``low_memory``: ``synchronous=NORMAL`` with SQLite's default cache and
+  no mmap, for small boards.
+- ``safe``: SQLite's own defaults (``synchronous=FULL``).
+
+SQLite's autocheckpoint only runs on a committing connection and can
+never reset the WAL while any reader holds an older snapshot, so under
+steady rip writes plus long API reads the WAL keeps growing and every
+reader pays for it.  :func:`start_checkpointer` runs a background
+thread (in the API process) with its own connection that, every
+``SQLITE_CHECKPOINT_INTERVAL`` seconds, runs a ``PASSIVE`` checkpoint
+when there were writes since the last tick, or a ``TRUNCATE``
+checkpoint once the database has been idle for a whole interval.  It
+waits at most ``CHECKPOINT_BUSY_MS`` for readers so it never holds up
+writers for long.  :func:`wal_stats` reports the WAL size and the
+checkpoint lag for ``/system/stats``.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+PROFILES: dict[str, dict[str, int | str]] = {
+    "balanced": {
+        "synchronous": "NORMAL",
+        "cache_size": -16000,           # KiB (negative = size, not pages)
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "journal_size_limit": 64 * 1024 * 1024,
+    },
+    "low_memory": {
+        "synchronous": "NORMAL",
+        "mmap_size": 0,
+        "journal_size_limit": 16 * 1024 * 1024,
+    },
+    "safe": {},
+}
+DEFAULT_PROFILE = "balanced"
+
+# Only pragmas that are safe to set per connection from config.
+_ALLOWED = {"synchronous", "cache_size", "mmap_size", "temp_store",
+            "journal_size_limit", "wal_autocheckpoint"}
+_VALUE_RE = re.compile(r"^-?\d+$|^[A-Za-z_]+$")
+
+#: Milliseconds the checkpointer waits on readers/writers before giving up.
+CHECKPOINT_BUSY_MS = 100
+
+
+def _parse_overrides(overrides: dict | str | None) -> dict:
+    """Accept a dict or arm.yaml's ``"name=value, name=value"`` string."""
+    if not overrides:
+        return {}
+    if isinstance(overrides, dict):
+        return overrides
+    parsed = {}
+    for item in str(overrides).split(","):
+        key, sep, value = item.partition("=")
+        if not sep:
+            log.warning("Ignoring SQLITE_PRAGMAS entry %r", item.strip())
+            continue
+        parsed[key.strip()] = value.strip()
+    return parsed
+
+
+def resolve_pragmas(profile: str | None = None, overrides: dict | str | None = None) -> dict:
+    """Return the pragmas for *profile* with *overrides* applied.
+
+    Unknown profiles fall back to :data:`DEFAULT_PROFILE`; unknown
+    pragmas or malformed values are skipped.  Both are logged.
+    """
+    name = profile or DEFAULT_PROFILE
+    if name not in PROFILES:
+        log.warning("Unknown SQLITE_PROFILE %r; using %r", name, DEFAULT_PROFILE)
+        name = DEFAULT_PROFILE
+    pragmas = dict(PROFILES[name])
+    for key, value in _parse_overrides(overrides).items():
+        if key not in _ALLOWED or not _VALUE_RE.match(str(value)):
+            log.warning("Ignoring SQLITE_PRAGMAS entry %s=%r", key, value)
+            continue
+        pragmas[key] = value
+    return pragmas
+
+
+def apply_pragmas(dbapi_conn, pragmas: dict) -> None:
+    """Set *pragmas* on a raw DBAPI connection."""
+    cursor = dbapi_conn.cursor()
+    try:
+        for key, value in pragmas.items():
+            cursor.execute(f"PRAGMA {key}={value}")
+    finally:
+        cursor.close()
+
+
+def _wal_size(path: str) -> int:
+    try:
+        return os.path.getsize(path + "-wal")
+    except OSError:
+        return 0
+
+
+class _Checkpointer:
+    """Background WAL checkpoints on a dedicated connection."""
+
+    def __init__(self, path: str, interval: float):
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._conn: sqlite3.Connection | None = None
+        self._data_version: int | None = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "last_checkpoint_mode": None,
+            "last_checkpoint_at": None,
+            "last_checkpoint_busy": None,
+            "checkpoint_lag_frames": None,
+            "caught_up_at": None,
+            "checkpoints": {"passive": 0, "truncate": 0, "busy": 0},
+        }
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="wal-checkpointer")
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except sqlite3.Error as e:
+                log.warning("WAL checkpoint failed: %s", e)
+
+    def run_once(self) -> str | None:
+        """Run one checkpoint if the WAL has content; return the mode used."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=CHECKPOINT_BUSY_MS / 1000,
+                                         isolation_level=None, check_same_thread=False)
+        # data_version changes when another connection commits, so an
+        # unchanged value means no writes for a whole interval.
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        idle = version == self._data_version
+        self._data_version = version
+        if _wal_size(self.path) == 0:
+            with self._lock:
+                self._stats["checkpoint_lag_frames"] = 0
+                self._stats["caught_up_at"] = time.monotonic()
+            return None
+
+        mode = "TRUNCATE" if idle else "PASSIVE"
+        busy, log_frames, done = self._conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+        lag = max(log_frames - done, 0) if log_frames >= 0 else None
+        now = time.monotonic()
+        with self._lock:
+            stats = self._stats
+            stats["last_checkpoint_mode"] = mode.lower()
+            stats["last_checkpoint_at"] = now
+            stats["last_checkpoint_busy"] = bool(busy)
+            stats["checkpoint_lag_frames"] = lag
+            stats["checkpoints"][mode.lower()] += 1
+            if busy:
+                stats["checkpoints"]["busy"] += 1
+            if lag == 0:
+                stats["caught_up_at"] = now
+        log.debug("WAL checkpoint %s: busy=%s log=%s checkpointed=%s", mode, busy, log_frames, done)
+        return mode
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            stats = dict(self._stats, checkpoints=dict(self._stats["checkpoints"]))
+        last_at = stats.pop("last_checkpoint_at")
+        caught_up = stats.pop("caught_up_at")
+        stats["last_checkpoint_age_s"] = None if last_at is None else round(now - last_at)
+        # Seconds since the WAL was last fully copied back into the database.
+        stats["checkpoint_lag_s"] = None if caught_up is None else round(now - caught_up)
+        stats["wal_bytes"] = _wal_size(self.path)
+        stats["interval_s"] = self.interval
+        return stats
+
+
+_checkpointer: _Checkpointer | None = None
+
+
+def start_checkpointer(engine, interval: float) -> bool:
+    """Start the checkpointer for *engine*'s database file.
+
+    No-op (returns False) for non-SQLite or in-memory databases, when
+    *interval* is 0, or when one is already running.
+    """
+    global _checkpointer
+    url = engine.url
+    if _checkpointer is not None or not interval or url.get_backend_name() != "sqlite":
+        return False
+    if url.database in (None, "", ":memory:"):
+        return False
+    _checkpointer = _Checkpointer(url.database, float(interval))
+    _checkpointer.start()
+    log.info("WAL checkpointer started (interval=%ss)", interval)
+    return True
+
+
+def stop_checkpointer() -> None:
+    """Stop the checkpointer, if running."""
+    global _checkpointer
+    if _checkpointer is not None:
+        _checkpointer.stop()
+        _checkpointer = None
+
+
+def wal_stats() -> dict | None:
+    """WAL size and checkpoint lag, or None when no checkpointer runs."""
+    return _checkpointer.stats() if _checkpointer is not None else None
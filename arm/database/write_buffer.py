@@ -0,0 +1,208 @@
+"""Coalescing write buffer for high-frequency ripper updates.
+
+Rippers write small progress updates (track phases, ripped flags, title
+counts) many times a minute, and each ``db.session.commit()`` takes the
+SQLite write lock.  With several drives plus the API that shows up as
+``RetrySession`` retries and long busy waits.
+
+:func:`stage` records column updates for persistent rows instead of
+committing them.  Updates to the same row are merged (last value per
+column wins) and written as one ``UPDATE`` per row, in the order the
+rows were first staged, inside a single transaction.  That happens when:
+
+- ``FLUSH_INTERVAL`` seconds have passed since the oldest pending write,
+  checked on every :func:`stage` and :func:`flush_if_due` call (callers
+  with a loop call :func:`flush_if_due` on each tick, so a lone staged
+  write does not wait for the next one);
+- a critical update is staged (any ``Job.status`` change by default);
+- anything else commits on the same session - the buffer is written at
+  the start of that commit, in the same transaction;
+- :func:`flush` is called.
+
+Ordering: a critical update is never buffered.  It is committed
+together with everything staged before it, and staged writes are
+applied before the ORM's own changes in that transaction, so no
+status change becomes visible ahead of writes made before it, and two
+status changes are never merged.  If the ORM itself writes a column
+that is also pending here, the pending value is dropped, since the
+ORM's value is newer.
+
+The buffer lives on the session (``session.info``); ``db.session`` is
+thread-scoped, so each ripper process (or rip thread in the API) has
+its own buffer.
+"""
+from __future__ import annotations
+
+import logging
+import time
+
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from arm.database import db
+
+log = logging.getLogger(__name__)
+
+#: Seconds a staged write may wait before stage() / flush_if_due() commits it.
+FLUSH_INTERVAL = 5.0
+
+_BUFFER_KEY = "write_buffer"
+_INFLIGHT_KEY = "write_buffer_inflight"
+
+
+class _Pending:
+    """Staged column values for one session: {(mapper, pk): {key: value}}."""
+
+    def __init__(self):
+        self.rows: dict[tuple, dict] = {}
+        self.objects: dict[tuple, object] = {}
+        self.oldest: float | None = None
+
+    def add(self, key, obj, values) -> None:
+        self.rows.setdefault(key, {}).update(values)
+        self.objects[key] = obj
+        if self.oldest is None:
+            self.oldest = time.monotonic()
+
+    def take(self) -> dict[tuple, dict]:
+        rows = self.rows
+        self.rows, self.objects, self.oldest = {}, {}, None
+        return rows
+
+    def restore(self, rows: dict[tuple, dict]) -> None:
+        """Put back writes from a failed commit under any newer values."""
+        for key, values in rows.items():
+            newer = self.rows.pop(key, {})
+            self.rows[key] = {**values, **newer}
+        if rows and self.oldest is None:
+            self.oldest = time.monotonic()
+
+
+def _pending(session, create=False) -> _Pending | None:
+    pending = session.info.get(_BUFFER_KEY)
+    if pending is None and create:
+        pending = session.info[_BUFFER_KEY] = _Pending()
+    return pending
+
+
+def _is_critical(obj, values) -> bool:
+    return getattr(obj, "__tablename__", None) == "job" and "status" in values
+
+
+def stage(obj, values: dict, critical: bool | None = None) -> bool:
+    """Apply *values* to *obj* and queue them for a coalesced write.
+
+    *obj* sees the new values immediately.  When *critical* is None it
+    is inferred (``Job.status`` changes are critical).  Objects that are
+    not yet persistent in the session are committed straight away.
+
+    :returns: True if the session was committed by this call.
+    """
+    session = db.session()
+    state = inspect(obj)
+    if critical is None:
+        critical = _is_critical(obj, values)
+    if critical or not state.persistent or state.session is not session:
+        for key, value in values.items():
+            setattr(obj, key, value)
+        session.commit()
+        return True
+
+    # Hide the change from the ORM so neither autoflush nor an unrelated
+    # flush writes it; the buffer owns it until the next flush.
+    for key, value in values.items():
+        set_committed_value(obj, key, value)
+    pending = _pending(session, create=True)
+    pending.add((state.mapper, state.identity), obj, values)
+    return _commit_if_due(session, pending)
+
+
+def _commit_if_due(session, pending) -> bool:
+    if pending.oldest is not None and time.monotonic() - pending.oldest >= FLUSH_INTERVAL:
+        session.commit()
+        return True
+    return False
+
+
+def flush_if_due() -> bool:
+    """Commit staged writes once the oldest has waited ``FLUSH_INTERVAL``.
+
+    Cheap when nothing is pending; meant to be called on every tick of
+    a ripper's output loop.
+
+    :returns: True if the session was committed by this call.
+    """
+    session = db.session()
+    pending = _pending(session)
+    if pending is None or not pending.rows:
+        return False
+    return _commit_if_due(session, pending)
+
+
+def flush() -> None:
+    """Commit any writes staged on the current session."""
+    session = db.session()
+    pending = _pending(session)
+    if pending is not None and pending.rows:
+        session.commit()
+
+
+def pending_count() -> int:
+    """Rows with staged, unwritten changes on the current session."""
+    pending = _pending(db.session())
+    return len(pending.rows) if pending is not None else 0
+
+
+def _write(session, rows) -> None:
+    for (mapper, identity), values in rows.items():
+        pk = dict(zip((col.key for col in mapper.primary_key), identity))
+        stmt = (
+            update(mapper.local_table)
+            .where(*(mapper.local_table.c[name] == value for name, value in pk.items()))
+            .values({mapper.get_property(key).columns[0]: value for key, value in values.items()})
+        )
+        session.execute(stmt)
+
+
+@event.listens_for(Session, "before_commit")
+def _write_pending(session):
+    pending = _pending(session)
+    if pending is None or not pending.rows:
+        return
+    rows = pending.take()
+    session.info[_INFLIGHT_KEY] = rows
+    _write(session, rows)
+    log.debug("write buffer: wrote %d coalesced row update(s)", len(rows))
+
+
+@event.listens_for(Session, "after_flush")
+def _drop_superseded(session, flush_context):
+    """The ORM just wrote columns that are also pending; its value is newer."""
+    pending = _pending(session)
+    if pending is None or not pending.rows:
+        return
+    for obj in session.dirty:
+        state = inspect(obj)
+        key = (state.mapper, state.identity)
+        values = pending.rows.get(key)
+        if not values:
+            continue
+        for attr in list(values):
+            if state.attrs[attr].history.has_changes():
+                del values[attr]
+        if not values:
+            del pending.rows[key]
+            pending.objects.pop(key, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_inflight(session):
+    session.info.pop(_INFLIGHT_KEY, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _restore_inflight(session):
+    rows = session.info.pop(_INFLIGHT_KEY, None)
+    if rows:
+        _pending(session, create=True).restore(rows)
@@ -0,0 +1,40 @@
+"""Index the hot job, track, config and notification query paths.
+
+The dashboard polls /jobs/active, /jobs/paginated and /jobs/stats, the
+ripper checks for duplicate runs per drive and label, and identification
+looks jobs up by CRC64 and TVDB id.  Without these indexes every one of
+those is a full scan of the job or track table.
+
+Revision ID: a2b3c4d5e6
+Revises: z1a2b3c4d5
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "a2b3c4d5e6"
+down_revision = "z1a2b3c4d5"
+branch_labels = None
+depends_on = None
+
+_INDEXES = (
+    ("ix_job_status_start_time", "job", ["status", "start_time"]),
+    ("ix_job_start_time", "job", ["start_time"]),
+    ("ix_job_devpath_status", "job", ["devpath", "status"]),
+    ("ix_job_label_status", "job", ["label", "status"]),
+    ("ix_job_crc_id", "job", ["crc_id"]),
+    ("ix_job_tvdb_id", "job", ["tvdb_id"]),
+    ("ix_track_job_id", "track", ["job_id"]),
+    ("ix_config_job_id", "config", ["job_id"]),
+    ("ix_notifications_cleared_trigger_time", "notifications", ["cleared", "trigger_time"]),
+    ("ix_notifications_seen", "notifications", ["seen"]),
+)
+
+
+def upgrade():
+    for name, table, columns in _INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,27 @@
+"""Create job_fts full-text index over job search fields.
+
+An FTS5 external-content table over title, title_auto, title_manual,
+label, year, imdb_id and path, kept in sync by triggers on job and
+backfilled from existing rows.  Skipped (job search stays on LIKE) on
+non-SQLite databases and SQLite builds without FTS5.
+
+Revision ID: b3c4d5e6f7
+Revises: a2b3c4d5e6
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+from arm.services.job_search import drop_fts, install_fts
+
+revision = "b3c4d5e6f7"
+down_revision = "a2b3c4d5e6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    install_fts(op.get_bind())
+
+
+def downgrade():
+    drop_fts(op.get_bind())
@@ -0,0 +1,36 @@
+"""Create job_change log and its job/track triggers.
+
+Backs the /jobs/changes feed: every insert, update and delete on job or
+track appends a row with a strictly increasing seq.
+
+Revision ID: c4d5e6f7a8
+Revises: b3c4d5e6f7
+Create Date: 2026-10-18
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from arm.models.job_change import create_triggers, drop_triggers
+
+revision = "c4d5e6f7a8"
+down_revision = "b3c4d5e6f7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "job_change",
+        sa.Column("seq", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("table_name", sa.String(length=8), nullable=False),
+        sa.Column("row_id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=True),
+        sa.Column("op", sa.String(length=6), nullable=False),
+        sqlite_autoincrement=True,
+    )
+    create_triggers(op.get_bind())
+
+
+def downgrade():
+    drop_triggers(op.get_bind())
+    op.drop_table("job_change")
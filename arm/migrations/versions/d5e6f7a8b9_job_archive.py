@@ -0,0 +1,57 @@
+"""Create job_archive and job_archive_data for archived job history.
+
+Finished jobs older than JOB_ARCHIVE_DAYS are moved out of job, track,
+config and expected_title into a summary row (job_archive) plus a JSON
+copy of the original rows (job_archive_data).
+
+Revision ID: d5e6f7a8b9
+Revises: c4d5e6f7a8
+Create Date: 2026-10-19
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "d5e6f7a8b9"
+down_revision = "c4d5e6f7a8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "job_archive",
+        sa.Column("job_id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("guid", sa.String(length=36)),
+        sa.Column("status", sa.String(length=32)),
+        sa.Column("title", sa.String(length=256)),
+        sa.Column("year", sa.String(length=4)),
+        sa.Column("video_type", sa.String(length=20)),
+        sa.Column("disctype", sa.String(length=20)),
+        sa.Column("label", sa.String(length=256)),
+        sa.Column("imdb_id", sa.String(length=15)),
+        sa.Column("crc_id", sa.String(length=63)),
+        sa.Column("poster_url", sa.String(length=256)),
+        sa.Column("hasnicetitle", sa.Boolean()),
+        sa.Column("logfile", sa.String(length=256)),
+        sa.Column("path", sa.String(length=256)),
+        sa.Column("raw_path", sa.String(length=256)),
+        sa.Column("start_time", sa.DateTime()),
+        sa.Column("stop_time", sa.DateTime()),
+        sa.Column("tracks_total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("tracks_ripped", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_job_archive_start_time", "job_archive", ["start_time"])
+    op.create_index("ix_job_archive_label_status", "job_archive", ["label", "status"])
+    op.create_table(
+        "job_archive_data",
+        sa.Column("job_id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("job_archive_data")
+    op.drop_index("ix_job_archive_label_status", table_name="job_archive")
+    op.drop_index("ix_job_archive_start_time", table_name="job_archive")
+    op.drop_table("job_archive")
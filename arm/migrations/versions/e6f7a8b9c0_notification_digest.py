@@ -0,0 +1,26 @@
+"""Add notification_channel.digest for coalesced digest delivery.
+
+Nullable JSON ``{"window_seconds", "max_batch"}``; NULL (every existing
+channel) means events are sent one by one as before.
+
+Revision ID: e6f7a8b9c0
+Revises: d5e6f7a8b9
+Create Date: 2026-10-19
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "e6f7a8b9c0"
+down_revision = "d5e6f7a8b9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("notification_channel") as batch_op:
+        batch_op.add_column(sa.Column("digest", sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("notification_channel") as batch_op:
+        batch_op.drop_column("digest")
@@ -0,0 +1,63 @@
+"""Make job and track ids AUTOINCREMENT so archived ids are never reused.
+
+A plain INTEGER PRIMARY KEY hands out max(rowid) + 1, so once the newest
+job was archived the next disc got its id back and collided with the
+job_archive row.  Both tables are rebuilt with AUTOINCREMENT and their
+sequences start above every id already archived or still claimed:
+job_archive for job ids, episode_claim (kept for archived jobs) for
+track ids.  The job_change and job_fts triggers go with the old tables
+and are reinstalled, and job_fts is re-indexed.
+
+Revision ID: f7a8b9c0d1
+Revises: e6f7a8b9c0
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+from arm.models.job_change import create_triggers, drop_triggers
+from arm.services.job_search import create_fts_triggers, drop_fts_triggers, rebuild_fts
+
+revision = "f7a8b9c0d1"
+down_revision = "e6f7a8b9c0"
+branch_labels = None
+depends_on = None
+
+_SEQUENCE_FLOORS = {
+    "job": ("job_id", "SELECT MAX(job_id) FROM job_archive"),
+    "track": ("track_id", "SELECT MAX(track_id) FROM episode_claim"),
+}
+
+
+def _rebuild(autoincrement: bool) -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    drop_triggers(bind)
+    drop_fts_triggers(bind)
+    for table in _SEQUENCE_FLOORS:
+        with op.batch_alter_table(table, recreate="always",
+                                  table_kwargs={"sqlite_autoincrement": autoincrement}):
+            pass
+    create_triggers(bind)
+    create_fts_triggers(bind)
+    rebuild_fts(bind)
+
+
+def upgrade():
+    _rebuild(True)
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    # Copying the rows already advanced each sequence to the table's max
+    # id; raise it over the ids that live on outside the table.
+    for table, (column, floor_sql) in _SEQUENCE_FLOORS.items():
+        floor = max(
+            bind.exec_driver_sql(f"SELECT MAX({column}) FROM {table}").scalar() or 0,
+            bind.exec_driver_sql(floor_sql).scalar() or 0,
+        )
+        bind.exec_driver_sql("DELETE FROM sqlite_sequence WHERE name = ?", (table,))
+        bind.exec_driver_sql("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table, floor))
+
+
+def downgrade():
+    _rebuild(False)
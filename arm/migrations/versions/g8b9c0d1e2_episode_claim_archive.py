@@ -0,0 +1,60 @@
+"""Move archived jobs' episode claims to episode_claim_archive.
+
+episode_claim has ON DELETE CASCADE foreign keys to job and track, so
+claims of archived jobs could only outlive their rows where foreign keys
+are not enforced (SQLite).  episode_claim_archive holds them without
+those keys.  Claims whose job is already archived are moved across.
+
+Revision ID: g8b9c0d1e2
+Revises: f7a8b9c0d1
+Create Date: 2026-10-19
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "g8b9c0d1e2"
+down_revision = "f7a8b9c0d1"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = "tvdb_id, season, episode_number, job_id, track_id, disc_number, claimed_at"
+_ARCHIVED = "job_id IN (SELECT job_id FROM job_archive)"
+
+
+def upgrade():
+    op.create_table(
+        "episode_claim_archive",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("tvdb_id", sa.Integer(), nullable=False),
+        sa.Column("season", sa.Integer(), nullable=True),
+        sa.Column("episode_number", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("track_id", sa.Integer(), nullable=False),
+        sa.Column("disc_number", sa.Integer(), nullable=True),
+        sa.Column("claimed_at", sa.DateTime(), nullable=False,
+                  server_default=sa.func.now()),
+    )
+    op.create_index(
+        "ix_episode_claim_archive_series_season", "episode_claim_archive",
+        ["tvdb_id", "season"],
+    )
+    op.create_index("ix_episode_claim_archive_job_id", "episode_claim_archive", ["job_id"])
+
+    op.execute(
+        f"INSERT INTO episode_claim_archive ({_COLUMNS}) "
+        f"SELECT {_COLUMNS} FROM episode_claim WHERE {_ARCHIVED}"
+    )
+    op.execute(f"DELETE FROM episode_claim WHERE {_ARCHIVED}")
+
+
+def downgrade():
+    # Put the claims back where the previous revision kept them; only
+    # possible where the foreign keys to the deleted rows aren't enforced.
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute(
+            f"INSERT INTO episode_claim ({_COLUMNS}) "
+            f"SELECT {_COLUMNS} FROM episode_claim_archive"
+        )
+    op.drop_index("ix_episode_claim_archive_job_id", table_name="episode_claim_archive")
+    op.drop_index("ix_episode_claim_archive_series_season", table_name="episode_claim_archive")
+    op.drop_table("episode_claim_archive")
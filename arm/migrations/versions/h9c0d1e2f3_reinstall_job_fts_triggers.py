@@ -0,0 +1,30 @@
+"""Reinstall the job_fts sync triggers and re-index job search.
+
+f7a8b9c0d1 rebuilt the job table, which dropped the job_fts triggers,
+and at first did not put them back: jobs written after that upgrade
+were missing from search.  Recreate the triggers (no-op without
+job_fts) and rebuild the index from the job table.
+
+Revision ID: h9c0d1e2f3
+Revises: g8b9c0d1e2
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+from arm.services.job_search import create_fts_triggers, rebuild_fts
+
+revision = "h9c0d1e2f3"
+down_revision = "g8b9c0d1e2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    create_fts_triggers(bind)
+    rebuild_fts(bind)
+
+
+def downgrade():
+    # The triggers belong to b3c4d5e6f7; leave them in place.
+    pass
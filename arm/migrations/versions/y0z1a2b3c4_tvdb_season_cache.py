@@ -0,0 +1,41 @@
+"""Create tvdb_season_cache table.
+
+Persists TVDB episode lists per (series, season) so matching can run
+offline once a series has been fetched.
+
+Revision ID: y0z1a2b3c4
+Revises: x9y0z1a2b3
+Create Date: 2026-10-18
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "y0z1a2b3c4"
+down_revision = "x9y0z1a2b3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "tvdb_season_cache",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("tvdb_id", sa.Integer(), nullable=False),
+        sa.Column("season", sa.Integer(), nullable=False),
+        sa.Column("episodes", sa.JSON(), nullable=False),
+        sa.Column("series_updated", sa.String(length=32), nullable=True),
+        sa.Column("fetched_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_tvdb_season_cache_series_season",
+        "tvdb_season_cache",
+        ["tvdb_id", "season"],
+        unique=True,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_tvdb_season_cache_series_season", table_name="tvdb_season_cache",
+    )
+    op.drop_table("tvdb_season_cache")
@@ -0,0 +1,89 @@
+"""Create episode_claim ledger and backfill it from existing tracks.
+
+One row per track that holds a TV episode, so cross-disc exclusion is
+a single indexed lookup instead of a Job/Track join over all history.
+Tracks whose episode_number is not an integer are skipped.
+
+Revision ID: z1a2b3c4d5
+Revises: y0z1a2b3c4
+Create Date: 2026-10-18
+"""
+import logging
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "z1a2b3c4d5"
+down_revision = "y0z1a2b3c4"
+branch_labels = None
+depends_on = None
+
+log = logging.getLogger("alembic.runtime.migration")
+
+
+def _int_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def upgrade():
+    claim = op.create_table(
+        "episode_claim",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("tvdb_id", sa.Integer(), nullable=False),
+        sa.Column("season", sa.Integer(), nullable=True),
+        sa.Column("episode_number", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.Integer(),
+                  sa.ForeignKey("job.job_id", ondelete="CASCADE"),
+                  nullable=False),
+        sa.Column("track_id", sa.Integer(),
+                  sa.ForeignKey("track.track_id", ondelete="CASCADE"),
+                  nullable=False),
+        sa.Column("disc_number", sa.Integer(), nullable=True),
+        sa.Column("claimed_at", sa.DateTime(), nullable=False,
+                  server_default=sa.func.now()),
+    )
+    op.create_index(
+        "ux_episode_claim_track_id", "episode_claim", ["track_id"], unique=True,
+    )
+    op.create_index(
+        "ix_episode_claim_series_season", "episode_claim", ["tvdb_id", "season"],
+    )
+    op.create_index("ix_episode_claim_job_id", "episode_claim", ["job_id"])
+
+    rows = op.get_bind().execute(sa.text(
+        "SELECT t.track_id, t.job_id, t.episode_number, "
+        "j.tvdb_id, j.season, j.season_auto, j.disc_number "
+        "FROM track t JOIN job j ON t.job_id = j.job_id "
+        "WHERE j.tvdb_id IS NOT NULL AND t.episode_number IS NOT NULL"
+    )).fetchall()
+
+    claims = []
+    for row in rows:
+        m = row._mapping
+        episode = _int_or_none(m["episode_number"])
+        if episode is None:
+            continue
+        season = _int_or_none(m["season"])
+        if season is None:
+            season = _int_or_none(m["season_auto"])
+        claims.append({
+            "tvdb_id": m["tvdb_id"],
+            "season": season,
+            "episode_number": episode,
+            "job_id": m["job_id"],
+            "track_id": m["track_id"],
+            "disc_number": m["disc_number"],
+        })
+    if claims:
+        op.bulk_insert(claim, claims)
+    log.info("episode-claim backfill: %d claim(s) from %d track(s)", len(claims), len(rows))
+
+
+def downgrade():
+    op.drop_index("ix_episode_claim_job_id", table_name="episode_claim")
+    op.drop_index("ix_episode_claim_series_season", table_name="episode_claim")
+    op.drop_index("ux_episode_claim_track_id", table_name="episode_claim")
+    op.drop_table("episode_claim")
@@ -14,6 +14,9 @@ HIDDEN_VALUE = "<hidden>"
 class Config(db.Model):
     """ Holds all the config settings for each job
     as these may change between each job """
+    __table_args__ = (
+        db.Index("ix_config_job_id", "job_id"),
+    )
     CONFIG_ID = db.Column(db.Integer, primary_key=True)
     job_id = db.Column(db.Integer, db.ForeignKey('job.job_id'))
     ARM_CHECK_UDF = db.Column(db.Boolean)
@@ -0,0 +1,63 @@
+"""EpisodeClaim: one TV episode assigned to one track of a disc job.
+
+A per-series ledger kept in step with ``Track.episode_number`` by
+arm.services.episode_claims.  Cross-disc exclusion reads it with a
+single indexed lookup instead of joining Job and Track history.
+
+Claims of archived jobs move to ``episode_claim_archive``
+(:class:`ArchivedEpisodeClaim`), which has no foreign keys to the hot
+``job`` / ``track`` rows they outlive.  Exclusion reads both tables.
+"""
+from datetime import datetime
+
+from arm.database import db
+
+
+class EpisodeClaim(db.Model):
+    __tablename__ = "episode_claim"
+    __table_args__ = (
+        db.Index("ux_episode_claim_track_id", "track_id", unique=True),
+        db.Index("ix_episode_claim_series_season", "tvdb_id", "season"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    tvdb_id = db.Column(db.Integer, nullable=False)
+    season = db.Column(db.Integer, nullable=True)
+    episode_number = db.Column(db.Integer, nullable=False)
+    job_id = db.Column(
+        db.Integer, db.ForeignKey("job.job_id", ondelete="CASCADE"),
+        nullable=False, index=True,
+    )
+    track_id = db.Column(
+        db.Integer, db.ForeignKey("track.track_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    disc_number = db.Column(db.Integer, nullable=True)
+    claimed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        season = f"S{self.season:02d}" if self.season is not None else "S??"
+        return (
+            f"<EpisodeClaim series={self.tvdb_id} {season}E{self.episode_number:02d} "
+            f"job={self.job_id} track={self.track_id}>"
+        )
+
+
+class ArchivedEpisodeClaim(db.Model):
+    """An :class:`EpisodeClaim` of a job moved to ``job_archive``."""
+    __tablename__ = "episode_claim_archive"
+    __table_args__ = (
+        db.Index("ix_episode_claim_archive_series_season", "tvdb_id", "season"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    tvdb_id = db.Column(db.Integer, nullable=False)
+    season = db.Column(db.Integer, nullable=True)
+    episode_number = db.Column(db.Integer, nullable=False)
+    job_id = db.Column(db.Integer, nullable=False, index=True)
+    track_id = db.Column(db.Integer, nullable=False)
+    disc_number = db.Column(db.Integer, nullable=True)
+    claimed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<ArchivedEpisodeClaim series={self.tvdb_id} job={self.job_id} track={self.track_id}>"
@@ -114,6 +114,16 @@ class Job(db.Model):
     Job Class hold most of the details for each job
     connects to track, config
     """
+    __table_args__ = (
+        db.Index("ix_job_status_start_time", "status", "start_time"),
+        db.Index("ix_job_start_time", "start_time"),
+        db.Index("ix_job_devpath_status", "devpath", "status"),
+        db.Index("ix_job_label_status", "label", "status"),
+        db.Index("ix_job_crc_id", "crc_id"),
+        db.Index("ix_job_tvdb_id", "tvdb_id"),
+        # Never reuse the id of an archived job.
+        {"sqlite_autoincrement": True},
+    )
     job_id = db.Column(db.Integer, primary_key=True)
     arm_version = db.Column(db.String(20))
     crc_id = db.Column(db.String(63))
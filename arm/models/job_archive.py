@@ -0,0 +1,51 @@
+"""JobArchive: finished jobs moved out of the hot tables.
+
+:mod:`arm.services.job_archive` moves old finished jobs, with their
+tracks, config and expected titles, out of ``job`` / ``track`` /
+``config`` / ``expected_title``.  Each archived job leaves a summary row
+in ``job_archive`` carrying the columns the history views filter, sort
+and display by, and one ``job_archive_data`` row with the full original
+rows as JSON, read only when a single archived job is opened.
+"""
+from datetime import datetime
+
+from arm.database import db
+
+
+class JobArchive(db.Model):
+    __tablename__ = "job_archive"
+    __table_args__ = (
+        db.Index("ix_job_archive_start_time", "start_time"),
+        db.Index("ix_job_archive_label_status", "label", "status"),
+    )
+
+    job_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    guid = db.Column(db.String(36))
+    status = db.Column(db.String(32))
+    title = db.Column(db.String(256))
+    year = db.Column(db.String(4))
+    video_type = db.Column(db.String(20))
+    disctype = db.Column(db.String(20))
+    label = db.Column(db.String(256))
+    imdb_id = db.Column(db.String(15))
+    crc_id = db.Column(db.String(63))
+    poster_url = db.Column(db.String(256))
+    hasnicetitle = db.Column(db.Boolean)
+    logfile = db.Column(db.String(256))
+    path = db.Column(db.String(256))
+    raw_path = db.Column(db.String(256))
+    start_time = db.Column(db.DateTime)
+    stop_time = db.Column(db.DateTime)
+    tracks_total = db.Column(db.Integer, nullable=False, default=0)
+    tracks_ripped = db.Column(db.Integer, nullable=False, default=0)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<JobArchive {self.job_id} {self.title!r} {self.status}>"
+
+
+class JobArchiveData(db.Model):
+    __tablename__ = "job_archive_data"
+
+    job_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    payload = db.Column(db.Text, nullable=False)
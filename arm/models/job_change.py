@@ -0,0 +1,85 @@
+"""JobChange: append-only log of job and track writes.
+
+Rows are written by SQLite triggers on ``job`` and ``track``, so every
+writer (API, ripper processes, transcoder callbacks) is captured without
+the ORM being involved.  ``seq`` is AUTOINCREMENT and therefore strictly
+increasing and never reused; /jobs/changes hands it to clients as their
+cursor.  The log trims itself to the newest ``RETAIN`` rows.
+
+Other databases get no triggers and an empty log; /jobs/changes answers
+501 there (see ``arm.services.job_changes.feed_supported``).
+"""
+from sqlalchemy import event
+
+from arm.database import db
+
+RETAIN = 100_000
+
+TRIGGERS = {
+    "job_change_job_ai": (
+        "AFTER INSERT ON job BEGIN INSERT INTO job_change (table_name, row_id, job_id, op) "
+        "VALUES ('job', new.job_id, new.job_id, 'insert'); END"
+    ),
+    "job_change_job_au": (
+        "AFTER UPDATE ON job BEGIN INSERT INTO job_change (table_name, row_id, job_id, op) "
+        "VALUES ('job', new.job_id, new.job_id, 'update'); END"
+    ),
+    "job_change_job_ad": (
+        "AFTER DELETE ON job BEGIN INSERT INTO job_change (table_name, row_id, job_id, op) "
+        "VALUES ('job', old.job_id, old.job_id, 'delete'); END"
+    ),
+    "job_change_track_ai": (
+        "AFTER INSERT ON track BEGIN INSERT INTO job_change (table_name, row_id, job_id, op) "
+        "VALUES ('track', new.track_id, new.job_id, 'insert'); END"
+    ),
+    "job_change_track_au": (
+        "AFTER UPDATE ON track BEGIN INSERT INTO job_change (table_name, row_id, job_id, op) "
+        "VALUES ('track', new.track_id, new.job_id, 'update'); END"
+    ),
+    "job_change_track_ad": (
+        "AFTER DELETE ON track BEGIN INSERT INTO job_change (table_name, row_id, job_id, op) "
+        "VALUES ('track', old.track_id, old.job_id, 'delete'); END"
+    ),
+    # Trim in batches rather than on every insert.
+    "job_change_prune": (
+        f"AFTER INSERT ON job_change WHEN new.seq % 1000 = 0 BEGIN "
+        f"DELETE FROM job_change WHERE seq <= new.seq - {RETAIN}; END"
+    ),
+}
+
+
+def create_triggers(connection) -> None:
+    """Install the log triggers (SQLite only; idempotent)."""
+    if connection.dialect.name != "sqlite":
+        return
+    for name, body in TRIGGERS.items():
+        connection.exec_driver_sql(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+
+def drop_triggers(connection) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    for name in TRIGGERS:
+        connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+
+
+class JobChange(db.Model):
+    __tablename__ = "job_change"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    table_name = db.Column(db.String(8), nullable=False)
+    row_id = db.Column(db.Integer, nullable=False)
+    job_id = db.Column(db.Integer, nullable=True)
+    op = db.Column(db.String(6), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<JobChange {self.seq} {self.op} {self.table_name}:{self.row_id}>"
+
+
+# Triggers reference job and track, so install them once create_all has
+# built every table rather than on job_change's own after_create.
+event.listen(
+    db.Model.metadata, "after_create",
+    lambda target, connection, **kw: create_triggers(connection),
+)
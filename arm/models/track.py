@@ -5,6 +5,11 @@ from arm.database import db
 
 class Track(db.Model):
     """ Holds all the individual track details for each job """
+    __table_args__ = (
+        db.Index("ix_track_job_id", "job_id"),
+        # Episode claims of archived jobs keep their track ids.
+        {"sqlite_autoincrement": True},
+    )
     track_id = db.Column(db.Integer, primary_key=True)
     job_id = db.Column(db.Integer, db.ForeignKey('job.job_id'))
     track_number = db.Column(db.String(4))
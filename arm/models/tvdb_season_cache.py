@@ -0,0 +1,34 @@
+"""TvdbSeasonCache: persisted TVDB episode list for one (series, season).
+
+Written by arm.services.tvdb_cache after every network fetch so later
+discs of the same box set (and rematches from the UI) can be scored
+without touching the TVDB API.  An empty ``episodes`` list records the
+first season past the end of the series, so a warm best-season scan
+knows where to stop without probing further.
+"""
+from datetime import datetime
+
+from arm.database import db
+
+
+class TvdbSeasonCache(db.Model):
+    __tablename__ = "tvdb_season_cache"
+    __table_args__ = (
+        db.Index(
+            "ix_tvdb_season_cache_series_season", "tvdb_id", "season",
+            unique=True,
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    tvdb_id = db.Column(db.Integer, nullable=False)
+    season = db.Column(db.Integer, nullable=False)
+    episodes = db.Column(db.JSON, nullable=False, default=list)
+    series_updated = db.Column(db.String(32), nullable=True)
+    fetched_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return (
+            f"<TvdbSeasonCache series={self.tvdb_id} S{self.season} "
+            f"{len(self.episodes or [])} episodes>"
+        )
@@ -0,0 +1,96 @@
+"""Per-channel coalescing of routine events into digest messages.
+
+A multi-disc session or a batch import publishes one event per job per
+transition, which floods chat targets and trips their rate limits. A
+channel with a ``digest`` setting holds its routine events instead of
+sending each at once:
+
+- The first event of a type opens a window: its outbox row is due
+  ``window_seconds`` later, and every further event of that type for
+  the channel joins it with the same due time. The window never
+  extends, so ``window_seconds`` is the longest any event waits.
+- Once ``max_batch`` events are held the window closes early.
+- ``CRITICAL_EVENTS`` (failures, jobs waiting on the user) are never
+  held.
+
+The dispatcher then sends the held rows of one type as a single
+message (``render_digest``). Each row keeps its own outbox status, so
+retries and history work as for single sends.
+
+Digests apply to apprise channels only: webhook receivers and bash
+scripts get one event per call by contract.
+"""
+import datetime
+from typing import Optional
+
+from sqlalchemy import func, select, update
+
+from arm.database import db
+from arm.notifications.models import NotificationOutbox
+
+CRITICAL_EVENTS = frozenset({"job.failed", "job.manual_wait_required"})
+DIGEST_CHANNEL_TYPES = frozenset({"apprise"})
+MAX_WINDOW_SECONDS = 3600
+# The dispatcher claims at most this many rows per dequeue
+# (dispatcher._BATCH_SIZE) and only merges rows it has claimed, so a
+# larger max_batch would be split across several messages.
+MAX_BATCH_LIMIT = 20
+DEFAULT_MAX_BATCH = 10
+
+_TITLES = {
+    "job.started": "ARM started {count} jobs",
+    "job.rip_complete": "{count} rips complete",
+    "job.transcode_complete": "{count} transcodes complete",
+    "job.duplicate_detected": "{count} duplicates detected",
+}
+
+
+def settings(channel) -> Optional[tuple[int, int]]:
+    """``(window_seconds, max_batch)`` if ``channel`` coalesces, else None."""
+    digest = channel.digest or {}
+    window = int(digest.get("window_seconds") or 0)
+    if window <= 0 or channel.type not in DIGEST_CHANNEL_TYPES:
+        return None
+    max_batch = int(digest.get("max_batch") or DEFAULT_MAX_BATCH)
+    return min(window, MAX_WINDOW_SECONDS), min(max(max_batch, 1), MAX_BATCH_LIMIT)
+
+
+def hold_until(channel, event_key: str,
+               now: datetime.datetime) -> datetime.datetime:
+    """When a new outbox row for ``event_key`` on ``channel`` falls due.
+
+    ``now`` for critical events and channels without a digest. Otherwise
+    the due time of the window already open for this type, or
+    ``now + window_seconds`` to open one. When this row fills the window
+    to ``max_batch``, the held rows are pulled forward to ``now`` (in the
+    caller's transaction) and sent together.
+    """
+    limits = settings(channel)
+    if limits is None or event_key in CRITICAL_EVENTS:
+        return now
+    window, max_batch = limits
+    # attempts == 0: a row backing off after a failed send isn't a window.
+    held = (NotificationOutbox.channel_id == channel.id,
+            NotificationOutbox.event_key == event_key,
+            NotificationOutbox.status == "pending",
+            NotificationOutbox.attempts == 0,
+            NotificationOutbox.next_attempt_at > now)
+    count, due = db.session.execute(
+        select(func.count(), func.min(NotificationOutbox.next_attempt_at))
+        .where(*held)
+    ).one()
+    if count + 1 >= max_batch:
+        db.session.execute(
+            update(NotificationOutbox).where(*held)
+            .values(next_attempt_at=now)
+            .execution_options(synchronize_session=False))
+        return now
+    return due or now + datetime.timedelta(seconds=window)
+
+
+def render_digest(event_key: str, titles: list[str]) -> tuple[str, str]:
+    """Title and body for one message standing in for ``titles`` (the
+    individually rendered titles of the merged events, oldest first)."""
+    title = _TITLES.get(event_key, "{count} ARM notifications")
+    body = "\n".join(f"- {t}" for t in titles)
+    return title.format(count=len(titles)), body
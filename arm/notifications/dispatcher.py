@@ -7,16 +7,46 @@ The public entry points are:
   state mutation). Tested in isolation.
 - ``run_dispatcher_loop()`` — async, runs forever. Called as an
   asyncio.Task from FastAPI's ``lifespan``. On startup, reaps stale
-  in_flight rows; then loops: dequeue → process each → sleep.
-
-The dispatcher is single-tasked; sends are sequential within the loop.
-Concurrency could be added later if real-world send latency demands
-it — for a home single-user setup, a few seconds per send is fine.
+  in_flight rows; then loops: wait → dequeue → hand each row to its
+  channel's queue.
+
+The loop waits on a :class:`~arm.notifications.wake.Waker`:
+``publish_event`` wakes it the moment rows are enqueued (directly in
+the API process, via a UNIX datagram socket from the ripper), and
+otherwise it sleeps until the next retry is due. Polling is only a
+fallback: every ``_IDLE_POLL_SECONDS`` while the wake socket is
+listening, every ``_TICK_INTERVAL_SECONDS`` when it is not.
+
+Apart from the one-off startup reap, nothing blocking runs on the
+event loop: outbox queries and
+``process_one_row`` (ORM work plus the Apprise/webhook/bash send) run
+on a dedicated thread pool of ``_SEND_WORKERS`` threads, each unit on
+its own scoped session. Rows are queued per channel and each channel is
+drained by at most ``_PER_CHANNEL_CONCURRENCY`` workers, so a slow
+webhook only delays its own channel while others keep sending. With the
+default of 1 a channel's rows are sent strictly in dequeue (FIFO)
+order; above 1 they start in order but may finish out of order.
+
+Draining a backlog is batched at both ends: ``dequeue_due`` claims up to
+``_BATCH_SIZE`` rows with one ``UPDATE ... RETURNING``, and send results
+are committed together (``outbox.record_outcomes``) every
+``_RESULT_BATCH`` rows or ``_RESULT_FLUSH_SECONDS``, whichever comes
+first. A crash inside that window leaves the sent rows in_flight; the
+startup reap re-queues them, so delivery stays at-least-once.
+
+For a channel with a digest setting (:mod:`arm.notifications.digest`)
+a worker takes the next row together with the other queued rows of the
+same event type, up to the channel's ``max_batch``, and sends them as
+one message. Those rows jump ahead of other event types in the
+channel's queue.
 """
 import asyncio
+import collections
 import datetime
+import functools
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from arm_contracts import (
@@ -29,6 +59,7 @@ from arm_contracts import (
 from pydantic import TypeAdapter
 
 from arm.database import db
+from arm.notifications import digest
 from arm.notifications.channels.apprise import send_apprise
 from arm.notifications.channels.webhook import send_webhook
 from arm.notifications.channels.bash import send_bash
@@ -37,20 +68,29 @@ from arm.notifications.outbox import (
     cleanup_completed,
     dequeue_due,
     record_failure,
+    record_outcomes,
     record_success,
     reap_stale_in_flight,
+    release_in_flight,
+    seconds_until_next_due,
 )
 from arm.notifications.templates import (
     render_title_and_body,
     TemplateRenderError,
 )
+from arm.notifications.wake import Waker
 
 log = logging.getLogger(__name__)
 
-_TICK_INTERVAL_SECONDS = 5.0
-_BATCH_SIZE = 20
+_TICK_INTERVAL_SECONDS = 5.0     # poll without a wake socket; error backoff
+_IDLE_POLL_SECONDS = 60.0        # fallback poll while the wake socket listens
+_BATCH_SIZE = 20                # >= digest.MAX_BATCH_LIMIT
 _CLEANUP_INTERVAL_SECONDS = 3600.0  # outbox retention sweep cadence
 _CLEANUP_RETENTION_DAYS = 7
+_SEND_WORKERS = 4               # threads for DB work + blocking sends
+_PER_CHANNEL_CONCURRENCY = 1    # 1 = strict per-channel FIFO
+_RESULT_BATCH = 50              # send results committed together...
+_RESULT_FLUSH_SECONDS = 0.2     # ...or after this long, whichever first
 
 # Keys we set explicitly in _build_bash_env — pass-through loop skips
 # these to avoid double-emit / overwrite of curated values.
@@ -94,12 +134,16 @@ def _build_bash_env(event_payload: dict, title: str, body: str) -> dict[str, str
     return env
 
 
+# Building a TypeAdapter compiles a validator for the whole event union;
+# do it once, not per outbox row.
+_EVENT_ADAPTER = TypeAdapter(NotificationEvent)
+
+
 def _reconstruct_event(event_payload: dict):
     """Re-validate the stored event_payload as a NotificationEvent so
     templating sees a model (with type-checked fields) rather than a
     raw dict."""
-    adapter = TypeAdapter(NotificationEvent)
-    return adapter.validate_python(event_payload)
+    return _EVENT_ADAPTER.validate_python(event_payload)
 
 
 def _render_and_send(channel_type: str, config: dict, event,
@@ -155,6 +199,150 @@ def send_now(channel_type: str, config: dict, event) -> tuple[bool, str | None]:
     return _render_and_send(channel_type, config, event, templates=None)
 
 
+def _deliver(outbox_id: int) -> Optional[tuple[int, bool, Optional[str], bool]]:
+    """Render and send one in_flight outbox row without recording the
+    result.
+
+    Returns ``(outbox_id, ok, error, terminal)`` for
+    ``outbox.record_outcomes`` (or ``record_success`` /
+    ``record_failure``), or None if the row vanished.  Sender errors are
+    turned into outcomes; only DB errors escape.
+    """
+    row = NotificationOutbox.query.get(outbox_id)
+    if row is None:
+        log.warning("process_one_row: outbox %s vanished", outbox_id)
+        return None
+
+    channel = NotificationChannel.query.get(row.channel_id)
+    if channel is None:
+        return outbox_id, False, "channel vanished", True
+    if not channel.enabled:
+        return outbox_id, False, "channel disabled", True
+
+    # 1. Reconstruct the event (template render is deferred to
+    #    _render_and_send so the render+send logic stays in one place).
+    try:
+        event = _reconstruct_event(row.event_payload)
+    except Exception as exc:
+        return outbox_id, False, f"event reconstruction: {exc}", True
+
+    # 2. Render + dispatch by channel type via the shared helper. The
+    #    helper renders the template and sends; we keep the outbox
+    #    bookkeeping and terminal-flag handling here.
+    if channel.type not in ("apprise", "webhook", "bash"):
+        return outbox_id, False, f"unknown channel type: {channel.type}", True
+    channel_ref = ChannelRef(id=channel.id, name=channel.name,
+                             type=channel.type)
+    try:
+        ok, error = _render_and_send(
+            channel.type, channel.config, event,
+            templates=channel.templates, channel_ref=channel_ref,
+        )
+    except TemplateRenderError as exc:
+        return outbox_id, False, f"template render: {exc}", True
+    except Exception as exc:
+        # Last-resort catch — channel senders shouldn't raise, but if
+        # one does, treat it as transient so a bug doesn't permanently
+        # break dispatch.
+        return outbox_id, False, f"sender raised: {exc}", False
+
+    if ok:
+        return outbox_id, True, None, False
+    # Per N9 contract, bash failures are *always* terminal, regardless
+    # of any embedded marker. Other channels honor the ``terminal=...``
+    # flag emitted by the sender.
+    if channel.type == "bash":
+        terminal = True
+    else:
+        terminal = _parse_terminal_flag(error or "")
+    return outbox_id, False, error or "send failed", terminal
+
+
+def _deliver_digest(outbox_ids: list[int]) -> list:
+    """Send in_flight rows of one channel and event type as a single
+    digest message.
+
+    Returns one outcome per row, as ``_deliver`` does: the rows share
+    the send's result, except ones that fail to decode or render, which
+    fail on their own.
+    """
+    rows = (NotificationOutbox.query
+            .filter(NotificationOutbox.id.in_(outbox_ids))
+            .order_by(NotificationOutbox.id).all())
+    if len(rows) < len(outbox_ids):
+        log.warning("dispatcher: %d digest rows vanished",
+                    len(outbox_ids) - len(rows))
+    if not rows:
+        return []
+    channel = NotificationChannel.query.get(rows[0].channel_id)
+    if channel is None or not channel.enabled:
+        error = "channel vanished" if channel is None else "channel disabled"
+        return [(row.id, False, error, True) for row in rows]
+    if channel.type not in digest.DIGEST_CHANNEL_TYPES:
+        # Type changed since the rows were claimed: send them one by one.
+        return [_deliver(row.id) for row in rows]
+
+    outcomes, merged, titles = [], [], []
+    for row in rows:
+        try:
+            event = _reconstruct_event(row.event_payload)
+        except Exception as exc:
+            outcomes.append((row.id, False, f"event reconstruction: {exc}", True))
+            continue
+        tmpl_dict = (channel.templates or {}).get(event.event_key)
+        tmpl = ChannelTemplate(**tmpl_dict) if tmpl_dict else None
+        try:
+            title, _ = render_title_and_body(event, channel_template=tmpl)
+        except TemplateRenderError as exc:
+            outcomes.append((row.id, False, f"template render: {exc}", True))
+            continue
+        merged.append(row.id)
+        titles.append(title)
+    if not merged:
+        return outcomes
+
+    title, body = digest.render_digest(rows[0].event_key, titles)
+    try:
+        ok, error = send_apprise(url=(channel.config or {}).get("url", ""),
+                                 title=title, body=body)
+        terminal = not ok and _parse_terminal_flag(error or "")
+    except Exception as exc:
+        ok, error, terminal = False, f"sender raised: {exc}", False
+    if ok:
+        error = None
+    else:
+        error = error or "send failed"
+    outcomes += [(outbox_id, ok, error, terminal) for outbox_id in merged]
+    return outcomes
+
+
+def _record(outcome: tuple[int, bool, Optional[str], bool]) -> None:
+    outbox_id, ok, error, terminal = outcome
+    if ok:
+        record_success(outbox_id)
+    else:
+        record_failure(outbox_id, error, terminal=terminal)
+
+
+def _record_batch(outcomes: list) -> None:
+    """Record a batch of outcomes in one commit; if that fails, fall
+    back to one commit per row so one bad row can't lose the rest."""
+    try:
+        record_outcomes(outcomes)
+        return
+    except Exception:
+        log.exception("dispatcher: batched result commit failed; "
+                      "recording %d rows one by one", len(outcomes))
+        db.session.rollback()
+    for outcome in outcomes:
+        try:
+            _record(outcome)
+        except Exception:
+            log.exception("dispatcher: could not record outbox row %s",
+                          outcome[0])
+            db.session.rollback()
+
+
 def process_one_row(outbox_id: int) -> None:
     """Process a single in_flight outbox row.
 
@@ -163,68 +351,14 @@ def process_one_row(outbox_id: int) -> None:
     routes it through ``record_failure``, and the entire body is wrapped
     in a final try/except so even a DB commit error in
     ``record_success``/``record_failure`` cannot escape.
+
+    The dispatcher loop itself calls ``_deliver`` and records results
+    in batches; this is the one-row form of the same steps.
     """
     try:
-        row = NotificationOutbox.query.get(outbox_id)
-        if row is None:
-            log.warning("process_one_row: outbox %s vanished", outbox_id)
-            return
-
-        channel = NotificationChannel.query.get(row.channel_id)
-        if channel is None:
-            record_failure(outbox_id, "channel vanished", terminal=True)
-            return
-        if not channel.enabled:
-            record_failure(outbox_id, "channel disabled", terminal=True)
-            return
-
-        # 1. Reconstruct the event (template render is deferred to
-        #    _render_and_send so the render+send logic stays in one place).
-        try:
-            event = _reconstruct_event(row.event_payload)
-        except Exception as exc:
-            record_failure(outbox_id, f"event reconstruction: {exc}",
-                           terminal=True)
-            return
-
-        # 2. Render + dispatch by channel type via the shared helper. The
-        #    helper renders the template and sends; we keep the outbox
-        #    bookkeeping (record_success/record_failure) and terminal-flag
-        #    handling here.
-        if channel.type not in ("apprise", "webhook", "bash"):
-            record_failure(outbox_id,
-                           f"unknown channel type: {channel.type}",
-                           terminal=True)
-            return
-        channel_ref = ChannelRef(id=channel.id, name=channel.name,
-                                 type=channel.type)
-        try:
-            ok, error = _render_and_send(
-                channel.type, channel.config, event,
-                templates=channel.templates, channel_ref=channel_ref,
-            )
-        except TemplateRenderError as exc:
-            record_failure(outbox_id, f"template render: {exc}", terminal=True)
-            return
-        except Exception as exc:
-            # Last-resort catch — channel senders shouldn't raise, but if
-            # one does, treat it as transient so a bug doesn't permanently
-            # break dispatch.
-            record_failure(outbox_id, f"sender raised: {exc}", terminal=False)
-            return
-
-        if ok:
-            record_success(outbox_id)
-        else:
-            # Per N9 contract, bash failures are *always* terminal,
-            # regardless of any embedded marker. Other channels honor the
-            # ``terminal=...`` flag emitted by the sender.
-            if channel.type == "bash":
-                terminal = True
-            else:
-                terminal = _parse_terminal_flag(error or "")
-            record_failure(outbox_id, error or "send failed",
-                           terminal=terminal)
+        outcome = _deliver(outbox_id)
+        if outcome is not None:
+            _record(outcome)
     except Exception:
         # Final safety net — record_success/record_failure can raise on
         # DB commit error. The dispatcher contract guarantees this
@@ -236,41 +370,235 @@ def process_one_row(outbox_id: int) -> None:
         return
 
 
-async def run_dispatcher_loop(stop_event: Optional[asyncio.Event] = None) -> None:
-    """Run the dispatcher loop. Yields to the event loop between rows
-    so other tasks (HTTP requests, etc.) aren't starved.
+def _dequeue_ids(limit: int) -> tuple[list[tuple[int, int, str]],
+                                      dict[int, int], float | None]:
+    """Claim the due rows.
+
+    Returns ``(outbox_id, channel_id, event_key)`` for each, in order;
+    the digest ``max_batch`` of those channels that have one; and the
+    seconds until the next still-pending row is due.
+    """
+    rows = [(row.id, row.channel_id, row.event_key)
+            for row in dequeue_due(limit=limit)]
+    batches = {}
+    channel_ids = {channel_id for _, channel_id, _ in rows}
+    if channel_ids:
+        for channel in NotificationChannel.query.filter(
+                NotificationChannel.id.in_(channel_ids)):
+            limits = digest.settings(channel)
+            if limits is not None:
+                batches[channel.id] = limits[1]
+    return rows, batches, seconds_until_next_due()
+
+
+class _ChannelQueues:
+    """Per-channel FIFO queues drained on a thread pool."""
+
+    def __init__(self, executor: ThreadPoolExecutor, waker: Waker):
+        self._executor = executor
+        self._waker = waker
+        # Set while due rows were left pending for lack of room; each
+        # finished row then wakes the loop to dequeue more.
+        self.more_due = False
+        self._queues: dict[int, collections.deque] = {}
+        self._digest_batch: dict[int, int] = {}
+        self._workers: dict[int, set[asyncio.Task]] = {}
+        self._stopping = False
+        self._outcomes: list = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_lock = asyncio.Lock()
+        self._flushes: set[asyncio.Task] = set()
+
+    async def run(self, fn, *args):
+        """Run blocking ``fn(*args)`` on the pool with its own session."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._call, fn, args)
+
+    @staticmethod
+    def _call(fn, args):
+        try:
+            return fn(*args)
+        finally:
+            db.session.remove()
+
+    def backlog(self) -> int:
+        """Rows dequeued (in_flight) but not yet handed to a sender."""
+        return sum(len(q) for q in self._queues.values())
+
+    def submit(self, outbox_id: int, channel_id: int, event_key: str,
+               digest_batch: int = 1) -> None:
+        self._digest_batch[channel_id] = digest_batch
+        self._queues.setdefault(channel_id, collections.deque()).append(
+            (outbox_id, event_key))
+        workers = self._workers.setdefault(channel_id, set())
+        if len(workers) < _PER_CHANNEL_CONCURRENCY:
+            task = asyncio.create_task(self._drain(channel_id),
+                                       name=f"notify-channel-{channel_id}")
+            workers.add(task)
+            task.add_done_callback(workers.discard)
+
+    async def _drain(self, channel_id: int) -> None:
+        queue = self._queues[channel_id]
+        while queue and not self._stopping:
+            ids = self._take(channel_id, queue)
+            try:
+                if len(ids) == 1:
+                    outcomes = [await self.run(_deliver, ids[0])]
+                else:
+                    outcomes = await self.run(_deliver_digest, ids)
+            except Exception:
+                # DB error loading the rows; they stay in_flight until
+                # the next startup's reap.
+                log.exception("dispatcher: worker failed on outbox rows %s",
+                              ids)
+                outcomes = []
+            for outcome in outcomes:
+                if outcome is not None:
+                    self._add_outcome(outcome)
+            if self.more_due:
+                self._waker.event.set()
+
+    def _take(self, channel_id: int, queue: collections.deque) -> list[int]:
+        """Pop the next row, plus for a digest channel up to
+        ``max_batch - 1`` queued rows of the same event type."""
+        outbox_id, event_key = queue.popleft()
+        ids = [outbox_id]
+        batch = self._digest_batch.get(channel_id, 1)
+        if batch > 1 and event_key not in digest.CRITICAL_EVENTS:
+            rest = collections.deque()
+            while queue:
+                entry = queue.popleft()
+                if entry[1] == event_key and len(ids) < batch:
+                    ids.append(entry[0])
+                else:
+                    rest.append(entry)
+            queue.extend(rest)
+        return ids
+
+    def _add_outcome(self, outcome) -> None:
+        self._outcomes.append(outcome)
+        if len(self._outcomes) >= _RESULT_BATCH:
+            self._schedule_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                _RESULT_FLUSH_SECONDS, self._schedule_flush)
+
+    def _schedule_flush(self) -> None:
+        task = asyncio.create_task(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def flush(self) -> None:
+        """Commit the send results collected so far in one transaction."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        async with self._flush_lock:
+            batch, self._outcomes = self._outcomes, []
+            if batch:
+                await self.run(_record_batch, batch)
+
+    async def close(self) -> None:
+        """Finish in-progress sends; return queued rows to pending."""
+        self._stopping = True
+        unsent = [oid for q in self._queues.values() for oid, _ in q]
+        self._queues.clear()
+        tasks = [t for ws in self._workers.values() for t in ws]
+        tasks += list(self._flushes)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        await self.flush()
+        if unsent:
+            try:
+                await self.run(release_in_flight, unsent)
+            except Exception:
+                log.exception("dispatcher: could not release %d queued rows",
+                              len(unsent))
+
+
+async def run_dispatcher_loop(stop_event: Optional[asyncio.Event] = None,
+                              wake_socket: Optional[str] = None) -> None:
+    """Run the dispatcher loop. DB work and sends run on a dedicated
+    thread pool, so the event loop (HTTP requests, etc.) is never
+    blocked by a slow channel.
 
     Calling code should pass a ``stop_event`` and set it on shutdown
-    so the loop exits cleanly. The FastAPI lifespan handles this.
+    so the loop exits cleanly. The FastAPI lifespan handles this, and
+    passes ``wake_socket`` (:func:`arm.notifications.wake.socket_path`)
+    so other processes can wake the loop.
     """
     log.info("notification dispatcher starting")
+    waker = Waker(wake_socket)
+    waker.open()
+    executor = ThreadPoolExecutor(max_workers=_SEND_WORKERS,
+                                  thread_name_prefix="notify-dispatch")
+    channels = _ChannelQueues(executor, waker)
+    forward = None
+    if stop_event is not None:
+        async def _forward_stop():
+            await stop_event.wait()
+            waker.event.set()
+        forward = asyncio.create_task(_forward_stop())
+    try:
+        await _dispatch(channels, waker, stop_event)
+    finally:
+        if forward is not None:
+            forward.cancel()
+        waker.close()
+        await channels.close()
+        executor.shutdown(wait=False)
+
+
+async def _dispatch(channels: _ChannelQueues, waker: Waker,
+                    stop_event: Optional[asyncio.Event]) -> None:
+    # One-off and quick: runs inline before the first tick, while the
+    # app is still starting up.
     rescued = reap_stale_in_flight(stale_after_minutes=5)
     if rescued:
         log.info("dispatcher rescued %d stale in_flight rows", rescued)
 
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     next_cleanup_at = loop.time() + _CLEANUP_INTERVAL_SECONDS
+    poll = _IDLE_POLL_SECONDS if waker.listening else _TICK_INTERVAL_SECONDS
+    # The first tick also catches rows left pending by the last run.
+    wait = _TICK_INTERVAL_SECONDS
 
     while True:
+        # Returns early on a wake (enqueue, freed capacity or
+        # stop_event); the timeout is the fallback poll / next retry.
+        await waker.wait(wait)
+
         if stop_event is not None and stop_event.is_set():
             log.info("notification dispatcher stopping")
             return
+        wait = poll
         try:
-            rows = dequeue_due(limit=_BATCH_SIZE)
-            for row in rows:
-                process_one_row(row.id)
-                # Yield to the loop between sends.
-                await asyncio.sleep(0)
+            # Don't pull more rows while a slow channel still has a
+            # batch waiting; they stay pending until there's room.
+            room = _BATCH_SIZE - channels.backlog()
+            if room > 0:
+                ids, batches, next_due = await channels.run(_dequeue_ids, room)
+                for outbox_id, channel_id, event_key in ids:
+                    channels.submit(outbox_id, channel_id, event_key,
+                                    batches.get(channel_id, 1))
+                channels.more_due = len(ids) == room
+            else:
+                channels.more_due = True
+            if not channels.more_due and next_due is not None:
+                # Sleep until the earliest scheduled retry, not a full poll.
+                wait = min(wait, max(next_due, 0.0))
         except Exception as exc:
-            # Dispatcher-level failure (DB error etc.) — log and sleep
-            # so we don't tight-loop on the same error.
+            # Dispatcher-level failure (DB error etc.) — log and back
+            # off so we don't tight-loop on the same error.
             log.exception("dispatcher tick failed: %s", exc)
+            wait = _TICK_INTERVAL_SECONDS
 
         if loop.time() >= next_cleanup_at:
             try:
-                deleted = cleanup_completed(
+                deleted = await channels.run(functools.partial(
+                    cleanup_completed,
                     older_than_days=_CLEANUP_RETENTION_DAYS,
-                )
+                ))
                 if deleted:
                     log.info(
                         "notification outbox cleanup: deleted %d "
@@ -279,17 +607,3 @@ async def run_dispatcher_loop(stop_event: Optional[asyncio.Event] = None) -> Non
             except Exception:
                 log.exception("notification outbox cleanup failed")
             next_cleanup_at = loop.time() + _CLEANUP_INTERVAL_SECONDS
-
-        # Interruptible sleep: wake immediately when stop_event is set,
-        # otherwise sleep up to _TICK_INTERVAL_SECONDS. A plain
-        # asyncio.sleep blocks for the full interval and silently swallows
-        # shutdown signals until it returns, which adds ~5s per test that
-        # exits the FastAPI lifespan (test suite was burning ~25 min on
-        # this alone).
-        if stop_event is not None:
-            try:
-                await asyncio.wait_for(stop_event.wait(), timeout=_TICK_INTERVAL_SECONDS)
-            except asyncio.TimeoutError:
-                pass
-        else:
-            await asyncio.sleep(_TICK_INTERVAL_SECONDS)
@@ -3,7 +3,8 @@ module from the rest of arm-neu.
 
 This function is intentionally synchronous and side-effect-only: it
 writes one Notifications history row and N outbox rows, then returns.
-The dispatcher (a separate asyncio task) picks up the outbox rows.
+The dispatcher (a separate asyncio task) picks up the outbox rows;
+``wake.notify()`` tells it to do so right away.
 
 Callers in arm.ripper construct a contracts NotificationEvent and pass
 it here. Adding a new event type is a contracts change first; arm-neu
@@ -26,6 +27,7 @@ from arm.database import db
 from arm.models.notifications import Notifications
 from arm.notifications.models import NotificationChannel, NotificationOutbox
 from arm.notifications.templates import render_title_and_body
+from arm.notifications import digest, wake
 
 log = logging.getLogger(__name__)
 
@@ -60,9 +62,12 @@ def publish_event(event) -> None:
     title, body = render_title_and_body(event, channel_template=None)
     db.session.add(Notifications(title=title, message=body))
 
-    # 2. Enqueue per subscribed enabled channel.
+    # 2. Enqueue per subscribed enabled channel. Channels with a digest
+    #    setting hold routine events to send them together.
     payload = json.loads(event.model_dump_json())
     channels = NotificationChannel.query.filter_by(enabled=True).all()
+    now = datetime.datetime.utcnow()
+    enqueued = 0
     for ch in channels:
         if event.event_key not in (ch.subscribed_events or []):
             continue
@@ -72,9 +77,12 @@ def publish_event(event) -> None:
             event_payload=payload,
             status="pending",
             attempts=0,
-            next_attempt_at=datetime.datetime.utcnow(),
+            next_attempt_at=digest.hold_until(ch, event.event_key, now),
         ))
+        enqueued += 1
 
     db.session.commit()
+    if enqueued:
+        wake.notify()
     log.info("published event %s for job_id=%s",
              event.event_key, event.job_id)
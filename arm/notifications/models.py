@@ -30,6 +30,9 @@ class NotificationChannel(db.Model):
     config = db.Column(db.JSON, nullable=False)
     subscribed_events = db.Column(db.JSON, nullable=False, default=list)
     templates = db.Column(db.JSON, nullable=False, default=dict)
+    # ``{"window_seconds": int, "max_batch": int}`` or None; see
+    # arm.notifications.digest.
+    digest = db.Column(db.JSON, nullable=True)
 
     last_fired_at = db.Column(db.DateTime, nullable=True)
     last_success_at = db.Column(db.DateTime, nullable=True)
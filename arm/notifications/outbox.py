@@ -6,6 +6,8 @@ this module owns the consumer-side dequeue/mark/retry/cleanup loop.
 import datetime
 import logging
 
+from sqlalchemy import func, select, update
+
 from arm.database import db
 from arm.notifications.models import NotificationChannel, NotificationOutbox
 
@@ -22,21 +24,69 @@ def _backoff_seconds(attempts: int) -> int:
     return min(seconds, _BACKOFF_CAP_SECONDS)
 
 
-def dequeue_due(limit: int = 50) -> list[NotificationOutbox]:
-    """Find pending rows past their next_attempt_at, mark them in_flight,
-    and return them for the dispatcher to send."""
+def dequeue_due(limit: int = 50) -> list:
+    """Claim up to ``limit`` pending rows past their next_attempt_at:
+    mark them in_flight and return ``(id, channel_id, event_key)``
+    rows, oldest due first, for the dispatcher to send.
+
+    One SELECT picks the rows in due order and one
+    ``UPDATE ... RETURNING`` claims them (RETURNING order is
+    unspecified, hence the separate SELECT); a row another claimer got
+    to first is left out.
+    """
     now = datetime.datetime.utcnow()
-    rows = (NotificationOutbox.query
-            .filter(NotificationOutbox.status == "pending",
-                    NotificationOutbox.next_attempt_at <= now)
-            .order_by(NotificationOutbox.next_attempt_at.asc())
-            .limit(limit)
-            .all())
-    for r in rows:
-        r.status = "in_flight"
-        r.next_attempt_at = now  # so the reaper can find stale ones
+    due = db.session.execute(
+        select(NotificationOutbox.id, NotificationOutbox.channel_id,
+               NotificationOutbox.event_key)
+        .where(NotificationOutbox.status == "pending",
+               NotificationOutbox.next_attempt_at <= now)
+        .order_by(NotificationOutbox.next_attempt_at.asc(),
+                  NotificationOutbox.id.asc())
+        .limit(limit)
+    ).all()
+    if not due:
+        db.session.rollback()
+        return []
+    claim = (update(NotificationOutbox)
+             .where(NotificationOutbox.id.in_([r.id for r in due]),
+                    NotificationOutbox.status == "pending")
+             # next_attempt_at = claim time, so the reaper can find stale ones
+             .values(status="in_flight", next_attempt_at=now)
+             .execution_options(synchronize_session=False))
+    if db.engine.dialect.update_returning:
+        claimed = set(db.session.execute(
+            claim.returning(NotificationOutbox.id)).scalars())
+        due = [r for r in due if r.id in claimed]
+    else:
+        db.session.execute(claim)
     db.session.commit()
-    return rows
+    return due
+
+
+def _apply_outcome(row, channel, ok: bool, error: str | None,
+                   terminal: bool, now: datetime.datetime) -> None:
+    if ok:
+        row.status = "success"
+        row.completed_at = now
+        row.last_error = None
+        if channel is not None:
+            channel.last_fired_at = now
+            channel.last_success_at = now
+            channel.last_error = None
+        return
+    short_error = (error or "")[:512]
+    row.attempts += 1
+    row.last_error = short_error
+    if terminal or row.attempts >= _MAX_ATTEMPTS:
+        row.status = "failed"
+        row.completed_at = now
+    else:
+        row.status = "pending"
+        row.next_attempt_at = now + datetime.timedelta(
+            seconds=_backoff_seconds(row.attempts))
+    if channel is not None:
+        channel.last_fired_at = now
+        channel.last_error = short_error
 
 
 def record_success(outbox_id: int) -> None:
@@ -45,15 +95,9 @@ def record_success(outbox_id: int) -> None:
     if row is None:
         log.warning("record_success: outbox row %s vanished", outbox_id)
         return
-    now = datetime.datetime.utcnow()
-    row.status = "success"
-    row.completed_at = now
-    row.last_error = None
     channel = NotificationChannel.query.get(row.channel_id)
-    if channel is not None:
-        channel.last_fired_at = now
-        channel.last_success_at = now
-        channel.last_error = None
+    _apply_outcome(row, channel, True, None, False,
+                   datetime.datetime.utcnow())
     db.session.commit()
 
 
@@ -71,24 +115,39 @@ def record_failure(outbox_id: int, error: str, terminal: bool) -> None:
     if row is None:
         log.warning("record_failure: outbox row %s vanished", outbox_id)
         return
-    now = datetime.datetime.utcnow()
-    short_error = (error or "")[:512]
-    row.attempts += 1
-    row.last_error = short_error
-    if terminal or row.attempts >= _MAX_ATTEMPTS:
-        row.status = "failed"
-        row.completed_at = now
-    else:
-        row.status = "pending"
-        row.next_attempt_at = now + datetime.timedelta(
-            seconds=_backoff_seconds(row.attempts))
     channel = NotificationChannel.query.get(row.channel_id)
-    if channel is not None:
-        channel.last_fired_at = now
-        channel.last_error = short_error
+    _apply_outcome(row, channel, False, error, terminal,
+                   datetime.datetime.utcnow())
     db.session.commit()
 
 
+def record_outcomes(outcomes) -> int:
+    """Apply many send results in one transaction.
+
+    :param outcomes: ``(outbox_id, ok, error, terminal)`` tuples, in
+        the order the sends finished; each is applied exactly as
+        ``record_success`` / ``record_failure`` would.
+    :returns: the number of rows updated (vanished rows are skipped).
+    """
+    outcomes = list(outcomes)
+    if not outcomes:
+        return 0
+    rows = {r.id: r for r in NotificationOutbox.query.filter(
+        NotificationOutbox.id.in_({o[0] for o in outcomes}))}
+    channels = {c.id: c for c in NotificationChannel.query.filter(
+        NotificationChannel.id.in_({r.channel_id for r in rows.values()}))}
+    now = datetime.datetime.utcnow()
+    for outbox_id, ok, error, terminal in outcomes:
+        row = rows.get(outbox_id)
+        if row is None:
+            log.warning("record_outcomes: outbox row %s vanished", outbox_id)
+            continue
+        _apply_outcome(row, channels.get(row.channel_id), ok, error,
+                       terminal, now)
+    db.session.commit()
+    return sum(1 for o in outcomes if o[0] in rows)
+
+
 def reap_stale_in_flight(stale_after_minutes: int = 5) -> int:
     """Return stale in_flight rows to pending on dispatcher startup.
 
@@ -125,3 +184,30 @@ def cleanup_completed(older_than_days: int = 7) -> int:
     q.delete(synchronize_session=False)
     db.session.commit()
     return count
+
+
+def release_in_flight(outbox_ids) -> int:
+    """Return in_flight rows the dispatcher dequeued but never started
+    to pending, so a restart sends them right away instead of waiting
+    for ``reap_stale_in_flight``. Returns the count released."""
+    ids = list(outbox_ids)
+    if not ids:
+        return 0
+    count = (NotificationOutbox.query
+             .filter(NotificationOutbox.id.in_(ids),
+                     NotificationOutbox.status == "in_flight")
+             .update({"status": "pending"}, synchronize_session=False))
+    db.session.commit()
+    return count
+
+
+def seconds_until_next_due() -> float | None:
+    """Seconds until the earliest pending row is due (0 or less if one
+    is due already), or None when nothing is pending. Lets the
+    dispatcher sleep until the next scheduled retry."""
+    earliest = (db.session.query(func.min(NotificationOutbox.next_attempt_at))
+                .filter(NotificationOutbox.status == "pending")
+                .scalar())
+    if earliest is None:
+        return None
+    return (earliest - datetime.datetime.utcnow()).total_seconds()
@@ -0,0 +1,130 @@
+"""Wake the dispatcher as soon as outbox rows are enqueued.
+
+``publish_event`` calls :func:`notify` after committing its outbox
+rows.  In the API process (where the dispatcher runs) that sets the
+dispatcher's :class:`Waker` event directly.  In any other process (the
+ripper) it sends one datagram to a UNIX socket next to the database
+file, which the API's :class:`Waker` listens on.  Nothing here is
+required for delivery: if the socket is missing, the send fails or a
+datagram is dropped, the dispatcher's fallback poll still picks the
+rows up.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+from typing import Optional
+
+import arm.config.config as cfg
+
+log = logging.getLogger(__name__)
+
+_SOCKET_NAME = "outbox-wake.sock"
+
+# The Waker of the dispatcher running in this process, if any.
+_local: Optional["Waker"] = None
+
+
+def socket_path() -> str | None:
+    """Path of the wake socket (beside ``DBFILE``), or None if unset."""
+    dbfile = cfg.arm_config.get("DBFILE") or ""
+    if not dbfile or not hasattr(socket, "AF_UNIX"):
+        return None
+    return os.path.join(os.path.dirname(dbfile), _SOCKET_NAME)
+
+
+def notify() -> None:
+    """Wake the dispatcher; never raises and never blocks."""
+    waker = _local
+    if waker is not None:
+        waker.set_threadsafe()
+        return
+    path = socket_path()
+    if path is None:
+        return
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.setblocking(False)
+            sock.sendto(b"\x01", path)
+    except OSError:
+        # No dispatcher listening (or its queue is full, so a wake is
+        # already pending); the fallback poll covers it.
+        pass
+
+
+class Waker:
+    """Dispatcher side: an event set by local publishes and by
+    datagrams on the wake socket."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self.event = asyncio.Event()
+        self.listening = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._sock: socket.socket | None = None
+
+    def open(self) -> None:
+        """Register for in-process wakes and bind the socket, if any.
+
+        Must be called from the dispatcher's event loop.
+        """
+        global _local
+        self._loop = asyncio.get_running_loop()
+        _local = self
+        if not self.path:
+            return
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            # A previous API process may have left its socket behind.
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            sock.bind(self.path)
+            sock.setblocking(False)
+            self._loop.add_reader(sock.fileno(), self._on_readable)
+        except OSError as exc:
+            sock.close()
+            log.warning("outbox wake socket %s unavailable (%s); "
+                        "falling back to polling", self.path, exc)
+            return
+        self._sock = sock
+        self.listening = True
+
+    def close(self) -> None:
+        global _local
+        if _local is self:
+            _local = None
+        if self._sock is not None:
+            self._loop.remove_reader(self._sock.fileno())
+            self._sock.close()
+            self._sock = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+        self.listening = False
+
+    def _on_readable(self) -> None:
+        # Any number of queued datagrams collapse into one wake.
+        try:
+            while self._sock.recv(64):
+                pass
+        except OSError:
+            pass
+        self.event.set()
+
+    def set_threadsafe(self) -> None:
+        """Set the event from any thread."""
+        try:
+            self._loop.call_soon_threadsafe(self.event.set)
+        except RuntimeError:
+            pass  # loop already closed
+
+    async def wait(self, timeout: float) -> None:
+        """Wait until woken or *timeout* seconds pass, then re-arm."""
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        self.event.clear()
@@ -4,7 +4,8 @@
 Phases:
   1. Mount + detect disc type (filesystem-based, always reliable)
   2. Resolve label from all sources (pyudev → blkid → lsdvd → XML)
-  3. Disc-specific ID (CRC64 for DVD, XML for Blu-ray)
+  3. Disc-specific ID (CRC64 for DVD, XML for Blu-ray), checking local
+     job history before any network lookup
   4. Search metadata APIs (OMDB/TMDB) if Phase 3 didn't fully identify
   5. Last resort — use cleaned label as title
   Finally: Unmount
@@ -325,6 +326,7 @@ def _identify_video_title(job):
         identify_dvd(job)
     elif job.disctype in ("bluray", "bluray4k"):
         identify_bluray(job)
+        _identify_from_history(job)
 
     if not job.hasnicetitle:
         _search_metadata(job)
@@ -478,6 +480,64 @@ def identify_bluray(job):
     return True
 
 
+def _identify_from_history(job):
+    """Identify the disc from previously confirmed jobs (no network).
+
+    Consults arm.services.title_index by CRC64, then normalised label,
+    then fuzzy label.  Returns True when a hit at or above
+    LOCAL_TITLE_INDEX_MIN_CONFIDENCE was applied (hasnicetitle=True).
+    """
+    if not cfg.arm_config.get("LOCAL_TITLE_INDEX", True):
+        return False
+    try:
+        from arm.services import title_index
+        hit = title_index.lookup(job.crc_id, job.label, exclude_job_id=job.job_id)
+    except Exception as error:
+        logging.warning(f"Local title index lookup failed: {error}")
+        return False
+    if not hit:
+        return False
+
+    min_confidence = float(cfg.arm_config.get("LOCAL_TITLE_INDEX_MIN_CONFIDENCE", 0.7))
+    entry = hit["entry"]
+    if hit["confidence"] < min_confidence:
+        logging.info(
+            "Local history suggests '%s' (%s match, confidence %.2f) — below %.2f, ignoring",
+            entry.title, hit["source"], hit["confidence"], min_confidence,
+        )
+        return False
+
+    logging.info(
+        "Identified from job history: '%s' (%s) via %s match on job %s, confidence %.2f",
+        entry.title, entry.year, hit["source"], entry.job_id, hit["confidence"],
+    )
+    args = {
+        'title': entry.title,
+        'title_auto': entry.title,
+        'year': entry.year,
+        'year_auto': entry.year,
+        'video_type': entry.video_type,
+        'video_type_auto': entry.video_type,
+        'imdb_id': entry.imdb_id,
+        'imdb_id_auto': entry.imdb_id,
+        'hasnicetitle': True,
+    }
+    if entry.tvdb_id:
+        args['tvdb_id'] = entry.tvdb_id
+    if entry.media_metadata:
+        args['media_metadata_auto'] = entry.media_metadata
+    utils.database_updater(args, job)
+    if entry.video_type == "movie":
+        _write_movie_expected_title(
+            job,
+            title=entry.title,
+            imdb_id=entry.imdb_id,
+            runtime_seconds=None,
+            source="manual",
+        )
+    return True
+
+
 def _resolve_poster(hit: dict) -> str:
     """Return poster URL from CRC hit, falling back to OMDb/TMDb."""
     poster = hit.get('poster_url') or None
@@ -496,17 +556,33 @@ def _resolve_poster(hit: dict) -> str:
 
 
 def identify_dvd(job):
-    """Try to identify DVD via CRC64 online database lookup (Phase 3).
+    """Try to identify DVD from local job history, then via CRC64 online
+    database lookup (Phase 3).
 
-    Returns True if CRC64 lookup found a match (hasnicetitle=True),
-    False otherwise.  Track 99 detection always runs.
+    Returns True if either found a match (hasnicetitle=True), False
+    otherwise.  The history lookup falls back to the disc label when
+    pydvdid cannot hash the disc.  Track 99 detection always runs.
     """
     logging.debug(f"\n\r{job.pretty_table()}")
 
+    crc64 = None
     try:
         crc64 = pydvdid.compute(str(job.mountpoint))
         logging.info(f"DVD CRC64 hash is: {crc64}")
         job.crc_id = str(crc64)
+    except Exception as error:
+        logging.error(f"Pydvdid failed with the error: {error}")
+
+    # Local history matches by CRC64 when we have one, by label otherwise.
+    if _identify_from_history(job):
+        _detect_track_99(job)
+        return True
+
+    if crc64 is None:
+        _detect_track_99(job)
+        return False
+
+    try:
         from arm.services.metadata_sync import lookup_crc_sync
         crc_result = lookup_crc_sync(str(crc64))
         logging.debug(f"CRC lookup result: {crc_result}")
@@ -559,7 +635,7 @@ def identify_dvd(job):
             _detect_track_99(job)
             return True
     except Exception as error:
-        logging.error(f"Pydvdid failed with the error: {error}")
+        logging.error(f"CRC64 lookup failed with the error: {error}")
 
     _detect_track_99(job)
     return False
@@ -32,7 +32,7 @@ from arm.models.job import JobState
 from arm.notifications import publish_event
 from arm.ripper import utils
 from arm.ripper._notify_helpers import job_disc_type as _disc_type_or_unknown
-from arm.database import db
+from arm.database import db, write_buffer
 
 MAKEMKV_INFO_WAIT_TIME = 60  # [s]
 """Wait for concurrent MakeMKV info processes.
@@ -780,6 +780,8 @@ def makemkv_mkv(job, rawpath):
             parsed = parse_makemkv_skip_message(getattr(msg, 'message', ''))
             if parsed:
                 skips.append(parsed)
+            write_buffer.flush_if_due()
+        write_buffer.flush()
         if skips:
             apply_makemkv_skips(job, skips)
         # Final sweep: mark any remaining tracks whose files exist on disk
@@ -973,11 +975,13 @@ def _mark_track_ripped_by_message(job, message):
     for track in job.tracks:
         track_prefix = re.sub(r'_t\d+\.mkv$', '', track.filename or '')
         if track_prefix == prefix:
-            track.ripped = True
-            track.status = TrackStatus.success.value
             logging.info("Track %s ripped: %s", track.track_number, filename)
+            # FILE_ADDED arrives once per title, so commit it now (with
+            # anything staged before it) rather than leave it buffered
+            # for the length of the next title's rip.
             try:
-                db.session.commit()
+                write_buffer.stage(track, {"ripped": True, "status": TrackStatus.success.value},
+                                   critical=True)
             except Exception:
                 db.session.rollback()
             return
@@ -1609,7 +1613,7 @@ class TrackInfoProcessor:
 
     def _handle_titles(self, message):
         logging.info(f"Found {message.count:d} titles")
-        utils.database_updater({"no_of_titles": message.count}, self.job)
+        utils.database_updater({"no_of_titles": message.count}, self.job, coalesce=True)
 
     def _add_track(self):
         if self.track_id is None:
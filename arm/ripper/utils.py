@@ -36,12 +36,14 @@ from arm_contracts.enums import TrackStatus, WebhookEventType
 import arm.config.config as cfg
 from arm.ripper.ProcessHandler import arm_subprocess
 from arm.database import db  # needs to be imported before models
+from arm.database import write_buffer
 from arm.models.job import Job, JobState
 from arm.models.notifications import Notifications
 from arm.models.track import Track
 from arm.models.user import User
 from arm.models.app_state import AppState
 from arm.models.system_drives import SystemDrives
+from arm.services import job_archive
 
 NOTIFY_TITLE = "ARM notification"
 
@@ -599,15 +601,20 @@ def _stream_abcde_output(proc, job):
             last_phase_update = now
 
     # Final phase update after process exits
-    _apply_track_phases(job, seen_grabbing, seen_encoding, seen_tagging)
+    _apply_track_phases(job, seen_grabbing, seen_encoding, seen_tagging, final=True)
     return error_lines
 
 
-def _apply_track_phases(job, grabbing, encoding, tagging):
-    """Set per-track ripped/status based on the abcde phases observed so far."""
+def _apply_track_phases(job, grabbing, encoding, tagging, final=False):
+    """Set per-track ripped/status based on the abcde phases observed so far.
+
+    Changes go through the write buffer, so a track's phases between two
+    flushes collapse into one UPDATE.  Each call also writes out staged
+    changes older than ``FLUSH_INTERVAL``, even if nothing new changed;
+    *final* writes them out at once.
+    """
     try:
         tracks = Track.query.filter_by(job_id=job.job_id).all()
-        changed = False
         for t in tracks:
             try:
                 tn = int(t.track_number)
@@ -615,19 +622,17 @@ def _apply_track_phases(job, grabbing, encoding, tagging):
                 continue
             if tn in tagging:
                 if t.status != TrackStatus.success.value:
-                    t.ripped = True
-                    t.status = TrackStatus.success.value
-                    changed = True
+                    write_buffer.stage(t, {"ripped": True, "status": TrackStatus.success.value})
             elif tn in encoding:
                 if t.status != TrackStatus.encoding.value:
-                    t.status = TrackStatus.encoding.value
-                    changed = True
+                    write_buffer.stage(t, {"status": TrackStatus.encoding.value})
             elif tn in grabbing:
                 if t.status != TrackStatus.ripping.value:
-                    t.status = TrackStatus.ripping.value
-                    changed = True
-        if changed:
-            db.session.commit()
+                    write_buffer.stage(t, {"status": TrackStatus.ripping.value})
+        if final:
+            write_buffer.flush()
+        else:
+            write_buffer.flush_if_due()
     except Exception as exc:
         logging.debug("Could not update track phases: %s", exc)
         db.session.rollback()
@@ -998,14 +1003,18 @@ def arm_setup(arm_log: Logger) -> None:
             arm_log.critical(f"Can't write to folder: {folder}")
 
 
-def database_updater(args, job, wait_time=90):
+def database_updater(args, job, wait_time=90, coalesce=False):
     """Try to commit attribute changes to the database.
 
     Delegates to :func:`arm.services.files.database_updater` (single
     implementation).  Ripper callers keep a higher default *wait_time*
     because rip processes are more tolerant of delays than API requests.
+    Pass ``coalesce=True`` for progress updates that can share a later
+    commit (see :mod:`arm.database.write_buffer`).
     """
     from arm.services.files import database_updater as _database_updater
+    if coalesce:
+        return _database_updater(args, job, wait_time=wait_time, coalesce=True)
     return _database_updater(args, job, wait_time=wait_time)
 
 
@@ -1358,6 +1367,8 @@ def job_dupe_check(job):
         {str(k): str(v) for k, v in j.get_d().items()}
         for j in previous_rips
     ]
+    if not results:
+        results = job_archive.previous_rips_by_label(job.label)
 
     if not results:
         logging.info("We have no previous rips/jobs matching this label")
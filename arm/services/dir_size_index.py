@@ -0,0 +1,400 @@
+"""Background-maintained index of recursive directory sizes.
+
+Listing a media root used to walk the whole tree under every
+subdirectory on every request.  This module keeps, per directory, its
+recursive size and entry count together with the directory's own mtime:
+
+- ``lookup`` answers from the index at once and says whether the value
+  is stale; stale and missing entries are queued for the walker thread,
+  so a later listing has them.
+- ``size_of`` is the blocking form for callers that need a number now.
+- Rescanning a directory reuses the entries of subdirectories that are
+  still fresh, so after a change only the path down to it is walked.
+
+An entry is fresh while its directory's mtime is unchanged and either
+inotify watches it (Linux, local filesystems: a change marks the
+directory and its ancestors dirty) or it was scanned less than
+``MAX_AGE`` seconds ago.  Changes made on another NFS client raise no
+inotify events; the age limit covers those.  The index is saved to
+``dir-size-index.json`` beside ``DBFILE``, so after a restart listings
+show the last known sizes (flagged stale) instead of nothing.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from dataclasses import dataclass
+
+import arm.config.config as cfg
+
+log = logging.getLogger(__name__)
+
+MAX_AGE = 600               # unwatched entries: rescan after this long
+WATCHED_MAX_AGE = 86400     # watched entries: safety net for lost events
+_SETTLE_SECONDS = 2.0       # let a burst of inotify events finish first
+_POLL_SECONDS = 5.0
+_SAVE_INTERVAL = 60
+_FILE_NAME = "dir-size-index.json"
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    size: int
+    entries: int
+    mtime: float
+    scanned_at: float
+    subdirs: tuple[str, ...]
+
+
+class _Inotify:
+    """Minimal inotify(7) wrapper: one non-recursive watch per directory."""
+
+    _MASK = (0x8        # IN_CLOSE_WRITE
+             | 0x40     # IN_MOVED_FROM
+             | 0x80     # IN_MOVED_TO
+             | 0x100    # IN_CREATE
+             | 0x200    # IN_DELETE
+             | 0x400    # IN_DELETE_SELF
+             | 0x800    # IN_MOVE_SELF
+             | 0x1000000)  # IN_ONLYDIR
+    _Q_OVERFLOW = 0x4000
+    _IGNORED = 0x8000
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._paths: dict[int, str] = {}
+        self._wds: dict[str, int] = {}
+        self._full = False
+
+    def watch(self, path: str) -> None:
+        if path in self._wds or self._full:
+            return
+        wd = self._add_watch(self.fd, os.fsencode(path), self._MASK)
+        if wd < 0:
+            if ctypes.get_errno() == 28:  # ENOSPC: fs.inotify.max_user_watches
+                log.warning("inotify watch limit reached; directory sizes "
+                            "not yet watched fall back to a %ds refresh", MAX_AGE)
+                self._full = True
+            return
+        self._paths[wd] = path
+        self._wds[path] = wd
+
+    def watching(self, path: str) -> bool:
+        return path in self._wds
+
+    def read(self) -> tuple[set[str], bool]:
+        """Directories with changes since the last read, and whether the
+        kernel dropped events (queue overflow)."""
+        changed, overflow = set(), False
+        while True:
+            try:
+                buf = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return changed, overflow
+            off = 0
+            while off < len(buf):
+                wd, mask, _, length = self._EVENT.unpack_from(buf, off)
+                off += self._EVENT.size + length
+                if mask & self._Q_OVERFLOW:
+                    overflow = True
+                path = self._paths.get(wd)
+                if path is None:
+                    continue
+                changed.add(path)
+                if mask & self._IGNORED:   # watch gone (directory removed)
+                    del self._paths[wd]
+                    self._wds.pop(path, None)
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _Index:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: dict[str, _Entry] = {}
+        self.dirty: set[str] = set()
+        self.requested: set[str] = set()
+        self.inotify: _Inotify | None = None
+        self.changed = False
+
+    def fresh(self, path: str, entry: _Entry | None, mtime: float) -> bool:
+        if entry is None or entry.mtime != mtime or path in self.dirty:
+            return False
+        watched = self.inotify is not None and self.inotify.watching(path)
+        max_age = WATCHED_MAX_AGE if watched else MAX_AGE
+        return time.time() - entry.scanned_at < max_age
+
+    def walk(self, path: str, mtime: float | None = None) -> _Entry | None:
+        """Bring *path*'s entry up to date, rescanning only stale parts."""
+        try:
+            if mtime is None:
+                mtime = os.stat(path).st_mtime
+        except OSError:
+            self.forget(path)
+            return None
+        with self.lock:
+            old = self.entries.get(path)
+            if self.fresh(path, old, mtime):
+                return old
+            # Cleared before the scan: a change during it marks it again.
+            self.dirty.discard(path)
+        if self.inotify is not None:
+            self.inotify.watch(path)
+
+        size = count = 0
+        subdirs = []
+        try:
+            with os.scandir(path) as it:
+                for item in it:
+                    count += 1
+                    try:
+                        if item.is_dir(follow_symlinks=False):
+                            child = self.walk(item.path,
+                                              item.stat(follow_symlinks=False).st_mtime)
+                            if child is not None:
+                                size += child.size
+                                count += child.entries
+                                subdirs.append(item.name)
+                        elif item.is_file(follow_symlinks=False):
+                            size += item.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        pass
+        except OSError:
+            return old
+
+        entry = _Entry(size, count, mtime, time.time(), tuple(subdirs))
+        with self.lock:
+            self.entries[path] = entry
+            self.changed = True
+        if old is not None:
+            for name in set(old.subdirs) - set(subdirs):
+                self.forget(os.path.join(path, name))
+        return entry
+
+    def forget(self, path: str) -> None:
+        """Drop *path* and everything indexed below it."""
+        prefix = path + os.sep
+        with self.lock:
+            for key in [k for k in self.entries if k == path or k.startswith(prefix)]:
+                del self.entries[key]
+            self.changed = True
+
+    def mark_dirty(self, path: str) -> str | None:
+        """Mark *path* and its indexed ancestors dirty; return the
+        topmost one (the directory to rescan), or None if none is indexed."""
+        top = None
+        with self.lock:
+            while path in self.entries:
+                self.dirty.add(path)
+                top = path
+                parent = os.path.dirname(path)
+                if parent == path:
+                    break
+                path = parent
+        return top
+
+
+_index = _Index()
+_stop = threading.Event()
+_thread: threading.Thread | None = None
+# Self-pipe: lets lookups and stop interrupt the walker's select().
+_wake_fds: tuple[int, int] | None = None
+_wake_pending = False
+
+
+def _wake() -> None:
+    global _wake_pending
+    if _wake_fds is None or _wake_pending:
+        return
+    _wake_pending = True
+    try:
+        os.write(_wake_fds[1], b"\x01")
+    except OSError:
+        pass
+
+
+def lookup(path: str, mtime: float) -> tuple[int | None, bool]:
+    """Cached ``(size, stale)`` for directory *path*.
+
+    *mtime* is the directory's current ``st_mtime`` (the caller has just
+    stat'ed it).  Never touches the filesystem: when the entry is stale
+    or missing it is queued for the walker and the last known size (None
+    if there is none) comes back with ``stale=True``.
+    """
+    with _index.lock:
+        entry = _index.entries.get(path)
+        if _index.fresh(path, entry, mtime):
+            return entry.size, False
+        _index.requested.add(path)
+    _wake()
+    return (entry.size if entry is not None else None), True
+
+
+def size_of(path: str) -> int:
+    """Recursive size of *path* in bytes, walking whatever is stale now."""
+    entry = _index.walk(os.path.normpath(path))
+    return entry.size if entry is not None else 0
+
+
+def invalidate(path: str) -> None:
+    """Note a change made to directory *path* (rename, delete, mkdir...)
+    so sizes that include it are recomputed even where inotify is off."""
+    top = _index.mark_dirty(os.path.normpath(path))
+    if top is not None:
+        with _index.lock:
+            _index.requested.add(top)
+        _wake()
+
+
+def _index_file() -> str | None:
+    dbfile = cfg.arm_config.get("DBFILE") or ""
+    if not dbfile or dbfile == ":memory:":
+        return None
+    return os.path.join(os.path.dirname(dbfile), _FILE_NAME)
+
+
+def _load() -> None:
+    path = _index_file()
+    if path is None or not os.path.exists(path):
+        return
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+        entries = {p: _Entry(e[0], e[1], e[2], e[3], tuple(e[4])) for p, e in raw.items()}
+    except (OSError, ValueError, TypeError, IndexError) as exc:
+        log.warning("Ignoring unreadable directory size index %s: %s", path, exc)
+        return
+    with _index.lock:
+        for p, e in entries.items():
+            _index.entries.setdefault(p, e)
+    log.info("Directory size index: loaded %d entries", len(entries))
+
+
+def _save() -> None:
+    path = _index_file()
+    if path is None:
+        return
+    with _index.lock:
+        raw = {p: [e.size, e.entries, e.mtime, e.scanned_at, list(e.subdirs)]
+               for p, e in _index.entries.items()}
+        _index.changed = False
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(raw, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError as exc:
+        log.warning("Could not save directory size index %s: %s", path, exc)
+
+
+def _wait(timeout: float) -> set[str]:
+    """Sleep until a lookup asks for work, inotify reports changes or
+    *timeout* passes; return the directories inotify saw change."""
+    global _wake_pending
+    inotify = _index.inotify
+    fds = [_wake_fds[0]] + ([inotify.fd] if inotify is not None else [])
+    ready, _, _ = select.select(fds, [], [], max(timeout, 0))
+    if _wake_fds[0] in ready:
+        _wake_pending = False
+        try:
+            os.read(_wake_fds[0], 4096)
+        except BlockingIOError:
+            pass
+    if inotify is None or inotify.fd not in ready:
+        return set()
+    changed, overflow = inotify.read()
+    if overflow:
+        with _index.lock:
+            _index.dirty.update(_index.entries)
+    return changed
+
+
+def _loop(roots: list[str]) -> None:
+    with _index.lock:
+        _index.requested.update(roots)
+    settle: set[str] = set()
+    settle_at = 0.0
+    last_save = time.monotonic()
+    while not _stop.is_set():
+        if settle and time.monotonic() >= settle_at:
+            with _index.lock:
+                _index.requested.update(settle)
+            settle.clear()
+        with _index.lock:
+            batch, _index.requested = _index.requested, set()
+        # Parents first: a rescanned parent refreshes its children too.
+        for path in sorted(batch, key=len):
+            if _stop.is_set():
+                break
+            try:
+                _index.walk(path)
+            except Exception:
+                log.exception("Directory size scan failed for %s", path)
+        if _index.changed and time.monotonic() - last_save >= _SAVE_INTERVAL:
+            _save()
+            last_save = time.monotonic()
+        for path in _wait(settle_at - time.monotonic() if settle else _POLL_SECONDS):
+            top = _index.mark_dirty(path)
+            if top is not None:
+                settle.add(top)
+                settle_at = time.monotonic() + _SETTLE_SECONDS
+
+
+def start_background_walker(roots: list[str]) -> None:
+    """Load the saved index and start the walker thread (call once at
+    startup with the media roots to keep warm)."""
+    global _thread, _wake_fds, _wake_pending
+    if _thread and _thread.is_alive():
+        return
+    _load()
+    if _wake_fds is None:
+        _wake_fds = os.pipe()
+        for fd in _wake_fds:
+            os.set_blocking(fd, False)
+    # Pending work is picked up by the first pass; start with a clear pipe.
+    _wake_pending = False
+    try:
+        os.read(_wake_fds[0], 4096)
+    except BlockingIOError:
+        pass
+    if _index.inotify is None:
+        try:
+            _index.inotify = _Inotify()
+        except (OSError, AttributeError, TypeError) as exc:
+            log.info("inotify unavailable (%s); directory sizes refresh "
+                     "every %ds", exc, MAX_AGE)
+    _stop.clear()
+    _thread = threading.Thread(target=_loop, args=([os.path.normpath(r) for r in roots],),
+                               daemon=True, name="dir-size-index")
+    _thread.start()
+    log.info("Directory size index: background walker started for %d roots", len(roots))
+
+
+def stop_background_walker() -> None:
+    """Stop the walker and save the index."""
+    global _thread
+    if _thread is None:
+        return
+    _stop.set()
+    os.write(_wake_fds[1], b"\x01")
+    _thread.join(timeout=5)
+    _thread = None
+    if _index.inotify is not None:
+        _index.inotify.close()
+        _index.inotify = None
+    _save()
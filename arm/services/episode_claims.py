@@ -0,0 +1,75 @@
+"""Episode-claim ledger: which TV episodes each disc job has taken.
+
+Every code path that finalises ``Track.episode_number`` (matcher apply,
+manual track edits, auto-numbering, track replacement) or changes the
+job's ``tvdb_id``, season or ``disc_number`` calls ``sync_job_claims``
+before its own commit, so the ledger changes in the same transaction as
+the tracks.  The matcher reads the ledger in
+arm.services.matching.cross_disc.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from arm.database import db
+
+log = logging.getLogger(__name__)
+
+
+def _int_or_none(value) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _job_season(job) -> int | None:
+    for field in ("season", "season_auto"):
+        season = _int_or_none(getattr(job, field, None))
+        if season is not None:
+            return season
+    return None
+
+
+def sync_job_claims(job) -> int:
+    """Rewrite the claims for *job* from its tracks.  Does not commit.
+
+    Jobs without a ``tvdb_id`` hold no claims.  Returns the number of
+    claims written.
+    """
+    from arm.models.episode_claim import EpisodeClaim
+    from arm.models.track import Track
+
+    # Flush so pending track edits (and new track ids) are visible below.
+    db.session.flush()
+    EpisodeClaim.query.filter_by(job_id=job.job_id).delete(synchronize_session=False)
+    tvdb_id = getattr(job, "tvdb_id", None)
+    if not tvdb_id:
+        return 0
+
+    season = _job_season(job)
+    disc_number = getattr(job, "disc_number", None)
+    rows = (
+        db.session.query(Track.track_id, Track.episode_number)
+        .filter(Track.job_id == job.job_id, Track.episode_number.isnot(None))
+        .all()
+    )
+    written = 0
+    for track_id, episode in rows:
+        episode = _int_or_none(episode)
+        if episode is None:
+            continue
+        db.session.add(EpisodeClaim(
+            tvdb_id=tvdb_id, season=season, episode_number=episode,
+            job_id=job.job_id, track_id=track_id, disc_number=disc_number,
+        ))
+        written += 1
+    return written
+
+
+def release_job_claims(job_id: int) -> None:
+    """Drop every claim held by a job (e.g. when it is deleted).  Does not commit."""
+    from arm.models.episode_claim import EpisodeClaim
+
+    EpisodeClaim.query.filter_by(job_id=job_id).delete(synchronize_session=False)
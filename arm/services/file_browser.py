@@ -1,13 +1,22 @@
 """File browser service — browse and manage media directories."""
+import base64
+import fnmatch
+import functools
+import json
 import logging
 import os
+import select
 import shutil
 import stat
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Iterator, NamedTuple
 
 import arm.config.config as cfg
 from arm.common.path_safety import is_within, safe_join
+from arm.services import dir_size_index
 
 log = logging.getLogger(__name__)
 
@@ -99,21 +108,85 @@ def _read_host_mounts() -> dict[str, _MountInfo]:
     return mounts
 
 
-def _find_mount_for_path(path: str, host_mounts: dict[str, _MountInfo]) -> tuple[str, _MountInfo] | tuple[str, None]:
-    """Find the best (longest) matching mount point for a given path."""
-    best_mount = ''
-    best_info = None
-    for mount_point, info in host_mounts.items():
-        if (path == mount_point or path.startswith(mount_point + '/')) and len(mount_point) > len(best_mount):
-            best_mount = mount_point
-            best_info = info
-    return best_mount, best_info
+class _MountTable:
+    """Mount points in a trie of path components, for longest-prefix lookups.
+
+    Each node is a dict of child component → node; a node that is a mount
+    point holds its ``(mount_point, _MountInfo)`` under the ``''`` key
+    (never a component of a normalised path).
+    """
+    __slots__ = ('_root',)
+
+    def __init__(self, mounts: dict[str, _MountInfo]):
+        self._root: dict = {}
+        for mount_point, info in mounts.items():
+            node = self._root
+            for part in mount_point.split('/'):
+                if part:
+                    node = node.setdefault(part, {})
+            node[''] = (mount_point, info)
+
+    def find(self, path: str) -> tuple[str, _MountInfo] | tuple[str, None]:
+        """Return the deepest mount point containing *path*, or ('', None)."""
+        node = self._root
+        best = node.get('', ('', None))
+        for part in path.split('/'):
+            if not part:
+                continue
+            node = node.get(part)
+            if node is None:
+                break
+            best = node.get('', best)
+        return best
+
+
+# Seconds a parsed mount table is trusted when mount changes can't be
+# polled for.
+MOUNT_TABLE_TTL = 5.0
+
+_mount_lock = threading.Lock()
+_mount_table: _MountTable | None = None
+_mount_table_read_at = 0.0
+_mount_poller = None  # select.poll() object watching /proc/self/mountinfo
+_mount_poll_failed = False
+
+
+def _mounts_changed() -> bool:
+    """Whether the mount table may have changed since it was last parsed.
+
+    The kernel flags POLLPRI|POLLERR on an open ``/proc/self/mountinfo``
+    when a mount is added, removed or remounted; polling clears the flag.
+    Where the file can't be opened and polled, fall back to a TTL.
+    """
+    global _mount_poller, _mount_poll_failed
+    if _mount_poller is None and not _mount_poll_failed:
+        try:
+            fd = os.open('/proc/self/mountinfo', os.O_RDONLY)
+            _mount_poller = select.poll()
+            _mount_poller.register(fd, select.POLLPRI | select.POLLERR)
+        except (OSError, AttributeError) as exc:
+            log.debug("Mount changes can't be polled, re-reading every %ss: %s",
+                      MOUNT_TABLE_TTL, exc)
+            _mount_poll_failed = True
+        return True  # changes before the fd was opened weren't seen
+    if _mount_poller is None:
+        return time.monotonic() - _mount_table_read_at > MOUNT_TABLE_TTL
+    return bool(_mount_poller.poll(0))
+
+
+def _host_mounts() -> _MountTable:
+    """The parsed mount table, re-read only after the mounts change."""
+    global _mount_table, _mount_table_read_at
+    with _mount_lock:
+        if _mounts_changed() or _mount_table is None:
+            _mount_table = _MountTable(_read_host_mounts())
+            _mount_table_read_at = time.monotonic()
+        return _mount_table
 
 
 def is_path_readonly(path: str) -> bool:
     """Check if a path is on a read-only mount."""
-    host_mounts = _read_host_mounts()
-    _, info = _find_mount_for_path(str(Path(path).resolve()), host_mounts)
+    _, info = _host_mounts().find(str(Path(path).resolve()))
     return info.readonly if info else False
 
 
@@ -126,7 +199,7 @@ def get_roots() -> list[dict]:
         'music': 'Music',
         'ingress': 'Ingress',
     }
-    host_mounts = _read_host_mounts()
+    host_mounts = _host_mounts()
     results = []
     for key, path in get_allowed_roots().items():
         entry: dict = {
@@ -135,7 +208,7 @@ def get_roots() -> list[dict]:
             'path': path,
             'readonly': False,
         }
-        mount_point, info = _find_mount_for_path(path, host_mounts)
+        mount_point, info = host_mounts.find(path)
         if info:
             suffix = path[len(mount_point):]
             entry['host_path'] = info.source + suffix
@@ -179,19 +252,31 @@ def _format_permissions(mode: int) -> str:
     return ''.join(ch if mode & bit else '-' for bit, ch in _PERM_BITS)
 
 
-def _get_owner_group(st: os.stat_result) -> tuple[str, str]:
-    """Return (owner, group) names for a stat result, falling back to uid/gid."""
+@functools.lru_cache(maxsize=256)
+def _user_name(uid: int) -> str:
     import pwd
-    import grp
     try:
-        owner = pwd.getpwuid(st.st_uid).pw_name
+        return pwd.getpwuid(uid).pw_name
     except KeyError:
-        owner = str(st.st_uid)
+        return str(uid)
+
+
+@functools.lru_cache(maxsize=256)
+def _group_name(gid: int) -> str:
+    import grp
     try:
-        group = grp.getgrgid(st.st_gid).gr_name
+        return grp.getgrgid(gid).gr_name
     except KeyError:
-        group = str(st.st_gid)
-    return owner, group
+        return str(gid)
+
+
+def _get_owner_group(st: os.stat_result) -> tuple[str, str]:
+    """Return (owner, group) names for a stat result, falling back to uid/gid.
+
+    Names are cached per id: each uncached lookup re-reads /etc/passwd
+    or /etc/group.
+    """
+    return _user_name(st.st_uid), _group_name(st.st_gid)
 
 
 def classify_file(name: str) -> str:
@@ -200,20 +285,6 @@ def classify_file(name: str) -> str:
     return _EXTENSION_CATEGORIES.get(ext, 'other')
 
 
-def _dir_size(path: Path) -> int:
-    """Return total size of all files under *path* (recursive)."""
-    total = 0
-    try:
-        for entry in os.scandir(path):
-            if entry.is_file(follow_symlinks=False):
-                total += entry.stat().st_size
-            elif entry.is_dir(follow_symlinks=False):
-                total += _dir_size(Path(entry.path))
-    except OSError:
-        pass
-    return total
-
-
 def _compute_parent(resolved_str, roots):
     """Return parent path or None if at a root."""
     for root_path in roots.values():
@@ -222,7 +293,7 @@ def _compute_parent(resolved_str, roots):
     return None
 
 
-def _classify_entry(entry_path: str) -> tuple[str, bool]:
+def _classify_entry(entry_path: str, is_dir: bool | None = None) -> tuple[str, bool]:
     """Return (kind, importable) for a directory entry.
 
     kind is one of:
@@ -231,37 +302,52 @@ def _classify_entry(entry_path: str) -> tuple[str, bool]:
       - 'other': any other file (never importable)
 
     The Import wizard uses these flags to render folders + ISOs in one
-    mixed listing and grey out non-importable entries.
+    mixed listing and grey out non-importable entries.  Pass *is_dir*
+    when it is already known to save a stat.
     """
-    if os.path.isdir(entry_path):
-        has_bdmv = os.path.isdir(os.path.join(entry_path, "BDMV"))
-        has_video_ts = os.path.isdir(os.path.join(entry_path, "VIDEO_TS"))
-        return ("dir", has_bdmv or has_video_ts)
+    if is_dir is None:
+        is_dir = os.path.isdir(entry_path)
+    if is_dir:
+        return ("dir", os.path.isdir(os.path.join(entry_path, "BDMV"))
+                or os.path.isdir(os.path.join(entry_path, "VIDEO_TS")))
     if entry_path.lower().endswith(".iso"):
         return ("iso", True)
     return ("other", False)
 
 
 def _build_entry(item, st, shallow=False):
-    """Build a directory entry dict from a Path and its stat result.
+    """Build a directory entry dict from a Path and its stat result."""
+    return _entry_dict(item.name, str(item), st, shallow)
+
+
+def _entry_dict(name: str, path: str, st: os.stat_result, shallow: bool) -> dict:
+    """Build a directory entry dict from a name, full path and stat result.
 
-    When *shallow* is True, directory sizes are reported as 0 instead of
-    recursively calculated — much faster for large or NFS-backed trees.
+    Directory sizes come from the background size index without
+    waiting; ``size_stale`` is True while the index is still (re)walking
+    the directory, and ``size`` is then the last known value (0 if none).
+    When *shallow* is True, directory sizes are not looked up at all and
+    reported as 0 — for large or NFS-backed trees.
     """
-    is_dir = item.is_dir()
+    is_dir = stat.S_ISDIR(st.st_mode)
     owner, group = _get_owner_group(st)
+    size_stale = False
     if is_dir:
-        size = 0 if shallow else _dir_size(item)
+        size = 0
+        if not shallow:
+            cached, size_stale = dir_size_index.lookup(path, st.st_mtime)
+            size = cached or 0
     else:
         size = st.st_size
-    kind, importable = _classify_entry(str(item))
+    kind, importable = _classify_entry(path, is_dir)
     return {
-        'name': item.name,
+        'name': name,
         'type': 'directory' if is_dir else 'file',
         'size': size,
+        'size_stale': size_stale,
         'modified': datetime.fromtimestamp(st.st_mtime, tz=timezone.utc).isoformat(),
-        'extension': '' if is_dir else item.suffix.lstrip('.').lower(),
-        'category': 'directory' if is_dir else classify_file(item.name),
+        'extension': '' if is_dir else os.path.splitext(name)[1].lstrip('.').lower(),
+        'category': 'directory' if is_dir else classify_file(name),
         'permissions': _format_permissions(st.st_mode),
         'owner': owner,
         'group': group,
@@ -270,15 +356,133 @@ def _build_entry(item, st, shallow=False):
     }
 
 
-def list_directory(path: str) -> dict:
-    """List contents of a validated directory.
+class ListingQueryError(ValueError):
+    """Raised for an unknown sort key or order, or a malformed cursor."""
+
+
+SORT_KEYS = ('name', 'size', 'modified')
+
+
+class _Item(NamedTuple):
+    name: str
+    entry: os.DirEntry
+    is_dir: bool
+
+
+def _scan(directory: str, glob: str | None, type_: str | None,
+          category: str | None, need_stat: bool) -> list[_Item]:
+    """One ``os.scandir`` pass: the entries passing the filters.
+
+    Names and file types (d_type) come with the directory read, so the
+    filters and a name sort cost no per-entry syscall.  With *need_stat*
+    (size or date sort) each kept entry is stat'ed once; otherwise only
+    the entries of the requested page are, when they are built.
+    """
+    pattern = glob.lower() if glob else None
+    items = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            name = entry.name
+            try:
+                # NFS shares sometimes contain filenames with surrogate
+                # bytes that crash JSON serialization.
+                name.encode('utf-8')
+            except UnicodeEncodeError:
+                log.debug("Skipping entry with invalid name in %s", directory)
+                continue
+            if pattern and not fnmatch.fnmatchcase(name.lower(), pattern):
+                continue
+            try:
+                if type_ and (type_ == 'directory') != entry.is_dir():
+                    continue
+                if category and category != (
+                        'directory' if entry.is_dir() else classify_file(name)):
+                    continue
+                is_dir = entry.is_dir()
+                if need_stat:
+                    entry.stat()
+            except OSError as exc:
+                log.debug("Skipping inaccessible entry %s: %s", entry.path, exc)
+                continue
+            items.append(_Item(name, entry, is_dir))
+    return items
+
+
+def _order(items: list[_Item], sort: str, descending: bool, shallow: bool) -> list[_Item]:
+    """Directories first, then files, each sorted by *sort*."""
+    if sort == 'size':
+        def key(i):
+            st = i.entry.stat()
+            if not i.is_dir:
+                size = st.st_size
+            elif shallow:
+                size = 0
+            else:
+                size = dir_size_index.lookup(i.entry.path, st.st_mtime)[0] or 0
+            return size, i.name.lower(), i.name
+    elif sort == 'modified':
+        def key(i):
+            return i.entry.stat().st_mtime, i.name.lower(), i.name
+    else:
+        def key(i):
+            return i.name.lower(), i.name
+    dirs = sorted((i for i in items if i.is_dir), key=key, reverse=descending)
+    files = sorted((i for i in items if not i.is_dir), key=key, reverse=descending)
+    return dirs + files
+
+
+def _encode_cursor(offset: int, name: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([offset, name]).encode()).decode()
+
+
+def _page_start(ordered: list[_Item], cursor: str | None) -> int:
+    """Index of the first entry after *cursor* (the last entry of the
+    previous page).  If that entry is gone, fall back to its offset."""
+    if not cursor:
+        return 0
+    try:
+        offset, name = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        offset = int(offset)
+    except (ValueError, TypeError) as exc:
+        raise ListingQueryError("Invalid cursor") from exc
+    if 0 < offset <= len(ordered) and ordered[offset - 1].name == name:
+        return offset
+    for n, item in enumerate(ordered):
+        if item.name == name:
+            return n + 1
+    return min(max(offset, 0), len(ordered))
+
+
+def stream_directory(path: str, sort: str = 'name', order: str = 'asc',
+                     glob: str | None = None, type: str | None = None,
+                     category: str | None = None, cursor: str | None = None,
+                     limit: int | None = None) -> tuple[dict, Iterator[dict]]:
+    """List a validated directory one page at a time.
+
+    Reads the directory with a single ``os.scandir`` pass, filters and
+    sorts the ``DirEntry`` records, and only builds full entries — stat,
+    owner names, import checks, directory sizes — for the requested
+    page, lazily.  A name-sorted page of a 50k-file folder costs the
+    directory read plus a few syscalls per entry on the page.
 
     :param path: Directory path to list
-    :return: dict with path, parent, and entries
+    :param sort: one of ``SORT_KEYS``; directories always come first
+    :param order: ``'asc'`` or ``'desc'``
+    :param glob: case-insensitive shell pattern the names must match
+    :param type: ``'directory'`` or ``'file'``
+    :param category: entry category (``'video'``, ``'directory'``, ...)
+    :param cursor: ``next_cursor`` from the previous page
+    :param limit: page size; None for everything after *cursor*
+    :return: ``(header, entries)``: header has path, parent, readonly,
+        total (entries matching the filters) and next_cursor (None on
+        the last page); entries is an iterator of entry dicts
+    :raises ListingQueryError: for a bad sort, order or cursor
     :raises ValueError: if path is outside allowed roots
     :raises FileNotFoundError: if path does not exist
     :raises NotADirectoryError: if path is not a directory
     """
+    if sort not in SORT_KEYS or order not in ('asc', 'desc'):
+        raise ListingQueryError(f"Unsupported sort: {sort} {order}")
     resolved = validate_path(path)
     if not resolved.is_dir():
         raise NotADirectoryError(f"Not a directory: {path}")
@@ -292,29 +496,53 @@ def list_directory(path: str) -> dict:
     ingress_root = roots.get('ingress', '')
     shallow = bool(ingress_root and resolved_str.startswith(ingress_root))
 
-    entries = []
     try:
-        for item in resolved.iterdir():
-            try:
-                # Verify the name is valid UTF-8 before building the entry —
-                # NFS shares sometimes contain filenames with surrogate bytes
-                # that crash JSON serialization.
-                item.name.encode('utf-8')
-                entries.append(_build_entry(item, item.stat(), shallow=shallow))
-            except (OSError, UnicodeEncodeError) as exc:
-                log.debug("Skipping inaccessible entry %s: %s", item, exc)
+        items = _scan(resolved_str, glob, type, category, need_stat=sort != 'name')
     except PermissionError as exc:
         log.error("Cannot list directory %s: %s", resolved, exc)
         raise
 
-    entries.sort(key=lambda e: (0 if e['type'] == 'directory' else 1, e['name'].lower()))
+    ordered = _order(items, sort, order == 'desc', shallow)
+    start = _page_start(ordered, cursor)
+    stop = len(ordered) if limit is None else min(start + limit, len(ordered))
+    next_cursor = None
+    if stop < len(ordered) and stop > start:
+        next_cursor = _encode_cursor(stop, ordered[stop - 1].name)
 
-    return {
+    header = {
         'path': resolved_str,
         'parent': parent,
-        'entries': entries,
         'readonly': is_path_readonly(resolved_str),
+        'total': len(ordered),
+        'next_cursor': next_cursor,
     }
+    return header, _build_page(ordered[start:stop], shallow)
+
+
+def _build_page(items: list[_Item], shallow: bool) -> Iterator[dict]:
+    for item in items:
+        try:
+            st = item.entry.stat()
+        except OSError as exc:
+            log.debug("Skipping inaccessible entry %s: %s", item.entry.path, exc)
+            continue
+        yield _entry_dict(item.name, item.entry.path, st, shallow)
+
+
+def list_directory(path: str, **query) -> dict:
+    """List contents of a validated directory.
+
+    Takes the same sort, filter and paging arguments as
+    :func:`stream_directory` (by default: everything, by name).
+
+    :param path: Directory path to list
+    :return: dict with path, parent, readonly, total, next_cursor and entries
+    :raises ValueError: if path is outside allowed roots
+    :raises FileNotFoundError: if path does not exist
+    :raises NotADirectoryError: if path is not a directory
+    """
+    header, entries = stream_directory(path, **query)
+    return {**header, 'entries': list(entries)}
 
 
 def rename_item(path: str, new_name: str) -> dict:
@@ -346,6 +574,7 @@ def rename_item(path: str, new_name: str) -> dict:
         raise FileExistsError(f"Already exists: {new_name}")
 
     resolved.rename(new_path)
+    dir_size_index.invalidate(str(resolved.parent))
     log.info("Renamed %s → %s", resolved, new_path)
     return {'success': True, 'new_path': str(new_path)}
 
@@ -370,6 +599,8 @@ def move_item(path: str, destination: str) -> dict:
         raise FileExistsError(f"Already exists at destination: {source.name}")
 
     shutil.move(str(source), str(final_path))
+    dir_size_index.invalidate(str(source.parent))
+    dir_size_index.invalidate(str(dest_dir))
     log.info("Moved %s → %s", source, final_path)
     return {'success': True, 'new_path': str(final_path)}
 
@@ -393,6 +624,7 @@ def delete_item(path: str) -> dict:
         shutil.rmtree(resolved)
     else:
         resolved.unlink()
+    dir_size_index.invalidate(str(resolved.parent))
 
     log.info("Deleted %s", resolved)
     return {'success': True}
@@ -421,6 +653,7 @@ def create_directory(path: str, name: str) -> dict:
         raise FileExistsError(f"Already exists: {name}")
 
     new_dir.mkdir()
+    dir_size_index.invalidate(str(parent))
     log.info("Created directory %s", new_dir)
     return {'success': True, 'new_path': str(new_dir)}
 
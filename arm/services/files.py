@@ -13,7 +13,7 @@ import requests
 
 import arm.config.config as cfg
 from arm.models.job import Job
-from arm.database import db
+from arm.database import db, write_buffer
 
 log = logging.getLogger(__name__)
 
@@ -24,7 +24,7 @@ _SENSITIVE_KEYS = frozenset({
 })
 
 
-def database_updater(args, job, wait_time=10):
+def database_updater(args, job, wait_time=10, coalesce=False):
     """Apply attribute changes to an ORM object and commit.
 
     Retry and rollback on SQLite BUSY is now handled by
@@ -37,6 +37,9 @@ def database_updater(args, job, wait_time=10):
     :param job: ORM object to update (Job, Config, Notification, etc.)
     :param wait_time: Ignored (retained for call-site compatibility).
         Retry timeout is now controlled by ``db.session.commit_timeout``.
+    :param coalesce: Stage the change in :mod:`arm.database.write_buffer`
+        instead of committing now.  For frequent progress-style updates;
+        ``Job.status`` changes are still committed immediately.
     :returns: True on success, False if args is not a dict (rollback).
     :raises: Any database error raised by the session commit.
     """
@@ -48,12 +51,17 @@ def database_updater(args, job, wait_time=10):
     prefix = f"ID:{job_id} " if job_id is not None else ""
 
     for key, value in args.items():
-        setattr(job, key, value)
         if key.lower() in _SENSITIVE_KEYS:
             log.debug("%s%s=<redacted>", prefix, key)
         else:
             log.debug("%s%s=%s", prefix, key, value)
 
+    if coalesce:
+        write_buffer.stage(job, args)
+        return True
+
+    for key, value in args.items():
+        setattr(job, key, value)
     db.session.commit()
     log.debug("successfully written to the database")
     return True
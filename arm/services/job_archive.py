@@ -0,0 +1,356 @@
+"""Job history archival: move old finished jobs out of the hot tables.
+
+``job``, ``track`` and ``config`` (a full config copy per job) grow with
+every disc, and every list, stats and duplicate-check query pays for
+that history.  :func:`archive_old_jobs` moves finished jobs (success or
+fail) whose last activity is older than ``JOB_ARCHIVE_DAYS`` days into
+:class:`~arm.models.job_archive.JobArchive` (a summary row) and
+:class:`~arm.models.job_archive.JobArchiveData` (the original job,
+track, config, expected-title and episode-claim rows as JSON), then
+deletes the originals.  Episode claims are also copied to
+``episode_claim_archive`` (no foreign keys to the deleted rows), so an
+archived disc still keeps its episodes out of later discs' matches.
+Archiving is off unless ``JOB_ARCHIVE_DAYS`` is set.
+
+``job`` and ``track`` ids are AUTOINCREMENT, so an archived id is never
+handed to a new job; a hot job whose id is already archived (left over
+from before that) is reported and skipped rather than stalling the run.
+
+Work is done ``CHUNK_SIZE`` jobs per transaction with a short pause
+between chunks, so the SQLite write lock is never held for long and
+rippers keep committing while a large backlog is archived.
+
+Jobs that are still referenced as a drive's current job, and jobs whose
+title or IMDb id was confirmed by hand (the local title index learns
+from those), stay in the hot tables.
+
+Readers: /jobs/paginated and /jobs/stats query both tables,
+/jobs/{id}/detail falls back to :func:`load_archived`, the ripper's
+duplicate check falls back to :func:`previous_rips_by_label`, and the
+orphan-log / orphan-folder scans include archived paths.
+"""
+from __future__ import annotations
+
+import enum
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import DateTime, Enum, delete, func, inspect, or_, update
+
+import arm.config.config as cfg
+from arm.database import db
+from arm.models.config import Config
+from arm.models.episode_claim import ArchivedEpisodeClaim, EpisodeClaim
+from arm.models.expected_title import ExpectedTitle
+from arm.models.job import JOB_STATUS_FINISHED, Job, JobState
+from arm.models.job_archive import JobArchive, JobArchiveData
+from arm.models.system_drives import SystemDrives
+from arm.models.track import Track
+from arm.services import jobs as svc_jobs
+
+log = logging.getLogger(__name__)
+
+#: Jobs moved per transaction.
+CHUNK_SIZE = 50
+#: Seconds to yield the write lock between chunks.
+CHUNK_PAUSE = 0.1
+#: Seconds between background archival runs.
+ARCHIVE_INTERVAL = 6 * 3600
+#: Seconds after startup before the first background run.
+_STARTUP_DELAY = 300
+
+_FINISHED = [state.value for state in JOB_STATUS_FINISHED]
+_run_lock = threading.Lock()
+
+
+# --- row <-> JSON --------------------------------------------------------
+
+def _json_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _encode(obj) -> dict:
+    """Column values of an ORM row as a JSON-safe dict."""
+    return {
+        attr.key: _json_value(getattr(obj, attr.key))
+        for attr in inspect(type(obj)).column_attrs
+    }
+
+
+def _decode(model, data: dict):
+    """A transient *model* instance rebuilt from :func:`_encode` output.
+
+    Keys for columns that no longer exist are ignored; columns added
+    since the job was archived are left unset.
+    """
+    obj = model.__mapper__.class_manager.new_instance()
+    for attr in inspect(model).column_attrs:
+        if attr.key not in data:
+            continue
+        value = data[attr.key]
+        column_type = attr.columns[0].type
+        if value is not None and isinstance(column_type, DateTime):
+            value = datetime.fromisoformat(value)
+        elif value is not None and isinstance(column_type, Enum) and column_type.enum_class:
+            value = column_type.enum_class(value)
+        setattr(obj, attr.key, value)
+    return obj
+
+
+# --- archiving -----------------------------------------------------------
+
+def _confirmed():
+    return or_(
+        func.coalesce(Job.title_manual, "") != "",
+        func.coalesce(Job.imdb_id_manual, "") != "",
+    )
+
+
+def _eligible_ids(session, cutoff: datetime, limit: int) -> list[int]:
+    in_use = (
+        session.query(SystemDrives.job_id_current)
+        .filter(SystemDrives.job_id_current.isnot(None))
+    )
+    rows = (
+        session.query(Job.job_id)
+        .filter(
+            Job.status.in_(_FINISHED),
+            func.coalesce(Job.stop_time, Job.start_time) < cutoff,
+            ~_confirmed(),
+            Job.job_id.notin_(in_use),
+            Job.job_id.notin_(session.query(JobArchive.job_id)),
+        )
+        .order_by(Job.job_id)
+        .limit(limit)
+        .all()
+    )
+    return [job_id for (job_id,) in rows]
+
+
+def _summary(job, counts: dict) -> JobArchive:
+    meta = job.media_metadata
+    return JobArchive(
+        job_id=job.job_id,
+        guid=job.guid,
+        status=_json_value(job.status),
+        title=job.title,
+        year=job.year,
+        video_type=job.video_type,
+        disctype=job.disctype,
+        label=job.label,
+        imdb_id=job.imdb_id,
+        crc_id=job.crc_id,
+        poster_url=getattr(meta, "poster_url", None) if meta is not None else None,
+        hasnicetitle=job.hasnicetitle,
+        logfile=job.logfile,
+        path=job.path,
+        raw_path=job.raw_path,
+        start_time=job.start_time,
+        stop_time=job.stop_time,
+        tracks_total=counts["total"],
+        tracks_ripped=counts["ripped"],
+    )
+
+
+def _archive_chunk(session, job_ids: list[int]) -> None:
+    jobs = session.query(Job).filter(Job.job_id.in_(job_ids)).all()
+    grouped = {job_id: {"tracks": [], "expected_titles": [], "episode_claims": [], "config": None}
+               for job_id in job_ids}
+    for track in session.query(Track).filter(Track.job_id.in_(job_ids)):
+        grouped[track.job_id]["tracks"].append(_encode(track))
+    for config in session.query(Config).filter(Config.job_id.in_(job_ids)):
+        grouped[config.job_id]["config"] = _encode(config)
+    for title in session.query(ExpectedTitle).filter(ExpectedTitle.job_id.in_(job_ids)):
+        grouped[title.job_id]["expected_titles"].append(_encode(title))
+    claims = session.query(EpisodeClaim).filter(EpisodeClaim.job_id.in_(job_ids)).all()
+    for claim in claims:
+        grouped[claim.job_id]["episode_claims"].append(_encode(claim))
+    counts = svc_jobs.track_counts_by_job(job_ids, session=session)
+
+    for job in jobs:
+        payload = {"job": _encode(job), **grouped[job.job_id]}
+        session.add(_summary(job, counts[job.job_id]))
+        session.add(JobArchiveData(job_id=job.job_id, payload=json.dumps(payload)))
+    session.add_all(
+        ArchivedEpisodeClaim(
+            tvdb_id=claim.tvdb_id, season=claim.season, episode_number=claim.episode_number,
+            job_id=claim.job_id, track_id=claim.track_id, disc_number=claim.disc_number,
+            claimed_at=claim.claimed_at,
+        )
+        for claim in claims
+    )
+    session.flush()
+    # The rows are deleted with bulk statements below; drop the loaded
+    # copies so the session never tries to flush them.
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, (Job, Track, Config, ExpectedTitle, EpisodeClaim)) \
+                and obj.job_id in grouped:
+            session.expunge(obj)
+
+    session.execute(
+        update(SystemDrives)
+        .where(SystemDrives.job_id_previous.in_(job_ids))
+        .values(job_id_previous=None)
+    )
+    for model in (EpisodeClaim, ExpectedTitle, Track, Config):
+        session.execute(delete(model).where(model.job_id.in_(job_ids)))
+    session.execute(delete(Job).where(Job.job_id.in_(job_ids)))
+
+
+def _report_collisions(session) -> None:
+    """Log hot jobs that cannot be archived because their id already is."""
+    clashing = [
+        job_id for (job_id,) in
+        session.query(Job.job_id).join(JobArchive, JobArchive.job_id == Job.job_id)
+    ]
+    if clashing:
+        log.error("Job(s) %s share an id with an archived job and will not be archived",
+                  ", ".join(map(str, clashing)))
+
+
+def archive_old_jobs(days: int, chunk_size: int = CHUNK_SIZE, pause: float = CHUNK_PAUSE) -> int:
+    """Archive finished jobs older than *days*; return how many were moved.
+
+    Each chunk of *chunk_size* jobs is its own transaction on
+    ``db.session``.  A failed chunk is rolled back and stops the run.
+    """
+    if not days or days <= 0:
+        return 0
+    cutoff = datetime.now() - timedelta(days=days)
+    session = db.session
+    _report_collisions(session)
+    moved = 0
+    while job_ids := _eligible_ids(session, cutoff, chunk_size):
+        try:
+            _archive_chunk(session, job_ids)
+            session.commit()
+        except Exception:
+            session.rollback()
+            log.exception("Job archival stopped after %d job(s)", moved)
+            break
+        moved += len(job_ids)
+        if len(job_ids) < chunk_size:
+            break
+        time.sleep(pause)
+    if moved:
+        log.info("Archived %d job(s) older than %d days", moved, days)
+    return moved
+
+
+def run_archival(days: int | None = None) -> dict:
+    """Archive with the configured age (or *days*), then release the session.
+
+    Entry point for the background thread and the maintenance endpoint;
+    runs are serialised.
+    """
+    if days is None:
+        days = int(cfg.arm_config.get("JOB_ARCHIVE_DAYS", 0) or 0)
+    with _run_lock:
+        try:
+            archived = archive_old_jobs(days)
+            total = db.session.query(func.count(JobArchive.job_id)).scalar()
+        finally:
+            db.session.remove()
+    return {"success": True, "archived": archived, "total_archived": total}
+
+
+_archive_thread: threading.Thread | None = None
+
+
+def start_background_archival() -> None:
+    """Start the periodic archival thread (call once at startup).
+
+    Does nothing when ``JOB_ARCHIVE_DAYS`` is 0 or unset.
+    """
+    global _archive_thread
+    if not int(cfg.arm_config.get("JOB_ARCHIVE_DAYS", 0) or 0):
+        return
+    if _archive_thread and _archive_thread.is_alive():
+        return
+
+    def _loop():
+        time.sleep(_STARTUP_DELAY)
+        while True:
+            try:
+                run_archival()
+            except Exception:
+                log.exception("Background job archival failed")
+            time.sleep(ARCHIVE_INTERVAL)
+
+    _archive_thread = threading.Thread(target=_loop, daemon=True, name="job-archive")
+    _archive_thread.start()
+    log.info("Job archival: background run every %ds", ARCHIVE_INTERVAL)
+
+
+# --- reading -------------------------------------------------------------
+
+def load_archived(job_id: int, session=None):
+    """Rebuild an archived job as transient objects.
+
+    :returns: ``(job, config, tracks)``, or None if *job_id* is not
+        archived.  ``job.expected_titles`` is populated; nothing is
+        attached to a session.
+    """
+    session = session if session is not None else db.session
+    data = session.get(JobArchiveData, job_id)
+    if data is None:
+        return None
+    return _from_payload(json.loads(data.payload))
+
+
+def archived_payloads(job_ids, session=None) -> dict:
+    """``{job_id: stored payload}`` for the archived jobs among *job_ids*.
+
+    Only fetches; :func:`archived_job` decodes a payload, so callers on
+    the event loop can do that part in a worker thread.
+    """
+    session = session if session is not None else db.session
+    job_ids = list(job_ids)
+    if not job_ids:
+        return {}
+    rows = (
+        session.query(JobArchiveData.job_id, JobArchiveData.payload)
+        .filter(JobArchiveData.job_id.in_(job_ids))
+    )
+    return dict(rows.all())
+
+
+def archived_job(payload: str):
+    """The transient Job (with ``expected_titles``) stored in *payload*."""
+    return _from_payload(json.loads(payload))[0]
+
+
+def _from_payload(payload: dict):
+    job = _decode(Job, payload["job"])
+    job.expected_titles = [_decode(ExpectedTitle, t) for t in payload.get("expected_titles", [])]
+    config = _decode(Config, payload["config"]) if payload.get("config") else None
+    tracks = [_decode(Track, t) for t in payload.get("tracks", [])]
+    return job, config, tracks
+
+
+def previous_rips_by_label(label: str, session=None) -> list[dict]:
+    """Archived successful jobs with *label*, shaped like ``Job.get_d()``
+    output for the fields the ripper's duplicate check reads."""
+    session = session if session is not None else db.session
+    rows = (
+        session.query(JobArchive)
+        .filter(JobArchive.label == label, JobArchive.status == JobState.SUCCESS.value)
+        .all()
+    )
+    return [
+        {
+            "title": row.title or "",
+            "year": row.year or "",
+            "poster_url": row.poster_url or "",
+            "hasnicetitle": str(bool(row.hasnicetitle)),
+            "video_type": row.video_type or "",
+        }
+        for row in rows
+    ]
@@ -0,0 +1,82 @@
+"""Read side of the job_change log (see arm.models.job_change).
+
+``changes_since`` turns the raw log into what a syncing client needs:
+which jobs and tracks to re-fetch and which were deleted, collapsed to
+the latest operation per row, plus the cursor to send next time.
+
+The log is only written on SQLite (see ``create_triggers``); check
+:func:`feed_supported` first, since elsewhere it is simply empty.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import func
+
+from arm.database import db
+from arm.models.job_change import JobChange
+
+
+def feed_supported() -> bool:
+    """True when the database maintains the change log.
+
+    Only SQLite has the triggers.  On PostgreSQL, sequence values are
+    handed out before commit, so a lower ``seq`` can become visible after
+    a client has already moved its cursor past it.  There an empty log
+    would read as "nothing changed", so callers must not serve it.
+    """
+    return db.engine.dialect.name == "sqlite"
+
+
+def current_cursor() -> int:
+    """Newest change sequence number, or 0 for an empty log."""
+    return db.session.query(func.max(JobChange.seq)).scalar() or 0
+
+
+def changes_since(since: int, limit: int = 500) -> dict:
+    """Collapse the log entries after *since* (at most *limit* of them).
+
+    Returns ``{"cursor", "more", "reset", "jobs", "tracks",
+    "deleted_jobs", "deleted_tracks"}`` where the four lists hold row
+    ids.  ``reset`` means *since* predates the retained log (or comes
+    from another database) and the client must re-fetch everything;
+    ``cursor`` is then the current head.
+    """
+    oldest, newest = db.session.query(
+        func.min(JobChange.seq), func.max(JobChange.seq),
+    ).one()
+    if since > (newest or 0) or (oldest is not None and since + 1 < oldest):
+        return {
+            "cursor": newest or 0, "more": False, "reset": True,
+            "jobs": [], "tracks": [], "deleted_jobs": [], "deleted_tracks": [],
+        }
+
+    rows = (
+        db.session.query(JobChange.seq, JobChange.table_name, JobChange.row_id, JobChange.op)
+        .filter(JobChange.seq > since)
+        .order_by(JobChange.seq)
+        .limit(limit + 1)
+        .all()
+    )
+    more = len(rows) > limit
+    rows = rows[:limit]
+
+    latest: dict[tuple[str, int], str] = {}
+    for _, table, row_id, op in rows:
+        latest.pop((table, row_id), None)  # re-insert so order follows the last change
+        latest[(table, row_id)] = op
+
+    def ids(table, deleted):
+        return [
+            row_id for (t, row_id), op in latest.items()
+            if t == table and (op == "delete") == deleted
+        ]
+
+    return {
+        "cursor": rows[-1].seq if rows else since,
+        "more": more,
+        "reset": False,
+        "jobs": ids("job", False),
+        "tracks": ids("track", False),
+        "deleted_jobs": ids("job", True),
+        "deleted_tracks": ids("track", True),
+    }
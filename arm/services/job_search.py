@@ -0,0 +1,193 @@
+"""Full-text job search backed by an SQLite FTS5 index.
+
+``job_fts`` is an external-content FTS5 table over the job columns a
+user searches by (titles, disc label, year, IMDb id, output path).
+Triggers on ``job`` keep it in step, so nothing in the ripper has to
+know it exists.  It is created by the b3c4d5e6f7 migration through
+``install_fts``; SQLite builds without FTS5 (and non-SQLite databases)
+simply never get the table, and ``search_clause`` / ``ranked_search``
+fall back to the previous ``LIKE`` filters.
+
+User input is split into word tokens and each becomes a quoted prefix
+term, so ``"matr 1999"`` finds *The Matrix (1999)* and FTS syntax in
+the input cannot produce a query error.  Unlike ``LIKE '%term%'`` this
+does not match inside words (``rix`` does not find *Matrix*).
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+
+from sqlalchemy import Float, Integer, exc, or_, select, text
+
+from arm.database import db
+
+log = logging.getLogger(__name__)
+
+FTS_TABLE = "job_fts"
+FTS_COLUMNS = ("title", "title_auto", "title_manual", "label", "year", "imdb_id", "path")
+# bm25 weights, one per FTS_COLUMNS entry: title hits outrank path hits.
+_RANK_WEIGHTS = (10.0, 5.0, 10.0, 4.0, 2.0, 3.0, 1.0)
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def install_fts(connection) -> bool:
+    """Create ``job_fts`` with its sync triggers and index existing jobs.
+
+    *connection* is a SQLAlchemy connection (alembic's ``op.get_bind()``
+    in the migration).  Returns False, without changing the schema, when
+    the database is not SQLite or SQLite lacks FTS5.
+    """
+    if connection.dialect.name != "sqlite":
+        return False
+    cols = ", ".join(FTS_COLUMNS)
+    try:
+        connection.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            f"{cols}, content='job', content_rowid='job_id', "
+            f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+    except exc.OperationalError as error:
+        log.warning(f"FTS5 unavailable, job search stays on LIKE: {error}")
+        return False
+    create_fts_triggers(connection)
+    weights = ", ".join(str(w) for w in _RANK_WEIGHTS)
+    connection.exec_driver_sql(
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', 'bm25({weights})')"
+    )
+    rebuild_fts(connection)
+    return True
+
+
+def create_fts_triggers(connection) -> None:
+    """(Re)create the triggers that keep ``job_fts`` in step with ``job``.
+
+    Rebuilding the ``job`` table (alembic batch mode) drops them; call
+    this afterwards, then :func:`rebuild_fts`.  A no-op when there is no
+    ``job_fts`` table.
+    """
+    if not _has_fts_table(connection):
+        return
+    drop_fts_triggers(connection)
+    cols = ", ".join(FTS_COLUMNS)
+    new = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    old = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+    connection.exec_driver_sql(
+        f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON job BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.job_id, {new}); END"
+    )
+    connection.exec_driver_sql(
+        f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON job BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) "
+        f"VALUES ('delete', old.job_id, {old}); END"
+    )
+    connection.exec_driver_sql(
+        f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF {cols} ON job BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) "
+        f"VALUES ('delete', old.job_id, {old}); "
+        f"INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.job_id, {new}); END"
+    )
+
+
+def drop_fts_triggers(connection) -> None:
+    """Remove the ``job_fts`` sync triggers (no-op if absent)."""
+    if connection.dialect.name != "sqlite":
+        return
+    for suffix in ("ai", "ad", "au"):
+        connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+
+
+def rebuild_fts(connection) -> None:
+    """Re-index every job, e.g. after writes the triggers missed."""
+    if _has_fts_table(connection):
+        connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def _has_fts_table(connection) -> bool:
+    if connection.dialect.name != "sqlite":
+        return False
+    return connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).first() is not None
+
+
+def drop_fts(connection) -> None:
+    """Remove ``job_fts`` and its triggers (no-op if absent)."""
+    if connection.dialect.name != "sqlite":
+        return
+    drop_fts_triggers(connection)
+    connection.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def fts_available(session=None) -> bool:
+    """True when the current database has the ``job_fts`` index."""
+    if db.engine.dialect.name != "sqlite":
+        return False
+    session = session if session is not None else db.session
+    found = session.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": FTS_TABLE},
+    ).first()
+    return found is not None
+
+
+def match_expression(term: str | None) -> str | None:
+    """FTS5 MATCH string for free-text *term*: every word as a prefix, ANDed."""
+    tokens = _TOKEN.findall(term or "")
+    if not tokens:
+        return None
+    return " ".join('"{}"*'.format(t.replace('"', '""')) for t in tokens)
+
+
+def _fts_matches(expression):
+    return (
+        text(f"SELECT rowid AS job_id, rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match")
+        .bindparams(match=expression)
+        .columns(job_id=Integer, rank=Float)
+        .subquery("fts")
+    )
+
+
+def search_clause(term: str, session=None):
+    """Filter clause matching jobs for the job-list search box.
+
+    Uses the FTS index when present; otherwise the previous
+    case-insensitive substring match on title, title_auto, title_manual
+    and label.  *session* is the one the filtered query will run on
+    (default ``db.session``).
+    """
+    from arm.models.job import Job
+
+    expression = match_expression(term)
+    if expression and fts_available(session):
+        return Job.job_id.in_(select(_fts_matches(expression).c.job_id))
+    pattern = f"%{term}%"
+    return or_(
+        Job.title.ilike(pattern),
+        Job.title_auto.ilike(pattern),
+        Job.title_manual.ilike(pattern),
+        Job.label.ilike(pattern),
+    )
+
+
+def ranked_search(term: str) -> list:
+    """Jobs matching *term*, best match first.
+
+    With FTS this is bm25-ranked over every indexed column.  Without it,
+    falls back to the legacy title ``LIKE`` with punctuation stripped, in
+    table order.
+    """
+    from arm.models.job import Job
+
+    expression = match_expression(term)
+    if expression and fts_available():
+        fts = _fts_matches(expression)
+        return (
+            db.session.query(Job)
+            .join(fts, fts.c.job_id == Job.job_id)
+            .order_by(fts.c.rank, Job.job_id.desc())
+            .all()
+        )
+    safe_search = re.sub(r'[^a-zA-Z\d]', '', term or "")
+    return db.session.query(Job).filter(Job.title.like(f"%{safe_search}%")).all()
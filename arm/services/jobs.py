@@ -14,13 +14,17 @@ import datetime
 import logging
 
 import psutil
+from sqlalchemy import Integer, case, cast, func, or_
+from sqlalchemy.orm import selectinload
 
 import arm.config.config as cfg
+from arm.models.config import Config
 from arm.models.job import Job, JobState, JOB_STATUS_FINISHED
 from arm.models.notifications import Notifications
 from arm.models.track import Track
 from arm.models.ui_settings import UISettings
 from arm.database import db
+from arm.services import job_search
 from arm.services.files import database_updater, job_id_validator
 from arm.common.path_safety import safe_join
 
@@ -44,11 +48,19 @@ def get_x_jobs(job_status):
     """
     success = False
     if job_status == "joblist":
-        jobs = db.session.query(Job).filter(~Job.finished).all()
+        query = db.session.query(Job).filter(~Job.finished)
     elif JobState(job_status) in JOB_STATUS_FINISHED:
-        jobs = Job.query.filter_by(status=job_status)
+        query = Job.query.filter_by(status=job_status)
     else:
         raise ValueError(f"{job_status} is not a valid option")
+    jobs = query.options(selectinload(Job.config)).all()
+
+    # One query for every music job's tracks instead of one per job.
+    music_tracks = {}
+    music_ids = [j.job_id for j in jobs if j.disctype == "music"]
+    if music_ids:
+        for t in Track.query.filter(Track.job_id.in_(music_ids)).order_by(Track.track_id):
+            music_tracks.setdefault(t.job_id, []).append(t)
 
     job_results = {}
     i = 0
@@ -69,7 +81,7 @@ def get_x_jobs(job_status):
 
         # Include per-track status summary for music jobs
         if j.disctype == "music":
-            tracks = Track.query.filter_by(job_id=j.job_id).all()
+            tracks = music_tracks.get(j.job_id, [])
             track_list = []
             for t in tracks:
                 track_list.append({
@@ -155,6 +167,54 @@ def track_counts(job) -> dict:
     }
 
 
+# MINLENGTH values int() accepts (surrounding whitespace, optional sign).
+_INT_PATTERN = r"^\s*[+-]?[0-9]+\s*$"
+
+
+def track_counts_by_job(job_ids, session=None) -> dict:
+    """Return ``{job_id: {total, ripped}}`` for many jobs in one query.
+
+    Same rules as :func:`track_counts` (enabled tracks at or above the
+    job's MINLENGTH; music discs ignore MINLENGTH), evaluated as a single
+    grouped aggregate so job-list endpoints don't issue a track query per
+    row.  Jobs with no rippable tracks map to ``{"total": 0, "ripped": 0}``.
+    *session* defaults to ``db.session``.
+    """
+    job_ids = list(job_ids)
+    counts = {job_id: {"total": 0, "ripped": 0} for job_id in job_ids}
+    if not job_ids:
+        return counts
+
+    # Only cast what int() in _job_minlength() accepts; anything else
+    # counts as 0 there.  An unguarded CAST would fail on PostgreSQL and
+    # read "600.0" as 600 on SQLite.
+    minlength = case(
+        (Job.disctype == "music", 0),
+        (Config.MINLENGTH.regexp_match(_INT_PATTERN), cast(func.trim(Config.MINLENGTH), Integer)),
+        else_=0,
+    )
+    session = session if session is not None else db.session
+    rows = (
+        session.query(
+            Track.job_id,
+            func.count(Track.track_id),
+            func.sum(case((Track.ripped.is_(True), 1), else_=0)),
+        )
+        .join(Job, Job.job_id == Track.job_id)
+        .outerjoin(Config, Config.job_id == Track.job_id)
+        .filter(
+            Track.job_id.in_(job_ids),
+            or_(Track.enabled.is_(None), Track.enabled.is_(True)),
+            or_(minlength <= 0, Track.length.is_(None), Track.length >= minlength),
+        )
+        .group_by(Track.job_id)
+        .all()
+    )
+    for job_id, total, ripped in rows:
+        counts[job_id] = {"total": total, "ripped": int(ripped or 0)}
+    return counts
+
+
 def percentage(part, whole):
     """percent calculator"""
     percent = 100 * float(part) / float(whole)
@@ -289,12 +349,11 @@ def read_all_log_lines(log_file):
 
 
 def search(search_query):
-    """ Queries ARMui db for the movie/show matching the query"""
-    safe_search = re.sub(r'[^a-zA-Z\d]', '', search_query)
-    safe_search = f"%{safe_search}%"
+    """ Queries ARMui db for the movie/show matching the query (ranked via
+    the FTS index when present, see arm.services.job_search)"""
     log.debug('-' * 30)
 
-    posts = db.session.query(Job).filter(Job.title.like(safe_search)).all()
+    posts = job_search.ranked_search(search_query)
     search_results = {}
     i = 0
     for job in posts:
@@ -322,6 +381,7 @@ def delete_job(job_id, mode):
     from arm.models.config import Config
     from arm.models.track import Track
     from arm.services.drives import job_cleanup
+    from arm.services.episode_claims import release_job_claims
 
     try:
         json_return = {}
@@ -347,6 +407,7 @@ def delete_job(job_id, mode):
                 else:
                     log.debug("No errors: job_id=" + str(post_value))
                     job_cleanup(job_id)
+                    release_job_claims(post_value)
                     Track.query.filter_by(job_id=job_id).delete()
                     Job.query.filter_by(job_id=job_id).delete()
                     Config.query.filter_by(job_id=job_id).delete()
@@ -5,11 +5,13 @@ import logging
 import os
 import shutil
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import arm.config.config as cfg
 from arm.database import db
 from arm.models.job import Job
+from arm.models.job_archive import JobArchive
+from arm.services import dir_size_index
 
 log = logging.getLogger(__name__)
 
@@ -17,17 +19,19 @@ log = logging.getLogger(__name__)
 def get_orphan_logs() -> dict[str, Any]:
     """Find log files not referenced by any job.
 
-    Scans LOGPATH for *.log files and cross-references against Job.logfile.
+    Scans LOGPATH for *.log files and cross-references against the logfile
+    of every job, archived ones included.
     Returns dict with root, total_size_bytes, and files list.
     """
-    log_path = Path(cfg.arm_config["LOGPATH"])
-    if not log_path.is_dir():
+    log_path = Path(cfg.arm_config.get("LOGPATH") or "")
+    if not cfg.arm_config.get("LOGPATH") or not log_path.is_dir():
         return {"root": str(log_path), "total_size_bytes": 0, "files": []}
 
     # Get all logfile references from jobs
     referenced = set()
-    for (logfile,) in db.session.query(Job.logfile).filter(Job.logfile.isnot(None)).all():
-        referenced.add(logfile)
+    for model in (Job, JobArchive):
+        for (logfile,) in db.session.query(model.logfile).filter(model.logfile.isnot(None)).all():
+            referenced.add(logfile)
 
     orphans = []
     total_size = 0
@@ -44,24 +48,13 @@ def get_orphan_logs() -> dict[str, Any]:
     return {"root": str(log_path), "total_size_bytes": total_size, "files": orphans}
 
 
-def _dir_size(path: Path) -> int:
-    """Compute total size of all files in a directory tree."""
-    total = 0
-    try:
-        for entry in os.scandir(path):
-            if entry.is_file(follow_symlinks=False):
-                total += entry.stat().st_size
-            elif entry.is_dir(follow_symlinks=False):
-                total += _dir_size(Path(entry.path))
-    except PermissionError:
-        pass
-    return total
-
-
 def _get_job_references() -> set[str]:
-    """Collect all folder name references from jobs (title, label, raw_path basename)."""
+    """Collect all folder name references from jobs (title, label, raw_path basename),
+    archived jobs included."""
     refs: set[str] = set()
     rows = db.session.query(Job.title, Job.label, Job.raw_path, Job.path).all()
+    rows += db.session.query(JobArchive.title, JobArchive.label,
+                             JobArchive.raw_path, JobArchive.path).all()
     for title, label, raw_path, path in rows:
         if title:
             refs.add(title)
@@ -74,41 +67,64 @@ def _get_job_references() -> set[str]:
     return refs
 
 
-def get_orphan_folders() -> dict[str, Any]:
+def _subdirectories(root: Path, listings: dict | None = None) -> list[Path]:
+    """Sorted subdirectories of *root* ([] if it is not a directory).
+
+    With *listings* (path -> ``[mtime_ns, names]``, kept between scans)
+    the names are reused while *root*'s mtime is unchanged: adding,
+    removing or renaming an entry is what updates a directory's mtime.
+    """
+    try:
+        mtime = os.stat(root).st_mtime_ns
+        cached = listings.get(str(root)) if listings is not None else None
+        if cached and cached[0] == mtime:
+            names = cached[1]
+        else:
+            with os.scandir(root) as it:
+                names = sorted(e.name for e in it if e.is_dir())
+            if listings is not None:
+                listings[str(root)] = [mtime, names]
+    except OSError:
+        return []
+    return [root / name for name in names]
+
+
+def get_orphan_folders(listings: dict | None = None,
+                       progress: Callable[[int, int], None] | None = None) -> dict[str, Any]:
     """Find folders in RAW_PATH and COMPLETED_PATH not referenced by any job.
 
     Cross-references directory names against Job.title, Job.label,
-    Job.raw_path basename, and Job.path basename.
+    Job.raw_path basename, and Job.path basename.  Folder sizes come from
+    the directory size index, which only re-walks folders that changed.
+    *listings* lets repeated scans skip unchanged directories (see
+    :func:`_subdirectories`); *progress* is called with (done, total) as
+    folders are sized.
     """
     raw_path = Path(cfg.arm_config.get("RAW_PATH", ""))
     completed_path = Path(cfg.arm_config.get("COMPLETED_PATH", ""))
 
     refs = _get_job_references()
 
+    candidates = [(entry, "raw") for entry in _subdirectories(raw_path, listings)]
+    # Scan completed subdirectories (completed/movies/, completed/series/, etc.)
+    for subdir in _subdirectories(completed_path, listings):
+        candidates += [(entry, "completed") for entry in _subdirectories(subdir, listings)]
+    candidates = [(entry, category) for entry, category in candidates
+                  if entry.name not in refs]
+
     orphans = []
     total_size = 0
-
-    def _scan_dir(root: Path, category: str):
-        nonlocal total_size
-        if not root.is_dir():
-            return
-        for entry in sorted(root.iterdir()):
-            if entry.is_dir() and entry.name not in refs:
-                size = _dir_size(entry)
-                orphans.append({
-                    "path": str(entry),
-                    "name": entry.name,
-                    "category": category,
-                    "size_bytes": size,
-                })
-                total_size += size
-
-    _scan_dir(raw_path, "raw")
-    # Scan completed subdirectories (completed/movies/, completed/series/, etc.)
-    if completed_path.is_dir():
-        for subdir in completed_path.iterdir():
-            if subdir.is_dir():
-                _scan_dir(subdir, "completed")
+    for done, (entry, category) in enumerate(candidates, 1):
+        size = dir_size_index.size_of(str(entry))
+        orphans.append({
+            "path": str(entry),
+            "name": entry.name,
+            "category": category,
+            "size_bytes": size,
+        })
+        total_size += size
+        if progress is not None:
+            progress(done, len(candidates))
 
     return {
         "roots": [str(raw_path), str(completed_path)],
@@ -187,6 +203,7 @@ def delete_folder(path_str: str) -> dict[str, Any]:
 
     try:
         shutil.rmtree(resolved)
+        dir_size_index.invalidate(str(resolved.parent))
         return {"success": True, "path": path_str, "error": None}
     except OSError as exc:
         log.error("Failed to delete folder %s: %s", path_str, exc)
@@ -247,13 +264,14 @@ def clear_raw_directories() -> dict[str, Any]:
                 item.unlink()
                 cleared += 1
             elif item.is_dir():
-                dir_size = sum(f.stat().st_size for f in item.rglob('*') if f.is_file())
+                dir_size = dir_size_index.size_of(str(item))
                 shutil.rmtree(item)
                 freed_bytes += dir_size
                 cleared += 1
         except OSError as exc:
             log.error("Failed to remove %s: %s", item.name, exc)
             errors.append(item.name)
+    dir_size_index.invalidate(str(raw_path))
 
     return {
         "success": True,
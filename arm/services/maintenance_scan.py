@@ -0,0 +1,239 @@
+"""Background orphan scan for the maintenance page.
+
+Finding orphan folders sizes every candidate folder under RAW_PATH and
+COMPLETED_PATH; on a large library that outlasts the request.  The scan
+runs on a worker thread instead and the maintenance endpoints serve its
+last result:
+
+- ``last_result`` answers at once with the last scan for the configured
+  paths and starts a refresh when it is older than ``MAX_AGE``.  With
+  no result yet it waits up to *wait* seconds for the first one.
+- ``refresh`` starts a scan unless one is running; ``status`` reports
+  its phase and progress.
+- Rescans are incremental: directory listings are reused while the
+  directory's mtime is unchanged, and folder sizes come from the
+  directory size index, which only re-walks what changed.
+- ``discard`` drops deleted paths from the last result, so the page is
+  right without waiting for a rescan.
+
+The last result and the listings are saved to ``maintenance-scan.json``
+beside ``DBFILE``, so after a restart the page shows the previous scan,
+with its timestamp, while a new one runs.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+import arm.config.config as cfg
+from arm.database import db
+from arm.services import maintenance
+
+log = logging.getLogger(__name__)
+
+MAX_AGE = 900               # serve older results but rescan behind them
+_FILE_NAME = "maintenance-scan.json"
+
+_lock = threading.Lock()
+_finished = threading.Condition(_lock)
+_thread: threading.Thread | None = None
+_loaded = False
+_progress: dict[str, Any] = {"running": False, "phase": None, "done": 0, "total": 0, "error": None}
+_last: dict[str, Any] | None = None
+_listings: dict[str, list] = {}
+
+
+def _key() -> list[str]:
+    """The configured paths a result belongs to."""
+    return [cfg.arm_config.get(name) or "" for name in ("LOGPATH", "RAW_PATH", "COMPLETED_PATH")]
+
+
+def _current() -> dict[str, Any] | None:
+    """The last result if it was scanned with the current paths (under ``_lock``)."""
+    return _last if _last is not None and _last["key"] == _key() else None
+
+
+def _set_progress(phase: str, done: int = 0, total: int = 0) -> None:
+    with _lock:
+        _progress.update(phase=phase, done=done, total=total)
+
+
+def _scan() -> None:
+    global _last
+    started = time.time()
+    key = _key()
+    try:
+        _set_progress("logs")
+        logs = maintenance.get_orphan_logs()
+        _set_progress("folders")
+        folders = maintenance.get_orphan_folders(
+            _listings, lambda done, total: _set_progress("folders", done, total))
+    except Exception as exc:
+        log.exception("Maintenance scan failed")
+        with _lock:
+            _progress.update(running=False, error=str(exc))
+            _finished.notify_all()
+        return
+    finally:
+        db.session.remove()
+    with _lock:
+        _last = {
+            "key": key,
+            "scanned_at": started,
+            "duration_seconds": round(time.time() - started, 3),
+            "orphan_logs": logs,
+            "orphan_folders": folders,
+        }
+        _progress.update(running=False, phase=None, error=None)
+        _finished.notify_all()
+    log.info("Maintenance scan: %d orphan log(s), %d orphan folder(s) in %.1fs",
+             len(logs["files"]), len(folders["folders"]), _last["duration_seconds"])
+    _save()
+
+
+def _start() -> bool:
+    """Start a scan unless one is running (under ``_lock``)."""
+    global _thread
+    if _progress["running"]:
+        return False
+    _progress.update(running=True, phase="starting", done=0, total=0, error=None)
+    _thread = threading.Thread(target=_scan, daemon=True, name="maintenance-scan")
+    _thread.start()
+    return True
+
+
+def refresh() -> bool:
+    """Start a scan in the background; False if one is already running."""
+    _ensure_loaded()
+    with _lock:
+        return _start()
+
+
+def status() -> dict[str, Any]:
+    """Progress of the running scan and the time of the last result."""
+    _ensure_loaded()
+    with _lock:
+        last = _current()
+        return {
+            **_progress,
+            "scanned_at": _timestamp(last),
+            "duration_seconds": last["duration_seconds"] if last else None,
+        }
+
+
+def last_result(wait: float = 0.0) -> dict[str, Any]:
+    """The last scan for the configured paths, without scanning inline.
+
+    Starts a refresh when there is no result or it is older than
+    ``MAX_AGE``; only when there is no result at all does it wait, up to
+    *wait* seconds.  Returns ``orphan_logs`` and ``orphan_folders`` in
+    the shapes of :mod:`arm.services.maintenance` (empty if no scan has
+    finished), ``scanned_at`` (ISO time or None) and ``scanning``.
+    """
+    _ensure_loaded()
+    deadline = time.monotonic() + wait
+    with _lock:
+        last = _current()
+        if last is None or time.time() - last["scanned_at"] > MAX_AGE:
+            _start()
+        while last is None and _progress["running"]:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            _finished.wait(remaining)
+            last = _current()
+        scanning = _progress["running"]
+    if last is None:
+        log_path, raw_path, completed_path = _key()
+        return {
+            "orphan_logs": {"root": log_path, "total_size_bytes": 0, "files": []},
+            "orphan_folders": {"roots": [raw_path, completed_path], "total_size_bytes": 0, "folders": []},
+            "scanned_at": None,
+            "scanning": scanning,
+        }
+    return {
+        "orphan_logs": last["orphan_logs"],
+        "orphan_folders": last["orphan_folders"],
+        "scanned_at": _timestamp(last),
+        "scanning": scanning,
+    }
+
+
+def discard(paths: list[str]) -> None:
+    """Drop *paths*, and folders under them, from the last result."""
+    global _last
+    gone = [os.path.normpath(p) for p in paths]
+
+    def kept(path: str) -> bool:
+        path = os.path.normpath(path)
+        return not any(path == p or path.startswith(p + os.sep) for p in gone)
+
+    with _lock:
+        if _last is None:
+            return
+        logs = [f for f in _last["orphan_logs"]["files"] if kept(f["path"])]
+        folders = [f for f in _last["orphan_folders"]["folders"] if kept(f["path"])]
+        _last = {
+            **_last,
+            "orphan_logs": {**_last["orphan_logs"], "files": logs,
+                            "total_size_bytes": sum(f["size_bytes"] for f in logs)},
+            "orphan_folders": {**_last["orphan_folders"], "folders": folders,
+                               "total_size_bytes": sum(f["size_bytes"] for f in folders)},
+        }
+
+
+def _timestamp(last: dict[str, Any] | None) -> str | None:
+    if last is None:
+        return None
+    return datetime.fromtimestamp(last["scanned_at"], tz=timezone.utc).isoformat()
+
+
+def _state_file() -> str | None:
+    dbfile = cfg.arm_config.get("DBFILE") or ""
+    if not dbfile or dbfile == ":memory:":
+        return None
+    return os.path.join(os.path.dirname(dbfile), _FILE_NAME)
+
+
+def _ensure_loaded() -> None:
+    global _loaded, _last
+    if _loaded:
+        return
+    _loaded = True
+    path = _state_file()
+    if path is None or not os.path.exists(path):
+        return
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+        last, listings = raw["last"], dict(raw["listings"])
+        if not isinstance(last.get("key"), list) or "scanned_at" not in last:
+            raise ValueError("missing key or scanned_at")
+    except (OSError, ValueError, TypeError, KeyError, AttributeError) as exc:
+        log.warning("Ignoring unreadable maintenance scan %s: %s", path, exc)
+        return
+    with _lock:
+        if _last is None:
+            _last = last
+            _listings.update(listings)
+
+
+def _save() -> None:
+    path = _state_file()
+    if path is None:
+        return
+    with _lock:
+        raw = {"last": _last, "listings": dict(_listings)}
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(raw, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError as exc:
+        log.warning("Could not save maintenance scan %s: %s", path, exc)
@@ -13,7 +13,9 @@ log = logging.getLogger(__name__)
 def resolve_tvdb_id(job, imdb_id: str) -> int | None:
     """Resolve TVDB series ID, using cached value if available.
 
-    Checks ``job.tvdb_id`` first.  If not set, queries the TVDB API.
+    Checks ``job.tvdb_id`` first, then any earlier job with the same
+    IMDb ID (other discs of a box set).  If neither has it, queries the
+    TVDB API.
     Does NOT mutate the job or commit to the database — the caller
     is responsible for persisting ``tvdb_id`` if desired.
 
@@ -22,8 +24,30 @@ def resolve_tvdb_id(job, imdb_id: str) -> int | None:
     tvdb_id = getattr(job, "tvdb_id", None)
     if tvdb_id:
         return tvdb_id
+    tvdb_id = _sibling_tvdb_id(job, imdb_id)
+    if tvdb_id:
+        log.debug("TVDB: reusing series %d from an earlier %s job", tvdb_id, imdb_id)
+        return tvdb_id
     tvdb_id = _run_async(tvdb.resolve_tvdb_id(imdb_id))
     if not tvdb_id:
         log.info("TVDB: no series found for %s", imdb_id)
         return None
     return tvdb_id
+
+
+def _sibling_tvdb_id(job, imdb_id: str) -> int | None:
+    """Return the tvdb_id already resolved for another job with this IMDb ID."""
+    from arm.models.job import Job
+
+    try:
+        row = (
+            Job.query.with_entities(Job.tvdb_id)
+            .filter(Job.imdb_id == imdb_id, Job.tvdb_id.isnot(None))
+            .filter(Job.job_id != getattr(job, "job_id", None))
+            .order_by(Job.job_id.desc())
+            .first()
+        )
+    except Exception as exc:
+        log.debug("TVDB: sibling tvdb_id lookup failed: %s", exc)
+        return None
+    return row[0] if row else None
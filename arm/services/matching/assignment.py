@@ -0,0 +1,99 @@
+"""Optimal assignment for cost matrices (pure Python, no numpy).
+
+Used by the TVDB matcher to pair tracks with episodes.  Matrices are
+small (a disc's tracks × a season's episodes), so the O(n²·m)
+Hungarian algorithm with potentials is fast enough without native code.
+"""
+
+from __future__ import annotations
+
+_INF = float("inf")
+
+
+def solve_assignment(cost: list[list[float]]) -> list[int]:
+    """Return the column assigned to each row minimising total cost.
+
+    *cost* is a rectangular ``rows × cols`` matrix of finite values.
+    When there are more rows than columns, the surplus rows get ``-1``.
+    """
+    n = len(cost)
+    if n == 0:
+        return []
+    m = len(cost[0])
+    if m == 0:
+        return [-1] * n
+    if n > m:
+        transposed = [[cost[i][j] for i in range(n)] for j in range(m)]
+        result = [-1] * n
+        for j, i in enumerate(solve_assignment(transposed)):
+            if i >= 0:
+                result[i] = j
+        return result
+
+    # Potentials formulation, 1-indexed with a virtual column 0.
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    owner = [0] * (m + 1)  # owner[j] = row assigned to column j
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        owner[0] = i
+        j0 = 0
+        minv = [_INF] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            row = cost[i0 - 1]
+            delta = _INF
+            j1 = 0
+            for j in range(1, m + 1):
+                if used[j]:
+                    continue
+                cur = row[j - 1] - u[i0] - v[j]
+                if cur < minv[j]:
+                    minv[j] = cur
+                    way[j] = j0
+                if minv[j] < delta:
+                    delta = minv[j]
+                    j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[owner[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+
+    result = [-1] * n
+    for j in range(1, m + 1):
+        if owner[j]:
+            result[owner[j] - 1] = j - 1
+    return result
+
+
+def row_margins(
+    cost: list[list[float]], assignment: list[int], cap: float,
+) -> list[float | None]:
+    """Confidence margin for each assigned row.
+
+    The margin is how much more the row's next-best column would cost
+    than the one it was given, capped at *cap* (also used when no other
+    column costs less than *cap* more).  Unassigned rows get ``None``.
+    """
+    margins: list[float | None] = []
+    for i, j in enumerate(assignment):
+        if j < 0:
+            margins.append(None)
+            continue
+        chosen = cost[i][j]
+        runner_up = min(
+            (c for k, c in enumerate(cost[i]) if k != j), default=_INF,
+        )
+        margins.append(min(max(runner_up - chosen, 0.0), cap))
+    return margins
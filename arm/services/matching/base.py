@@ -22,6 +22,8 @@ class TrackMatch:
     episode_number: int
     episode_name: str
     episode_runtime: int = 0
+    # Seconds by which the runner-up episode scored worse (None = unknown)
+    margin: float | None = None
 
 
 @dataclass
@@ -0,0 +1,213 @@
+"""Joint episode matching across every disc of a TV box set.
+
+Matching discs one at a time lets insertion order decide the result:
+a wrong pick on disc 1 is excluded from disc 2 onwards and the error
+cascades.  ``match_box_set_tracks`` instead pairs every main track of
+every disc with every candidate episode (across all seasons given) in
+a single optimal assignment:
+
+1. Solve on runtime delta alone.
+2. Estimate where the set starts in the episode list from the median
+   (episode index − track index) of the pairs found.
+3. Re-solve with a disc-order prior around that offset, so equal
+   runtimes fall back to box-set order (disc 1 track 0 first).
+
+A job stores one season and bare episode numbers, so each disc is held
+to a single season: a disc whose pairs span seasons is pinned to its
+majority season and the set is solved again.  Tracks of the other
+season on that disc are left unmatched.  A disc given with a
+``season`` (set by the user) is pinned from the start.
+
+Pure function — no DB or API access.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from statistics import median
+from typing import Any
+
+from arm.services.matching.assignment import row_margins, solve_assignment
+
+log = logging.getLogger(__name__)
+
+_MIN_TRACK_LENGTH = 120  # seconds; shorter tracks are menus/intros
+_POSITION_WEIGHT = 30
+
+
+def _disc_sort_key(disc: dict) -> tuple:
+    number = disc.get("disc_number")
+    return (number is None, number or 0, disc.get("job_id") or 0)
+
+
+def match_box_set_tracks(
+    discs: list[dict],
+    seasons_episodes: dict[int, list[dict[str, Any]]],
+    tolerance: int = 300,
+    exclude: set[tuple[int, int]] | None = None,
+) -> dict[str, Any]:
+    """Assign tracks from several discs to episodes in one pass.
+
+    Args:
+        discs: [{"job_id": 1, "disc_number": 1, "season": None,
+                 "tracks": [{"track_number": "0", "length": 2700}, ...]}, ...]
+            ``season`` is optional; when set, only that season's
+            episodes are matched to the disc.
+        seasons_episodes: {season: [{"number", "name", "runtime"}, ...]}
+        tolerance: max runtime delta in seconds for a valid pair
+        exclude: (season, episode) pairs already claimed outside the set
+
+    Returns:
+        {"discs": [{"job_id", "disc_number", "season", "matches",
+                    "match_count", "track_count", "confidence"}, ...],
+         "match_count": int, "track_count": int}
+
+        Each match has track_number, season, episode_number,
+        episode_name, episode_runtime and margin.  A disc's confidence
+        is the sum of its margins over (tolerance × main tracks), so
+        unmatched tracks and ambiguous runtimes both pull it toward 0.
+    """
+    exclude = exclude or set()
+    discs = sorted(discs, key=_disc_sort_key)
+
+    rows: list[tuple[int, dict]] = []  # (disc index, track)
+    for di, disc in enumerate(discs):
+        main = sorted(
+            (t for t in disc.get("tracks", []) if (t.get("length") or 0) >= _MIN_TRACK_LENGTH),
+            key=lambda t: int(t.get("track_number") or 0),
+        )
+        rows.extend((di, t) for t in main)
+
+    cols: list[tuple[int, dict]] = [
+        (season, ep)
+        for season in sorted(seasons_episodes)
+        for ep in sorted(seasons_episodes[season], key=lambda e: e["number"])
+        if (season, ep["number"]) not in exclude
+    ]
+
+    pins = {di: disc["season"] for di, disc in enumerate(discs) if disc.get("season") is not None}
+    pairs: list[tuple[int, int, float]] = []
+    if rows and cols:
+        # Each round pins at least one more disc, so this ends.
+        while True:
+            pairs = _solve(rows, cols, tolerance, pins)
+            mixed = _mixed_discs(rows, cols, pairs)
+            if not mixed:
+                break
+            pins.update(mixed)
+
+    per_disc: list[dict[str, Any]] = []
+    for di, disc in enumerate(discs):
+        track_count = sum(1 for d, _ in rows if d == di)
+        matches = [
+            {
+                "track_number": str(rows[r][1]["track_number"]),
+                "season": cols[c][0],
+                "episode_number": cols[c][1]["number"],
+                "episode_name": cols[c][1]["name"],
+                "episode_runtime": cols[c][1].get("runtime", 0),
+                "margin": round(margin, 1),
+            }
+            for r, c, margin in pairs
+            if rows[r][0] == di
+        ]
+        seasons = Counter(m["season"] for m in matches)
+        confidence = (
+            sum(m["margin"] for m in matches) / (tolerance * track_count)
+            if track_count and tolerance else 0.0
+        )
+        per_disc.append({
+            "job_id": disc.get("job_id"),
+            "disc_number": disc.get("disc_number"),
+            "season": pins.get(di, seasons.most_common(1)[0][0] if seasons else None),
+            "matches": matches,
+            "match_count": len(matches),
+            "track_count": track_count,
+            "confidence": round(confidence, 2),
+        })
+
+    log.info(
+        "Box set: %d/%d tracks matched across %d discs",
+        len(pairs), len(rows), len(discs),
+    )
+    return {
+        "discs": per_disc,
+        "match_count": len(pairs),
+        "track_count": len(rows),
+    }
+
+
+def _solve(
+    rows: list[tuple[int, dict]],
+    cols: list[tuple[int, dict]],
+    tolerance: int,
+    pins: dict[int, int],
+) -> list[tuple[int, int, float]]:
+    """(row, column, margin) for every in-tolerance pair of the assignment."""
+    cost = _cost_matrix(rows, cols, tolerance, offset=None, pins=pins)
+    assignment = solve_assignment(cost)
+    valid = [(r, c) for r, c in enumerate(assignment) if c >= 0 and cost[r][c] <= tolerance]
+    if valid:
+        offset = median(c - r for r, c in valid)
+        cost = _cost_matrix(rows, cols, tolerance, offset=offset, pins=pins)
+        assignment = solve_assignment(cost)
+    margins = row_margins(cost, assignment, cap=float(tolerance))
+    return [
+        (r, c, margins[r])
+        for r, c in enumerate(assignment)
+        if c >= 0 and _delta(rows[r][1], cols[c][1]) <= tolerance
+        and pins.get(rows[r][0], cols[c][0]) == cols[c][0]
+    ]
+
+
+def _mixed_discs(
+    rows: list[tuple[int, dict]],
+    cols: list[tuple[int, dict]],
+    pairs: list[tuple[int, int, float]],
+) -> dict[int, int]:
+    """Majority season of each disc whose pairs span more than one season."""
+    seasons: dict[int, Counter] = {}
+    for r, c, _ in pairs:
+        seasons.setdefault(rows[r][0], Counter())[cols[c][0]] += 1
+    return {
+        di: min(counts, key=lambda s: (-counts[s], s))
+        for di, counts in seasons.items()
+        if len(counts) > 1
+    }
+
+
+def _delta(track: dict, episode: dict) -> int:
+    return abs((track.get("length") or 0) - (episode.get("runtime") or 0))
+
+
+def _cost_matrix(
+    rows: list[tuple[int, dict]],
+    cols: list[tuple[int, dict]],
+    tolerance: int,
+    offset: float | None,
+    pins: dict[int, int] | None = None,
+) -> list[list[float]]:
+    """Runtime delta per pair, plus a box-set-order prior when *offset* is set.
+
+    Out-of-tolerance pairs, and pairs outside the season a disc is
+    pinned to (*pins*: disc index → season), cost more than any full set
+    of valid pairs.
+    """
+    pins = pins or {}
+    max_prior = _POSITION_WEIGHT * len(cols) if offset is not None else 0
+    forbidden = float((len(rows) + 1) * (tolerance + max_prior + 1))
+    cost = []
+    for r, (di, track) in enumerate(rows):
+        pin = pins.get(di)
+        row = []
+        for c, (season, ep) in enumerate(cols):
+            delta = _delta(track, ep)
+            if delta > tolerance or (pin is not None and season != pin):
+                row.append(forbidden)
+                continue
+            if offset is not None:
+                delta += _POSITION_WEIGHT * abs(c - (r + offset))
+            row.append(float(delta))
+        cost.append(row)
+    return cost
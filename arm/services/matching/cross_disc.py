@@ -1,9 +1,8 @@
 """Cross-disc state: find episodes already matched on sibling discs.
 
-Queries the database for other jobs that share the same TVDB series ID
-and season, with tracks that have assigned episode numbers.  These
-episodes are excluded from matching on the current disc to prevent
-duplicates.
+Reads the episode-claim ledger (arm.services.episode_claims) for other
+jobs that share the same TVDB series ID and season.  These episodes are
+excluded from matching on the current disc to prevent duplicates.
 """
 
 from __future__ import annotations
@@ -20,10 +19,11 @@ log = logging.getLogger(__name__)
 def get_excluded_episodes(job, season: int | None = None) -> set[int]:
     """Return episode numbers already matched on sibling discs.
 
-    Looks for other jobs with the same ``tvdb_id`` whose tracks have
-    non-null ``episode_number`` values.  When *season* is provided,
-    restricts to siblings in the same season (prevents excluding
-    episodes from a different season that share the same numbering).
+    Looks up claims held by other jobs with the same ``tvdb_id`` (one
+    indexed query each on ``episode_claim`` and ``episode_claim_archive``).
+    When *season* is provided, restricts to siblings in the same season
+    (prevents excluding episodes from a different season that share the
+    same numbering).
 
     Returns an empty set when there are no siblings or no matches.
     """
@@ -31,39 +31,31 @@ def get_excluded_episodes(job, season: int | None = None) -> set[int]:
     if not tvdb_id:
         return set()
 
-    from arm.models.job import Job
-    from arm.models.track import Track
+    from arm.models.episode_claim import ArchivedEpisodeClaim, EpisodeClaim
 
+    rows = []
     try:
-        query = (
-            db.session.query(Track.episode_number)
-            .join(Job, Track.job_id == Job.job_id)
-            .filter(
-                Job.tvdb_id == tvdb_id,
-                Job.job_id != job.job_id,
-                Track.episode_number.isnot(None),
+        # Claims of archived jobs live in their own table; both count.
+        for claim in (EpisodeClaim, ArchivedEpisodeClaim):
+            query = db.session.query(claim.episode_number).filter(
+                claim.tvdb_id == tvdb_id,
+                claim.job_id != job.job_id,
             )
-        )
-        # Only exclude from jobs on DIFFERENT disc numbers.
-        # Re-runs of the same disc (same disc_number) should not
-        # exclude their own episodes from matching.
-        disc_number = getattr(job, "disc_number", None)
-        if disc_number is not None:
-            query = query.filter(
-                or_(
-                    Job.disc_number != disc_number,
-                    Job.disc_number.is_(None),
-                )
-            )
-        # Filter by season when known — episode numbers restart each season
-        if season is not None:
-            query = query.filter(
-                or_(
-                    Job.season == str(season),
-                    Job.season_auto == str(season),
+            # Only exclude from jobs on DIFFERENT disc numbers.
+            # Re-runs of the same disc (same disc_number) should not
+            # exclude their own episodes from matching.
+            disc_number = getattr(job, "disc_number", None)
+            if disc_number is not None:
+                query = query.filter(
+                    or_(
+                        claim.disc_number != disc_number,
+                        claim.disc_number.is_(None),
+                    )
                 )
-            )
-        rows = query.all()
+            # Filter by season when known — episode numbers restart each season
+            if season is not None:
+                query = query.filter(claim.season == int(season))
+            rows.extend(query.distinct().all())
     except Exception as e:
         log.warning("Cross-disc lookup failed: %s", e)
         return set()
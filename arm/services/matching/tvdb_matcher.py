@@ -5,6 +5,7 @@ against TVDB episode runtimes.  Supports:
 
 - Single-season matching (when season is known from label/metadata)
 - Multi-season auto-detection (scans seasons, picks best fit)
+- Optimal (Hungarian) track/episode assignment with per-match margins
 - Disc-number position bias (later discs prefer later episodes)
 - Cross-disc exclusion (skips episodes already matched on sibling discs)
 """
@@ -16,11 +17,16 @@ from typing import Any
 
 import arm.config.config as cfg
 from arm.services.matching._async_compat import run_async as _run_async
+from arm.services.matching.assignment import row_margins, solve_assignment
 from arm.services.matching.base import MatchResult, MatchStrategy, TrackMatch
 from arm.services.matching.cross_disc import get_excluded_episodes
 
 log = logging.getLogger(__name__)
 
+# Cost (in seconds of runtime delta) per episode a pair drifts from the
+# disc's expected position when disc number is known.
+_POSITION_WEIGHT = 30
+
 
 class TvdbMatcher(MatchStrategy):
     """Match tracks to TVDB episodes by runtime similarity."""
@@ -94,10 +100,10 @@ class TvdbMatcher(MatchStrategy):
         self, job_id, tvdb_id, tracks, season, tolerance,
         disc_number, disc_total, exclude,
     ) -> MatchResult:
-        from arm.services import tvdb
+        from arm.services import tvdb_cache
         from arm.services.tvdb_sync import persist_expected_titles_from_episodes
 
-        episodes = _run_async(tvdb.get_season_episodes(tvdb_id, season))
+        episodes = _run_async(tvdb_cache.get_season_episodes(tvdb_id, season))
         if not episodes:
             log.info("TVDB: no episodes for series %d season %d", tvdb_id, season)
             return MatchResult(matcher=self.name, season=season, tvdb_id=tvdb_id)
@@ -129,11 +135,11 @@ class TvdbMatcher(MatchStrategy):
         # from a tentative season would create stale ExpectedTitle rows if
         # the best-fit season later changes. Layer C will need to revisit
         # this if we want runtime-aware filtering for best-season jobs.
-        from arm.services import tvdb
+        from arm.services import tvdb_cache
 
         log.info("TVDB: no season from metadata, scanning seasons 1-%d", max_season)
         seasons_episodes = _run_async(
-            tvdb.get_all_season_episodes(tvdb_id, max_season)
+            tvdb_cache.get_all_season_episodes(tvdb_id, max_season)
         )
         if not seasons_episodes:
             log.info("TVDB: no episodes found for series %d", tvdb_id)
@@ -185,9 +191,10 @@ def match_tracks_to_episodes(
 
     Strategy:
     1. When disc info is available, compute an episode window for this disc
-       and assign tracks positionally (track 0 → first episode in window).
-    2. Runtime is used as validation, not as the primary signal.
-    3. Falls back to greedy runtime matching when no disc info is given.
+       and prefer positional pairs (track 0 → first episode in window).
+    2. Pairs are chosen by optimal assignment over runtime delta, never
+       outside the runtime tolerance.
+    3. Without disc info, runtime delta alone drives the assignment.
 
     Args:
         tracks: [{"track_number": "0", "length": 3407}, ...]
@@ -198,7 +205,8 @@ def match_tracks_to_episodes(
         exclude_episodes: episode numbers to skip (already matched elsewhere)
 
     Returns:
-        [{"track_number": "0", "episode_number": 1, "episode_name": "Pilot"}, ...]
+        [{"track_number": "0", "episode_number": 1, "episode_name": "Pilot",
+          "episode_runtime": 3300, "margin": 120.0}, ...]
     """
     if not tracks or not episodes:
         return []
@@ -225,7 +233,7 @@ def match_tracks_to_episodes(
     if use_disc_window:
         return _match_windowed(main_tracks, episodes, tolerance, disc_number, disc_total)
     else:
-        return _match_greedy(main_tracks, episodes, tolerance)
+        return _match_optimal(main_tracks, episodes, tolerance)
 
 
 def _match_windowed(
@@ -235,13 +243,17 @@ def _match_windowed(
     disc_number: int,
     disc_total: int | None,
 ) -> list[dict]:
-    """Windowed positional matching: disc position determines episode range.
+    """Windowed matching: disc position determines episode range.
 
     1. Compute a generous window (1.5x expected disc share) centered on
        this disc's expected position in the season.
-    2. Pair tracks to windowed episodes positionally (T0→first, T1→second).
-    3. Validate each pair with runtime tolerance; flag but keep mismatches.
-    4. If the window produces fewer matches than greedy would, fall back.
+    2. Solve an optimal assignment over the window where each pair costs
+       its runtime delta plus a disc-order prior (``_POSITION_WEIGHT``
+       per episode of drift from the track's expected position), so
+       equal runtimes fall back to positional order (T0→first, T1→second).
+    3. Pairs outside the runtime tolerance are never matched.
+    4. If the window produces fewer matches than the unwindowed
+       assignment would, fall back to it.
     """
     n_tracks = len(main_tracks)
     n_episodes = len(episodes)
@@ -273,114 +285,118 @@ def _match_windowed(
         len(windowed), n_tracks,
     )
 
-    # Positional assignment: pair tracks with windowed episodes by position
-    # When more episodes than tracks, pick the best-fitting slice
-    if len(windowed) > n_tracks:
-        # Find the contiguous slice of n_tracks episodes with minimum
-        # total runtime delta against the tracks.
-        # Bias the offset toward where the disc center falls within the window
-        # so that disc 4/4 prefers the END of its window, disc 1/4 the START.
-        expected_offset = center - win_start - n_tracks / 2
-        expected_offset = max(0, min(len(windowed) - n_tracks, expected_offset))
-
-        best_offset = 0
-        best_cost = float("inf")
-        for offset in range(len(windowed) - n_tracks + 1):
-            cost = sum(
-                abs((main_tracks[i].get("length") or 0) - (windowed[offset + i].get("runtime") or 0))
-                for i in range(n_tracks)
-            )
-            cost += abs(offset - expected_offset) * 30  # bias toward expected position
-            if cost < best_cost:
-                best_cost = cost
-                best_offset = offset
-        selected = windowed[best_offset:best_offset + n_tracks]
-    elif len(windowed) < n_tracks:
-        # Fewer episodes than tracks — match what we can positionally,
-        # remaining tracks get no match
-        selected = windowed
-    else:
-        selected = windowed
-
-    # Build positional matches
-    matches = []
-    for i, ep in enumerate(selected):
-        if i >= len(main_tracks):
-            break
-        track = main_tracks[i]
-        delta = abs((track.get("length") or 0) - (ep.get("runtime") or 0))
-        if delta <= tolerance:
-            matches.append({
-                "track_number": track["track_number"],
-                "episode_number": ep["number"],
-                "episode_name": ep["name"],
-                "episode_runtime": ep.get("runtime", 0),
-            })
-
-    # Fallback: if windowed matching got fewer results than greedy would,
-    # use greedy instead (handles edge cases where disc info is wrong)
-    greedy = _match_greedy(main_tracks, episodes, tolerance)
-    if len(greedy) > len(matches):
+    # Where track 0 is expected to land inside the window.  Disc 4/4
+    # prefers the END of its window, disc 1/4 the START.
+    expected_offset = center - win_start - n_tracks / 2
+    expected_offset = max(0, min(max(len(windowed) - n_tracks, 0), expected_offset))
+
+    matches = _match_optimal(
+        main_tracks, windowed, tolerance, expected_offset=expected_offset,
+    )
+
+    # Fallback: if windowed matching got fewer results than the unwindowed
+    # assignment, use that instead (handles edge cases where disc info is wrong)
+    unwindowed = _match_optimal(main_tracks, episodes, tolerance)
+    if len(unwindowed) > len(matches):
         log.info(
-            "Windowed matching (%d) worse than greedy (%d), using greedy",
-            len(matches), len(greedy),
+            "Windowed matching (%d) worse than unwindowed (%d), using unwindowed",
+            len(matches), len(unwindowed),
         )
-        return greedy
+        return unwindowed
 
     return matches
 
 
-def _match_greedy(
+def _match_optimal(
     main_tracks: list[dict],
     episodes: list[dict],
     tolerance: int,
+    expected_offset: float | None = None,
 ) -> list[dict]:
-    """Greedy runtime matching: no disc info, pure runtime similarity.
-
-    Builds all (track, episode) pairs within tolerance, assigns by
-    smallest delta first, then re-orders so track sequence matches
-    episode sequence.
+    """Optimal runtime matching over a track × episode cost matrix.
+
+    Maximises the number of pairs within tolerance, then minimises the
+    total cost (runtime delta, plus the disc-order prior when
+    *expected_offset* is given).  The result is re-ordered so track
+    sequence follows episode sequence, unless that would push a pair
+    out of tolerance.  Each match carries a ``margin``: how many seconds
+    worse the track's runner-up episode scores (capped at tolerance).
     """
-    pairs = []
-    for ti, track in enumerate(main_tracks):
-        t_len = track.get("length") or 0
-        for ei, ep in enumerate(episodes):
-            delta = abs(t_len - ep.get("runtime", 0))
-            if delta <= tolerance:
-                pairs.append((delta, ti, ei))
+    cost = _build_cost_matrix(main_tracks, episodes, tolerance, expected_offset)
+    assignment = solve_assignment(cost)
 
-    pairs.sort()
-    used_tracks: set[int] = set()
-    used_episodes: set[int] = set()
-    matches = []
+    pairs = [
+        (ti, ei)
+        for ti, ei in enumerate(assignment)
+        if ei >= 0 and _within_tolerance(main_tracks[ti], episodes[ei], tolerance)
+    ]
 
-    for _delta, ti, ei in pairs:
-        if ti in used_tracks or ei in used_episodes:
-            continue
-        used_tracks.add(ti)
-        used_episodes.add(ei)
-        matches.append({
+    # Re-order: track sequence → episode sequence
+    if len(pairs) > 1:
+        by_track = sorted(pairs, key=lambda p: int(main_tracks[p[0]]["track_number"]))
+        by_episode = sorted(pairs, key=lambda p: episodes[p[1]]["number"])
+        reordered = [(t[0], e[1]) for t, e in zip(by_track, by_episode)]
+        if all(
+            _within_tolerance(main_tracks[ti], episodes[ei], tolerance)
+            for ti, ei in reordered
+        ):
+            pairs = reordered
+        else:
+            pairs = by_track
+
+    # Margins describe the pairs actually returned, so score them after
+    # any re-order rather than carrying the solver's over.
+    final = [-1] * len(main_tracks)
+    for ti, ei in pairs:
+        final[ti] = ei
+    margins = row_margins(cost, final, cap=float(tolerance))
+
+    return [
+        {
             "track_number": main_tracks[ti]["track_number"],
             "episode_number": episodes[ei]["number"],
             "episode_name": episodes[ei]["name"],
             "episode_runtime": episodes[ei].get("runtime", 0),
-        })
+            "margin": round(margins[ti], 1),
+        }
+        for ti, ei in pairs
+    ]
 
-    # Re-order: track sequence → episode sequence
-    if len(matches) > 1:
-        sorted_tracks = sorted(matches, key=lambda m: int(m["track_number"]))
-        sorted_eps = sorted(matches, key=lambda m: m["episode_number"])
-        matches = [
-            {
-                "track_number": t["track_number"],
-                "episode_number": e["episode_number"],
-                "episode_name": e["episode_name"],
-                "episode_runtime": e["episode_runtime"],
-            }
-            for t, e in zip(sorted_tracks, sorted_eps)
-        ]
 
-    return matches
+def _runtime_delta(track: dict, episode: dict) -> int:
+    return abs((track.get("length") or 0) - (episode.get("runtime") or 0))
+
+
+def _within_tolerance(track: dict, episode: dict, tolerance: int) -> bool:
+    return _runtime_delta(track, episode) <= tolerance
+
+
+def _build_cost_matrix(
+    main_tracks: list[dict],
+    episodes: list[dict],
+    tolerance: int,
+    expected_offset: float | None = None,
+) -> list[list[float]]:
+    """Cost of pairing each track (row) with each episode (column).
+
+    Pairs outside tolerance get a cost larger than any complete set of
+    valid pairs, so the solver only uses them when nothing else is left.
+    """
+    max_prior = _POSITION_WEIGHT * len(episodes) if expected_offset is not None else 0
+    forbidden = float((len(main_tracks) + 1) * (tolerance + max_prior + 1))
+    cost = []
+    for ti, track in enumerate(main_tracks):
+        row = []
+        for ei, ep in enumerate(episodes):
+            delta = _runtime_delta(track, ep)
+            if delta > tolerance:
+                row.append(forbidden)
+                continue
+            if expected_offset is not None:
+                delta += _POSITION_WEIGHT * abs(ei - (expected_offset + ti))
+            row.append(float(delta))
+        cost.append(row)
+    return cost
 
 
 def match_tracks_best_season(
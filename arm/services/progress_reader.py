@@ -11,6 +11,7 @@ this data over HTTP instead of needing the LOGPATH bind mount.
 """
 from __future__ import annotations
 
+import os
 import re
 from pathlib import Path
 from typing import Any
@@ -29,6 +30,15 @@ def _safe_log_path(*parts: str) -> Path | None:
     return candidate
 
 
+def _read_text(path: Path) -> str | None:
+    """Read a progress/log file as text, or None if it can't be opened."""
+    try:
+        with open(path, "rb") as f:
+            return f.read().decode("utf-8", errors="replace")
+    except OSError:
+        return None
+
+
 def _parse_progress_lines(lines: list[str]):
     """Scan MakeMKV progress lines and return (last_prgv, last_prgc, last_prgt)."""
     last_prgv = None
@@ -60,13 +70,14 @@ def get_rip_progress(job_id: int) -> dict[str, Any]:
     path = _safe_log_path("progress", f"{job_id}.log")
     if path is None or not path.is_file():
         return result
-
-    try:
-        with open(path, "rb") as f:
-            data = f.read().decode("utf-8", errors="replace")
-    except OSError:
+    data = _read_text(path)
+    if data is None:
         return result
+    return _rip_progress_from(data)
 
+
+def _rip_progress_from(data: str) -> dict[str, Any]:
+    result: dict[str, Any] = {"progress": None, "stage": None, "tracks_ripped": None}
     last_prgv, last_prgc, last_prgt = _parse_progress_lines(data.splitlines())
 
     # PRGC tracks per-title state; PRGT tracks overall operation. Between
@@ -119,13 +130,19 @@ def get_music_progress(logfile: str | None, total_tracks: int) -> dict[str, Any]
     path = _safe_log_path(logfile)
     if path is None or not path.is_file():
         return result
-
-    try:
-        with open(path, "r", errors="replace") as f:
-            content = f.read()
-    except OSError:
+    content = _read_text(path)
+    if content is None:
         return result
+    return _music_progress_from(content, total_tracks)
 
+
+def _music_progress_from(content: str, total_tracks: int) -> dict[str, Any]:
+    result: dict[str, Any] = {
+        "progress": None,
+        "stage": None,
+        "tracks_ripped": None,
+        "tracks_total": None,
+    }
     grabbing = {int(m.group(1)) for m in re.finditer(r"Grabbing track (\d+):", content)}
     encoding = {int(m.group(1)) for m in re.finditer(r"Encoding track (\d+) of", content)}
     tagging = {int(m.group(1)) for m in re.finditer(r"Tagging track (\d+) of", content)}
@@ -179,19 +196,22 @@ def get_copy_progress(
     Fail-soft: garbage lines are skipped without raising. Symmetric to
     get_rip_progress and get_music_progress in this module.
     """
-    result: dict[str, Any] = {
-        "progress": None, "stage": None,
-        "files_transferred": None, "current_file": None,
-    }
     path = _safe_log_path("progress", f"{job_id}.copy.log")
     if path is None or not path.is_file():
-        return result
-    try:
-        with open(path, "r", errors="replace") as f:
-            content = f.read()
-    except OSError:
-        return result
+        return dict(_NO_COPY)
+    content = _read_text(path)
+    if content is None:
+        return dict(_NO_COPY)
+    return _copy_progress_from(content, stage)
+
 
+_NO_COPY: dict[str, Any] = {
+    "progress": None, "stage": None,
+    "files_transferred": None, "current_file": None,
+}
+
+
+def _copy_progress_from(content: str, stage: str | None = None) -> dict[str, Any]:
     latest: dict[str, Any] | None = None
     for line in content.splitlines():
         line = line.strip()
@@ -217,4 +237,43 @@ def get_copy_progress(
             "files_transferred": files,
             "current_file": current_file or None,
         }
-    return latest if latest is not None else result
+    return latest if latest is not None else dict(_NO_COPY)
+
+
+def get_progress_for_jobs(jobs) -> dict[int, dict[str, Any]]:
+    """Rip, music and copy progress for many jobs at once.
+
+    ``jobs`` is an iterable of ``(job_id, logfile, total_tracks)``.
+    Returns ``{job_id: {"rip": ..., "music": ..., "copy": ...}}`` with
+    the same shapes as the single-job readers.  The progress directory
+    is listed once and only files that exist are opened, instead of a
+    stat per candidate file per job.
+    """
+    jobs = list(jobs)
+    progress_dir = _safe_log_path("progress")
+    try:
+        present = {entry.name for entry in os.scandir(progress_dir)} if progress_dir else set()
+    except OSError:
+        present = set()
+
+    def side_file(name: str) -> str | None:
+        if name not in present:
+            return None
+        return _read_text(progress_dir / name)
+
+    results = {}
+    for job_id, logfile, total_tracks in jobs:
+        rip_text = side_file(f"{job_id}.log")
+        copy_text = side_file(f"{job_id}.copy.log")
+        results[job_id] = {
+            "rip": (
+                _rip_progress_from(rip_text) if rip_text is not None
+                else {"progress": None, "stage": None, "tracks_ripped": None}
+            ),
+            "music": get_music_progress(logfile, total_tracks),
+            "copy": (
+                _copy_progress_from(copy_text) if copy_text is not None
+                else dict(_NO_COPY)
+            ),
+        }
+    return results
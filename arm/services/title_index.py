@@ -0,0 +1,209 @@
+"""Local title index built from previously confirmed jobs.
+
+The job table already remembers what every past disc turned out to be.
+Before identification goes to the network (CRC64 database, OMDb/TMDb),
+``lookup`` checks that history in three tiers:
+
+1. **crc** – same DVD CRC64 as a confirmed job (confidence 1.0)
+2. **label** – same normalised disc label (``arm_matcher.parse_label``,
+   so disc/season suffixes are ignored); confidence is scaled down when
+   one label has been confirmed as different titles
+3. **fuzzy** – closest normalised label by ``title_similarity``
+
+Only jobs with a manual title or IMDb override count as confirmed, so
+auto-identifications never feed back into the index.  The index is
+rebuilt in-process when the set of confirmed jobs changes (row count or
+highest job_id) or after ``_REFRESH_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+
+from sqlalchemy import func, or_
+
+from arm.database import db
+from arm.ripper.arm_matcher import parse_label, title_similarity
+
+log = logging.getLogger(__name__)
+
+_REFRESH_SECONDS = 300
+_LABEL_CONFIDENCE = 0.9
+_FUZZY_CONFIDENCE = 0.8
+_FUZZY_MIN_SIMILARITY = 0.85
+
+_lock = threading.Lock()
+_index: _Index | None = None
+
+
+@dataclass(frozen=True)
+class TitleEntry:
+    """Identity of one confirmed job, as copied onto a new job."""
+    job_id: int
+    title: str
+    year: str | None
+    video_type: str | None
+    imdb_id: str | None
+    tvdb_id: int | None
+    media_metadata: str | None
+
+
+@dataclass
+class _Index:
+    signature: tuple
+    built_at: float
+    by_crc: dict[str, list[TitleEntry]]
+    by_label: dict[str, list[TitleEntry]]
+    by_token: dict[str, set[str]]
+
+
+def _confirmed():
+    from arm.models.job import Job
+
+    return or_(
+        func.coalesce(Job.title_manual, "") != "",
+        func.coalesce(Job.imdb_id_manual, "") != "",
+    )
+
+
+def _signature() -> tuple:
+    from arm.models.job import Job
+
+    count, max_id = (
+        db.session.query(func.count(Job.job_id), func.max(Job.job_id))
+        .filter(_confirmed())
+        .one()
+    )
+    return count, max_id
+
+
+def _normalise(label: str | None) -> str:
+    return parse_label(label).title if label else ""
+
+
+def _build(signature: tuple) -> _Index:
+    from arm.models.job import Job
+
+    rows = (
+        db.session.query(
+            Job.job_id, Job.crc_id, Job.label, Job.title, Job.year,
+            Job.video_type, Job.imdb_id, Job.tvdb_id,
+            Job.media_metadata_manual, Job.media_metadata_auto,
+        )
+        .filter(_confirmed())
+        .order_by(Job.job_id.desc())
+        .all()
+    )
+    by_crc: dict[str, list[TitleEntry]] = defaultdict(list)
+    by_label: dict[str, list[TitleEntry]] = defaultdict(list)
+    by_token: dict[str, set[str]] = defaultdict(set)
+    for row in rows:
+        if not row.title:
+            continue
+        entry = TitleEntry(
+            job_id=row.job_id,
+            title=row.title,
+            year=row.year or None,
+            video_type=row.video_type or None,
+            imdb_id=row.imdb_id or None,
+            tvdb_id=row.tvdb_id,
+            media_metadata=row.media_metadata_manual or row.media_metadata_auto,
+        )
+        if row.crc_id:
+            by_crc[row.crc_id].append(entry)
+        key = _normalise(row.label)
+        if key:
+            by_label[key].append(entry)
+            for token in key.split():
+                by_token[token].add(key)
+    log.debug("Title index built: %d confirmed jobs, %d labels", len(rows), len(by_label))
+    return _Index(signature, time.monotonic(), dict(by_crc), dict(by_label), dict(by_token))
+
+
+def _current_index() -> _Index:
+    global _index
+    with _lock:
+        signature = _signature()
+        if (
+            _index is None
+            or _index.signature != signature
+            or time.monotonic() - _index.built_at > _REFRESH_SECONDS
+        ):
+            _index = _build(signature)
+        return _index
+
+
+def invalidate() -> None:
+    """Drop the cached index; the next lookup rebuilds it."""
+    global _index
+    with _lock:
+        _index = None
+
+
+def _identity(entry: TitleEntry) -> tuple:
+    return entry.imdb_id or (entry.title.lower(), entry.year)
+
+
+def _vote(entries: list[TitleEntry]) -> tuple[TitleEntry, float]:
+    """Most common identity (newest job wins ties) and its share of the votes."""
+    counts = Counter(_identity(e) for e in entries)
+    top, votes = counts.most_common(1)[0]
+    entry = next(e for e in entries if _identity(e) == top)
+    return entry, votes / len(entries)
+
+
+def lookup(
+    crc_id: str | None = None,
+    label: str | None = None,
+    exclude_job_id: int | None = None,
+) -> dict | None:
+    """Find a confirmed identity for a disc from local job history.
+
+    Returns ``{"entry": TitleEntry, "source": "crc"|"label"|"fuzzy",
+    "confidence": float}`` for the best tier that matched, or None.
+    """
+    index = _current_index()
+
+    def usable(entries):
+        return [e for e in entries if e.job_id != exclude_job_id]
+
+    if crc_id:
+        entries = usable(index.by_crc.get(str(crc_id), []))
+        if entries:
+            entry, share = _vote(entries)
+            return {"entry": entry, "source": "crc", "confidence": round(share, 3)}
+
+    key = _normalise(label)
+    if not key:
+        return None
+
+    entries = usable(index.by_label.get(key, []))
+    if entries:
+        entry, share = _vote(entries)
+        return {"entry": entry, "source": "label",
+                "confidence": round(_LABEL_CONFIDENCE * share, 3)}
+
+    # Only score labels sharing at least one token with this one.
+    candidates = set()
+    for token in key.split():
+        candidates |= index.by_token.get(token, set())
+    best_key, best_score = None, 0.0
+    for candidate in candidates:
+        # title_similarity is asymmetric (share of the first label's
+        # tokens); averaging both ways tolerates suffixes like "WS"
+        # without letting "the matrix" match "the matrix reloaded".
+        score = (title_similarity(key, candidate) + title_similarity(candidate, key)) / 2
+        if score > best_score:
+            best_key, best_score = candidate, score
+    if best_key is None or best_score < _FUZZY_MIN_SIMILARITY:
+        return None
+    entries = usable(index.by_label[best_key])
+    if not entries:
+        return None
+    entry, share = _vote(entries)
+    return {"entry": entry, "source": "fuzzy",
+            "confidence": round(_FUZZY_CONFIDENCE * best_score * share, 3)}
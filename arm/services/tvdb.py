@@ -13,9 +13,11 @@ The old names are re-exported here for backward compatibility.
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import contextvars
 import logging
 import time
-from typing import Any
+from typing import Any, AsyncIterator
 
 import httpx
 
@@ -28,6 +30,14 @@ _TOKEN: str | None = None
 _TOKEN_EXPIRES: float = 0
 _TOKEN_TTL = 23 * 3600  # refresh after 23 hours (tokens last 30 days)
 _TOKEN_LOCK = asyncio.Lock()
+_SEASON_FETCH_CONCURRENCY = 4
+
+# Client shared by every _get() inside a shared_client() block, so a
+# multi-season scan reuses one connection pool instead of a TLS
+# handshake per page.
+_CLIENT: contextvars.ContextVar[httpx.AsyncClient | None] = contextvars.ContextVar(
+    "tvdb_client", default=None,
+)
 
 
 async def _ensure_token() -> str:
@@ -76,11 +86,28 @@ async def validate_tvdb_key(api_key: str) -> dict[str, str]:
         return {"success": False, "message": f"Test failed: {type(exc).__name__}"}
 
 
+@contextlib.asynccontextmanager
+async def shared_client() -> AsyncIterator[None]:
+    """Route every ``_get`` issued inside the block through one AsyncClient.
+
+    Nested blocks reuse the outer client.
+    """
+    if _CLIENT.get() is not None:
+        yield
+        return
+    async with httpx.AsyncClient(timeout=15.0) as client:
+        token = _CLIENT.set(client)
+        try:
+            yield
+        finally:
+            _CLIENT.reset(token)
+
+
 async def _get(path: str, params: dict | None = None) -> dict:
     """Authenticated GET request to TVDB v4 API."""
     token = await _ensure_token()
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        resp = await client.get(
+    async with shared_client():
+        resp = await _CLIENT.get().get(
             f"{_BASE}{path}",
             params=params,
             headers={"Authorization": f"Bearer {token}"},
@@ -110,6 +137,15 @@ async def resolve_tvdb_id(imdb_id: str) -> int | None:
     return None
 
 
+async def get_series_last_updated(tvdb_id: int) -> str | None:
+    """Return the series' ``lastUpdated`` stamp, used for cache revalidation.
+
+    Raises httpx.HTTPError on network/API failure.
+    """
+    data = await _get(f"/series/{tvdb_id}")
+    return (data.get("data") or {}).get("lastUpdated") or None
+
+
 async def get_season_episodes(
     tvdb_id: int, season: int
 ) -> list[dict[str, Any]]:
@@ -166,19 +202,35 @@ async def _fetch_episodes(
 
 
 async def get_all_season_episodes(
-    tvdb_id: int, max_season: int = 10,
+    tvdb_id: int, max_season: int = 10, first_season: int = 1,
 ) -> dict[int, list[dict[str, Any]]]:
-    """Fetch episodes for seasons 1..max_season.
+    """Fetch episodes for seasons first_season..max_season.
 
-    Stops early when a season returns no episodes.
-    Returns dict keyed by season number.
+    The first season is fetched alone (it also warms the token), the
+    rest in concurrent batches of ``_SEASON_FETCH_CONCURRENCY``.  Stops
+    at the first season that returns no episodes; seasons after it in
+    the same batch are discarded.  Returns dict keyed by season number.
     """
     result: dict[int, list[dict[str, Any]]] = {}
-    for s in range(1, max_season + 1):
-        eps = await get_season_episodes(tvdb_id, s)
+    if first_season > max_season:
+        return result
+    async with shared_client():
+        eps = await get_season_episodes(tvdb_id, first_season)
         if not eps:
-            break
-        result[s] = eps
+            return result
+        result[first_season] = eps
+
+        start = first_season + 1
+        while start <= max_season:
+            batch = range(start, min(start + _SEASON_FETCH_CONCURRENCY, max_season + 1))
+            fetched = await asyncio.gather(
+                *(get_season_episodes(tvdb_id, s) for s in batch)
+            )
+            for s, eps in zip(batch, fetched):
+                if not eps:
+                    return result
+                result[s] = eps
+            start = batch.stop
     return result
 
 
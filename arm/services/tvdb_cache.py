@@ -0,0 +1,210 @@
+"""Persistent TVDB episode cache.
+
+Wraps the season fetchers in arm.services.tvdb with a database-backed
+cache (``tvdb_season_cache``) keyed by (series, season):
+
+- Rows younger than ``TVDB_CACHE_TTL_HOURS`` are served without any
+  network traffic, so matching a box set is fully offline once the
+  first disc has warmed the cache.
+- Older rows are revalidated with one ``/series/{id}`` request: an
+  unchanged ``lastUpdated`` stamp refreshes them in place, a changed
+  one drops the series and refetches.
+- When TVDB is unreachable, stale rows are used rather than failing.
+
+The async entry points mirror tvdb.get_season_episodes and
+tvdb.get_all_season_episodes.  Their database reads and writes are
+plain synchronous calls: run_async() drives the coroutine on the
+caller's thread, so they share that thread's scoped session.  Any
+database failure degrades to a cache miss.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+from typing import Any
+
+import httpx
+
+import arm.config.config as cfg
+from arm.database import db
+from arm.services import tvdb
+
+log = logging.getLogger(__name__)
+
+_DEFAULT_TTL_HOURS = 24
+
+Episodes = list[dict[str, Any]]
+
+
+def _ttl() -> datetime.timedelta:
+    try:
+        hours = float(cfg.arm_config.get("TVDB_CACHE_TTL_HOURS", _DEFAULT_TTL_HOURS))
+    except (TypeError, ValueError):
+        hours = _DEFAULT_TTL_HOURS
+    return datetime.timedelta(hours=hours)
+
+
+# ------------------------------------------------------------------
+# Persistence (sync)
+# ------------------------------------------------------------------
+
+
+def load_series(tvdb_id: int) -> dict[int, Any]:
+    """Return cached rows for a series keyed by season number."""
+    from arm.models.tvdb_season_cache import TvdbSeasonCache
+
+    rows = TvdbSeasonCache.query.filter_by(tvdb_id=tvdb_id).all()
+    return {row.season: row for row in rows}
+
+
+def store_seasons(
+    tvdb_id: int, seasons: dict[int, Episodes], series_updated: str | None,
+) -> None:
+    """Upsert episode lists for the given seasons and commit."""
+    from arm.models.tvdb_season_cache import TvdbSeasonCache
+
+    now = datetime.datetime.utcnow()
+    existing = load_series(tvdb_id)
+    for season, episodes in seasons.items():
+        row = existing.get(season)
+        if row is None:
+            row = TvdbSeasonCache(tvdb_id=tvdb_id, season=season)
+            db.session.add(row)
+        row.episodes = episodes
+        row.series_updated = series_updated
+        row.fetched_at = now
+    db.session.commit()
+
+
+def touch_series(tvdb_id: int) -> None:
+    """Mark every cached season of a series as freshly validated."""
+    from arm.models.tvdb_season_cache import TvdbSeasonCache
+
+    TvdbSeasonCache.query.filter_by(tvdb_id=tvdb_id).update(
+        {"fetched_at": datetime.datetime.utcnow()}, synchronize_session=False,
+    )
+    db.session.commit()
+
+
+def invalidate_series(tvdb_id: int) -> None:
+    """Drop every cached season of a series."""
+    from arm.models.tvdb_season_cache import TvdbSeasonCache
+
+    TvdbSeasonCache.query.filter_by(tvdb_id=tvdb_id).delete(
+        synchronize_session=False,
+    )
+    db.session.commit()
+
+
+def _safely(fn, *args) -> Any:
+    """Run a persistence helper, logging and swallowing database errors."""
+    try:
+        return fn(*args)
+    except Exception as exc:
+        log.debug("TVDB cache %s failed: %s", getattr(fn, "__name__", fn), exc)
+        try:
+            db.session.rollback()
+        except Exception:
+            pass
+        return None
+
+
+# ------------------------------------------------------------------
+# Cache-aware fetchers (async)
+# ------------------------------------------------------------------
+
+
+async def _series_last_updated(tvdb_id: int) -> str | None:
+    try:
+        return await tvdb.get_series_last_updated(tvdb_id)
+    except (httpx.HTTPError, KeyError, ValueError, TypeError) as exc:
+        log.debug("TVDB: lastUpdated lookup failed for %d: %s", tvdb_id, exc)
+        return None
+
+
+async def _valid_seasons(tvdb_id: int) -> tuple[dict[int, Episodes], str | None]:
+    """Return ({season: episodes}, series_updated) usable for this series.
+
+    Empty when nothing is cached or the series changed upstream.
+    """
+    rows = _safely(load_series, tvdb_id)
+    if not rows:
+        return {}, None
+
+    cached = {season: list(row.episodes or []) for season, row in rows.items()}
+    stored = next((r.series_updated for r in rows.values() if r.series_updated), None)
+    oldest = min(row.fetched_at for row in rows.values())
+    if datetime.datetime.utcnow() - oldest < _ttl():
+        return cached, stored
+
+    try:
+        current = await tvdb.get_series_last_updated(tvdb_id)
+    except (httpx.HTTPError, KeyError, ValueError, TypeError) as exc:
+        log.info(
+            "TVDB: cannot revalidate series %d (%s); using cached episodes",
+            tvdb_id, exc,
+        )
+        return cached, stored
+
+    if current and current == stored:
+        _safely(touch_series, tvdb_id)
+        return cached, stored
+
+    log.info(
+        "TVDB: series %d changed upstream (%s -> %s); refetching",
+        tvdb_id, stored, current,
+    )
+    _safely(invalidate_series, tvdb_id)
+    return {}, current
+
+
+async def get_season_episodes(tvdb_id: int, season: int) -> Episodes:
+    """Cache-aware tvdb.get_season_episodes."""
+    cached, series_updated = await _valid_seasons(tvdb_id)
+    if season in cached:
+        log.debug("TVDB cache hit: series %d season %d", tvdb_id, season)
+        return cached[season]
+
+    async with tvdb.shared_client():
+        episodes = await tvdb.get_season_episodes(tvdb_id, season)
+        if series_updated is None:
+            series_updated = await _series_last_updated(tvdb_id)
+    _safely(store_seasons, tvdb_id, {season: episodes}, series_updated)
+    return episodes
+
+
+async def get_all_season_episodes(
+    tvdb_id: int, max_season: int = 10,
+) -> dict[int, Episodes]:
+    """Cache-aware tvdb.get_all_season_episodes.
+
+    Leading seasons already in the cache are reused; the scan resumes
+    from the first uncached season.  The season that ends the scan is
+    stored as an empty list so the next warm scan stops there too.
+    """
+    cached, series_updated = await _valid_seasons(tvdb_id)
+    result: dict[int, Episodes] = {}
+    season = 1
+    while season <= max_season and season in cached:
+        if not cached[season]:
+            return result
+        result[season] = cached[season]
+        season += 1
+    if season > max_season:
+        return result
+
+    async with tvdb.shared_client():
+        fetched = await tvdb.get_all_season_episodes(
+            tvdb_id, max_season, first_season=season,
+        )
+        if series_updated is None:
+            series_updated = await _series_last_updated(tvdb_id)
+
+    result.update(fetched)
+    to_store = dict(fetched)
+    end = season + len(fetched)
+    if end <= max_season:
+        to_store[end] = []
+    _safely(store_seasons, tvdb_id, to_store, series_updated)
+    return result
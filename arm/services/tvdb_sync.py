@@ -12,13 +12,16 @@ from __future__ import annotations
 
 import logging
 
+from sqlalchemy import or_
+
 from arm.database import db
 
 log = logging.getLogger(__name__)
 
 
 def _apply_matches(job, result) -> int:
-    """Write match results to Track rows.  Returns count of matched tracks."""
+    """Write match results to Track rows and rewrite the job's episode
+    claims.  Does not commit.  Returns count of matched tracks."""
     track_map = {str(t.track_number): t for t in job.tracks}
     matched_count = 0
     for m in result.matches:
@@ -32,6 +35,10 @@ def _apply_matches(job, result) -> int:
                 "Match: track %s → S%02dE%02d %s",
                 m.track_number, result.season, m.episode_number, m.episode_name,
             )
+    from arm.services.episode_claims import sync_job_claims
+    # Claims also copy tvdb_id and the season, which the callers may
+    # have just set even when no track matched.
+    sync_job_claims(job)
     return matched_count
 
 
@@ -71,6 +78,7 @@ def match_episodes_sync(job) -> bool:
         return False
 
     except Exception as e:
+        db.session.rollback()
         log.warning("Episode matching failed (non-fatal): %s", e)
         return False
 
@@ -141,6 +149,7 @@ def match_episodes_for_api(job, season=None, tolerance=None, apply=False):
                 "episode_number": m.episode_number,
                 "episode_name": m.episode_name,
                 "episode_runtime": m.episode_runtime,
+                "margin": m.margin,
             }
             for m in result.matches
         ],
@@ -154,15 +163,154 @@ def match_episodes_for_api(job, season=None, tolerance=None, apply=False):
 
     # Always persist tvdb_id so fetchTvdbEpisodes can load full season dropdown
     if result.tvdb_id and not getattr(job, "tvdb_id", None):
+        from arm.services.episode_claims import sync_job_claims
         job.tvdb_id = result.tvdb_id
+        sync_job_claims(job)
         db.session.commit()
 
     if apply and result.success:
-        matched_count = _apply_matches(job, result)
         if result.season is not None:
             job.season_auto = str(result.season)
-        if matched_count:
-            db.session.commit()
+        _apply_matches(job, result)
+        db.session.commit()
         out["applied"] = True
 
     return out
+
+
+def match_box_set_for_api(jobs, season=None, tolerance=None, apply=False):
+    """Match every disc of a box set jointly; optionally apply atomically.
+
+    Args:
+        jobs: Job ORM instances for one series (any order)
+        season: restrict to one season (None = scan seasons 1..TVDB_MAX_SEASON_SCAN)
+        tolerance: max runtime delta in seconds (default from config)
+        apply: if True, write every disc's matches in a single commit
+
+    Returns dict with per-disc proposals (see match_box_set_tracks) plus
+    success/tvdb_id/applied, or success=False with an error.
+    """
+    import arm.config.config as cfg
+    from arm.models.episode_claim import ArchivedEpisodeClaim, EpisodeClaim
+    from arm.services import tvdb_cache
+    from arm.services.matching._async_compat import run_async
+    from arm.services.matching._tvdb_resolve import resolve_tvdb_id
+    from arm.services.matching.boxset import match_box_set_tracks
+    from arm.services.matching.registry import _build_track_data
+
+    if tolerance is None:
+        tolerance = int(cfg.arm_config.get("TVDB_MATCH_TOLERANCE", 300))
+
+    tvdb_ids = {j.tvdb_id for j in jobs if getattr(j, "tvdb_id", None)}
+    if len(tvdb_ids) > 1:
+        return {"success": False, "error": f"Jobs belong to different TVDB series: {sorted(tvdb_ids)}"}
+    tvdb_id = next(iter(tvdb_ids), None)
+    if tvdb_id is None:
+        imdb_id = next(
+            (j.imdb_id or j.imdb_id_auto for j in jobs
+             if getattr(j, "imdb_id", None) or getattr(j, "imdb_id_auto", None)),
+            None,
+        )
+        if imdb_id:
+            tvdb_id = resolve_tvdb_id(jobs[0], imdb_id)
+    if not tvdb_id:
+        return {"success": False, "error": "No TVDB series for these jobs"}
+
+    if season is not None:
+        episodes = run_async(tvdb_cache.get_season_episodes(tvdb_id, season))
+        seasons_episodes = {season: episodes} if episodes else {}
+    else:
+        max_season = int(cfg.arm_config.get("TVDB_MAX_SEASON_SCAN", 10))
+        seasons_episodes = run_async(tvdb_cache.get_all_season_episodes(tvdb_id, max_season))
+    if not seasons_episodes:
+        return {"success": False, "error": f"No TVDB episodes for series {tvdb_id}", "tvdb_id": tvdb_id}
+
+    # Episodes already claimed by discs outside this set stay off-limits.
+    # As in cross_disc, earlier rips of a disc in the set (same
+    # disc_number, including archived ones) don't count; claims with no
+    # disc number can't be told apart and still exclude.
+    job_ids = [j.job_id for j in jobs]
+    disc_numbers = {j.disc_number for j in jobs if getattr(j, "disc_number", None) is not None}
+    exclude = set()
+    for claim in (EpisodeClaim, ArchivedEpisodeClaim):
+        claims = db.session.query(claim.season, claim.episode_number).filter(
+            claim.tvdb_id == tvdb_id, claim.job_id.notin_(job_ids))
+        if disc_numbers:
+            claims = claims.filter(or_(
+                claim.disc_number.notin_(disc_numbers),
+                claim.disc_number.is_(None),
+            ))
+        exclude.update((s, e) for s, e in claims)
+
+    # A season the user set on a job pins that disc to it.
+    discs = [
+        {"job_id": j.job_id, "disc_number": j.disc_number,
+         "season": _manual_season(j), "tracks": _build_track_data(j)}
+        for j in jobs
+    ]
+    proposal = match_box_set_tracks(discs, seasons_episodes, tolerance, exclude=exclude)
+    out = {
+        "success": proposal["match_count"] > 0,
+        "tvdb_id": tvdb_id,
+        "tolerance": tolerance,
+        **proposal,
+        "applied": False,
+    }
+
+    if apply and out["success"]:
+        try:
+            _apply_box_set(jobs, tvdb_id, proposal["discs"])
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            log.warning("Box set apply failed, nothing written: %s", e)
+            out["success"] = False
+            out["error"] = f"Apply failed: {e}"
+            return out
+        out["applied"] = True
+    return out
+
+
+def _manual_season(job) -> int | None:
+    try:
+        return int(job.season)
+    except (TypeError, ValueError):
+        return None
+
+
+def _apply_box_set(jobs, tvdb_id, disc_results) -> None:
+    """Write a box-set proposal to every job and its tracks.  Does not commit.
+
+    Tracks left unmatched have any previous episode assignment cleared so
+    the set never carries stale duplicates from earlier per-disc matches.
+    Tracks only store an episode number, so every match on a disc must be
+    in the disc's season (and the user's season, if set); raises
+    ValueError otherwise.
+    """
+    from arm.services.episode_claims import sync_job_claims
+
+    by_id = {j.job_id: j for j in jobs}
+    for disc in disc_results:
+        job = by_id[disc["job_id"]]
+        seasons = {m["season"] for m in disc["matches"]}
+        manual = _manual_season(job)
+        if len(seasons) > 1 or (manual is not None and seasons - {manual}):
+            raise ValueError(
+                f"Job {job.job_id} matches span seasons {sorted(seasons)}"
+                + (f" (season set to {manual})" if manual is not None else ""))
+        job.tvdb_id = tvdb_id
+        if disc["season"] is not None:
+            job.season_auto = str(disc["season"])
+        matches = {m["track_number"]: m for m in disc["matches"]}
+        for track in job.tracks:
+            m = matches.get(str(track.track_number))
+            if m is None:
+                track.episode_number = None
+                track.episode_name = None
+                continue
+            track.title = m["episode_name"]
+            track.episode_number = str(m["episode_number"])
+            track.episode_name = m["episode_name"]
+        if matches:
+            job.multi_title = True
+        sync_job_claims(job)
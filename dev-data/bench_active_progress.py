@@ -0,0 +1,95 @@
+"""
+Benchmark per-job /jobs/{id}/progress-state polling vs /jobs/active/progress.
+
+Seeds a throwaway SQLite database with a job history plus N active jobs
+(each with tracks, a MakeMKV progress file and a copy side-file), then
+times one dashboard poll done both ways: N progress-state calls, and one
+batched call with its sub-second cache cold and warm.
+
+Usage (exec into container):
+    docker exec arm-rippers python3 /opt/arm/dev-data/bench_active_progress.py [active_jobs]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import unittest.mock
+
+os.environ.setdefault("ARM_CONFIG_FILE", "/etc/arm/config/arm.yaml")
+sys.path.insert(0, "/opt/arm")
+
+from arm.api.v1 import jobs as jobs_api  # noqa: E402
+from arm.database import db  # noqa: E402
+
+ACTIVE = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+HISTORY = 20_000
+TRACKS = 20
+
+
+def seed(path, log_dir):
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO job (job_id, guid, status, disctype, title, logfile, no_of_titles) "
+        "VALUES (?, ?, ?, 'bluray', ?, ?, ?)",
+        (
+            (n, f"bench-{n}", "video_ripping" if n > HISTORY else "success",
+             f"Title {n}", f"job_{n}.log", TRACKS)
+            for n in range(1, HISTORY + ACTIVE + 1)
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO track (job_id, track_number, length, enabled, ripped) VALUES (?, ?, 3000, 1, ?)",
+        (
+            (job_id, str(t), t < 5)
+            for job_id in range(HISTORY + 1, HISTORY + ACTIVE + 1)
+            for t in range(TRACKS)
+        ),
+    )
+    conn.commit()
+    conn.close()
+    progress = os.path.join(log_dir, "progress")
+    os.makedirs(progress)
+    for job_id in range(HISTORY + 1, HISTORY + ACTIVE + 1):
+        with open(os.path.join(progress, f"{job_id}.log"), "w") as f:
+            f.write('PRGT:0,0,"Saving to MKV file"\n')
+            f.writelines(f"PRGV:{i},{i},65536\n" for i in range(0, 65536, 16))
+            f.write('PRGC:4,0,"Saving to MKV file"\n')
+        with open(os.path.join(progress, f"{job_id}.copy.log"), "w") as f:
+            f.writelines(f"copy,{i / 10:.1f},{i // 100},file_{i}.mkv\n" for i in range(1000))
+
+
+def timed(fn, repeat=50, setup=None):
+    fn()
+    total = 0.0
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        total += time.perf_counter() - start
+    return total / repeat * 1000
+
+
+def per_job_poll():
+    return [jobs_api.get_job_progress_state(job_id)
+            for job_id in range(HISTORY + 1, HISTORY + ACTIVE + 1)]
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        log_dir = os.path.join(tmp, "logs")
+        db.init_engine(f"sqlite:///{path}")
+        db.create_all()
+        seed(path, log_dir)
+        with unittest.mock.patch.dict("arm.config.config.arm_config", {"LOGPATH": log_dir}):
+            batched = jobs_api.get_active_jobs_progress()["jobs"]
+            assert [{k: v for k, v in e.items() if k != "job_id"} for e in batched] == per_job_poll()
+            print(f"── one dashboard poll, {ACTIVE} active jobs (ms) ──")
+            print(f"{'N x /jobs/{id}/progress-state':<34}{timed(per_job_poll):>9.2f}")
+            print(f"{'/jobs/active/progress (cold)':<34}"
+                  f"{timed(jobs_api.get_active_jobs_progress, setup=jobs_api._progress_cache.clear):>9.2f}")
+            print(f"{'/jobs/active/progress (warm)':<34}{timed(jobs_api.get_active_jobs_progress):>9.2f}")
+        db.dispose()
@@ -0,0 +1,114 @@
+"""
+Benchmark API tail latency under mixed load, threadpool vs async reads.
+
+Seeds a throwaway SQLite database with 50k jobs and no FTS index, so a
+/jobs/paginated search is a slow LIKE scan.  SLOW clients keep such
+searches in flight while one probe per cheap endpoint polls it every 20 ms:
+
+- /api/v1/drives       (sync endpoint, runs in the AnyIO threadpool)
+- /api/v1/jobs/active  (hot read, goes through db.run_read)
+- /api/v1/system/ripping-enabled (sync endpoint)
+
+Mode ``threadpool`` disables the async engine, so run_read falls back to
+worker threads as the endpoints did before.  Mode ``async`` uses the
+aiosqlite engine.  Requests go through the ASGI app in-process via
+httpx.ASGITransport, so the middleware and FastAPI routing are included.
+
+Usage (exec into container):
+    docker exec arm-rippers python3 /opt/arm/dev-data/bench_async_reads.py [slow_clients] [seconds]
+"""
+
+import asyncio
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("ARM_CONFIG_FILE", "/etc/arm/config/arm.yaml")
+sys.path.insert(0, "/opt/arm")
+
+import httpx  # noqa: E402
+
+from arm.app import app  # noqa: E402
+from arm.database import db  # noqa: E402
+
+SLOW = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+SECONDS = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+JOBS = 50_000
+PROBES = ("/api/v1/drives", "/api/v1/jobs/active", "/api/v1/system/ripping-enabled")
+
+
+def seed(path):
+    rng = random.Random(3)
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO job (job_id, guid, status, disctype, title, label) VALUES (?, ?, ?, 'dvd', ?, ?)",
+        (
+            (n, f"bench-{n}", "video_ripping" if n % 10_000 == 0 else "success",
+             f"Title {rng.randrange(10**6)}", f"LABEL_{n}")
+            for n in range(1, JOBS + 1)
+        ),
+    )
+    conn.execute("DROP TABLE IF EXISTS job_fts")
+    conn.commit()
+    conn.close()
+
+
+async def slow_client(client, stop):
+    rng = random.Random()
+    while not stop.is_set():
+        await client.get(f"/api/v1/jobs/paginated?search=zz{rng.randrange(10**6)}")
+
+
+async def probe(client, stop, path, latencies):
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get(path)
+        assert response.status_code == 200, (path, response.status_code)
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.02)
+
+
+def pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000
+
+
+async def run(mode):
+    async_factory = db._async_session_factory
+    if mode == "threadpool":
+        db._async_session_factory = None
+    latencies = {path: [] for path in PROBES}
+    stop = asyncio.Event()
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            tasks = [asyncio.create_task(slow_client(client, stop)) for _ in range(SLOW)]
+            await asyncio.sleep(1.0)  # let the slow requests pile up
+            tasks += [asyncio.create_task(probe(client, stop, path, latencies[path]))
+                      for path in PROBES]
+            await asyncio.sleep(SECONDS)
+            stop.set()
+            await asyncio.gather(*tasks)
+    finally:
+        db._async_session_factory = async_factory
+    for path, values in latencies.items():
+        print(f"{mode:<12}{path:<34}{len(values):>6}{pct(values, .5):>10.1f}"
+              f"{pct(values, .95):>10.1f}{pct(values, .99):>10.1f}{max(values) * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        db.dispose()
+        db.init_engine(f"sqlite:///{path}")
+        db.create_all()
+        seed(path)
+        assert db.async_engine is not None, "aiosqlite is not installed"
+        print(f"── probe latency (ms) with {SLOW} slow searches in flight over {JOBS} jobs ──")
+        print(f"{'mode':<12}{'endpoint':<34}{'n':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+        for mode in ("threadpool", "async"):
+            asyncio.run(run(mode))
+        db.dispose()
@@ -0,0 +1,186 @@
+"""
+Benchmark file-browser directory listing: Path.iterdir() + per-entry
+stat calls vs the os.scandir listing with server-side paging.
+
+Builds a throwaway folder of FILES files (1% of them .iso) and DIRS
+subfolders, then lists it with:
+
+- ``iterdir``   the old listing: iterdir, stat, is_dir, isdir and an
+                uncached passwd/group lookup per entry, full sort
+- ``scandir``   list_directory() of everything
+- ``page``      list_directory(limit=100), the first page
+- ``glob``      list_directory(glob="*.iso")
+- ``stream``    stream_directory() up to its first entry (first byte)
+
+Syscalls are counted by running each listing in a child process under
+ptrace (PTRACE_SYSCALL stops) and subtracting the same child doing one
+listing less, so interpreter start-up and imports cancel out. Wall time
+is the best of three untraced runs.
+
+Usage (exec into container):
+    docker exec arm-rippers python3 /opt/arm/dev-data/bench_dir_listing.py [files]
+"""
+
+import ctypes
+import os
+import signal
+import sys
+import tempfile
+import time
+import unittest.mock
+from datetime import datetime, timezone
+
+os.environ.setdefault("ARM_CONFIG_FILE", "/etc/arm/config/arm.yaml")
+sys.path.insert(0, "/opt/arm")
+
+from arm.services import file_browser  # noqa: E402
+
+FILES = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1] != "--child" else 50000
+DIRS = 200
+MODES = ("iterdir", "scandir", "page", "glob", "stream")
+
+PTRACE_TRACEME = 0
+PTRACE_SYSCALL = 24
+PTRACE_SETOPTIONS = 0x4200
+PTRACE_O_TRACESYSGOOD = 0x1
+PTRACE_O_EXITKILL = 0x100000
+
+
+def seed(root):
+    for n in range(DIRS):
+        os.mkdir(os.path.join(root, f"Title {n:04d}"))
+    for n in range(FILES):
+        ext = "iso" if n % 100 == 0 else "mkv"
+        open(os.path.join(root, f"title_{n:06d}.{ext}"), "wb").close()
+
+
+def _old_entry(item, st):
+    import grp
+    import pwd
+    is_dir = item.is_dir()
+    try:
+        owner = pwd.getpwuid(st.st_uid).pw_name
+    except KeyError:
+        owner = str(st.st_uid)
+    try:
+        group = grp.getgrgid(st.st_gid).gr_name
+    except KeyError:
+        group = str(st.st_gid)
+    size = 0 if is_dir else st.st_size
+    kind, importable = file_browser._classify_entry(str(item))
+    return {
+        'name': item.name,
+        'type': 'directory' if is_dir else 'file',
+        'size': size,
+        'modified': datetime.fromtimestamp(st.st_mtime, tz=timezone.utc).isoformat(),
+        'extension': '' if is_dir else item.suffix.lstrip('.').lower(),
+        'category': 'directory' if is_dir else file_browser.classify_file(item.name),
+        'permissions': file_browser._format_permissions(st.st_mode),
+        'owner': owner,
+        'group': group,
+        'kind': kind,
+        'importable': importable,
+    }
+
+
+def old_listing(root):
+    from pathlib import Path
+    entries = []
+    for item in Path(root).iterdir():
+        try:
+            item.name.encode('utf-8')
+            entries.append(_old_entry(item, item.stat()))
+        except (OSError, UnicodeEncodeError):
+            pass
+    entries.sort(key=lambda e: (0 if e['type'] == 'directory' else 1, e['name'].lower()))
+    return entries
+
+
+def run(mode, root):
+    if mode == "iterdir":
+        old_listing(root)
+    elif mode == "scandir":
+        file_browser.list_directory(root)
+    elif mode == "page":
+        file_browser.list_directory(root, limit=100)
+    elif mode == "glob":
+        file_browser.list_directory(root, glob="*.iso")
+    elif mode == "stream":
+        _header, entries = file_browser.stream_directory(root)
+        next(entries)
+
+
+def _patched(root):
+    # Size lookups only queue work for a walker that isn't running here.
+    return unittest.mock.patch.object(file_browser, "get_allowed_roots",
+                                      return_value={"raw": root})
+
+
+def child(mode, root, reps):
+    with _patched(root):
+        for _ in range(reps):
+            run(mode, root)
+
+
+def count_syscalls(argv):
+    """Syscalls made by ``argv`` run under ptrace, or None if not allowed."""
+    libc = ctypes.CDLL(None, use_errno=True)
+    libc.ptrace.argtypes = [ctypes.c_long, ctypes.c_long, ctypes.c_void_p, ctypes.c_void_p]
+    libc.ptrace.restype = ctypes.c_long
+    pid = os.fork()
+    if pid == 0:
+        if libc.ptrace(PTRACE_TRACEME, 0, None, None) != 0:
+            os._exit(111)
+        os.execv(sys.executable, argv)
+    _, status = os.waitpid(pid, 0)
+    if os.WIFEXITED(status):
+        return None
+    libc.ptrace(PTRACE_SETOPTIONS, pid, None, PTRACE_O_TRACESYSGOOD | PTRACE_O_EXITKILL)
+    stops, sig = 0, 0
+    while True:
+        libc.ptrace(PTRACE_SYSCALL, pid, None, sig)
+        sig = 0
+        _, status = os.waitpid(pid, 0)
+        if os.WIFEXITED(status) or os.WIFSIGNALED(status):
+            break
+        stopsig = os.WSTOPSIG(status)
+        if stopsig == signal.SIGTRAP | 0x80:
+            stops += 1
+        else:
+            sig = stopsig
+    return stops // 2  # one stop on entry, one on exit
+
+
+def syscalls_per_listing(mode, root):
+    argv = [sys.executable, os.path.abspath(__file__), "--child", mode, root]
+    # One warm-up listing in both, so first-call imports cancel out too.
+    one, two = (count_syscalls(argv + [str(n)]) for n in (1, 2))
+    if one is None or two is None:
+        return None
+    return two - one
+
+
+def wall_ms(mode, root):
+    best = float("inf")
+    with _patched(root):
+        for _ in range(3):
+            start = time.perf_counter()
+            run(mode, root)
+            best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory() as root:
+        seed(root)
+        print(f"── list a folder of {FILES} files + {DIRS} dirs ──")
+        print(f"{'mode':<12}{'syscalls':>12}{'per entry':>12}{'ms':>10}")
+        for mode in MODES:
+            calls = syscalls_per_listing(mode, root)
+            per_entry = "n/a" if calls is None else f"{calls / (FILES + DIRS):.2f}"
+            calls = "n/a" if calls is None else calls
+            print(f"{mode:<12}{calls:>12}{per_entry:>12}{wall_ms(mode, root):>10.1f}")
@@ -0,0 +1,87 @@
+"""
+Benchmark file-browser directory sizes: recursive walk per request vs
+the background size index.
+
+Builds a throwaway media root with TITLES title folders (a Blu-ray
+style tree of a few subfolders and small files each) and times listing
+the root three ways:
+
+- ``walk``     the old listing: a recursive walk under every subfolder
+- ``cold``     index empty: the listing returns at once, sizes stale
+- ``warm``     index filled by the walker: sizes from memory
+
+plus ``size_of`` on the root after one title changed (only the path
+down to the change is rescanned).
+
+Usage (exec into container):
+    docker exec arm-rippers python3 /opt/arm/dev-data/bench_dir_sizes.py [titles]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest.mock
+
+os.environ.setdefault("ARM_CONFIG_FILE", "/etc/arm/config/arm.yaml")
+sys.path.insert(0, "/opt/arm")
+
+from arm.services import dir_size_index, file_browser  # noqa: E402
+
+TITLES = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+SUBDIRS = ("BDMV/STREAM", "BDMV/PLAYLIST", "BDMV/CLIPINF", "extras")
+
+
+def seed(root):
+    for n in range(TITLES):
+        title = os.path.join(root, f"Title {n:05d}")
+        for sub in SUBDIRS:
+            os.makedirs(os.path.join(title, sub))
+            for f in range(3):
+                with open(os.path.join(title, sub, f"{f:05d}.bin"), "wb") as fh:
+                    fh.write(b"x" * (f + 1))
+
+
+def _walk(path):
+    total = 0
+    for entry in os.scandir(path):
+        if entry.is_file(follow_symlinks=False):
+            total += entry.stat().st_size
+        elif entry.is_dir(follow_symlinks=False):
+            total += _walk(entry.path)
+    return total
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as root:
+        seed(root)
+        with unittest.mock.patch.object(file_browser, "get_allowed_roots",
+                                        return_value={"completed": root}):
+            def listing():
+                return file_browser.list_directory(root)
+
+            def walk_listing():
+                for entry in os.scandir(root):
+                    _walk(entry.path)
+                listing()
+
+            print(f"── list root of {TITLES} titles ({TITLES * (len(SUBDIRS) + 2)} dirs) ──")
+            print(f"{'mode':<28}{'ms':>10}")
+            print(f"{'walk':<28}{timed(walk_listing):>10.1f}")
+            print(f"{'cold index':<28}{timed(listing):>10.1f}")
+            print(f"{'index fill (walker)':<28}{timed(lambda: dir_size_index.size_of(root)):>10.1f}")
+            print(f"{'warm index':<28}{timed(listing):>10.1f}")
+
+            changed = os.path.join(root, "Title 00000", "extras")
+            with open(os.path.join(changed, "new.bin"), "wb") as fh:
+                fh.write(b"x" * 10)
+            dir_size_index.invalidate(changed)
+            print(f"{'size_of after one change':<28}{timed(lambda: dir_size_index.size_of(root)):>10.1f}")
+            stale = sum(e["size_stale"] for e in listing()["entries"])
+            print(f"\nstale entries after refresh: {stale}")
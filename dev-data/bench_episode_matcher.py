@@ -0,0 +1,108 @@
+"""
+Benchmark TVDB track-to-episode assignment.
+
+Times match_tracks_to_episodes / match_tracks_best_season on synthetic
+box sets and compares assignment quality against the previous greedy
+strategy (smallest delta first) on seasons with clustered runtimes.
+
+Usage (exec into container):
+    docker exec arm-rippers python3 /opt/arm/dev-data/bench_episode_matcher.py
+"""
+
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("ARM_CONFIG_FILE", "/etc/arm/config/arm.yaml")
+sys.path.insert(0, "/opt/arm")
+
+from arm.services.matching.tvdb_matcher import (  # noqa: E402
+    match_tracks_best_season,
+    match_tracks_to_episodes,
+)
+
+TOLERANCE = 300
+
+
+def greedy_reference(tracks, episodes, tolerance):
+    """The pre-assignment matcher: sort every pair, take smallest first."""
+    pairs = sorted(
+        (abs(t["length"] - e["runtime"]), ti, ei)
+        for ti, t in enumerate(tracks)
+        for ei, e in enumerate(episodes)
+        if abs(t["length"] - e["runtime"]) <= tolerance
+    )
+    used_t, used_e, total = set(), set(), 0
+    for delta, ti, ei in pairs:
+        if ti in used_t or ei in used_e:
+            continue
+        used_t.add(ti)
+        used_e.add(ei)
+        total += delta
+    return len(used_t), total
+
+
+def make_season(rng, count, base=2640, spread=240):
+    return [
+        {"number": n, "name": f"Episode {n}", "runtime": base + rng.randint(-spread, spread)}
+        for n in range(1, count + 1)
+    ]
+
+
+def make_disc(rng, episodes, first, count, jitter=90):
+    return [
+        {"track_number": str(i), "length": ep["runtime"] + rng.randint(-jitter, jitter)}
+        for i, ep in enumerate(episodes[first:first + count])
+    ]
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def bench_speed():
+    print("── speed (ms per call) ─────────────────────────────────────")
+    print(f"{'episodes':>8} {'tracks':>6} {'no disc':>9} {'disc 2/4':>9} {'10 seasons':>11}")
+    rng = random.Random(7)
+    for n_eps, n_tracks in ((10, 4), (22, 6), (40, 8), (80, 12)):
+        season = make_season(rng, n_eps)
+        tracks = make_disc(rng, season, n_eps // 4, n_tracks)
+        seasons = {s: make_season(rng, n_eps) for s in range(1, 11)}
+        plain = timed(lambda: match_tracks_to_episodes(tracks, season, TOLERANCE), 50)
+        windowed = timed(lambda: match_tracks_to_episodes(
+            tracks, season, TOLERANCE, disc_number=2, disc_total=4), 50)
+        best = timed(lambda: match_tracks_best_season(tracks, seasons, TOLERANCE), 5)
+        print(f"{n_eps:>8} {n_tracks:>6} {plain:>9.2f} {windowed:>9.2f} {best:>11.2f}")
+
+
+def bench_quality(trials=500):
+    print("── quality vs greedy (clustered runtimes) ──────────────────")
+    rng = random.Random(11)
+    more_matches = lower_delta = worse = 0
+    for _ in range(trials):
+        season = make_season(rng, 12, spread=180)
+        tracks = make_disc(rng, season, rng.randint(0, 6), 6, jitter=200)
+        g_count, g_total = greedy_reference(tracks, season, TOLERANCE)
+        matches = match_tracks_to_episodes(tracks, season, TOLERANCE)
+        lengths = {t["track_number"]: t["length"] for t in tracks}
+        o_count = len(matches)
+        o_total = sum(abs(lengths[m["track_number"]] - m["episode_runtime"]) for m in matches)
+        if o_count > g_count:
+            more_matches += 1
+        elif o_count == g_count and o_total < g_total:
+            lower_delta += 1
+        elif o_count < g_count:
+            worse += 1
+    print(f"trials: {trials}")
+    print(f"  more tracks matched than greedy: {more_matches}")
+    print(f"  same count, lower total delta:   {lower_delta}")
+    print(f"  fewer matches than greedy:       {worse}")
+
+
+if __name__ == "__main__":
+    bench_speed()
+    bench_quality()
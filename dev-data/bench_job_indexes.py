@@ -0,0 +1,140 @@
+"""
+Benchmark the hot-path job/track/notification indexes.
+
+Seeds a throwaway SQLite database (50k jobs, 10 tracks each, 5k
+notifications), times each hot query with the a2b3c4d5e6 indexes in
+place, then drops them and times the same queries again.
+
+Usage (exec into container):
+    docker exec arm-rippers python3 /opt/arm/dev-data/bench_job_indexes.py [jobs]
+"""
+
+import importlib
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("ARM_CONFIG_FILE", "/etc/arm/config/arm.yaml")
+sys.path.insert(0, "/opt/arm")
+
+from arm.api.v1 import jobs as jobs_api  # noqa: E402
+from arm.database import db  # noqa: E402
+from arm.models.job import Job  # noqa: E402
+from arm.models.notifications import Notifications  # noqa: E402
+from arm.services.jobs import track_counts_by_job  # noqa: E402
+
+_migration = importlib.import_module("arm.migrations.versions.a2b3c4d5e6_hot_path_indexes")
+
+JOBS = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+TRACKS_PER_JOB = 10
+# A long-lived install: almost everything finished, a handful in flight.
+STATUSES = ["success", "fail", "video_ripping", "transcoding", "waiting_transcode"]
+STATUS_WEIGHTS = [850, 147, 1, 1, 1]
+
+
+def seed(path):
+    rng = random.Random(5)
+    now = datetime.now()
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO job (job_id, guid, status, disctype, title, label, devpath, crc_id, "
+        "tvdb_id, start_time) VALUES (?, ?, ?, 'dvd', ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                n, f"bench-{n}", rng.choices(STATUSES, STATUS_WEIGHTS)[0],
+                f"Title {n}", f"LABEL_{n % 20_000}",
+                f"/dev/sr{n % 4}", f"{rng.getrandbits(64):016x}", rng.randint(1, 5000),
+                (now - timedelta(minutes=JOBS - n)).isoformat(" "),
+            )
+            for n in range(1, JOBS + 1)
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO config (job_id, MINLENGTH) VALUES (?, '600')",
+        ((n,) for n in range(1, JOBS + 1)),
+    )
+    conn.executemany(
+        "INSERT INTO track (job_id, track_number, length, enabled, ripped) VALUES (?, ?, ?, 1, 1)",
+        (
+            (n, str(t), rng.randint(60, 3600))
+            for n in range(1, JOBS + 1)
+            for t in range(TRACKS_PER_JOB)
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO notifications (title, message, seen, cleared, trigger_time) "
+        "VALUES ('t', 'm', ?, ?, ?)",
+        (
+            (n % 10 != 0, n % 3 != 0, (now - timedelta(minutes=n)).isoformat(" "))
+            for n in range(5000)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def drop_indexes(path):
+    conn = sqlite3.connect(path)
+    for name, _, _ in _migration._INDEXES:
+        conn.execute(f"DROP INDEX {name}")
+    conn.commit()
+    conn.close()
+
+
+def queries():
+    recent = list(range(JOBS - 24, JOBS + 1))
+    return {
+        "/jobs/active": jobs_api.get_active_jobs,
+        "/jobs/paginated?status=success": lambda: jobs_api.get_jobs_paginated(
+            page=1, per_page=25, status="success"),
+        "/jobs/paginated (default)": lambda: jobs_api.get_jobs_paginated(page=1, per_page=25),
+        "/jobs/stats": lambda: (jobs_api._invalidate_stats(), jobs_api.get_jobs_stats()),
+        "duplicate_run_check": lambda: db.session.query(Job).filter(
+            ~Job.finished, Job.devpath == "/dev/sr1").all(),
+        "job_dupe_check (label)": lambda: Job.query.filter_by(
+            label="LABEL_123", status="success").all(),
+        "crc_id lookup": lambda: Job.query.filter_by(crc_id="0123456789abcdef").all(),
+        "tvdb_id siblings": lambda: Job.query.filter_by(tvdb_id=42).all(),
+        "track_counts_by_job (25)": lambda: track_counts_by_job(recent),
+        "notifications (uncleared)": lambda: Notifications.query.filter(
+            Notifications.cleared == False  # noqa: E712
+        ).order_by(Notifications.trigger_time.desc()).all(),
+    }
+
+
+def timed(fn, repeat=10):
+    fn()
+    db.session.rollback()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+        db.session.rollback()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run_all():
+    return {name: timed(fn) for name, fn in queries().items()}
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        db.init_engine(f"sqlite:///{path}")
+        db.create_all()
+        seed(path)
+        with_idx = run_all()
+        db.dispose()
+        drop_indexes(path)
+        db.init_engine(f"sqlite:///{path}")
+        without_idx = run_all()
+        db.dispose()
+
+    print(f"── hot queries over {JOBS} jobs / {JOBS * TRACKS_PER_JOB} tracks (ms per call) ──")
+    print(f"{'query':<34} {'no index':>10} {'indexed':>10} {'speedup':>8}")
+    for name, fast in with_idx.items():
+        slow = without_idx[name]
+        print(f"{name:<34} {slow:>10.2f} {fast:>10.2f} {slow / fast:>7.1f}x")
@@ -0,0 +1,96 @@
+"""
+Benchmark offset vs keyset pagination on /jobs/paginated.
+
+Seeds a throwaway SQLite database with 100k jobs and times page 1,
+page 500 and page 3000 (25 per page) using ``page=`` (OFFSET) and
+``cursor=`` (keyset on start_time, job_id), with and without a status
+filter.  Every call also runs the COUNT for ``total``, which is the
+same in both modes.
+
+Usage (exec into container):
+    docker exec arm-rippers python3 /opt/arm/dev-data/bench_job_pagination.py [jobs]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("ARM_CONFIG_FILE", "/etc/arm/config/arm.yaml")
+sys.path.insert(0, "/opt/arm")
+
+from arm.api.v1 import jobs as jobs_api  # noqa: E402
+from arm.database import db  # noqa: E402
+
+JOBS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+PER_PAGE = 25
+DEEP_PAGES = (500, 3000)
+
+
+def seed(path):
+    rng = random.Random(9)
+    now = datetime.now()
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO job (job_id, guid, status, disctype, title, label, start_time) "
+        "VALUES (?, ?, ?, 'dvd', ?, ?, ?)",
+        (
+            (
+                n, f"bench-{n}", rng.choices(["success", "fail"], [85, 15])[0],
+                f"Title {n}", f"LABEL_{n}",
+                (now - timedelta(minutes=JOBS - n)).isoformat(" "),
+            )
+            for n in range(1, JOBS + 1)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def cursors_for_pages(pages, **filters):
+    """Walk the list with cursors (untimed) and return {page: cursor}."""
+    cursors, cursor = {}, None
+    for page in range(1, max(pages)):
+        kwargs = {"cursor": cursor} if cursor else {"page": 1}
+        cursor = jobs_api.get_jobs_paginated(per_page=PER_PAGE, **kwargs, **filters)["next_cursor"]
+        if page + 1 in pages:
+            cursors[page + 1] = cursor
+    return cursors
+
+
+def timed(fn, repeat=20):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def bench(label, **filters):
+    cursors = cursors_for_pages(DEEP_PAGES, **filters)
+    cells = [timed(lambda: jobs_api.get_jobs_paginated(page=1, per_page=PER_PAGE, **filters))[0]]
+    for page in DEEP_PAGES:
+        offset_ms, by_offset = timed(
+            lambda: jobs_api.get_jobs_paginated(page=page, per_page=PER_PAGE, **filters))
+        cursor_ms, by_cursor = timed(
+            lambda: jobs_api.get_jobs_paginated(per_page=PER_PAGE, cursor=cursors[page], **filters))
+        assert [j["job_id"] for j in by_offset["jobs"]] == [j["job_id"] for j in by_cursor["jobs"]]
+        cells += [offset_ms, cursor_ms]
+    print(f"{label:<16}" + "".join(f"{ms:>13.2f}" for ms in cells))
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        db.init_engine(f"sqlite:///{path}")
+        db.create_all()
+        seed(path)
+        print(f"── /jobs/paginated over {JOBS} jobs, {PER_PAGE}/page (ms per call) ──")
+        heads = ["page 1"] + [f"{mode} p{p}" for p in DEEP_PAGES for mode in ("offset", "cursor")]
+        print(f"{'':<16}" + "".join(f"{h:>13}" for h in heads))
+        bench("no filter")
+        bench("status=success", status="success")
+        db.dispose()
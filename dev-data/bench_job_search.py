@@ -0,0 +1,93 @@
+"""
+Benchmark job search: LIKE scans vs the job_fts FTS5 index.
+
+Seeds a throwaway SQLite database with 100k jobs (synthetic titles,
+labels, years, IMDb ids and output paths), times /jobs/paginated?search=
+and the legacy /jobs?q= search on the LIKE fallback, then installs
+job_fts and times the same calls again.
+
+Usage (exec into container):
+    docker exec arm-rippers python3 /opt/arm/dev-data/bench_job_search.py [jobs]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("ARM_CONFIG_FILE", "/etc/arm/config/arm.yaml")
+sys.path.insert(0, "/opt/arm")
+
+from arm.api.v1 import jobs as jobs_api  # noqa: E402
+from arm.database import db  # noqa: E402
+from arm.services import job_search  # noqa: E402
+
+JOBS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+WORDS = (
+    "alien blade runner matrix heat ronin star wars trek empire return jedi night day "
+    "dark knight rises falls city river mountain ghost house lost found last first "
+    "king queen prince war peace love story toy monster planet ocean storm fire ice"
+).split()
+TERMS = ("matrix", "dark knight", "blade run", "tt00123", "zzz no match")
+
+
+def seed(path):
+    rng = random.Random(13)
+    conn = sqlite3.connect(path)
+    rows = []
+    for n in range(1, JOBS + 1):
+        title = " ".join(rng.choice(WORDS).title() for _ in range(rng.randint(1, 4)))
+        year = str(rng.randint(1950, 2026))
+        rows.append((
+            n, f"bench-{n}", "success", title, title.upper().replace(" ", "_"), year,
+            f"tt{rng.randint(0, 9_999_999):07d}", f"/home/arm/media/movies/{title} ({year})",
+        ))
+    conn.executemany(
+        "INSERT INTO job (job_id, guid, status, title, label, year, imdb_id, path) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+def timed(fn, repeat=5):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def run():
+    results = {}
+    for term in TERMS:
+        page_ms, page = timed(lambda: jobs_api.get_jobs_paginated(page=1, per_page=25, search=term))
+        legacy_ms, _ = timed(lambda: job_search.ranked_search(term))
+        results[term] = (page_ms, legacy_ms, page["total"])
+    return results
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        db.init_engine(f"sqlite:///{path}")
+        db.create_all()
+        seed(path)
+        like = run()
+        start = time.perf_counter()
+        with db.engine.begin() as conn:
+            assert job_search.install_fts(conn), "SQLite build lacks FTS5"
+        build_s = time.perf_counter() - start
+        fts = run()
+        db.dispose()
+
+    print(f"── job search over {JOBS} jobs (ms per call; FTS index built in {build_s:.1f} s) ──")
+    print(f"{'term':<16}{'paginated LIKE':>16}{'paginated FTS':>15}"
+          f"{'search LIKE':>13}{'search FTS':>12}{'hits L/F':>14}")
+    for term in TERMS:
+        lp, ll, lh = like[term]
+        fp, fl, fh = fts[term]
+        print(f"{term:<16}{lp:>16.2f}{fp:>15.2f}{ll:>13.2f}{fl:>12.2f}{f'{lh}/{fh}':>14}")
@@ -0,0 +1,121 @@
+"""
+Benchmark the /jobs/stats aggregation.
+
+Seeds a throwaway SQLite database with 50k jobs and times the previous
+five-COUNT implementation against a single SUM(CASE ...) query, the
+GROUP BY status query the endpoint uses, and the cached endpoint.
+
+Usage (exec into container):
+    docker exec arm-rippers python3 /opt/arm/dev-data/bench_job_stats.py [jobs]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("ARM_CONFIG_FILE", "/etc/arm/config/arm.yaml")
+sys.path.insert(0, "/opt/arm")
+
+from sqlalchemy import case, func  # noqa: E402
+
+from arm.api.v1 import jobs as jobs_api  # noqa: E402
+from arm.database import db  # noqa: E402
+from arm.models.job import Job  # noqa: E402
+
+JOBS = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+STATUSES = ["success"] * 70 + ["fail"] * 15 + [
+    "video_ripping", "transcoding", "manual_paused", "waiting_transcode", "ready",
+] * 3
+DISCTYPES = ["dvd", "bluray", "bluray4k", "music", "data"]
+
+
+def seed(path):
+    rng = random.Random(3)
+    now = datetime.now()
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO job (guid, status, disctype, video_type, title, label, start_time) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                f"bench-{n}", rng.choice(STATUSES), rng.choice(DISCTYPES),
+                rng.choice(["movie", "series"]), f"Title {n}", f"LABEL_{n}",
+                (now - timedelta(days=rng.randint(0, 1500))).isoformat(" "),
+            )
+            for n in range(JOBS)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def five_counts():
+    """The pre-aggregate implementation: one COUNT per bucket."""
+    base = db.session.query(Job)
+    status = func.lower(Job.status)
+    active = list(jobs_api._ACTIVE_STATUSES - jobs_api._WAITING_STATUSES)
+    return {
+        "total": base.count(),
+        "active": base.filter(status.in_(active)).count(),
+        "waiting": base.filter(status.in_(list(jobs_api._WAITING_STATUSES))).count(),
+        "success": base.filter(status == "success").count(),
+        "fail": base.filter(status == "fail").count(),
+    }
+
+
+def sum_case():
+    """Single conditional-aggregate alternative (evaluates lower() per row)."""
+    status = func.lower(Job.status)
+    active = list(jobs_api._ACTIVE_STATUSES - jobs_api._WAITING_STATUSES)
+    buckets = {
+        "active": status.in_(active),
+        "waiting": status.in_(list(jobs_api._WAITING_STATUSES)),
+        "success": status == "success",
+        "fail": status == "fail",
+    }
+    row = db.session.query(
+        func.count(Job.job_id),
+        *(func.sum(case((cond, 1), else_=0)) for cond in buckets.values()),
+    ).one()
+    return dict(zip(("total", *buckets), (int(v or 0) for v in row)))
+
+
+def grouped():
+    jobs_api._invalidate_stats()
+    return jobs_api.get_jobs_stats()
+
+
+def cached():
+    return jobs_api.get_jobs_stats()
+
+
+def timed(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        db.init_engine(f"sqlite:///{path}")
+        db.create_all()
+        seed(path)
+        print(f"── /jobs/stats over {JOBS} jobs (ms per call) ──────────────")
+        old_ms, old = timed(five_counts, 20)
+        case_ms, by_case = timed(sum_case, 20)
+        new_ms, new = timed(grouped, 20)
+        hit_ms, _ = timed(cached, 1000)
+        assert old == by_case == new, (old, by_case, new)
+        print(f"  five COUNT queries:     {old_ms:8.2f}")
+        print(f"  one SUM(CASE) query:    {case_ms:8.2f}")
+        print(f"  one GROUP BY status:    {new_ms:8.2f}")
+        print(f"  cached:                 {hit_ms:8.4f}")
+        print(f"  buckets: {new}")
+        db.dispose()
@@ -0,0 +1,65 @@
+"""
+Benchmark read-only mount detection: re-parsing /proc/self/mountinfo
+per call vs the cached mount table.
+
+- ``parse``    the old is_path_readonly: read and parse mountinfo, then
+               scan every mount point for the longest prefix
+- ``cached``   is_path_readonly with the cached trie (one poll() per call)
+
+plus the lookup alone, linear scan vs trie, over a synthetic table of
+MOUNTS bind mounts (hosts with many containers or NFS exports).
+
+Usage (exec into container):
+    docker exec arm-rippers python3 /opt/arm/dev-data/bench_mount_lookup.py [mounts]
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("ARM_CONFIG_FILE", "/etc/arm/config/arm.yaml")
+sys.path.insert(0, "/opt/arm")
+
+from arm.services import file_browser  # noqa: E402
+
+MOUNTS = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+CALLS = 2000
+PATH = "/home/arm/media/completed/movies/Heat (1995)/Heat (1995).mkv"
+
+
+def linear_find(path, mounts):
+    best_mount, best_info = "", None
+    for mount_point, info in mounts.items():
+        if (path == mount_point or path.startswith(mount_point + "/")) and len(mount_point) > len(best_mount):
+            best_mount, best_info = mount_point, info
+    return best_mount, best_info
+
+
+def old_is_path_readonly(path):
+    _, info = linear_find(str(file_browser.Path(path).resolve()), file_browser._read_host_mounts())
+    return info.readonly if info else False
+
+
+def per_call_us(fn, calls=CALLS):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+if __name__ == "__main__":
+    real = len(file_browser._read_host_mounts())
+    print(f"── is_path_readonly, {real} tracked mounts in this container ──")
+    print(f"{'mode':<28}{'us/call':>10}")
+    print(f"{'parse':<28}{per_call_us(lambda: old_is_path_readonly(PATH)):>10.1f}")
+    file_browser.is_path_readonly(PATH)
+    print(f"{'cached':<28}{per_call_us(lambda: file_browser.is_path_readonly(PATH)):>10.1f}")
+
+    synthetic = {f"/mnt/share{n:04d}/media": file_browser._MountInfo(f"/srv/{n}", n % 2 == 0)
+                 for n in range(MOUNTS)}
+    synthetic["/home/arm/media"] = file_browser._MountInfo("/srv/media", False)
+    table = file_browser._MountTable(synthetic)
+    print(f"\n── lookup only, {MOUNTS} mounts ──")
+    print(f"{'mode':<28}{'us/call':>10}")
+    print(f"{'linear scan':<28}{per_call_us(lambda: linear_find(PATH, synthetic)):>10.1f}")
+    print(f"{'trie':<28}{per_call_us(lambda: table.find(PATH)):>10.1f}")
@@ -0,0 +1,135 @@
+"""
+Benchmark SQLite tuning profiles and the managed WAL checkpointer.
+
+Seeds a throwaway database with 20k notifications, then runs three
+processes for a few write bursts: a writer committing one small insert
+every 2 ms for BURST seconds followed by IDLE seconds of nothing, and
+two readers that each hold a read transaction for 1 s (a long API read)
+at staggered times, timing a point lookup inside it.  The WAL size is
+sampled every 50 ms.
+
+Modes:
+
+- ``safe``      SQLite defaults, autocheckpoint only (the old setup)
+- ``balanced``  the balanced pragma profile, autocheckpoint only
+- ``managed``   balanced plus the background checkpointer (0.5 s ticks)
+
+Reported: writer commit p50/p99 (ms), reader lookup p50/p99 (ms), the
+largest WAL seen and the WAL size at the end of the last idle period.
+
+Usage (exec into container):
+    docker exec arm-rippers python3 /opt/arm/dev-data/bench_wal_checkpoint.py [bursts]
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("ARM_CONFIG_FILE", "/etc/arm/config/arm.yaml")
+sys.path.insert(0, "/opt/arm")
+
+from sqlalchemy import text  # noqa: E402
+
+from arm.database import db, sqlite_tuning  # noqa: E402
+
+BURSTS = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+BURST = 3.0
+IDLE = 2.0
+ROWS = 20_000
+INSERT = text("INSERT INTO notifications (title, message, seen, cleared, trigger_time) "
+              "VALUES ('bench', :m, 0, 0, CURRENT_TIMESTAMP)")
+
+
+def _connect(url, profile):
+    db.dispose()
+    db.init_engine(url, sqlite_profile=profile)
+
+
+def writer(url, profile, results):
+    _connect(url, profile)
+    latencies = []
+    for _ in range(BURSTS):
+        deadline = time.monotonic() + BURST
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            with db.engine.begin() as conn:
+                conn.execute(INSERT, {"m": "x" * 200})
+            latencies.append(time.perf_counter() - start)
+            time.sleep(0.002)
+        time.sleep(IDLE)
+    db.dispose()
+    results.put(("writer", latencies))
+
+
+def reader(url, profile, offset, stop, results):
+    _connect(url, profile)
+    latencies = []
+    time.sleep(offset)
+    while not stop.is_set():
+        with db.engine.connect() as conn:
+            conn.execute(text("BEGIN"))
+            conn.execute(text("SELECT count(*) FROM notifications")).scalar()
+            held = time.monotonic() + 1.0
+            while time.monotonic() < held:
+                start = time.perf_counter()
+                conn.execute(text("SELECT title FROM notifications WHERE id = :id"),
+                             {"id": int(start * 1000) % ROWS + 1}).scalar()
+                latencies.append(time.perf_counter() - start)
+                time.sleep(0.01)
+            conn.execute(text("COMMIT"))
+        time.sleep(0.3)
+    db.dispose()
+    results.put(("reader", latencies))
+
+
+def pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000
+
+
+def run(mode):
+    profile = "safe" if mode == "safe" else "balanced"
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        url = f"sqlite:///{path}"
+        _connect(url, profile)
+        db.create_all()
+        with db.engine.begin() as conn:
+            conn.execute(INSERT, [{"m": f"seed {n}"} for n in range(ROWS)])
+        if mode == "managed":
+            sqlite_tuning.start_checkpointer(db.engine, 0.5)
+
+        ctx = multiprocessing.get_context("fork")
+        results, stop = ctx.Queue(), ctx.Event()
+        procs = [ctx.Process(target=writer, args=(url, profile, results))]
+        procs += [ctx.Process(target=reader, args=(url, profile, offset, stop, results))
+                  for offset in (0.0, 0.6)]
+        for proc in procs:
+            proc.start()
+        wal_max = 0
+        while procs[0].is_alive():
+            wal_max = max(wal_max, sqlite_tuning._wal_size(path))
+            time.sleep(0.05)
+        stop.set()
+        out = [results.get() for _ in procs]
+        for proc in procs:
+            proc.join()
+        wal_end = sqlite_tuning._wal_size(path)
+        sqlite_tuning.stop_checkpointer()
+        db.dispose()
+
+    write = [lat for kind, lats in out if kind == "writer" for lat in lats]
+    read = [lat for kind, lats in out if kind == "reader" for lat in lats]
+    print(f"{mode:<10}{pct(write, .5):>10.2f}{pct(write, .99):>10.2f}"
+          f"{pct(read, .5):>10.2f}{pct(read, .99):>10.2f}"
+          f"{wal_max / 1024:>12.0f}{wal_end / 1024:>12.0f}")
+
+
+if __name__ == "__main__":
+    print(f"── {BURSTS} x ({BURST:.0f}s writes + {IDLE:.0f}s idle), 2 long readers ──")
+    print(f"{'mode':<10}{'write p50':>10}{'write p99':>10}{'read p50':>10}{'read p99':>10}"
+          f"{'WAL max KiB':>12}{'WAL end KiB':>12}")
+    for mode in ("safe", "balanced", "managed"):
+        run(mode)
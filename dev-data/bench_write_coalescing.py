@@ -0,0 +1,151 @@
+"""
+Benchmark SQLite write contention with and without the write buffer.
+
+Seeds a throwaway WAL database with one job and 20 tracks per drive,
+then runs one process per simulated drive.  Each drive loops for a few
+seconds advancing track phases (ripping -> encoding -> success) and
+bumping job fields, sleeping a few ms between updates, with a status
+change at the start and end.  An extra process plays the API, committing
+a small notification write every 20 ms.
+
+Mode ``direct`` commits every update (the old ``database_updater``
+behaviour); ``buffered`` stages them through arm.database.write_buffer.
+Reported: commits per drive, p50/p99/max latency of a drive's update
+call, and p50/p99/max of the API's commits.
+
+Usage (exec into container):
+    docker exec arm-rippers python3 /opt/arm/dev-data/bench_write_coalescing.py [drives] [seconds]
+"""
+
+import multiprocessing
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("ARM_CONFIG_FILE", "/etc/arm/config/arm.yaml")
+sys.path.insert(0, "/opt/arm")
+
+from sqlalchemy import event  # noqa: E402
+
+from arm.database import db, write_buffer  # noqa: E402
+from arm.models.job import Job  # noqa: E402
+from arm.models.notifications import Notifications  # noqa: E402
+from arm.models.track import Track  # noqa: E402
+from arm.ripper.utils import database_updater  # noqa: E402
+
+DRIVES = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+SECONDS = float(sys.argv[2]) if len(sys.argv) > 2 else 12.0
+TRACKS = 20
+TICK = 0.005
+
+
+def seed(path):
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO job (job_id, guid, status, disctype, title) VALUES (?, ?, 'identifying', 'music', ?)",
+        ((n, f"bench-{n}", f"Drive {n}") for n in range(1, DRIVES + 1)),
+    )
+    conn.executemany(
+        "INSERT INTO track (job_id, track_number, length, enabled, ripped, status) "
+        "VALUES (?, ?, 300, 1, 0, 'pending')",
+        ((job_id, str(t)) for job_id in range(1, DRIVES + 1) for t in range(1, TRACKS + 1)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _connect(url):
+    db.dispose()
+    db.init_engine(url)
+    commits = []
+    event.listen(db.engine, "commit", lambda conn: commits.append(1))
+    return commits
+
+
+def drive(url, job_id, buffered, results):
+    commits = _connect(url)
+    job = db.session.get(Job, job_id)
+    tracks = Track.query.filter_by(job_id=job_id).order_by(Track.track_id).all()
+    database_updater({"status": "audio_ripping"}, job)
+    latencies = []
+    phases = ("ripping", "encoding", "success")
+    step = 0
+    deadline = time.monotonic() + SECONDS
+    while time.monotonic() < deadline:
+        track = tracks[(step // len(phases)) % TRACKS]
+        phase = phases[step % len(phases)]
+        values = {"status": phase, "ripped": phase == "success"}
+        start = time.perf_counter()
+        if buffered:
+            write_buffer.stage(track, values)
+            database_updater({"stage": str(step)}, job, coalesce=True)
+        else:
+            database_updater(values, track)
+            database_updater({"stage": str(step)}, job)
+        latencies.append(time.perf_counter() - start)
+        step += 1
+        time.sleep(TICK)
+    database_updater({"status": "success"}, job)
+    db.dispose()
+    results.put(("drive", len(commits), latencies))
+
+
+def api(url, stop, results):
+    _connect(url)
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        db.session.add(Notifications("bench", "api write"))
+        db.session.commit()
+        latencies.append(time.perf_counter() - start)
+        time.sleep(0.02)
+    db.dispose()
+    results.put(("api", 0, latencies))
+
+
+def pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000
+
+
+def run(mode):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        url = f"sqlite:///{path}"
+        db.dispose()
+        db.init_engine(url)
+        db.create_all()
+        db.dispose()
+        seed(path)
+
+        ctx = multiprocessing.get_context("fork")
+        results, stop = ctx.Queue(), ctx.Event()
+        api_proc = ctx.Process(target=api, args=(url, stop, results))
+        drives = [ctx.Process(target=drive, args=(url, n, mode == "buffered", results))
+                  for n in range(1, DRIVES + 1)]
+        api_proc.start()
+        for proc in drives:
+            proc.start()
+        out = [results.get() for _ in drives]
+        stop.set()
+        out.append(results.get())
+        for proc in [*drives, api_proc]:
+            proc.join()
+
+        drive_lat = [lat for kind, _, lats in out if kind == "drive" for lat in lats]
+        api_lat = [lat for kind, _, lats in out if kind == "api" for lat in lats]
+        commits = statistics.mean(n for kind, n, _ in out if kind == "drive")
+        print(f"{mode:<10}{commits:>10.0f}{len(drive_lat):>10}"
+              f"{pct(drive_lat, .5):>9.2f}{pct(drive_lat, .99):>9.2f}{max(drive_lat) * 1000:>9.1f}"
+              f"{pct(api_lat, .5):>9.2f}{pct(api_lat, .99):>9.2f}{max(api_lat) * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    print(f"── {DRIVES} drives + API writer, {SECONDS:.0f}s (latency ms) ──")
+    print(f"{'':<10}{'commits':>10}{'updates':>10}{'upd p50':>9}{'upd p99':>9}{'upd max':>9}"
+          f"{'api p50':>9}{'api p99':>9}{'api max':>9}")
+    for mode in ("direct", "buffered"):
+        run(mode)
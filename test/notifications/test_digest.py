@@ -0,0 +1,160 @@
+"""Tests for digest coalescing (arm.notifications.digest) and the
+dispatcher's digest sends."""
+import asyncio
+import datetime
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def _digest_channel(make_channel, window=60, max_batch=10, type="apprise"):
+    ch = make_channel(type=type,
+                      config={"type": type, "url": "discord://x/y"},
+                      subscribed_events=["job.started", "job.failed"])
+    ch.digest = {"window_seconds": window, "max_batch": max_batch}
+    return ch
+
+
+def _enqueue(db_session, ch, event_key="job.started", job_id=1, now=None):
+    """Add an outbox row the way publish_event does."""
+    from arm.notifications import digest
+    from arm.notifications.models import NotificationOutbox
+    now = now or datetime.datetime.utcnow()
+    payload = {
+        "event_key": event_key,
+        "event_id": str(uuid4()),
+        "occurred_at": now.isoformat(),
+        "job_id": job_id, "job_title": f"Disc {job_id}",
+        "job_disc_type": "dvd", "job_imdb_id": None,
+    }
+    if event_key == "job.started":
+        payload["drive_mount"] = "/dev/sr0"
+    else:
+        payload.update(phase="rip", error_message="boom", error_code=None)
+    row = NotificationOutbox(channel_id=ch.id, event_key=event_key,
+                             event_payload=payload, status="pending",
+                             attempts=0,
+                             next_attempt_at=digest.hold_until(ch, event_key, now))
+    db_session.add(row)
+    db_session.commit()
+    return row
+
+
+def test_routine_events_share_one_window(db_session, make_channel):
+    ch = _digest_channel(make_channel, window=60)
+    now = datetime.datetime.utcnow()
+    first = _enqueue(db_session, ch, now=now)
+    later = _enqueue(db_session, ch, job_id=2,
+                     now=now + datetime.timedelta(seconds=30))
+    assert first.next_attempt_at == now + datetime.timedelta(seconds=60)
+    # Joins the open window instead of extending it.
+    assert later.next_attempt_at == first.next_attempt_at
+
+
+def test_critical_events_and_plain_channels_are_not_held(db_session, make_channel):
+    from arm.notifications import digest
+    ch = _digest_channel(make_channel)
+    now = datetime.datetime.utcnow()
+    assert _enqueue(db_session, ch, "job.failed", now=now).next_attempt_at == now
+
+    webhook = _digest_channel(make_channel, type="webhook")
+    assert digest.settings(webhook) is None
+    assert _enqueue(db_session, webhook, now=now).next_attempt_at == now
+
+
+def test_full_window_is_released_early(db_session, make_channel):
+    ch = _digest_channel(make_channel, window=600, max_batch=3)
+    now = datetime.datetime.utcnow()
+    rows = [_enqueue(db_session, ch, job_id=n, now=now) for n in range(3)]
+    db_session.expire_all()
+    assert [r.next_attempt_at for r in rows] == [now] * 3
+
+
+def test_max_batch_fits_one_dequeue(make_channel):
+    """_take only merges rows claimed together; a larger batch would split."""
+    from arm.notifications import digest, dispatcher
+    assert digest.MAX_BATCH_LIMIT <= dispatcher._BATCH_SIZE
+    ch = _digest_channel(make_channel, max_batch=100)
+    assert digest.settings(ch) == (60, digest.MAX_BATCH_LIMIT)
+
+
+def test_dispatcher_sends_held_rows_as_one_digest(db_session, make_channel):
+    from arm.notifications import dispatcher as dispatcher_mod
+    from arm.notifications.models import NotificationOutbox
+
+    ch = _digest_channel(make_channel, window=600, max_batch=3)
+    for n in range(3):
+        _enqueue(db_session, ch, job_id=n)
+    _enqueue(db_session, ch, "job.failed", job_id=9)
+
+    sends = []
+
+    def send(**kwargs):
+        sends.append(kwargs)
+        return True, None
+
+    async def _run():
+        stop = asyncio.Event()
+        with patch.object(dispatcher_mod, "_TICK_INTERVAL_SECONDS", 0.01), \
+                patch.object(dispatcher_mod, "_CLEANUP_INTERVAL_SECONDS", 1e9), \
+                patch.object(dispatcher_mod, "send_apprise", side_effect=send):
+            task = asyncio.create_task(
+                dispatcher_mod.run_dispatcher_loop(stop_event=stop))
+            for _ in range(200):
+                await asyncio.sleep(0.01)
+                if len(sends) >= 2:
+                    break
+            stop.set()
+            await asyncio.wait_for(task, timeout=2.0)
+
+    asyncio.run(_run())
+    db_session.expire_all()
+    assert {r.status for r in NotificationOutbox.query} == {"success"}
+    titles = sorted(s["title"] for s in sends)
+    assert titles == ["ARM job failed: Disc 9", "ARM started 3 jobs"]
+    digest_body = next(s["body"] for s in sends if s["title"] == "ARM started 3 jobs")
+    assert digest_body.splitlines() == [
+        "- ARM started: Disc 0", "- ARM started: Disc 1", "- ARM started: Disc 2"]
+
+
+def test_digest_send_failure_retries_every_row(db_session, make_channel):
+    from arm.notifications import dispatcher as dispatcher_mod
+    from arm.notifications.models import NotificationOutbox
+
+    ch = _digest_channel(make_channel)
+    ids = [_enqueue(db_session, ch, job_id=n).id for n in range(2)]
+    with patch.object(dispatcher_mod, "send_apprise",
+                      return_value=(False, "rate limited terminal=false")):
+        outcomes = dispatcher_mod._deliver_digest(ids)
+    assert outcomes == [(i, False, "rate limited terminal=false", False) for i in ids]
+    dispatcher_mod._record_batch(outcomes)
+    db_session.expire_all()
+    assert [r.status for r in NotificationOutbox.query] == ["pending", "pending"]
+
+
+@pytest.fixture
+def client(db_session):
+    from arm.app import app
+    return TestClient(app)
+
+
+def test_put_digest_endpoint(client, make_channel):
+    apprise = make_channel(type="apprise",
+                           config={"type": "apprise", "url": "discord://x/y"},
+                           subscribed_events=["job.started"])
+    url = f"/api/v1/notifications/channels/{apprise.id}/digest"
+
+    body = client.put(url, json={"window_seconds": 120, "max_batch": 5}).json()
+    assert body["digest"] == {"window_seconds": 120, "max_batch": 5}
+    assert client.put(url, json={"window_seconds": 0}).json()["digest"] is None
+    assert client.put(url, json={"window_seconds": 10, "max_batch": 1}).status_code == 422
+    assert client.put(url, json={"window_seconds": 10, "max_batch": 21}).status_code == 422
+
+    webhook = make_channel(type="webhook",
+                           config={"type": "webhook", "url": "https://example.com/h"},
+                           subscribed_events=["job.started"])
+    resp = client.put(f"/api/v1/notifications/channels/{webhook.id}/digest",
+                      json={"window_seconds": 60})
+    assert resp.status_code == 422
@@ -582,3 +582,142 @@ def test_dispatcher_loop_logs_cleanup_deletions(db_session):
 
     asyncio.run(_run())
     assert calls["n"] >= 1
+
+
+def _run_loop_until(dispatcher_mod, done, *, timeout=5.0, while_running=None):
+    """Run the dispatcher loop until ``done()`` is true; return the max
+    event-loop lag observed by a 10 ms heartbeat."""
+    import asyncio
+    import time
+
+    async def _run():
+        stop = asyncio.Event()
+        with patch.object(dispatcher_mod, "_TICK_INTERVAL_SECONDS", 0.01), \
+                patch.object(dispatcher_mod, "_CLEANUP_INTERVAL_SECONDS", 1e9):
+            task = asyncio.create_task(
+                dispatcher_mod.run_dispatcher_loop(stop_event=stop)
+            )
+            max_lag = 0.0
+            deadline = time.monotonic() + timeout
+            while not done() and time.monotonic() < deadline:
+                before = time.monotonic()
+                await asyncio.sleep(0.01)
+                max_lag = max(max_lag, time.monotonic() - before - 0.01)
+            stop.set()
+            await asyncio.wait_for(task, timeout=5.0)
+            return max_lag
+
+    return asyncio.run(_run())
+
+
+def test_dispatcher_loop_not_blocked_by_slow_channel(db_session, make_channel):
+    """A channel whose send blocks for a while must not stall the event
+    loop, and must not hold up sends to other channels."""
+    import threading
+    import time
+    from arm.notifications import dispatcher as dispatcher_mod
+    from arm.notifications.models import NotificationOutbox
+
+    slow = make_channel(type="apprise", name="slow",
+                        config={"type": "apprise", "url": "slow://x"},
+                        subscribed_events=["job.started"])
+    fast = make_channel(type="apprise", name="fast",
+                        config={"type": "apprise", "url": "fast://x"},
+                        subscribed_events=["job.started"])
+    slow_row = _outbox_row(db_session, slow.id, _started_payload(), status="pending")
+    fast_row = _outbox_row(db_session, fast.id, _started_payload(), status="pending")
+    finished = []
+    release = threading.Event()
+
+    def send(url, title, body):
+        if url == "slow://x":
+            release.wait(2.0)
+        finished.append(url)
+        return True, None
+
+    def done():
+        if finished == ["fast://x"]:
+            release.set()       # fast channel delivered while slow blocked
+        return len(finished) == 2
+
+    with patch.object(dispatcher_mod, "send_apprise", side_effect=send):
+        started = time.monotonic()
+        max_lag = _run_loop_until(dispatcher_mod, done)
+
+    assert finished == ["fast://x", "slow://x"]
+    assert time.monotonic() - started < 2.0
+    assert max_lag < 0.1
+    for row in (slow_row, fast_row):
+        db_session.refresh(row)
+        assert row.status == "success"
+    assert NotificationOutbox.query.filter_by(status="in_flight").count() == 0
+
+
+def test_dispatcher_loop_keeps_per_channel_fifo(db_session, make_channel):
+    """Rows for one channel are sent one at a time, in dequeue order."""
+    import threading
+    from arm.notifications import dispatcher as dispatcher_mod
+
+    ch = make_channel(type="apprise",
+                      config={"type": "apprise", "url": "discord://x/y"},
+                      subscribed_events=["job.started"])
+    rows = []
+    for n in range(5):
+        payload = dict(_started_payload(), job_id=n)
+        rows.append(_outbox_row(db_session, ch.id, payload, status="pending"))
+    sent, active, overlap = [], [0], []
+    lock = threading.Lock()
+
+    def send(url, title, body):
+        with lock:
+            active[0] += 1
+            overlap.append(active[0])
+        sent.append(title)
+        with lock:
+            active[0] -= 1
+        return True, None
+
+    with patch.object(dispatcher_mod, "send_apprise", side_effect=send), \
+            patch.object(dispatcher_mod, "render_title_and_body",
+                         side_effect=lambda event, channel_template: (str(event.job_id), "")):
+        _run_loop_until(dispatcher_mod, lambda: len(sent) == 5)
+
+    assert sent == ["0", "1", "2", "3", "4"]
+    assert max(overlap) == 1
+
+
+def test_dispatcher_loop_commits_results_in_batches(db_session, make_channel):
+    """Draining a backlog records send results a batch at a time, not
+    one commit per row."""
+    from sqlalchemy import event
+    from arm.database import db
+    from arm.notifications import dispatcher as dispatcher_mod
+    from arm.notifications.models import NotificationOutbox
+
+    channels = [
+        make_channel(type="apprise", name=f"ch{n}",
+                     config={"type": "apprise", "url": f"ch{n}://x"},
+                     subscribed_events=["job.started"])
+        for n in range(2)
+    ]
+    for n in range(20):
+        _outbox_row(db_session, channels[n % 2].id, _started_payload(),
+                    status="pending")
+    sent = []
+    commits = []
+    listener = lambda conn: commits.append(1)  # noqa: E731
+
+    def send(url, title, body):
+        sent.append(url)
+        return True, None
+
+    event.listen(db.engine, "commit", listener)
+    try:
+        with patch.object(dispatcher_mod, "send_apprise", side_effect=send):
+            _run_loop_until(dispatcher_mod, lambda: len(sent) == 20)
+    finally:
+        event.remove(db.engine, "commit", listener)
+
+    assert NotificationOutbox.query.filter_by(status="success").count() == 20
+    # One claim plus a handful of result batches, rather than 20+ commits.
+    assert len(commits) < 10
@@ -12,7 +12,7 @@ def test_lifespan_starts_and_stops_dispatcher(monkeypatch):
     started = asyncio.Event()
     stopped = asyncio.Event()
 
-    async def fake_dispatcher(stop_event):
+    async def fake_dispatcher(stop_event, wake_socket=None):
         started.set()
         await stop_event.wait()
         stopped.set()
@@ -14,7 +14,7 @@ def test_notification_channel_fields_match_spec():
     cols = NotificationChannel.__table__.columns.keys()
     assert set(cols) == {
         "id", "type", "name", "enabled", "config",
-        "subscribed_events", "templates",
+        "subscribed_events", "templates", "digest",
         "last_fired_at", "last_success_at", "last_error",
         "created_at", "updated_at",
     }
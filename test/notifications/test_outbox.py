@@ -54,6 +54,56 @@ def test_dequeue_marks_in_flight(db_session, make_channel):
     assert refreshed.status == "in_flight"
 
 
+def test_dequeue_claims_in_due_order_with_channel(db_session, make_channel):
+    from arm.notifications.outbox import dequeue_due
+    ch = make_channel(type="apprise",
+                      config={"type": "apprise", "url": "discord://x/y"},
+                      subscribed_events=["job.started"])
+    now = datetime.datetime.utcnow()
+    later = _outbox_row(db_session, ch.id, next_at=now - datetime.timedelta(minutes=1))
+    earlier = _outbox_row(db_session, ch.id, next_at=now - datetime.timedelta(minutes=5))
+    _outbox_row(db_session, ch.id, next_at=now - datetime.timedelta(minutes=9),
+                status="in_flight")
+
+    rows = dequeue_due(limit=10)
+    assert [(r.id, r.channel_id) for r in rows] == [(earlier.id, ch.id), (later.id, ch.id)]
+    assert dequeue_due(limit=10) == []
+
+
+def test_record_outcomes_applies_batch_in_one_commit(db_session, make_channel):
+    from sqlalchemy import event
+    from arm.database import db
+    from arm.notifications.outbox import record_outcomes
+    ch = make_channel(type="apprise",
+                      config={"type": "apprise", "url": "discord://x/y"},
+                      subscribed_events=["job.started"])
+    ok = _outbox_row(db_session, ch.id, status="in_flight")
+    retry = _outbox_row(db_session, ch.id, status="in_flight")
+    dead = _outbox_row(db_session, ch.id, status="in_flight")
+    commits = []
+    listener = lambda conn: commits.append(1)  # noqa: E731
+    event.listen(db.engine, "commit", listener)
+    try:
+        applied = record_outcomes([
+            (ok.id, True, None, False),
+            (retry.id, False, "503 terminal=false", False),
+            (dead.id, False, "404 terminal=true", True),
+            (99999, True, None, False),
+        ])
+    finally:
+        event.remove(db.engine, "commit", listener)
+    assert applied == 3
+    assert len(commits) == 1
+    for row in (ok, retry, dead):
+        db_session.refresh(row)
+    assert ok.status == "success" and ok.completed_at is not None
+    assert retry.status == "pending" and retry.attempts == 1
+    assert dead.status == "failed" and dead.last_error == "404 terminal=true"
+    db_session.refresh(ch)
+    assert ch.last_error == "404 terminal=true"
+    assert ch.last_success_at is not None
+
+
 def test_record_success(db_session, make_channel):
     from arm.notifications.outbox import record_success
     from arm.notifications.models import NotificationOutbox, NotificationChannel
@@ -161,6 +211,24 @@ def test_reap_in_flight_returns_stale_rows(db_session, make_channel):
     assert recent.status == "in_flight"
 
 
+def test_release_in_flight_returns_rows_to_pending(db_session, make_channel):
+    """Rows the dispatcher dequeued but never started go back to pending
+    on shutdown; rows that already finished are left alone."""
+    from arm.notifications.outbox import release_in_flight
+    ch = make_channel(type="apprise",
+                      config={"type": "apprise", "url": "discord://x/y"},
+                      subscribed_events=["job.started"])
+    queued = _outbox_row(db_session, ch.id, status="in_flight")
+    done = _outbox_row(db_session, ch.id, status="success")
+
+    assert release_in_flight([queued.id, done.id]) == 1
+    assert release_in_flight([]) == 0
+    db_session.refresh(queued)
+    db_session.refresh(done)
+    assert queued.status == "pending"
+    assert done.status == "success"
+
+
 def test_cleanup_completed_older_than_7_days(db_session, make_channel):
     from arm.notifications.outbox import cleanup_completed
     from arm.notifications.models import NotificationOutbox
@@ -0,0 +1,188 @@
+"""Tests for wake-on-enqueue (arm.notifications.wake) and the
+dispatcher's use of it.
+
+Sync tests driving their own event loop via asyncio.run, like the
+other dispatcher tests.
+"""
+import asyncio
+import datetime
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+import arm.config.config as cfg
+
+
+@pytest.fixture
+def dbfile(tmp_path):
+    """Point DBFILE (and so the wake socket) into a temp dir."""
+    path = tmp_path / "arm.db"
+    with patch.dict(cfg.arm_config, {"DBFILE": str(path)}):
+        yield path
+
+
+def _pending_row(db_session, channel_id, due_in=0.0):
+    from uuid import uuid4
+    from arm.notifications.models import NotificationOutbox
+    row = NotificationOutbox(
+        channel_id=channel_id,
+        event_key="job.started",
+        event_payload={
+            "event_key": "job.started",
+            "event_id": str(uuid4()),
+            "occurred_at": datetime.datetime.utcnow().isoformat(),
+            "job_id": 1, "job_title": "X", "job_disc_type": "dvd",
+            "job_imdb_id": None, "drive_mount": "/dev/sr0",
+        },
+        status="pending",
+        attempts=0,
+        next_attempt_at=datetime.datetime.utcnow() + datetime.timedelta(seconds=due_in),
+    )
+    db_session.add(row)
+    db_session.commit()
+    return row
+
+
+def test_socket_path_is_beside_dbfile(dbfile):
+    from arm.notifications import wake
+    assert wake.socket_path() == str(dbfile.parent / "outbox-wake.sock")
+
+
+def test_notify_without_listener_is_silent(dbfile):
+    from arm.notifications import wake
+    wake.notify()  # no socket bound: must not raise
+
+
+def test_datagram_from_other_process_sets_event(dbfile):
+    from arm.notifications import wake
+
+    async def _run():
+        waker = wake.Waker(wake.socket_path())
+        waker.open()
+        try:
+            assert waker.listening
+            # A ripper process has no local Waker; it sends a datagram.
+            with patch.object(wake, "_local", None):
+                wake.notify()
+                wake.notify()
+            await asyncio.wait_for(waker.event.wait(), timeout=1.0)
+        finally:
+            waker.close()
+        assert not (dbfile.parent / "outbox-wake.sock").exists()
+
+    asyncio.run(_run())
+
+
+def test_unusable_socket_path_falls_back_to_polling(tmp_path):
+    from arm.notifications import wake
+
+    async def _run():
+        waker = wake.Waker(str(tmp_path / "missing" / "outbox-wake.sock"))
+        waker.open()
+        try:
+            assert not waker.listening
+        finally:
+            waker.close()
+
+    asyncio.run(_run())
+
+
+def _run_dispatcher(dispatcher_mod, body, wake_socket=None):
+    """Run the loop (5 s tick, 60 s idle poll) while ``body`` runs."""
+    async def _run():
+        stop = asyncio.Event()
+        with patch.object(dispatcher_mod, "_TICK_INTERVAL_SECONDS", 5.0), \
+                patch.object(dispatcher_mod, "_IDLE_POLL_SECONDS", 60.0), \
+                patch.object(dispatcher_mod, "_CLEANUP_INTERVAL_SECONDS", 1e9):
+            task = asyncio.create_task(dispatcher_mod.run_dispatcher_loop(
+                stop_event=stop, wake_socket=wake_socket))
+            await asyncio.sleep(0.05)
+            try:
+                await body()
+            finally:
+                stop.set()
+                await asyncio.wait_for(task, timeout=2.0)
+
+    asyncio.run(_run())
+
+
+def test_enqueue_wakes_dispatcher_without_waiting_for_poll(
+    db_session, make_channel
+):
+    """A row enqueued from another thread is sent well inside the 5 s
+    poll interval, because the publisher wakes the loop."""
+    from arm.notifications import dispatcher as dispatcher_mod
+    from arm.notifications import wake
+
+    ch = make_channel(type="apprise",
+                      config={"type": "apprise", "url": "discord://x/y"},
+                      subscribed_events=["job.started"])
+    sent = threading.Event()
+
+    def send(**kwargs):
+        sent.set()
+        return True, None
+
+    async def body():
+        _pending_row(db_session, ch.id)
+        started = time.monotonic()
+        # publish_event runs in a request thread in the API process.
+        threading.Thread(target=wake.notify).start()
+        while not sent.is_set() and time.monotonic() - started < 3.0:
+            await asyncio.sleep(0.01)
+        assert sent.is_set()
+        assert time.monotonic() - started < 1.0
+
+    with patch.object(dispatcher_mod, "send_apprise", side_effect=send):
+        _run_dispatcher(dispatcher_mod, body)
+
+
+def test_idle_dispatcher_does_not_poll_while_socket_listens(
+    db_session, dbfile
+):
+    from arm.notifications import dispatcher as dispatcher_mod
+    from arm.notifications import wake
+
+    calls = {"n": 0}
+
+    def dequeue(limit):
+        calls["n"] += 1
+        return []
+
+    async def body():
+        wake.notify()       # one tick
+        await asyncio.sleep(0.5)
+
+    with patch.object(dispatcher_mod, "dequeue_due", side_effect=dequeue):
+        _run_dispatcher(dispatcher_mod, body, wake_socket=wake.socket_path())
+    assert calls["n"] == 1
+
+
+def test_dispatcher_sleeps_until_next_retry_is_due(db_session, make_channel):
+    """A row scheduled a moment ahead is sent when it falls due, without
+    another wake and without waiting for the poll interval."""
+    from arm.notifications import dispatcher as dispatcher_mod
+    from arm.notifications import wake
+
+    ch = make_channel(type="apprise",
+                      config={"type": "apprise", "url": "discord://x/y"},
+                      subscribed_events=["job.started"])
+    sent = threading.Event()
+
+    def send(**kwargs):
+        sent.set()
+        return True, None
+
+    async def body():
+        _pending_row(db_session, ch.id, due_in=0.3)
+        wake.notify()
+        started = time.monotonic()
+        while not sent.is_set() and time.monotonic() - started < 3.0:
+            await asyncio.sleep(0.01)
+        assert sent.is_set()
+        assert time.monotonic() - started < 1.5
+
+    with patch.object(dispatcher_mod, "send_apprise", side_effect=send):
+        _run_dispatcher(dispatcher_mod, body)
@@ -3144,6 +3144,97 @@ class TestApiJobsPaginated:
         assert len(data["jobs"]) == 2
 
 
+class TestApiJobsPaginatedCursor:
+    """Keyset pagination on /jobs/paginated via next_cursor/cursor."""
+
+    def _make_jobs(self, starts):
+        import unittest.mock
+        from arm.models.job import Job
+        from arm.database import db
+
+        jobs = []
+        for i, start in enumerate(starts):
+            with unittest.mock.patch.object(Job, 'parse_udev'), \
+                 unittest.mock.patch.object(Job, 'get_pid'):
+                j = Job('/dev/sr0')
+            j.title = f"Movie {i}"
+            j.status = "success"
+            j.disctype = "dvd"
+            j.start_time = start
+            db.session.add(j)
+            jobs.append(j)
+        db.session.commit()
+        return [j.job_id for j in jobs]
+
+    def _walk(self, client, query):
+        ids, cursor = [], None
+        while True:
+            url = f'/api/v1/jobs/paginated?per_page=2{query}'
+            if cursor:
+                url += f'&cursor={cursor}'
+            data = client.get(url).json()
+            ids += [j["job_id"] for j in data["jobs"]]
+            cursor = data["next_cursor"]
+            if not cursor:
+                return ids
+
+    def test_cursor_walk_matches_offset_order(self, client, app_context):
+        import datetime
+        base = datetime.datetime(2026, 1, 1)
+        # Duplicate start_time and a NULL exercise the job_id tiebreak.
+        self._make_jobs([base, base, base + datetime.timedelta(hours=1), None,
+                         base - datetime.timedelta(days=1)])
+
+        offset_ids = [
+            j["job_id"]
+            for j in client.get('/api/v1/jobs/paginated?per_page=100').json()["jobs"]
+        ]
+        assert self._walk(client, '') == offset_ids
+        asc_ids = [
+            j["job_id"]
+            for j in client.get('/api/v1/jobs/paginated?per_page=100&sort_dir=asc').json()["jobs"]
+        ]
+        assert self._walk(client, '&sort_dir=asc') == asc_ids
+
+    def test_inserts_do_not_shift_cursor_pages(self, client, app_context):
+        import datetime
+        base = datetime.datetime(2026, 1, 1)
+        self._make_jobs([base + datetime.timedelta(minutes=m) for m in range(4)])
+
+        first = client.get('/api/v1/jobs/paginated?per_page=2').json()
+        assert first["page"] == 1
+        seen = [j["job_id"] for j in first["jobs"]]
+        # A new rip starts between page fetches.
+        self._make_jobs([base + datetime.timedelta(days=1)])
+        second = client.get(
+            f'/api/v1/jobs/paginated?per_page=2&cursor={first["next_cursor"]}'
+        ).json()
+        assert second["page"] is None
+        assert second["next_cursor"] is None
+        assert not set(seen) & {j["job_id"] for j in second["jobs"]}
+        assert len(second["jobs"]) == 2
+
+    def test_cursor_respects_filters(self, client, sample_job, app_context):
+        import datetime
+        self._make_jobs([datetime.datetime(2026, 1, 1, h) for h in range(3)])
+        ids = self._walk(client, '&disctype=dvd')
+        assert len(ids) == 3
+        assert sample_job.job_id not in ids  # sample_job is a bluray
+
+    def test_no_cursor_for_other_sorts(self, client, app_context):
+        import datetime
+        self._make_jobs([datetime.datetime(2026, 1, 1, h) for h in range(3)])
+        data = client.get('/api/v1/jobs/paginated?per_page=2&sort_by=title').json()
+        assert data["next_cursor"] is None
+        response = client.get('/api/v1/jobs/paginated?sort_by=title&cursor=abc')
+        assert response.status_code == 400
+
+    def test_invalid_cursor(self, client, app_context):
+        response = client.get('/api/v1/jobs/paginated?cursor=not-a-cursor')
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
+
 class TestApiJobTrackCounts:
     """Test GET /api/v1/jobs/<id>/track-counts endpoint."""
 
@@ -3224,9 +3315,110 @@ class TestApiJobTrackCounts:
         assert response.json() == {"total": 2, "ripped": 1}
 
 
+class TestTrackCountsByJob:
+    """svc_jobs.track_counts_by_job must agree with per-job track_counts."""
+
+    @pytest.mark.parametrize("disctype,minlength", [
+        ("bluray", "600"), ("bluray", "0"), ("bluray", "not-a-number"),
+        ("bluray", None), ("music", "600"), ("bluray", "600.0"), ("bluray", ""),
+        ("bluray", " 900 "), ("bluray", "-5"),
+    ])
+    def test_matches_track_counts(self, sample_job, app_context, disctype, minlength):
+        from arm.database import db
+        from arm.services import jobs as svc_jobs
+        sample_job.disctype = disctype
+        sample_job.config.MINLENGTH = minlength
+        db.session.commit()
+        TestApiJobTrackCounts()._add_tracks(sample_job.job_id, [
+            (3600, True, True), (300, True, True), (1800, False, True),
+            (3600, True, False), (None, False, None),
+        ])
+
+        expected = svc_jobs.track_counts(sample_job)
+        assert svc_jobs.track_counts_by_job([sample_job.job_id]) == {sample_job.job_id: expected}
+
+    def test_jobs_without_tracks_are_zero(self, sample_job, app_context):
+        from arm.services import jobs as svc_jobs
+        assert svc_jobs.track_counts_by_job([sample_job.job_id]) == {
+            sample_job.job_id: {"total": 0, "ripped": 0},
+        }
+        assert svc_jobs.track_counts_by_job([]) == {}
+
+
+class TestJobListQueryCount:
+    """Job-list endpoints issue a constant number of statements per page."""
+
+    def _make_jobs(self, count):
+        from arm.database import db
+        from arm.models.config import Config
+        from arm.models.expected_title import ExpectedTitle
+        from arm.models.job import Job
+        from arm.models.track import Track
+
+        for n in range(count):
+            with unittest.mock.patch.object(Job, 'parse_udev'), \
+                 unittest.mock.patch.object(Job, 'get_pid'):
+                job = Job(f'/dev/sr{n}')
+            job.status = "video_ripping"
+            job.disctype = "music" if n % 2 else "dvd"
+            job.title = f"Job {n}"
+            db.session.add(job)
+            db.session.flush()
+            db.session.add(Config({"MINLENGTH": "600"}, job.job_id))
+            db.session.add(ExpectedTitle(job_id=job.job_id, source="manual", title=job.title))
+            for i in range(3):
+                db.session.add(Track(job.job_id, str(i), 3600, "16:9", 23.976, False,
+                                     "MakeMKV", f"t{i}", f"t{i}.mkv"))
+        db.session.commit()
+        db.session.expire_all()
+
+    def _count_statements(self, client, url):
+        from sqlalchemy import event
+        from arm.database import db
+
+        statements = []
+
+        def _record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", _record)
+        try:
+            response = client.get(url)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", _record)
+        assert response.status_code == 200
+        return len(statements), response.json()
+
+    @pytest.mark.parametrize("url", [
+        "/api/v1/jobs/active",
+        "/api/v1/jobs/paginated?per_page=50",
+        "/api/v1/jobs",
+    ])
+    def test_statements_do_not_grow_with_jobs(self, client, app_context, url):
+        from arm.database import db
+
+        self._make_jobs(2)
+        small, _ = self._count_statements(client, url)
+        self._make_jobs(20)
+        db.session.remove()
+        large, body = self._count_statements(client, url)
+
+        assert large == small
+        if "jobs" in body:
+            assert len(body["jobs"]) == 22
+            assert body["jobs"][0]["track_counts"]["total"] in (0, 3)
+
+
 class TestApiJobsStats:
     """Test GET /api/v1/jobs/stats endpoint."""
 
+    @pytest.fixture(autouse=True)
+    def _clear_stats_cache(self):
+        from arm.api.v1.jobs import _invalidate_stats
+        _invalidate_stats()
+        yield
+        _invalidate_stats()
+
     def _make_jobs(self, statuses):
         """Helper: spin up Job rows in the given statuses."""
         import unittest.mock
@@ -3316,6 +3508,39 @@ class TestApiJobsStats:
         data = client.get('/api/v1/jobs/stats?days=7').json()
         assert data["total"] == 1
 
+    def test_stats_single_statement_then_cached(self, client, app_context):
+        from sqlalchemy import event
+        from arm.database import db
+        self._make_jobs(["success", "fail", "video_ripping"])
+        statements = []
+
+        def _record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", _record)
+        try:
+            first = client.get('/api/v1/jobs/stats').json()
+            second = client.get('/api/v1/jobs/stats').json()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", _record)
+        assert first == second == {"total": 3, "active": 1, "waiting": 0, "success": 1, "fail": 1}
+        assert len(statements) == 1
+        assert "GROUP BY" in statements[0]
+
+    def test_stats_cache_cleared_on_status_change(self, client, app_context):
+        from arm.database import db
+        jobs = self._make_jobs(["video_ripping"])
+        assert client.get('/api/v1/jobs/stats').json()["active"] == 1
+        jobs[0].status = "success"
+        db.session.commit()
+        data = client.get('/api/v1/jobs/stats').json()
+        assert data["active"] == 0 and data["success"] == 1
+
+    def test_stats_cache_cleared_on_new_job(self, client, app_context):
+        assert client.get('/api/v1/jobs/stats').json()["total"] == 0
+        self._make_jobs(["success"])
+        assert client.get('/api/v1/jobs/stats').json()["total"] == 1
+
 
 class TestApiActiveJobsRippableFilter:
     """Verify /jobs/active and /jobs/{id}/detail use the rippable-track filter."""
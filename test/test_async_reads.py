@@ -0,0 +1,159 @@
+"""Tests for the async read path (db.run_read and the async read engine)."""
+import asyncio
+import threading
+import unittest.mock
+
+import pytest
+import sqlalchemy as sa
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    """A real SQLite file, so the async engine is created alongside the sync one."""
+    from arm.database import db
+
+    db.dispose()
+    db.init_engine(f"sqlite:///{tmp_path / 'arm.db'}")
+    db.create_all()
+    yield db
+    db.dispose()
+
+
+def _make_job(db, status="video_ripping", title="Heat"):
+    from arm.models.job import Job
+
+    with unittest.mock.patch.object(Job, 'parse_udev'), \
+         unittest.mock.patch.object(Job, 'get_pid'):
+        job = Job('/dev/sr0')
+    job.status = status
+    job.title = title
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+class TestAsyncUrl:
+    @pytest.mark.parametrize("uri, expected", [
+        ("sqlite:////home/arm/db/arm.db", "sqlite+aiosqlite:////home/arm/db/arm.db"),
+        ("postgresql://arm:pw@db/arm", "postgresql+asyncpg://arm:pw@db/arm"),
+        ("postgresql+psycopg2://arm:pw@db/arm", "postgresql+asyncpg://arm:pw@db/arm"),
+    ])
+    def test_driver_mapping(self, uri, expected):
+        from arm.database import _async_url
+        assert _async_url(uri).render_as_string(hide_password=False) == expected
+
+    @pytest.mark.parametrize("uri", ["sqlite:///:memory:", "sqlite://", "mysql://arm@db/arm"])
+    def test_no_async_engine(self, uri):
+        from arm.database import _async_url
+        assert _async_url(uri) is None
+
+
+class TestRunRead:
+    def test_async_path_runs_on_event_loop_thread(self, file_db):
+        from arm.models.job import Job
+
+        _make_job(file_db)
+        assert file_db.async_engine is not None
+
+        async def main():
+            loop_thread = threading.get_ident()
+
+            def read(session):
+                return session.query(Job).count(), threading.get_ident() == loop_thread
+            return await file_db.run_read(read)
+
+        assert asyncio.run(main()) == (1, True)
+
+    def test_build_runs_off_the_event_loop(self, file_db):
+        async def main():
+            loop_thread = threading.get_ident()
+
+            def fetch(session):
+                return threading.get_ident() == loop_thread
+
+            def build(fetched_on_loop):
+                return fetched_on_loop, threading.get_ident() != loop_thread
+            return await file_db.run_read(fetch, build=build)
+
+        assert asyncio.run(main()) == (True, True)
+
+    def test_build_on_fallback_path(self, app_context):
+        _, db = app_context
+        assert asyncio.run(db.run_read(lambda session: 20, build=lambda n: n + 1)) == 21
+
+    def test_async_engine_is_read_only(self, file_db):
+        from arm.models.job import Job
+
+        def write(session):
+            session.execute(sa.update(Job).values(title="x"))
+
+        with pytest.raises(sa.exc.OperationalError, match="readonly"):
+            asyncio.run(file_db.run_read(write))
+
+    def test_in_memory_falls_back_to_worker_thread(self, app_context):
+        _, db = app_context
+        assert db.async_engine is None
+        main_thread = threading.get_ident()
+        other = asyncio.run(db.run_read(lambda session: threading.get_ident() != main_thread))
+        assert other is True
+
+    def test_missing_driver_falls_back(self, tmp_path):
+        from arm.database import db
+
+        db.dispose()
+        with unittest.mock.patch("arm.database.create_async_engine",
+                                 side_effect=ImportError("No module named 'aiosqlite'")):
+            db.init_engine(f"sqlite:///{tmp_path / 'arm.db'}")
+        try:
+            db.create_all()
+            assert db.async_engine is None
+            assert asyncio.run(db.run_read(lambda session: 42)) == 42
+        finally:
+            db.dispose()
+
+
+class TestEndpointsOnAsyncEngine:
+    def test_hot_reads_see_sync_writes(self, file_db):
+        from arm.api import conditional
+        from arm.api.v1 import jobs as jobs_api
+        from arm.app import app
+
+        conditional.invalidate()
+        jobs_api._invalidate_stats()
+        _make_job(file_db)
+        _make_job(file_db, status="success", title="Ronin")
+        with TestClient(app, raise_server_exceptions=True) as client:
+            active = client.get('/api/v1/jobs/active').json()["jobs"]
+            assert [j["title"] for j in active] == ["Heat"]
+            assert active[0]["track_counts"] == {"total": 0, "ripped": 0}
+
+            page = client.get('/api/v1/jobs/paginated?per_page=1').json()
+            assert page["total"] == 2 and page["next_cursor"]
+            rest = client.get(f'/api/v1/jobs/paginated?per_page=1&cursor={page["next_cursor"]}').json()
+            assert {page["jobs"][0]["title"], rest["jobs"][0]["title"]} == {"Heat", "Ronin"}
+
+            stats = client.get('/api/v1/jobs/stats').json()
+            assert stats["total"] == 2 and stats["active"] == 1 and stats["success"] == 1
+
+            assert client.get('/api/v1/drives/with-jobs').json() == {"drives": []}
+        conditional.invalidate()
+
+    def test_jobs_serialised_from_rows(self, file_db):
+        """/jobs/active builds JobContract output from fetched rows, not
+        session-bound ORM objects; expected titles come along."""
+        from arm.api import conditional
+        from arm.app import app
+        from arm.models.expected_title import ExpectedTitle
+
+        conditional.invalidate()
+        job = _make_job(file_db)
+        file_db.session.add(ExpectedTitle(job_id=job.job_id, source="manual", title="Heat"))
+        file_db.session.commit()
+        with TestClient(app, raise_server_exceptions=True) as client:
+            active = client.get('/api/v1/jobs/active').json()["jobs"]
+            page = client.get('/api/v1/jobs/paginated').json()["jobs"]
+        assert active == page
+        assert active[0]["status"] == "video_ripping"
+        assert [t["title"] for t in active[0]["expected_titles"]] == ["Heat"]
+        conditional.invalidate()
@@ -0,0 +1,193 @@
+"""Tests for ETag / If-None-Match handling on polled endpoints (arm/api/conditional.py)."""
+import unittest.mock
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+
+@pytest.fixture
+def client(app_context):
+    """FastAPI test client."""
+    from arm.app import app
+    with TestClient(app, raise_server_exceptions=True) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def _fresh_etags():
+    from arm.api import conditional
+    from arm.api.v1 import jobs as jobs_api
+    conditional.invalidate()
+    jobs_api._invalidate_stats()
+    yield
+    conditional.invalidate()
+
+
+def _make_job(db, status="video_ripping"):
+    from arm.models.job import Job
+
+    with unittest.mock.patch.object(Job, 'parse_udev'), \
+         unittest.mock.patch.object(Job, 'get_pid'):
+        job = Job('/dev/sr0')
+    job.status = status
+    job.title = "Heat"
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+class _StatementCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+class TestEtagSemantics:
+    def test_200_carries_etag(self, client, app_context):
+        _make_job(app_context[1])
+        response = client.get('/api/v1/jobs/active')
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('"')
+        assert response.headers["cache-control"] == "no-cache"
+
+    def test_matching_if_none_match_is_304_without_db(self, client, app_context):
+        _, db = app_context
+        _make_job(db)
+        etag = client.get('/api/v1/jobs/active').headers["etag"]
+
+        with _StatementCounter(db.engine) as counter:
+            response = client.get('/api/v1/jobs/active', headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert counter.count == 0
+
+    def test_weak_and_listed_etags_match(self, client, app_context):
+        _make_job(app_context[1])
+        etag = client.get('/api/v1/jobs/active').headers["etag"]
+        for header in (f"W/{etag}", f'"other", {etag}', "*"):
+            response = client.get('/api/v1/jobs/active', headers={"If-None-Match": header})
+            assert response.status_code == 304, header
+
+    def test_stale_etag_gets_full_response(self, client, app_context):
+        _make_job(app_context[1])
+        response = client.get('/api/v1/jobs/active', headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
+        assert response.json()["jobs"]
+
+    def test_job_write_changes_etag(self, client, app_context):
+        _, db = app_context
+        job = _make_job(db)
+        etag = client.get('/api/v1/jobs/active').headers["etag"]
+
+        job.title = "Ronin"
+        db.session.commit()
+        response = client.get('/api/v1/jobs/active', headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json()["jobs"][0]["title"] == "Ronin"
+
+    def test_unrelated_commit_keeps_shortcut(self, client, app_context):
+        from arm.models.notifications import Notifications
+
+        _, db = app_context
+        _make_job(db)
+        etag = client.get('/api/v1/jobs/active').headers["etag"]
+        db.session.add(Notifications("t", "m"))
+        db.session.commit()
+        with _StatementCounter(db.engine) as counter:
+            response = client.get('/api/v1/jobs/active', headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert counter.count == 0
+
+    def test_expired_trust_reruns_endpoint_but_still_304(self, client, app_context, monkeypatch):
+        from arm.api import conditional
+
+        _, db = app_context
+        _make_job(db)
+        etag = client.get('/api/v1/jobs/active').headers["etag"]
+        monkeypatch.setattr(conditional, "_TRUST_SECONDS", -1)
+        with _StatementCounter(db.engine) as counter:
+            response = client.get('/api/v1/jobs/active', headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert counter.count > 0
+
+    def test_query_string_is_part_of_key(self, client, app_context):
+        _make_job(app_context[1], status="success")
+        etag = client.get('/api/v1/jobs/stats').headers["etag"]
+        response = client.get('/api/v1/jobs/stats?search=zzz', headers={"If-None-Match": etag})
+        assert response.status_code == 200
+
+
+class TestEtagCoverage:
+    def test_drives_with_jobs(self, client, app_context):
+        etag = client.get('/api/v1/drives/with-jobs').headers["etag"]
+        response = client.get('/api/v1/drives/with-jobs', headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_progress_state_uses_content_hash(self, client, app_context):
+        job = _make_job(app_context[1])
+        url = f'/api/v1/jobs/{job.job_id}/progress-state'
+        etag = client.get(url).headers["etag"]
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    def test_system_stats_content_hash(self, client, app_context):
+        with unittest.mock.patch("arm.api.v1.system.psutil") as psutil:
+            psutil.cpu_percent.return_value = 5.0
+            psutil.sensors_temperatures.return_value = {}
+            psutil.virtual_memory.return_value = unittest.mock.Mock(
+                total=8 << 30, used=4 << 30, available=4 << 30, percent=50.0)
+            etag = client.get('/api/v1/system/stats').headers["etag"]
+            assert client.get('/api/v1/system/stats',
+                              headers={"If-None-Match": etag}).status_code == 304
+            psutil.cpu_percent.return_value = 6.0
+            assert client.get('/api/v1/system/stats',
+                              headers={"If-None-Match": etag}).status_code == 200
+
+    def test_errors_and_other_endpoints_untouched(self, client, app_context):
+        assert "etag" not in client.get('/api/v1/jobs/999/progress-state').headers
+        assert "etag" not in client.get('/api/v1/drives').headers
+
+
+class TestDbVersion:
+    def test_write_from_another_process_changes_version(self, tmp_path):
+        import sqlite3
+        from arm.api.conditional import db_version
+        from arm.database import db
+
+        path = tmp_path / "arm.db"
+        db.dispose()
+        db.init_engine(f"sqlite:///{path}")
+        try:
+            db.create_all()
+            before = db_version()
+            assert before == db_version()
+            # The ripper writes through its own connection, not this session.
+            conn = sqlite3.connect(path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "INSERT INTO job (guid, status, title) VALUES ('g', 'success', 'Heat')")
+            conn.commit()
+            conn.close()
+            assert db_version() != before
+        finally:
+            db.dispose()
+
+    def test_non_sqlite_has_no_version(self):
+        from arm.api import conditional
+
+        engine = unittest.mock.Mock()
+        engine.dialect.name = "postgresql"
+        with unittest.mock.patch.object(conditional.db, "_engine", engine):
+            assert conditional.db_version() is None
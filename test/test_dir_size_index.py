@@ -0,0 +1,109 @@
+"""Tests for arm.services.dir_size_index and its use by the file browser."""
+import os
+import time
+import unittest.mock
+
+import pytest
+
+import arm.config.config as cfg
+from arm.services import dir_size_index, file_browser
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    """Fresh in-memory index; saved beside a temp DBFILE."""
+    monkeypatch.setattr(dir_size_index, "_index", dir_size_index._Index())
+    monkeypatch.setattr(dir_size_index, "_SETTLE_SECONDS", 0.05)
+    with unittest.mock.patch.dict(cfg.arm_config, {"DBFILE": str(tmp_path / "arm.db")}):
+        yield dir_size_index
+    dir_size_index.stop_background_walker()
+
+
+@pytest.fixture
+def library(tmp_path):
+    root = tmp_path / "completed"
+    for title in ("Heat (1995)", "Ronin (1998)"):
+        (root / title / "extras").mkdir(parents=True)
+        (root / title / "movie.mkv").write_bytes(b"x" * 1000)
+        (root / title / "extras" / "trailer.mkv").write_bytes(b"x" * 100)
+    return root
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_size_of_rescans_only_what_changed(index, library):
+    assert index.size_of(str(library)) == 2200
+
+    (library / "Heat (1995)" / "extras" / "deleted.mkv").write_bytes(b"x" * 50)
+    index.invalidate(str(library / "Heat (1995)" / "extras"))
+    scanned = []
+    real_scandir = os.scandir
+
+    def counting_scandir(path):
+        scanned.append(os.path.basename(path))
+        return real_scandir(path)
+
+    with unittest.mock.patch.object(dir_size_index.os, "scandir", counting_scandir):
+        assert index.size_of(str(library)) == 2250
+    assert sorted(scanned) == ["Heat (1995)", "completed", "extras"]
+
+
+def test_removed_subtree_is_forgotten(index, library):
+    import shutil
+    index.size_of(str(library))
+    shutil.rmtree(library / "Ronin (1998)")
+    index.invalidate(str(library))
+    assert index.size_of(str(library)) == 1100
+    assert not any("Ronin" in p for p in index._index.entries)
+
+
+def test_lookup_is_served_by_the_walker(index, library):
+    heat = library / "Heat (1995)"
+    mtime = heat.stat().st_mtime
+    assert index.lookup(str(heat), mtime) == (None, True)
+
+    index.start_background_walker([])
+    assert _wait_for(lambda: index.lookup(str(heat), mtime) == (1100, False))
+
+
+def test_inotify_change_refreshes_size(index, library):
+    index.start_background_walker([str(library)])
+    assert _wait_for(lambda: str(library) in index._index.entries)
+    if index._index.inotify is None:
+        pytest.skip("inotify unavailable")
+
+    (library / "Ronin (1998)" / "extras" / "featurette.mkv").write_bytes(b"x" * 7)
+    ronin = library / "Ronin (1998)"
+    assert _wait_for(
+        lambda: index.lookup(str(ronin), ronin.stat().st_mtime) == (1107, False))
+
+
+def test_index_survives_restart_as_stale(index, library, tmp_path):
+    index.start_background_walker([str(library)])
+    assert _wait_for(lambda: str(library) in index._index.entries)
+    index.stop_background_walker()
+    assert (tmp_path / "dir-size-index.json").exists()
+
+    index._index = dir_size_index._Index()
+    index._load()
+    heat = library / "Heat (1995)"
+    with unittest.mock.patch.object(dir_size_index, "MAX_AGE", 0):
+        assert index.lookup(str(heat), heat.stat().st_mtime) == (1100, True)
+
+
+def test_listing_reports_cached_size_and_stale_flag(index, library):
+    with unittest.mock.patch.object(file_browser, "get_allowed_roots",
+                                    return_value={"completed": str(library)}):
+        first = file_browser.list_directory(str(library))["entries"]
+        assert [(e["size"], e["size_stale"]) for e in first] == [(0, True), (0, True)]
+
+        index.size_of(str(library))
+        second = file_browser.list_directory(str(library))["entries"]
+        assert [(e["size"], e["size_stale"]) for e in second] == [(1100, False), (1100, False)]
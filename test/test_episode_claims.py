@@ -0,0 +1,268 @@
+"""Tests for the episode-claim ledger (arm.services.episode_claims)."""
+import os
+import unittest.mock
+
+import pytest
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config as AlembicConfig
+
+
+def _make_job(db, tvdb_id=300, season="1", disc_number=None, devpath='/dev/sr0'):
+    from arm.models.job import Job
+
+    with unittest.mock.patch.object(Job, 'parse_udev'), \
+         unittest.mock.patch.object(Job, 'get_pid'):
+        job = Job(devpath)
+    job.tvdb_id = tvdb_id
+    job.season = season
+    job.disc_number = disc_number
+    job.title = "Show"
+    job.video_type = "series"
+    db.session.add(job)
+    db.session.flush()
+    return job
+
+
+def _add_tracks(db, job, episodes):
+    from arm.models.track import Track
+
+    tracks = []
+    for i, ep in enumerate(episodes):
+        t = Track(job.job_id, str(i), 3600, "16:9", 23.976, False, "mkv", f"t{i}", f"t{i}.mkv")
+        t.episode_number = ep
+        tracks.append(t)
+    db.session.add_all(tracks)
+    db.session.flush()
+    return tracks
+
+
+class TestSyncJobClaims:
+    """sync_job_claims keeps the ledger in step with Track.episode_number."""
+
+    def test_writes_one_claim_per_numbered_track(self, app_context):
+        from arm.database import db
+        from arm.models.episode_claim import EpisodeClaim
+        from arm.services.episode_claims import sync_job_claims
+
+        job = _make_job(db, disc_number=2)
+        _add_tracks(db, job, ["1", "2", None, "bonus"])
+        assert sync_job_claims(job) == 2
+        db.session.commit()
+
+        claims = EpisodeClaim.query.order_by(EpisodeClaim.episode_number).all()
+        assert [(c.tvdb_id, c.season, c.episode_number, c.disc_number) for c in claims] == [
+            (300, 1, 1, 2), (300, 1, 2, 2),
+        ]
+
+    def test_resync_replaces_previous_claims(self, app_context):
+        from arm.database import db
+        from arm.models.episode_claim import EpisodeClaim
+        from arm.services.episode_claims import sync_job_claims
+
+        job = _make_job(db)
+        tracks = _add_tracks(db, job, ["1", "2"])
+        sync_job_claims(job)
+        tracks[1].episode_number = "3"
+        sync_job_claims(job)
+        db.session.commit()
+
+        assert {c.episode_number for c in EpisodeClaim.query} == {1, 3}
+
+    def test_season_auto_used_when_season_unset(self, app_context):
+        from arm.database import db
+        from arm.models.episode_claim import EpisodeClaim
+        from arm.services.episode_claims import sync_job_claims
+
+        job = _make_job(db, season=None)
+        job.season_auto = "4"
+        _add_tracks(db, job, ["1"])
+        sync_job_claims(job)
+
+        assert EpisodeClaim.query.one().season == 4
+
+    def test_job_without_tvdb_id_holds_no_claims(self, app_context):
+        from arm.database import db
+        from arm.models.episode_claim import EpisodeClaim
+        from arm.services.episode_claims import sync_job_claims
+
+        job = _make_job(db)
+        _add_tracks(db, job, ["1"])
+        sync_job_claims(job)
+        job.tvdb_id = None
+        assert sync_job_claims(job) == 0
+        assert EpisodeClaim.query.count() == 0
+
+    def test_release_job_claims(self, app_context):
+        from arm.database import db
+        from arm.models.episode_claim import EpisodeClaim
+        from arm.services.episode_claims import release_job_claims, sync_job_claims
+
+        job = _make_job(db)
+        _add_tracks(db, job, ["1", "2"])
+        sync_job_claims(job)
+        release_job_claims(job.job_id)
+        db.session.commit()
+        assert EpisodeClaim.query.count() == 0
+
+    def test_track_can_hold_only_one_claim(self, app_context):
+        from sqlalchemy.exc import IntegrityError
+
+        from arm.database import db
+        from arm.models.episode_claim import EpisodeClaim
+
+        job = _make_job(db)
+        track = _add_tracks(db, job, ["1"])[0]
+        for ep in (1, 2):
+            db.session.add(EpisodeClaim(
+                tvdb_id=300, season=1, episode_number=ep,
+                job_id=job.job_id, track_id=track.track_id,
+            ))
+        with pytest.raises(IntegrityError):
+            db.session.flush()
+        db.session.rollback()
+
+
+class TestCrossDiscLedgerLookup:
+    """get_excluded_episodes reads claims from sibling discs."""
+
+    def test_same_disc_number_not_excluded(self, app_context):
+        from arm.database import db
+        from arm.services.episode_claims import sync_job_claims
+        from arm.services.matching.cross_disc import get_excluded_episodes
+
+        disc1 = _make_job(db, disc_number=1)
+        rerun = _make_job(db, disc_number=1, devpath='/dev/sr1')
+        disc2 = _make_job(db, disc_number=2, devpath='/dev/sr2')
+        _add_tracks(db, disc1, ["1", "2"])
+        sync_job_claims(disc1)
+        db.session.commit()
+
+        assert get_excluded_episodes(rerun, season=1) == set()
+        assert get_excluded_episodes(disc2, season=1) == {1, 2}
+
+    def test_other_season_not_excluded(self, app_context):
+        from arm.database import db
+        from arm.services.episode_claims import sync_job_claims
+        from arm.services.matching.cross_disc import get_excluded_episodes
+
+        s1 = _make_job(db, season="1")
+        s2 = _make_job(db, season="2", devpath='/dev/sr1')
+        _add_tracks(db, s1, ["1", "2"])
+        sync_job_claims(s1)
+        db.session.commit()
+
+        assert get_excluded_episodes(s2, season=2) == set()
+        assert get_excluded_episodes(s2) == {1, 2}
+
+
+class TestClaimsFollowJobEdits:
+    """Edits to the job columns a claim copies rewrite the job's claims."""
+
+    def _claims(self, job_id):
+        from arm.models.episode_claim import EpisodeClaim
+
+        return sorted(
+            (c.tvdb_id, c.season, c.episode_number, c.disc_number)
+            for c in EpisodeClaim.query.filter_by(job_id=job_id)
+        )
+
+    def test_title_edit_of_season_and_disc(self, app_context):
+        from arm.api.v1.jobs import update_job_title
+        from arm.database import db
+        from arm.services.episode_claims import sync_job_claims
+
+        job = _make_job(db, disc_number=1)
+        _add_tracks(db, job, ["1", "2"])
+        sync_job_claims(job)
+        db.session.commit()
+
+        assert update_job_title(job.job_id, {"season": "2", "disc_number": "3"})["success"]
+        assert self._claims(job.job_id) == [(300, 2, 1, 3), (300, 2, 2, 3)]
+
+    def test_preview_match_claims_resolved_tvdb_id(self, app_context):
+        from arm.database import db
+        from arm.services.matching.base import MatchResult
+        from arm.services.tvdb_sync import match_episodes_for_api
+
+        job = _make_job(db, tvdb_id=None)
+        _add_tracks(db, job, ["1", "2"])
+        db.session.commit()
+        assert self._claims(job.job_id) == []
+
+        result = MatchResult(matcher="tvdb", season=1, tvdb_id=300)
+        with unittest.mock.patch("arm.services.matching.match_job", return_value=result):
+            match_episodes_for_api(job, apply=False)
+        assert self._claims(job.job_id) == [(300, 1, 1, None), (300, 1, 2, None)]
+
+    def test_failed_claim_sync_rolls_back_match(self, app_context):
+        from arm.database import db
+        from arm.models.track import Track
+        from arm.services import episode_claims
+        from arm.services.matching.base import MatchResult, TrackMatch
+        from arm.services.tvdb_sync import match_episodes_sync
+
+        job = _make_job(db)
+        _add_tracks(db, job, [None])
+        db.session.commit()
+
+        result = MatchResult(matcher="tvdb", season=1, tvdb_id=300, match_count=1,
+                             matches=[TrackMatch("0", 5, "Pilot")])
+        with unittest.mock.patch("arm.services.matching.match_job", return_value=result), \
+                unittest.mock.patch.object(episode_claims, "sync_job_claims",
+                                           side_effect=RuntimeError("locked")):
+            assert match_episodes_sync(job) is False
+        db.session.expire_all()
+        assert Track.query.filter_by(job_id=job.job_id).one().episode_number is None
+
+
+_MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'arm', 'migrations',
+)
+_BEFORE = 'y0z1a2b3c4'
+_AFTER = 'z1a2b3c4d5'
+
+
+def _make_config(db_path):
+    cfg = AlembicConfig()
+    cfg.set_main_option('script_location', _MIGRATIONS_DIR)
+    cfg.set_main_option('sqlalchemy.url', f'sqlite:///{db_path}')
+    return cfg
+
+
+class TestEpisodeClaimMigration:
+    """The z1a2b3c4d5 migration creates the ledger and backfills it."""
+
+    def test_backfill_from_existing_tracks(self, tmp_path):
+        db_path = tmp_path / 'test.db'
+        cfg = _make_config(str(db_path))
+        command.upgrade(cfg, _BEFORE)
+        engine = sa.create_engine(f'sqlite:///{db_path}')
+        with engine.begin() as conn:
+            conn.execute(sa.text(
+                "INSERT INTO job (job_id, status, disctype, guid, tvdb_id, season_auto, disc_number) "
+                "VALUES (1, 'success', 'dvd', 'g-1', 100, '2', 1), "
+                "(2, 'success', 'dvd', 'g-2', NULL, '1', NULL)"
+            ))
+            conn.execute(sa.text(
+                "INSERT INTO track (track_id, job_id, episode_number) "
+                "VALUES (10, 1, '3'), (11, 1, 'bonus'), (12, 1, NULL), (13, 2, '4')"
+            ))
+        engine.dispose()
+
+        command.upgrade(cfg, _AFTER)
+
+        insp = sa.inspect(engine)
+        index_names = {ix['name'] for ix in insp.get_indexes('episode_claim')}
+        assert {'ux_episode_claim_track_id', 'ix_episode_claim_series_season'} <= index_names
+        with engine.connect() as conn:
+            rows = conn.execute(sa.text(
+                "SELECT tvdb_id, season, episode_number, job_id, track_id, disc_number "
+                "FROM episode_claim"
+            )).fetchall()
+        assert [tuple(r) for r in rows] == [(100, 2, 3, 1, 10, 1)]
+
+        command.downgrade(cfg, _BEFORE)
+        assert 'episode_claim' not in sa.inspect(engine).get_table_names()
+        engine.dispose()
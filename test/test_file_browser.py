@@ -114,6 +114,58 @@ class TestGetRoots:
                 assert r['key'] != 'raw' or os.path.isdir(r['path'])
 
 
+# ---------------------------------------------------------------------------
+# mount table
+# ---------------------------------------------------------------------------
+
+class TestMountTable:
+    MOUNTS = {
+        '/mnt/media': file_browser._MountInfo('/srv/media', False),
+        '/mnt/media/raw': file_browser._MountInfo('/srv/raw', True),
+        '/mnt/med': file_browser._MountInfo('/srv/med', True),
+    }
+
+    def test_longest_prefix_by_component(self):
+        table = file_browser._MountTable(self.MOUNTS)
+        assert table.find('/mnt/media/raw/Disc 1')[0] == '/mnt/media/raw'
+        assert table.find('/mnt/media/raw')[0] == '/mnt/media/raw'
+        assert table.find('/mnt/media/rawx')[0] == '/mnt/media'
+        assert table.find('/mnt/medi') == ('', None)
+        assert table.find('/') == ('', None)
+
+    @pytest.fixture
+    def reads(self, monkeypatch):
+        """Count mountinfo parses; mount changes are signalled via ``poll``."""
+        poll = unittest.mock.Mock(return_value=[])
+        monkeypatch.setattr(file_browser, '_mount_table', None)
+        monkeypatch.setattr(file_browser, '_mount_poller', unittest.mock.Mock(poll=poll))
+        monkeypatch.setattr(file_browser, '_mount_poll_failed', False)
+        read = unittest.mock.Mock(return_value=self.MOUNTS)
+        monkeypatch.setattr(file_browser, '_read_host_mounts', read)
+        read.poll = poll
+        return read
+
+    def test_table_reread_only_after_mount_change(self, reads):
+        assert file_browser.is_path_readonly('/mnt/media/raw/x') is True
+        assert file_browser.is_path_readonly('/mnt/media/x') is False
+        assert reads.call_count == 1
+
+        reads.poll.return_value = [(3, 10)]  # POLLPRI | POLLERR
+        reads.return_value = {'/mnt/media': file_browser._MountInfo('/srv/media', True)}
+        assert file_browser.is_path_readonly('/mnt/media/x') is True
+        assert reads.call_count == 2
+
+    def test_ttl_when_mounts_cannot_be_polled(self, reads, monkeypatch):
+        monkeypatch.setattr(file_browser, '_mount_poller', None)
+        monkeypatch.setattr(file_browser, '_mount_poll_failed', True)
+        file_browser.is_path_readonly('/mnt/media')
+        file_browser.is_path_readonly('/mnt/media')
+        assert reads.call_count == 1
+        monkeypatch.setattr(file_browser, 'MOUNT_TABLE_TTL', -1)
+        file_browser.is_path_readonly('/mnt/media')
+        assert reads.call_count == 2
+
+
 # ---------------------------------------------------------------------------
 # validate_path
 # ---------------------------------------------------------------------------
@@ -264,6 +316,107 @@ class TestListDirectory:
         assert by_name["Serial Mom (1994)"]["importable"] is False
 
 
+class TestListingQuery:
+    @pytest.fixture
+    def raw(self, media_tree):
+        """raw/ with 2 folders and 5 files of increasing size and mtime."""
+        raw = media_tree['raw']
+        (raw / "extras").mkdir()
+        for n, name in enumerate(["e.mkv", "b.srt", "D.mkv", "a.nfo", "c.mkv"]):
+            path = raw / name
+            path.write_bytes(b"x" * (n + 1))
+            os.utime(path, (1_000_000 + n, 1_000_000 + n))
+        return media_tree['roots']['raw']
+
+    @staticmethod
+    def _names(listing):
+        return [e['name'] for e in listing['entries']]
+
+    def test_sort_keeps_directories_first(self, raw):
+        desc = file_browser.list_directory(raw, order='desc')
+        assert self._names(desc) == [
+            "Serial Mom (1994)", "extras", "e.mkv", "D.mkv", "c.mkv", "b.srt", "a.nfo"]
+        by_size = file_browser.list_directory(raw, sort='size', type='file')
+        assert self._names(by_size) == ["e.mkv", "b.srt", "D.mkv", "a.nfo", "c.mkv"]
+        newest = file_browser.list_directory(raw, sort='modified', order='desc', type='file')
+        assert self._names(newest)[0] == "c.mkv"
+
+    def test_filters(self, raw):
+        mkvs = file_browser.list_directory(raw, glob="*.MKV")
+        assert self._names(mkvs) == ["c.mkv", "D.mkv", "e.mkv"]
+        assert mkvs['total'] == 3
+        dirs = file_browser.list_directory(raw, type='directory')
+        assert self._names(dirs) == ["extras", "Serial Mom (1994)"]
+        text = file_browser.list_directory(raw, category='text')
+        assert self._names(text) == ["a.nfo", "b.srt"]
+
+    def test_cursor_pages_cover_listing_once(self, raw):
+        names, cursor = [], None
+        while True:
+            page = file_browser.list_directory(raw, cursor=cursor, limit=3)
+            assert page['total'] == 7
+            names += self._names(page)
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        assert names == self._names(file_browser.list_directory(raw))
+
+    def test_cursor_survives_deleted_entries(self, raw, media_tree):
+        first = file_browser.list_directory(raw, type='file', limit=2)
+        assert self._names(first) == ["a.nfo", "b.srt"]
+        (media_tree['raw'] / "a.nfo").unlink()
+        rest = file_browser.list_directory(raw, type='file', cursor=first['next_cursor'])
+        assert self._names(rest) == ["c.mkv", "D.mkv", "e.mkv"]
+
+    def test_bad_query_rejected(self, raw):
+        with pytest.raises(file_browser.ListingQueryError):
+            file_browser.list_directory(raw, cursor="not-a-cursor")
+        with pytest.raises(file_browser.ListingQueryError):
+            file_browser.list_directory(raw, sort='owner')
+
+    def test_undecodable_names_skipped(self, media_tree):
+        raw = os.fsencode(media_tree['roots']['raw'])
+        try:
+            open(os.path.join(raw, b"bad\xff.mkv"), "wb").close()
+        except OSError:
+            pytest.skip("filesystem rejects non-UTF-8 names")
+        listing = file_browser.list_directory(media_tree['roots']['raw'])
+        assert self._names(listing) == ["Serial Mom (1994)"]
+
+    def test_only_page_entries_are_stated(self, raw):
+        stated = []
+        real_scandir = os.scandir
+
+        class Entry:
+            def __init__(self, entry):
+                self._entry = entry
+                self.name, self.path = entry.name, entry.path
+
+            def is_dir(self):
+                return self._entry.is_dir()
+
+            def stat(self):
+                stated.append(self.name)
+                return self._entry.stat()
+
+        class Scan:
+            def __init__(self, path):
+                self._it = real_scandir(path)
+
+            def __enter__(self):
+                return (Entry(e) for e in self._it)
+
+            def __exit__(self, *exc):
+                self._it.close()
+
+        with unittest.mock.patch.object(file_browser.os, "scandir", Scan):
+            file_browser.list_directory(raw, glob="*.mkv")
+            assert sorted(stated) == ["D.mkv", "c.mkv", "e.mkv"]
+            stated.clear()
+            file_browser.list_directory(raw, type='file', limit=2)
+            assert stated == ["a.nfo", "b.srt"]
+
+
 # ---------------------------------------------------------------------------
 # rename_item
 # ---------------------------------------------------------------------------
@@ -417,6 +570,36 @@ class TestAPIEndpoints:
         resp = client.get("/api/v1/files/list", params={"path": path})
         assert resp.status_code == 404
 
+    def test_list_paged(self, client, media_tree):
+        params = {"path": media_tree['roots']['music'], "limit": 2}
+        data = client.get("/api/v1/files/list", params=params).json()
+        assert [e['name'] for e in data['entries']] == ["album.flac", "cover.png"]
+        rest = client.get("/api/v1/files/list",
+                          params={**params, "cursor": data['next_cursor']}).json()
+        assert [e['name'] for e in rest['entries']] == ["info.nfo"]
+        assert rest['next_cursor'] is None
+
+    def test_list_bad_query(self, client, media_tree):
+        params = {"path": media_tree['roots']['music']}
+        assert client.get("/api/v1/files/list",
+                          params={**params, "cursor": "%%%"}).status_code == 400
+        assert client.get("/api/v1/files/list",
+                          params={**params, "sort": "owner"}).status_code == 422
+
+    def test_list_stream(self, client, media_tree):
+        import json
+        resp = client.get("/api/v1/files/list/stream",
+                          params={"path": media_tree['roots']['music'], "glob": "*.flac"})
+        assert resp.status_code == 200
+        assert resp.headers['content-type'] == "application/x-ndjson"
+        header, *entries = [json.loads(line) for line in resp.text.splitlines()]
+        assert header['total'] == 1 and header['next_cursor'] is None
+        assert [e['name'] for e in entries] == ["album.flac"]
+
+    def test_list_stream_outside_roots_403(self, client, media_tree):
+        resp = client.get("/api/v1/files/list/stream", params={"path": "/etc"})
+        assert resp.status_code == 403
+
     def test_rename_success(self, client, media_tree):
         path = os.path.join(media_tree['roots']['raw'], "Serial Mom (1994)", "title00.mkv")
         resp = client.post("/api/v1/files/rename", json={"path": path, "new_name": "feature.mkv"})
@@ -555,6 +555,23 @@ class TestIdentifyDvdCrc:
         assert call_args[0]["hasnicetitle"] is True
         assert call_args[1] is job
 
+    def test_local_history_skips_network_lookup(self):
+        """A confident local-history hit returns before the online CRC lookup."""
+        from arm.ripper.identify import identify_dvd
+
+        job = self._make_job()
+        with unittest.mock.patch('arm.ripper.identify.pydvdid') as mock_dvdid, \
+             unittest.mock.patch('arm.ripper.identify._identify_from_history',
+                                 return_value=True) as mock_history, \
+             unittest.mock.patch('arm.services.metadata_sync.lookup_crc_sync') as mock_lookup, \
+             unittest.mock.patch('arm.ripper.identify._detect_track_99'):
+            mock_dvdid.compute.return_value = "abc123"
+            result = identify_dvd(job)
+        assert result is True
+        assert job.crc_id == "abc123"
+        mock_history.assert_called_once_with(job)
+        mock_lookup.assert_not_called()
+
     def test_crc_not_found_returns_false(self):
         """CRC lookup returns not found — returns False."""
         from arm.ripper.identify import identify_dvd
@@ -688,6 +705,24 @@ class TestIdentifyDvdCrc:
             result = identify_dvd(job)
         assert result is False
 
+    def test_pydvdid_exception_still_checks_history(self):
+        """Without a CRC64 the history lookup still runs (by label); the
+        online CRC lookup is skipped."""
+        from arm.ripper.identify import identify_dvd
+
+        job = self._make_job()
+        with unittest.mock.patch('arm.ripper.identify.pydvdid') as mock_dvdid, \
+             unittest.mock.patch('arm.ripper.identify._identify_from_history',
+                                 return_value=True) as mock_history, \
+             unittest.mock.patch('arm.services.metadata_sync.lookup_crc_sync') as mock_lookup, \
+             unittest.mock.patch('arm.ripper.identify._detect_track_99'):
+            mock_dvdid.compute.side_effect = RuntimeError("no disc structure")
+            result = identify_dvd(job)
+        assert result is True
+        assert job.crc_id is None
+        mock_history.assert_called_once_with(job)
+        mock_lookup.assert_not_called()
+
     def test_crc_id_set_on_job(self):
         """CRC64 hash is stored on job.crc_id."""
         from arm.ripper.identify import identify_dvd
@@ -0,0 +1,284 @@
+"""Tests for arm.services.job_archive and the archive-aware history endpoints."""
+import json
+import unittest.mock
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+
+@pytest.fixture
+def client(app_context):
+    """FastAPI test client."""
+    from arm.api import conditional
+    from arm.api.v1 import jobs as jobs_api
+    from arm.app import app
+
+    conditional.invalidate()
+    jobs_api._invalidate_stats()
+    with TestClient(app, raise_server_exceptions=True) as client:
+        yield client
+    conditional.invalidate()
+
+
+def _make_job(db, title, status="success", age_days=400, label=None, tracks=0):
+    from arm.models.config import Config
+    from arm.models.job import Job
+    from arm.models.track import Track
+
+    with unittest.mock.patch.object(Job, 'parse_udev'), \
+         unittest.mock.patch.object(Job, 'get_pid'):
+        job = Job('/dev/sr0')
+    job.status = status
+    job.title = title
+    job.label = label or title.upper()
+    job.disctype = "dvd"
+    job.video_type = "movie"
+    job.logfile = f"{title}.log"
+    job.start_time = datetime.now() - timedelta(days=age_days)
+    job.stop_time = job.start_time + timedelta(hours=1)
+    db.session.add(job)
+    db.session.flush()
+    db.session.add(Config({"MINLENGTH": "600", "OMDB_API_KEY": "secret"}, job.job_id))
+    for n in range(tracks):
+        db.session.add(Track(job.job_id, str(n), 3000, "16:9", 24.0, False, "makemkv",
+                             f"title_{n}", f"title_t{n}.mkv"))
+    db.session.commit()
+    return job.job_id
+
+
+def _archive(days=30, **kw):
+    from arm.services import job_archive
+    return job_archive.archive_old_jobs(days, pause=0, **kw)
+
+
+class TestArchiveOldJobs:
+    def test_moves_old_finished_jobs_with_children(self, app_context):
+        from arm.models.config import Config
+        from arm.models.job import Job
+        from arm.models.job_archive import JobArchive, JobArchiveData
+        from arm.models.track import Track
+
+        _, db = app_context
+        old = _make_job(db, "Heat", tracks=2)
+        recent = _make_job(db, "Ronin", age_days=3)
+        running = _make_job(db, "Thief", status="video_ripping")
+
+        assert _archive() == 1
+        db.session.expire_all()
+        assert {j.job_id for j in Job.query} == {recent, running}
+        assert Track.query.filter_by(job_id=old).count() == 0
+        assert Config.query.filter_by(job_id=old).count() == 0
+
+        summary = db.session.get(JobArchive, old)
+        assert (summary.title, summary.status, summary.label) == ("Heat", "success", "HEAT")
+        assert summary.tracks_total == 2
+        payload = json.loads(db.session.get(JobArchiveData, old).payload)
+        assert payload["job"]["title"] == "Heat"
+        assert [t["track_number"] for t in payload["tracks"]] == ["0", "1"]
+        assert payload["config"]["OMDB_API_KEY"] == "secret"
+
+    def test_runs_in_bounded_chunks(self, app_context):
+        _, db = app_context
+        for n in range(5):
+            _make_job(db, f"Job{n}")
+        commits = []
+        listener = lambda conn: commits.append(1)  # noqa: E731
+        event.listen(db.engine, "commit", listener)
+        try:
+            assert _archive(chunk_size=2) == 5
+        finally:
+            event.remove(db.engine, "commit", listener)
+        assert len(commits) == 3
+
+    def test_keeps_confirmed_and_drive_current_jobs(self, app_context):
+        from arm.models.job import Job
+        from arm.models.system_drives import SystemDrives
+
+        _, db = app_context
+        confirmed = _make_job(db, "Heat")
+        db.session.get(Job, confirmed).title_manual = "Heat (1995)"
+        current = _make_job(db, "Ronin")
+        previous = _make_job(db, "Thief")
+        drive = SystemDrives()
+        drive.job_id_current = current
+        drive.job_id_previous = previous
+        db.session.add(drive)
+        db.session.commit()
+
+        assert _archive() == 1
+        db.session.expire_all()
+        assert {j.job_id for j in Job.query} == {confirmed, current}
+        assert db.session.get(SystemDrives, drive.drive_id).job_id_previous is None
+
+    def test_disabled_when_days_is_zero(self, app_context):
+        _, db = app_context
+        _make_job(db, "Heat")
+        assert _archive(days=0) == 0
+
+    def test_failed_chunk_rolls_back(self, app_context):
+        from arm.models.job import Job
+        from arm.services import job_archive
+
+        _, db = app_context
+        _make_job(db, "Heat")
+        with unittest.mock.patch.object(job_archive, "_summary", side_effect=RuntimeError("boom")):
+            assert _archive() == 0
+        assert Job.query.count() == 1
+
+    def test_archived_ids_are_not_reused(self, app_context):
+        from arm.models.track import Track
+
+        _, db = app_context
+        _make_job(db, "Heat")
+        newest = _make_job(db, "Ronin", tracks=1)
+        newest_track = Track.query.filter_by(job_id=newest).one().track_id
+        assert _archive() == 2
+
+        fresh = _make_job(db, "Thief", age_days=0, tracks=1)
+        assert fresh > newest
+        assert Track.query.filter_by(job_id=fresh).one().track_id > newest_track
+
+    def test_id_collision_skips_only_that_job(self, app_context, caplog):
+        from arm.models.job import Job
+        from arm.models.job_archive import JobArchive
+
+        _, db = app_context
+        clashing = _make_job(db, "Heat")
+        other = _make_job(db, "Ronin")
+        db.session.add(JobArchive(job_id=clashing, title="Old Heat", archived_at=datetime.now()))
+        db.session.commit()
+
+        assert _archive() == 1
+        db.session.expire_all()
+        assert {j.job_id for j in Job.query} == {clashing}
+        assert db.session.get(JobArchive, other).title == "Ronin"
+        assert db.session.get(JobArchive, clashing).title == "Old Heat"
+        assert f"Job(s) {clashing} share an id" in caplog.text
+
+    def test_archived_claims_still_exclude_episodes(self, app_context):
+        from arm.models.episode_claim import ArchivedEpisodeClaim, EpisodeClaim
+        from arm.models.job import Job
+        from arm.models.track import Track
+        from arm.services.episode_claims import sync_job_claims
+        from arm.services.matching.cross_disc import get_excluded_episodes
+
+        _, db = app_context
+        old = _make_job(db, "Lost", tracks=2)
+        job = db.session.get(Job, old)
+        job.tvdb_id, job.season, job.disc_number = 4607, "1", 1
+        for n, track in enumerate(Track.query.filter_by(job_id=old).order_by(Track.track_id), 1):
+            track.episode_number = str(n)
+        sync_job_claims(job)
+        db.session.commit()
+
+        assert _archive() == 1
+        # Moved out of episode_claim, whose foreign keys would cascade
+        # (or block) the job/track delete on databases that enforce them.
+        assert EpisodeClaim.query.filter_by(job_id=old).count() == 0
+        claims = ArchivedEpisodeClaim.query.filter_by(job_id=old).all()
+        assert sorted((c.season, c.episode_number, c.disc_number) for c in claims) == \
+            [(1, 1, 1), (1, 2, 1)]
+
+        later = db.session.get(Job, _make_job(db, "Lost", age_days=0))
+        later.tvdb_id, later.disc_number = 4607, 2
+        assert get_excluded_episodes(later, season=1) == {1, 2}
+        later.disc_number = 1
+        assert get_excluded_episodes(later, season=1) == set()
+
+    def test_claim_archive_has_no_foreign_keys(self):
+        from arm.models.episode_claim import ArchivedEpisodeClaim
+
+        assert not ArchivedEpisodeClaim.__table__.foreign_keys
+
+
+class TestReadingArchive:
+    def test_load_archived_round_trips_types(self, app_context):
+        from arm.models.job import JobState
+        from arm.services import job_archive
+
+        _, db = app_context
+        job_id = _make_job(db, "Heat", tracks=1)
+        _archive()
+        job, config, tracks = job_archive.load_archived(job_id)
+        assert job.status is JobState.SUCCESS
+        assert isinstance(job.start_time, datetime)
+        assert job.expected_titles == []
+        assert config.MINLENGTH == "600"
+        assert tracks[0].filename == "title_t0.mkv"
+        assert job_archive.load_archived(9999) is None
+
+    def test_dupe_check_falls_back_to_archive(self, app_context, sample_job):
+        from arm.ripper import utils
+
+        _, db = app_context
+        _make_job(db, "Serial Mom", label=sample_job.label)
+        _archive()
+        with unittest.mock.patch.object(utils, "database_updater") as updater:
+            assert utils.job_dupe_check(sample_job) is True
+        assert updater.call_args.args[0]["title"] == "Serial Mom"
+
+
+class TestHistoryEndpoints:
+    def test_paginated_merges_archived_jobs(self, client, app_context):
+        _, db = app_context
+        oldest = _make_job(db, "Heat", age_days=500)
+        old = _make_job(db, "Ronin", age_days=400)
+        _archive()
+        recent = _make_job(db, "Thief", age_days=3)
+
+        data = client.get('/api/v1/jobs/paginated').json()
+        assert data["total"] == 3
+        assert [j["job_id"] for j in data["jobs"]] == [recent, old, oldest]
+        assert [j.get("archived", False) for j in data["jobs"]] == [False, True, True]
+        assert data["jobs"][1]["title"] == "Ronin"
+
+        by_title = client.get('/api/v1/jobs/paginated?sort_by=title&sort_dir=asc').json()
+        assert [j["title"] for j in by_title["jobs"]] == ["Heat", "Ronin", "Thief"]
+        assert client.get('/api/v1/jobs/paginated?search=heat').json()["total"] == 1
+        assert client.get('/api/v1/jobs/paginated?status=active').json()["total"] == 0
+
+    def test_cursor_walks_across_hot_and_archived(self, client, app_context):
+        _, db = app_context
+        ids = [_make_job(db, f"Job{n}", age_days=400 - n) for n in range(3)]
+        _archive()
+        ids += [_make_job(db, f"New{n}", age_days=3 - n) for n in range(2)]
+
+        seen, cursor = [], None
+        while True:
+            url = '/api/v1/jobs/paginated?per_page=2' + (f'&cursor={cursor}' if cursor else '')
+            page = client.get(url).json()
+            seen += [j["job_id"] for j in page["jobs"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        assert seen == ids[::-1]
+
+    def test_stats_count_archived_jobs(self, client, app_context):
+        _, db = app_context
+        _make_job(db, "Heat")
+        _make_job(db, "Ronin", status="fail")
+        _archive()
+        _make_job(db, "Thief", status="video_ripping", age_days=0)
+        stats = client.get('/api/v1/jobs/stats').json()
+        assert stats == {"total": 3, "active": 1, "waiting": 0, "success": 1, "fail": 1}
+
+    def test_detail_serves_archived_job(self, client, app_context):
+        _, db = app_context
+        job_id = _make_job(db, "Heat", tracks=2)
+        _archive()
+        data = client.get(f'/api/v1/jobs/{job_id}/detail').json()
+        assert data["archived"] is True
+        assert data["job"]["title"] == "Heat"
+        assert data["config"]["OMDB_API_KEY"] == "***"
+        assert len(data["tracks"]) == 2
+        assert data["track_counts"] == {"total": 2, "ripped": 0}
+
+    def test_archive_endpoint(self, client, app_context):
+        _, db = app_context
+        _make_job(db, "Heat")
+        with unittest.mock.patch("arm.services.job_archive.db.session.remove"):
+            result = client.post('/api/v1/maintenance/archive-jobs', json={"days": 30}).json()
+        assert result == {"success": True, "archived": 1, "total_archived": 1}
+        assert client.post('/api/v1/maintenance/archive-jobs', json={"days": 0}).status_code == 400
@@ -0,0 +1,200 @@
+"""Tests for the job_change log and GET /api/v1/jobs/changes."""
+import os
+import unittest.mock
+
+import pytest
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def client(app_context):
+    """FastAPI test client."""
+    from arm.app import app
+    with TestClient(app, raise_server_exceptions=True) as client:
+        yield client
+
+
+def _make_job(db, title="Heat"):
+    from arm.models.job import Job
+
+    with unittest.mock.patch.object(Job, 'parse_udev'), \
+         unittest.mock.patch.object(Job, 'get_pid'):
+        job = Job('/dev/sr0')
+    job.status = "video_ripping"
+    job.title = title
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def _add_track(db, job, number="0"):
+    from arm.models.track import Track
+
+    track = Track(job.job_id, number, 3000, "16:9", 24.0, True, "makemkv",
+                  "title", f"title_t{number}.mkv")
+    db.session.add(track)
+    db.session.commit()
+    return track
+
+
+class TestChangeLog:
+    def test_triggers_record_job_and_track_writes(self, app_context):
+        from arm.models.job_change import JobChange
+
+        _, db = app_context
+        job = _make_job(db)
+        track = _add_track(db, job)
+        job.title = "Ronin"
+        db.session.commit()
+        db.session.delete(track)
+        db.session.commit()
+
+        log = [(c.table_name, c.row_id, c.op) for c in JobChange.query.order_by(JobChange.seq)]
+        assert log == [
+            ("job", job.job_id, "insert"),
+            ("track", track.track_id, "insert"),
+            ("job", job.job_id, "update"),
+            ("track", track.track_id, "delete"),
+        ]
+
+    def test_changes_collapse_to_latest_op(self, app_context):
+        from arm.services.job_changes import changes_since
+
+        _, db = app_context
+        kept = _make_job(db)
+        gone = _make_job(db, "Gone")
+        kept.title = "Ronin"
+        db.session.commit()
+        db.session.delete(gone)
+        db.session.commit()
+
+        changes = changes_since(0)
+        assert changes["jobs"] == [kept.job_id]
+        assert changes["deleted_jobs"] == [gone.job_id]
+        assert changes["reset"] is False and changes["more"] is False
+
+    def test_limit_pages_through_log(self, app_context):
+        from arm.services.job_changes import changes_since
+
+        _, db = app_context
+        jobs = [_make_job(db, f"Job {i}") for i in range(5)]
+        first = changes_since(0, limit=3)
+        assert first["more"] is True
+        second = changes_since(first["cursor"], limit=3)
+        assert second["more"] is False
+        assert first["jobs"] + second["jobs"] == [j.job_id for j in jobs]
+
+    def test_cursor_before_retained_log_requests_reset(self, app_context):
+        from arm.models.job_change import JobChange
+        from arm.services.job_changes import changes_since
+
+        _, db = app_context
+        for i in range(3):
+            _make_job(db, f"Job {i}")
+        JobChange.query.filter(JobChange.seq <= 2).delete()  # as the prune trigger would
+        db.session.commit()
+        assert changes_since(0)["reset"] is True
+        assert changes_since(2)["reset"] is False
+        assert changes_since(99)["reset"] is True  # cursor from another database
+
+
+class TestChangesEndpoint:
+    def test_bootstrap_then_incremental(self, client, app_context):
+        _, db = app_context
+        _make_job(db)
+        head = client.get('/api/v1/jobs/changes').json()
+        assert head["jobs"] == [] and head["cursor"] > 0
+
+        job = _make_job(db, "Ronin")
+        track = _add_track(db, job)
+        data = client.get(f'/api/v1/jobs/changes?since={head["cursor"]}').json()
+        assert [j["job_id"] for j in data["jobs"]] == [job.job_id]
+        assert data["jobs"][0]["track_counts"]["total"] == 1
+        assert [t["track_id"] for t in data["tracks"]] == [track.track_id]
+        assert data["cursor"] > head["cursor"]
+
+        again = client.get(f'/api/v1/jobs/changes?since={data["cursor"]}').json()
+        assert again["jobs"] == [] and again["cursor"] == data["cursor"]
+
+    def test_long_poll_times_out_empty(self, client, app_context):
+        head = client.get('/api/v1/jobs/changes').json()["cursor"]
+        data = client.get(f'/api/v1/jobs/changes?since={head}&wait=0.2').json()
+        assert data["jobs"] == [] and data["cursor"] == head
+
+    def test_long_poll_returns_when_a_write_lands(self, client, app_context):
+        from arm.api.v1 import jobs as jobs_api
+
+        _, db = app_context
+        head = client.get('/api/v1/jobs/changes').json()["cursor"]
+        written = []
+
+        async def write_while_waiting(_seconds):
+            if not written:
+                written.append(_make_job(db, "Late"))
+
+        with unittest.mock.patch.object(jobs_api.asyncio, "sleep", write_while_waiting):
+            data = client.get(f'/api/v1/jobs/changes?since={head}&wait=30').json()
+        assert [j["job_id"] for j in data["jobs"]] == [written[0].job_id]
+
+    def test_deleted_job_reported(self, client, app_context):
+        _, db = app_context
+        job = _make_job(db)
+        head = client.get('/api/v1/jobs/changes').json()["cursor"]
+        db.session.delete(job)
+        db.session.commit()
+        data = client.get(f'/api/v1/jobs/changes?since={head}').json()
+        assert data["deleted_jobs"] == [job.job_id]
+        assert data["jobs"] == []
+
+    def test_unsupported_database_is_not_served_as_empty(self, client, app_context):
+        """Without the SQLite triggers the log never fills; an empty feed
+        would tell clients nothing changed, so say the feed is unavailable."""
+        from arm.services import job_changes
+
+        with unittest.mock.patch.object(job_changes, "feed_supported", return_value=False):
+            assert client.get('/api/v1/jobs/changes').status_code == 501
+            assert client.get('/api/v1/jobs/changes?since=0').status_code == 501
+
+
+_MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'arm', 'migrations',
+)
+_BEFORE = 'b3c4d5e6f7'
+_AFTER = 'c4d5e6f7a8'
+
+
+def _make_config(db_path):
+    cfg = AlembicConfig()
+    cfg.set_main_option('script_location', _MIGRATIONS_DIR)
+    cfg.set_main_option('sqlalchemy.url', f'sqlite:///{db_path}')
+    return cfg
+
+
+class TestJobChangeMigration:
+    """The c4d5e6f7a8 migration creates the log and its triggers."""
+
+    def test_upgrade_logs_writes_and_downgrade_drops(self, tmp_path):
+        db_path = str(tmp_path / 'arm.db')
+        cfg = _make_config(db_path)
+        command.upgrade(cfg, _AFTER)
+        engine = sa.create_engine(f'sqlite:///{db_path}')
+        with engine.begin() as conn:
+            conn.execute(sa.text(
+                "INSERT INTO job (job_id, guid, status, title) VALUES (3, 'g3', 'success', 'Heat')"
+            ))
+            rows = conn.execute(sa.text(
+                "SELECT table_name, row_id, op FROM job_change"
+            )).all()
+        assert rows == [('job', 3, 'insert')]
+        engine.dispose()
+
+        command.downgrade(cfg, _BEFORE)
+        insp = sa.inspect(engine)
+        assert 'job_change' not in insp.get_table_names()
+        with engine.begin() as conn:
+            conn.execute(sa.text("UPDATE job SET title = 'Ronin' WHERE job_id = 3"))
+        engine.dispose()
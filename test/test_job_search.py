@@ -0,0 +1,216 @@
+"""Tests for arm.services.job_search (FTS5 job search with LIKE fallback)."""
+import os
+import unittest.mock
+
+import pytest
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from fastapi.testclient import TestClient
+
+
+def _make_job(db, title, label=None, year=None, imdb_id=None, path=None):
+    from arm.models.job import Job
+
+    with unittest.mock.patch.object(Job, 'parse_udev'), \
+         unittest.mock.patch.object(Job, 'get_pid'):
+        job = Job('/dev/sr0')
+    job.title = title
+    job.label = label
+    job.year = year
+    job.imdb_id = imdb_id
+    job.path = path
+    job.status = "success"
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+@pytest.fixture
+def fts_db(app_context):
+    from arm.services.job_search import install_fts
+
+    _, db = app_context
+    with db.engine.begin() as conn:
+        assert install_fts(conn)
+    return db
+
+
+@pytest.fixture
+def client(app_context):
+    """FastAPI test client."""
+    from arm.app import app
+    with TestClient(app, raise_server_exceptions=True) as client:
+        yield client
+
+
+class TestMatchExpression:
+    def test_words_become_quoted_prefix_terms(self):
+        from arm.services.job_search import match_expression
+        assert match_expression("the matr") == '"the"* "matr"*'
+
+    def test_fts_syntax_is_neutralised(self):
+        from arm.services.job_search import match_expression
+        assert match_expression('title:"x" OR NEAR(a') == '"title"* "x"* "OR"* "NEAR"* "a"*'
+
+    def test_no_words(self):
+        from arm.services.job_search import match_expression
+        assert match_expression("  -- ") is None
+        assert match_expression(None) is None
+
+
+class TestFtsSearch:
+    def test_prefix_match_across_columns(self, fts_db):
+        from arm.services.job_search import ranked_search
+
+        matrix = _make_job(fts_db, "The Matrix", label="MATRIX_WS", year="1999",
+                           imdb_id="tt0133093", path="/media/movies/The Matrix (1999)")
+        _make_job(fts_db, "Serial Mom", label="SERIAL_MOM", year="1994")
+
+        for term in ("matr", "MATRIX 1999", "tt01330", "movies matrix"):
+            assert [j.job_id for j in ranked_search(term)] == [matrix.job_id], term
+        assert ranked_search("matrix 1994") == []
+
+    def test_title_hit_outranks_path_hit(self, fts_db):
+        from arm.services.job_search import ranked_search
+
+        by_path = _make_job(fts_db, "Other", path="/media/alien")
+        by_title = _make_job(fts_db, "Alien")
+        assert [j.job_id for j in ranked_search("alien")] == [by_title.job_id, by_path.job_id]
+
+    def test_triggers_follow_insert_update_delete(self, fts_db):
+        from arm.services.job_search import ranked_search
+
+        job = _make_job(fts_db, "Heat")
+        assert [j.job_id for j in ranked_search("heat")] == [job.job_id]
+
+        job.title = "Ronin"
+        fts_db.session.commit()
+        assert ranked_search("heat") == []
+        assert [j.job_id for j in ranked_search("ronin")] == [job.job_id]
+
+        fts_db.session.delete(job)
+        fts_db.session.commit()
+        assert ranked_search("ronin") == []
+
+    def test_paginated_and_stats_use_index(self, fts_db, client):
+        _make_job(fts_db, "SERIAL_MOM", label="SERIAL_MOM")
+        _make_job(fts_db, "OTHER_MOVIE")
+
+        data = client.get('/api/v1/jobs/paginated?search=serial').json()
+        assert [j["title"] for j in data["jobs"]] == ["SERIAL_MOM"]
+        assert client.get('/api/v1/jobs/stats?search=serial').json()["total"] == 1
+
+    def test_legacy_search_endpoint_is_ranked(self, fts_db, client):
+        _make_job(fts_db, "Other", path="/media/alien")
+        _make_job(fts_db, "Alien")
+
+        results = client.get('/api/v1/jobs?q=alien').json()["results"]
+        assert [results[k]["title"] for k in sorted(results, key=int)] == ["Alien", "Other"]
+
+
+class TestLikeFallback:
+    def test_without_index_substring_like_is_used(self, app_context):
+        from arm.services.job_search import fts_available, ranked_search, search_clause
+        from arm.models.job import Job
+
+        _, db = app_context
+        job = _make_job(db, "The Matrix")
+        assert not fts_available()
+        # Infix match only the LIKE path supports.
+        assert [j.job_id for j in ranked_search("atri")] == [job.job_id]
+        assert Job.query.filter(search_clause("ATRI")).count() == 1
+
+    def test_non_sqlite_is_skipped(self):
+        from arm.services.job_search import install_fts
+
+        conn = unittest.mock.MagicMock()
+        conn.dialect.name = "postgresql"
+        assert install_fts(conn) is False
+        conn.exec_driver_sql.assert_not_called()
+
+    def test_missing_fts5_module_is_skipped(self):
+        from arm.services.job_search import install_fts
+
+        conn = unittest.mock.MagicMock()
+        conn.dialect.name = "sqlite"
+        conn.exec_driver_sql.side_effect = sa.exc.OperationalError(
+            "CREATE VIRTUAL TABLE", {}, Exception("no such module: fts5"))
+        assert install_fts(conn) is False
+        assert conn.exec_driver_sql.call_count == 1
+
+
+_MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'arm', 'migrations',
+)
+_BEFORE = 'a2b3c4d5e6'
+_AFTER = 'b3c4d5e6f7'
+
+
+def _make_config(db_path):
+    cfg = AlembicConfig()
+    cfg.set_main_option('script_location', _MIGRATIONS_DIR)
+    cfg.set_main_option('sqlalchemy.url', f'sqlite:///{db_path}')
+    return cfg
+
+
+class TestJobSearchMigration:
+    """The b3c4d5e6f7 migration builds job_fts and backfills existing jobs."""
+
+    def test_backfill_and_downgrade(self, tmp_path):
+        db_path = str(tmp_path / 'arm.db')
+        cfg = _make_config(db_path)
+        command.upgrade(cfg, _BEFORE)
+        engine = sa.create_engine(f'sqlite:///{db_path}')
+        with engine.begin() as conn:
+            conn.execute(sa.text(
+                "INSERT INTO job (job_id, guid, status, title, label) "
+                "VALUES (7, 'g7', 'success', 'Blade Runner', 'BLADE_RUNNER')"
+            ))
+        engine.dispose()
+
+        command.upgrade(cfg, _AFTER)
+        with engine.connect() as conn:
+            hits = conn.execute(sa.text(
+                "SELECT rowid FROM job_fts WHERE job_fts MATCH '\"blade\"*'"
+            )).scalars().all()
+            triggers = conn.execute(sa.text(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'job_fts_%'"
+            )).scalars().all()
+        assert hits == [7]
+        assert sorted(triggers) == ['job_fts_ad', 'job_fts_ai', 'job_fts_au']
+        engine.dispose()
+
+        command.downgrade(cfg, _BEFORE)
+        insp = sa.inspect(engine)
+        assert 'job_fts' not in insp.get_table_names()
+        engine.dispose()
+
+    def test_index_follows_writes_after_upgrade_to_head(self, tmp_path):
+        """Later migrations rebuild the job table; the sync triggers must
+        survive, or new jobs silently drop out of search."""
+        db_path = str(tmp_path / 'arm.db')
+        cfg = _make_config(db_path)
+        command.upgrade(cfg, 'head')
+        engine = sa.create_engine(f'sqlite:///{db_path}')
+        with engine.begin() as conn:
+            conn.execute(sa.text(
+                "INSERT INTO job (guid, status, disctype, title, label) "
+                "VALUES ('g8', 'success', 'dvd', 'Blade Runner', 'DISC')"
+            ))
+            job_id = conn.execute(sa.text("SELECT job_id FROM job WHERE guid = 'g8'")).scalar()
+            conn.execute(sa.text("UPDATE job SET title = 'Heat' WHERE guid = 'g8'"))
+
+        def hits(term):
+            with engine.connect() as conn:
+                return conn.execute(sa.text(
+                    "SELECT rowid FROM job_fts WHERE job_fts MATCH :m"
+                ), {"m": f'"{term}"*'}).scalars().all()
+
+        assert hits("heat") == [job_id]
+        assert hits("blade") == []
+        with engine.begin() as conn:
+            conn.execute(sa.text("DELETE FROM job WHERE guid = 'g8'"))
+        assert hits("heat") == []
+        engine.dispose()
@@ -0,0 +1,127 @@
+"""Tests for GET /api/v1/jobs/active/progress (batched progress-state)."""
+import unittest.mock
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+
+@pytest.fixture
+def client(app_context):
+    """FastAPI test client."""
+    from arm.app import app
+    with TestClient(app, raise_server_exceptions=True) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def progress_dir(tmp_path, app_context):
+    from arm.api.v1 import jobs as jobs_api
+
+    log_dir = tmp_path / "logs"
+    (log_dir / "progress").mkdir(parents=True)
+    jobs_api._progress_cache.clear()
+    with unittest.mock.patch.dict("arm.config.config.arm_config", {"LOGPATH": str(log_dir)}):
+        yield log_dir
+    jobs_api._progress_cache.clear()
+
+
+def _make_job(db, status="video_ripping"):
+    from arm.models.job import Job
+
+    with unittest.mock.patch.object(Job, 'parse_udev'), \
+         unittest.mock.patch.object(Job, 'get_pid'):
+        job = Job('/dev/sr0')
+    job.status = status
+    job.title = "Heat"
+    job.disctype = "dvd"
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def _count_statements(engine):
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", listener)
+
+
+class TestActiveProgress:
+    def test_entries_match_single_job_endpoint(self, client, app_context, progress_dir):
+        _, db = app_context
+        ripping = _make_job(db)
+        copying = _make_job(db, status="transcoding")
+        _make_job(db, status="success")
+        (progress_dir / "progress" / f"{ripping.job_id}.log").write_text(
+            'PRGT:0,0,"Saving to MKV file"\n'
+            "PRGV:3333,3333,10000\n"
+        )
+        (progress_dir / "progress" / f"{copying.job_id}.copy.log").write_text(
+            "copy,12.5,1,a.mkv\n"
+        )
+
+        data = client.get('/api/v1/jobs/active/progress').json()
+        assert [entry["job_id"] for entry in data["jobs"]] == [ripping.job_id, copying.job_id]
+        for entry in data["jobs"]:
+            single = client.get(f'/api/v1/jobs/{entry.pop("job_id")}/progress-state').json()
+            assert entry == single
+        assert data["jobs"][0]["rip_progress"] == pytest.approx(33.3)
+
+    def test_query_count_is_independent_of_job_count(self, client, app_context):
+        from arm.api.v1 import jobs as jobs_api
+
+        _, db = app_context
+        for _ in range(5):
+            _make_job(db)
+        statements, stop = _count_statements(db.engine)
+        try:
+            client.get('/api/v1/jobs/active/progress')
+        finally:
+            stop()
+        assert len(statements) == 2  # active jobs + grouped track counts
+        assert len(jobs_api._progress_cache) == 5
+
+    def test_entries_reused_within_ttl(self, client, app_context, progress_dir):
+        _, db = app_context
+        job = _make_job(db)
+        path = progress_dir / "progress" / f"{job.job_id}.log"
+        path.write_text('PRGT:0,0,"Saving to MKV file"\nPRGV:1,1,4\n')
+        first = client.get('/api/v1/jobs/active/progress').json()["jobs"][0]
+
+        path.write_text('PRGT:0,0,"Saving to MKV file"\nPRGV:2,2,4\n')
+        statements, stop = _count_statements(db.engine)
+        try:
+            cached = client.get('/api/v1/jobs/active/progress').json()["jobs"][0]
+        finally:
+            stop()
+        assert cached == first
+        assert len(statements) == 1  # only the active-job lookup
+
+    def test_expired_entry_rebuilt(self, client, app_context, progress_dir, monkeypatch):
+        from arm.api.v1 import jobs as jobs_api
+
+        _, db = app_context
+        job = _make_job(db)
+        path = progress_dir / "progress" / f"{job.job_id}.log"
+        path.write_text('PRGT:0,0,"Saving to MKV file"\nPRGV:1,1,4\n')
+        client.get('/api/v1/jobs/active/progress')
+
+        path.write_text('PRGT:0,0,"Saving to MKV file"\nPRGV:2,2,4\n')
+        monkeypatch.setattr(jobs_api, "_PROGRESS_TTL", -1)
+        entry = client.get('/api/v1/jobs/active/progress').json()["jobs"][0]
+        assert entry["rip_progress"] == 50.0
+
+    def test_finished_job_drops_out(self, client, app_context):
+        from arm.api.v1 import jobs as jobs_api
+
+        _, db = app_context
+        job = _make_job(db)
+        client.get('/api/v1/jobs/active/progress')
+        job.status = "success"
+        db.session.commit()
+        assert client.get('/api/v1/jobs/active/progress').json() == {"jobs": []}
+        assert jobs_api._progress_cache == {}
+
+    def test_no_active_jobs(self, client, app_context):
+        assert client.get('/api/v1/jobs/active/progress').json() == {"jobs": []}
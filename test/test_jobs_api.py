@@ -443,6 +443,38 @@ class TestTvdbMatch:
         assert resp.status_code == 404
 
 
+class TestTvdbMatchBoxSet:
+    """Test POST /jobs/tvdb-match/box-set request validation."""
+
+    def test_passes_jobs_and_options(self, app_context, sample_job, client):
+        captured = {}
+
+        def fake_match(jobs, season=None, tolerance=None, apply=False):
+            captured.update(job_ids=[j.job_id for j in jobs], season=season, apply=apply)
+            return {"success": True, "discs": [], "applied": apply}
+
+        with unittest.mock.patch("arm.services.tvdb_sync.match_box_set_for_api", side_effect=fake_match):
+            resp = client.post(
+                "/api/v1/jobs/tvdb-match/box-set",
+                json={"job_ids": [sample_job.job_id], "season": "2", "apply": True},
+            )
+
+        assert resp.status_code == 200
+        assert captured == {"job_ids": [sample_job.job_id], "season": 2, "apply": True}
+
+    def test_requires_job_ids(self, app_context, client):
+        resp = client.post("/api/v1/jobs/tvdb-match/box-set", json={"job_ids": []})
+        assert resp.status_code == 400
+
+    def test_unknown_job_returns_404(self, app_context, sample_job, client):
+        resp = client.post(
+            "/api/v1/jobs/tvdb-match/box-set",
+            json={"job_ids": [sample_job.job_id, 99999]},
+        )
+        assert resp.status_code == 404
+        assert "99999" in resp.json()["error"]
+
+
 class TestNamingPreviewForJob:
     """Test GET /api/v1/jobs/{job_id}/naming-preview."""
 
@@ -0,0 +1,127 @@
+"""Tests for arm.services.maintenance_scan — the background orphan scan."""
+import os
+import unittest.mock
+
+import pytest
+
+from arm.services import maintenance, maintenance_scan
+
+
+@pytest.fixture
+def scanner(monkeypatch, app_context, sample_job, tmp_logs, tmp_media, tmp_path):
+    """Scanner with no previous result, pointed at the tmp media roots."""
+    monkeypatch.setattr(maintenance_scan, "_last", None)
+    monkeypatch.setattr(maintenance_scan, "_listings", {})
+    monkeypatch.setattr(maintenance_scan, "_loaded", True)
+    monkeypatch.setattr(maintenance_scan, "_progress", {
+        "running": False, "phase": None, "done": 0, "total": 0, "error": None})
+    mock_cfg = {
+        "LOGPATH": str(tmp_logs),
+        "RAW_PATH": tmp_media["raw"],
+        "COMPLETED_PATH": tmp_media["completed"],
+        "DBFILE": str(tmp_path / "arm.db"),
+    }
+    with unittest.mock.patch("arm.config.config.arm_config", mock_cfg):
+        yield maintenance_scan
+    if maintenance_scan._thread is not None:
+        maintenance_scan._thread.join(5)
+
+
+def _scan(scanner):
+    assert scanner.refresh()
+    scanner._thread.join(5)
+    return scanner.last_result()
+
+
+def test_first_request_waits_for_the_scan(scanner):
+    result = scanner.last_result(wait=5)
+    names = [f["name"] for f in result["orphan_folders"]["folders"]]
+    assert names == ["Orphan Movie", "Another Orphan"]
+    assert {f["relative_path"] for f in result["orphan_logs"]["files"]} == {
+        "orphan1.log", "orphan2.log", "referenced.log"}
+    assert result["scanned_at"] is not None
+
+    status = scanner.status()
+    assert status["running"] is False
+    assert (status["done"], status["total"]) == (2, 2)
+    assert status["scanned_at"] == result["scanned_at"]
+
+
+def test_cached_result_is_served_without_scanning(scanner):
+    first = _scan(scanner)
+    with unittest.mock.patch.object(scanner, "_start") as start:
+        again = scanner.last_result()
+    start.assert_not_called()
+    assert again == first
+
+    with unittest.mock.patch.object(scanner, "MAX_AGE", -1), \
+            unittest.mock.patch.object(scanner, "_start") as start:
+        assert scanner.last_result() == first
+    start.assert_called_once()
+
+
+def test_rescan_lists_only_changed_directories(scanner, tmp_media):
+    _scan(scanner)
+    os.mkdir(os.path.join(tmp_media["raw"], "New Orphan"))
+    listed = []
+    real_scandir = os.scandir
+
+    def counting_scandir(path):
+        listed.append(os.path.relpath(path, os.path.dirname(tmp_media["raw"])))
+        return real_scandir(path)
+
+    with unittest.mock.patch.object(maintenance.os, "scandir", counting_scandir):
+        result = _scan(scanner)
+    # Only raw/ changed; completed/ and completed/movies/ are reused.
+    assert "raw" in listed
+    assert not [p for p in listed if p.startswith("completed")]
+    assert "New Orphan" in [f["name"] for f in result["orphan_folders"]["folders"]]
+
+
+def test_other_paths_do_not_reuse_the_result(scanner, tmp_path):
+    _scan(scanner)
+    other = dict(maintenance_scan.cfg.arm_config, RAW_PATH=str(tmp_path / "elsewhere"))
+    with unittest.mock.patch("arm.config.config.arm_config", other), \
+            unittest.mock.patch.object(scanner, "_start"):
+        result = scanner.last_result()
+    assert result["scanned_at"] is None
+    assert result["orphan_folders"]["folders"] == []
+
+
+def test_discard_drops_deleted_folders(scanner, tmp_media):
+    _scan(scanner)
+    scanner.discard([tmp_media["raw"]])
+    folders = scanner.last_result()["orphan_folders"]
+    assert [f["name"] for f in folders["folders"]] == ["Another Orphan"]
+    assert folders["total_size_bytes"] == folders["folders"][0]["size_bytes"]
+
+
+def test_result_survives_restart(scanner, tmp_path):
+    first = _scan(scanner)
+    assert (tmp_path / "maintenance-scan.json").exists()
+
+    scanner._last = None
+    scanner._listings = {}
+    scanner._loaded = False
+    with unittest.mock.patch.object(scanner, "_start"):
+        assert scanner.last_result() == first
+    assert scanner._listings
+
+
+def test_scan_endpoints(scanner):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from arm.api.v1.maintenance import router
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    assert client.post("/api/v1/maintenance/scan").json()["started"] is True
+    scanner._thread.join(5)
+    status = client.get("/api/v1/maintenance/scan").json()
+    assert status["running"] is False and status["scanned_at"] is not None
+
+    counts = client.get("/api/v1/maintenance/counts").json()
+    assert counts["orphan_folders"] == 2
+    assert counts["scanned_at"] == status["scanned_at"]
@@ -227,6 +227,88 @@ class TestWindowedPositionalMatching:
         assert eps == [1, 2, 3, 4, 5, 6]
 
 
+class TestOptimalAssignment:
+    """Regression cases where greedy runtime matching was suboptimal."""
+
+    def test_clustered_runtimes_match_every_track(self):
+        """Greedy took T0→E1 (delta 50) and left T1 with nothing in tolerance."""
+        tracks = [
+            {"track_number": "0", "length": 3100},
+            {"track_number": "1", "length": 3400},
+        ]
+        episodes = [
+            {"number": 1, "name": "Ep 1", "runtime": 3150},
+            {"number": 2, "name": "Ep 2", "runtime": 2850},
+        ]
+        matches = match_tracks_to_episodes(tracks, episodes, tolerance=300)
+        assert len(matches) == 2
+        by_track = {m["track_number"]: m["episode_number"] for m in matches}
+        # Re-ordering to track sequence would break tolerance, so the
+        # runtime-optimal pairing is kept.
+        assert by_track == {"0": 2, "1": 1}
+
+    def test_minimises_total_delta(self):
+        tracks = [
+            {"track_number": "0", "length": 2600},
+            {"track_number": "1", "length": 2700},
+            {"track_number": "2", "length": 2800},
+        ]
+        episodes = [
+            {"number": 1, "name": "Ep 1", "runtime": 2590},
+            {"number": 2, "name": "Ep 2", "runtime": 2710},
+            {"number": 3, "name": "Ep 3", "runtime": 2790},
+            {"number": 4, "name": "Ep 4", "runtime": 2400},
+        ]
+        matches = match_tracks_to_episodes(tracks, episodes, tolerance=300)
+        assert [m["episode_number"] for m in matches] == [1, 2, 3]
+
+    def test_matches_carry_margins(self):
+        tracks = [
+            {"track_number": "0", "length": 3000},
+            {"track_number": "1", "length": 3600},
+        ]
+        episodes = [
+            {"number": 1, "name": "Ep 1", "runtime": 3000},
+            {"number": 2, "name": "Ep 2", "runtime": 3600},
+        ]
+        matches = match_tracks_to_episodes(tracks, episodes, tolerance=300)
+        # Each track's runner-up is out of tolerance: margin is capped.
+        assert [m["margin"] for m in matches] == [300.0, 300.0]
+
+    def test_ambiguous_runtimes_have_small_margin(self):
+        tracks = [{"track_number": "0", "length": 3000}]
+        episodes = [
+            {"number": 1, "name": "Ep 1", "runtime": 3005},
+            {"number": 2, "name": "Ep 2", "runtime": 3010},
+        ]
+        matches = match_tracks_to_episodes(tracks, episodes, tolerance=300)
+        assert matches[0]["episode_number"] == 1
+        assert matches[0]["margin"] == 5.0
+
+    def test_reordered_pairs_get_their_own_margins(self):
+        """Re-ordering to disc sequence gives each track an episode that is
+        not its cheapest one, so its margin must reflect that pair."""
+        tracks = [
+            {"track_number": "0", "length": 3100},
+            {"track_number": "1", "length": 2900},
+        ]
+        episodes = [
+            {"number": 1, "name": "Ep 1", "runtime": 2900},
+            {"number": 2, "name": "Ep 2", "runtime": 3100},
+        ]
+        matches = match_tracks_to_episodes(tracks, episodes, tolerance=300)
+        assert [m["episode_number"] for m in matches] == [1, 2]
+        assert [m["margin"] for m in matches] == [0.0, 0.0]
+
+    def test_margin_reaches_match_result(self):
+        match = TrackMatch(
+            track_number="0", episode_number=1, episode_name="Ep 1",
+            episode_runtime=3000, margin=42.0,
+        )
+        assert match.margin == 42.0
+        assert TrackMatch("1", 2, "Ep 2").margin is None
+
+
 class TestCrossDiscExclusion:
     """Test exclude_episodes parameter in matching functions."""
 
@@ -557,6 +639,7 @@ class TestCrossDiscDB:
         from arm.database import db
         from arm.models.job import Job
         from arm.models.track import Track
+        from arm.services.episode_claims import sync_job_claims
         from arm.services.matching.cross_disc import get_excluded_episodes
 
         # Create two jobs with same tvdb_id
@@ -584,6 +667,7 @@ class TestCrossDiscDB:
         t2 = Track(job1.job_id, "1", 3600, "16:9", 23.976, False, "mkv", "t1", "t1.mkv")
         t2.episode_number = "2"
         db.session.add_all([t1, t2])
+        sync_job_claims(job1)
         db.session.commit()
 
         # job2 should see episodes from job1 as excluded (no season filter
@@ -596,6 +680,7 @@ class TestCrossDiscDB:
         from arm.database import db
         from arm.models.job import Job
         from arm.models.track import Track
+        from arm.services.episode_claims import sync_job_claims
         from arm.services.matching.cross_disc import get_excluded_episodes
 
         with unittest.mock.patch.object(Job, 'parse_udev'), \
@@ -611,6 +696,7 @@ class TestCrossDiscDB:
         t = Track(job1.job_id, "0", 3600, "16:9", 23.976, False, "mkv", "t0", "t0.mkv")
         t.episode_number = "5"
         db.session.add(t)
+        sync_job_claims(job1)
         db.session.commit()
 
         # Should be empty since there are no other jobs
@@ -638,6 +724,7 @@ class TestCrossDiscDB:
         from arm.database import db
         from arm.models.job import Job
         from arm.models.track import Track
+        from arm.services.episode_claims import sync_job_claims
         from arm.services.matching.cross_disc import get_excluded_episodes
 
         with unittest.mock.patch.object(Job, 'parse_udev'), \
@@ -657,6 +744,7 @@ class TestCrossDiscDB:
         t = Track(job1.job_id, "0", 3600, "16:9", 23.976, False, "mkv", "t0", "t0.mkv")
         t.episode_number = "not_a_number"
         db.session.add(t)
+        sync_job_claims(job1)
         db.session.commit()
 
         excluded = get_excluded_episodes(job2)
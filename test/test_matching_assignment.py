@@ -0,0 +1,79 @@
+"""Tests for the optimal assignment solver (arm.services.matching.assignment)."""
+
+import itertools
+import random
+
+from arm.services.matching.assignment import row_margins, solve_assignment
+
+
+def _brute_force(cost):
+    """Minimum total cost over every injective row → column mapping."""
+    n, m = len(cost), len(cost[0])
+    best = float("inf")
+    if n <= m:
+        for cols in itertools.permutations(range(m), n):
+            best = min(best, sum(cost[i][j] for i, j in enumerate(cols)))
+    else:
+        for rows in itertools.permutations(range(n), m):
+            best = min(best, sum(cost[i][j] for j, i in enumerate(rows)))
+    return best
+
+
+def _total(cost, assignment):
+    return sum(cost[i][j] for i, j in enumerate(assignment) if j >= 0)
+
+
+class TestSolveAssignment:
+    """Hungarian solver correctness."""
+
+    def test_empty(self):
+        assert solve_assignment([]) == []
+        assert solve_assignment([[], []]) == [-1, -1]
+
+    def test_square_identity(self):
+        cost = [[0, 9, 9], [9, 0, 9], [9, 9, 0]]
+        assert solve_assignment(cost) == [0, 1, 2]
+
+    def test_beats_greedy(self):
+        """Greedy would take the 1 and be forced into the 100."""
+        cost = [[1, 2], [2, 100]]
+        assert solve_assignment(cost) == [1, 0]
+
+    def test_more_columns_than_rows(self):
+        cost = [[5, 1, 9, 9], [9, 9, 9, 2]]
+        assert solve_assignment(cost) == [1, 3]
+
+    def test_more_rows_than_columns(self):
+        cost = [[5, 9], [1, 9], [9, 2]]
+        result = solve_assignment(cost)
+        assert result == [-1, 0, 1]
+
+    def test_matches_brute_force_on_random_matrices(self):
+        rng = random.Random(1234)
+        for _ in range(200):
+            n = rng.randint(1, 5)
+            m = rng.randint(1, 6)
+            cost = [[rng.randint(0, 50) for _ in range(m)] for _ in range(n)]
+            result = solve_assignment(cost)
+            assigned = [j for j in result if j >= 0]
+            assert len(assigned) == min(n, m)
+            assert len(set(assigned)) == len(assigned)
+            assert _total(cost, result) == _brute_force(cost)
+
+
+class TestRowMargins:
+    """Per-row confidence margins."""
+
+    def test_margin_is_gap_to_runner_up(self):
+        cost = [[10, 40, 100], [50, 5, 60]]
+        assert row_margins(cost, [0, 1], cap=300) == [30, 45]
+
+    def test_margin_capped(self):
+        cost = [[0, 1000]]
+        assert row_margins(cost, [0], cap=300) == [300]
+
+    def test_single_column_uses_cap(self):
+        assert row_margins([[7]], [0], cap=120) == [120]
+
+    def test_unassigned_row_is_none(self):
+        assert row_margins([[1], [2]], [0, -1], cap=10) == [10, None]
@@ -0,0 +1,302 @@
+"""Tests for joint box-set matching (arm.services.matching.boxset)."""
+import unittest.mock
+
+from arm.services.matching.boxset import match_box_set_tracks
+
+
+def _season(count, runtime=2700, start=1):
+    return [
+        {"number": n, "name": f"Episode {n}", "runtime": runtime}
+        for n in range(start, start + count)
+    ]
+
+
+def _disc(job_id, disc_number, lengths):
+    return {
+        "job_id": job_id,
+        "disc_number": disc_number,
+        "tracks": [{"track_number": str(i), "length": l} for i, l in enumerate(lengths)],
+    }
+
+
+def _episodes(result, job_id):
+    disc = next(d for d in result["discs"] if d["job_id"] == job_id)
+    return [(m["season"], m["episode_number"]) for m in disc["matches"]]
+
+
+class TestMatchBoxSetTracks:
+    """Joint assignment across discs."""
+
+    def test_equal_runtimes_follow_disc_order(self):
+        discs = [
+            _disc(10, 1, [2710, 2690, 2705, 2700]),
+            _disc(11, 2, [2695, 2700, 2710, 2702]),
+            _disc(12, 3, [2700, 2708, 2690, 2699]),
+        ]
+        result = match_box_set_tracks(discs, {1: _season(12)}, tolerance=300)
+        assert result["match_count"] == 12
+        assert _episodes(result, 10) == [(1, 1), (1, 2), (1, 3), (1, 4)]
+        assert _episodes(result, 11) == [(1, 5), (1, 6), (1, 7), (1, 8)]
+        assert _episodes(result, 12) == [(1, 9), (1, 10), (1, 11), (1, 12)]
+
+    def test_input_order_does_not_matter(self):
+        discs = [
+            _disc(12, 3, [2700, 2700]),
+            _disc(10, 1, [2700, 2700]),
+            _disc(11, 2, [2700, 2700]),
+        ]
+        result = match_box_set_tracks(discs, {1: _season(6)}, tolerance=300)
+        assert [d["job_id"] for d in result["discs"]] == [10, 11, 12]
+        assert _episodes(result, 12) == [(1, 5), (1, 6)]
+
+    def test_distinct_runtime_pins_episode_regardless_of_disc(self):
+        """A double-length finale lands on the finale even when the disc
+        order prior would put it elsewhere."""
+        season = _season(6)
+        season[5]["runtime"] = 5400
+        discs = [
+            _disc(10, 1, [2700, 2700, 2700]),
+            _disc(11, 2, [2700, 2700, 5380]),
+        ]
+        result = match_box_set_tracks(discs, {1: season}, tolerance=300)
+        assert _episodes(result, 11)[-1] == (1, 6)
+        assert result["match_count"] == 6
+
+    def test_spans_seasons(self):
+        seasons = {1: _season(3, runtime=1320), 2: _season(3, runtime=2640)}
+        discs = [
+            _disc(10, 1, [1300, 1330, 1310]),
+            _disc(11, 2, [2650, 2630, 2645]),
+        ]
+        result = match_box_set_tracks(discs, seasons, tolerance=300)
+        disc1, disc2 = result["discs"]
+        assert disc1["season"] == 1 and disc2["season"] == 2
+        assert _episodes(result, 11) == [(2, 1), (2, 2), (2, 3)]
+
+    def test_disc_across_season_boundary_keeps_one_season(self):
+        """Disc 2 holds the S1 finale and the start of S2; a job stores one
+        season, so the minority-season track is left unmatched."""
+        seasons = {1: _season(4, runtime=1320), 2: _season(3, runtime=2640)}
+        discs = [
+            _disc(10, 1, [1310, 1325, 1330]),
+            _disc(11, 2, [1315, 2650, 2630, 2645]),
+        ]
+        result = match_box_set_tracks(discs, seasons, tolerance=300)
+        disc1, disc2 = result["discs"]
+        assert disc1["season"] == 1
+        assert disc2["season"] == 2
+        assert _episodes(result, 11) == [(2, 1), (2, 2), (2, 3)]
+        assert disc2["match_count"] == 3 and disc2["track_count"] == 4
+        for disc in result["discs"]:
+            assert {m["season"] for m in disc["matches"]} == {disc["season"]}
+
+    def test_pinned_season_restricts_disc(self):
+        seasons = {1: _season(2, runtime=2700), 2: _season(2, runtime=2700)}
+        discs = [dict(_disc(10, 1, [2700, 2700]), season=2)]
+        result = match_box_set_tracks(discs, seasons, tolerance=300)
+        assert _episodes(result, 10) == [(2, 1), (2, 2)]
+        assert result["discs"][0]["season"] == 2
+
+    def test_excluded_episodes_skipped(self):
+        discs = [_disc(10, 2, [2700, 2700])]
+        result = match_box_set_tracks(
+            discs, {1: _season(4)}, tolerance=300, exclude={(1, 1), (1, 2)},
+        )
+        assert _episodes(result, 10) == [(1, 3), (1, 4)]
+
+    def test_confidence_drops_with_unmatched_tracks(self):
+        season = [
+            {"number": 1, "name": "Ep 1", "runtime": 1500},
+            {"number": 2, "name": "Ep 2", "runtime": 3000},
+        ]
+        discs = [
+            _disc(10, 1, [1500]),          # clean match
+            _disc(11, 2, [3000, 6000]),    # one track fits nothing
+        ]
+        result = match_box_set_tracks(discs, {1: season}, tolerance=300)
+        clean, partial = result["discs"]
+        assert clean["confidence"] == 1.0
+        assert partial["match_count"] == 1
+        assert partial["track_count"] == 2
+        assert partial["confidence"] == 0.5
+
+    def test_short_tracks_ignored(self):
+        discs = [_disc(10, 1, [30, 2700, 90])]
+        result = match_box_set_tracks(discs, {1: _season(2)}, tolerance=300)
+        assert result["track_count"] == 1
+        assert result["discs"][0]["matches"][0]["track_number"] == "1"
+
+    def test_no_episodes(self):
+        result = match_box_set_tracks([_disc(10, 1, [2700])], {}, tolerance=300)
+        assert result["match_count"] == 0
+        assert result["discs"][0]["season"] is None
+
+
+class TestMatchBoxSetForApi:
+    """Service wrapper: episode fetch, claim exclusion, atomic apply."""
+
+    def _jobs(self, db, count=2, tvdb_id=500):
+        from arm.models.job import Job
+        from arm.models.track import Track
+
+        jobs = []
+        for n in range(1, count + 1):
+            with unittest.mock.patch.object(Job, 'parse_udev'), \
+                 unittest.mock.patch.object(Job, 'get_pid'):
+                job = Job(f'/dev/sr{n}')
+            job.tvdb_id = tvdb_id
+            job.disc_number = n
+            job.title = "Show"
+            job.video_type = "series"
+            db.session.add(job)
+            db.session.flush()
+            for i in range(2):
+                db.session.add(Track(job.job_id, str(i), 2700, "16:9", 23.976,
+                                     False, "mkv", f"t{i}", f"t{i}.mkv"))
+            jobs.append(job)
+        db.session.commit()
+        return jobs
+
+    def test_preview_does_not_write(self, app_context):
+        from arm.database import db
+        from arm.models.track import Track
+        from arm.services.tvdb_sync import match_box_set_for_api
+
+        jobs = self._jobs(db)
+        with unittest.mock.patch(
+            "arm.services.tvdb_cache.get_season_episodes",
+            new=unittest.mock.AsyncMock(return_value=_season(4)),
+        ):
+            out = match_box_set_for_api(jobs, season=1)
+
+        assert out["success"] is True
+        assert out["applied"] is False
+        assert out["match_count"] == 4
+        assert Track.query.filter(Track.episode_number.isnot(None)).count() == 0
+
+    def test_apply_writes_all_discs_and_claims(self, app_context):
+        from arm.database import db
+        from arm.models.episode_claim import EpisodeClaim
+        from arm.services.tvdb_sync import match_box_set_for_api
+
+        jobs = self._jobs(db)
+        with unittest.mock.patch(
+            "arm.services.tvdb_cache.get_season_episodes",
+            new=unittest.mock.AsyncMock(return_value=_season(4)),
+        ):
+            out = match_box_set_for_api(jobs, season=1, apply=True)
+
+        assert out["applied"] is True
+        disc2 = sorted(jobs[1].tracks, key=lambda t: t.track_number)
+        assert [t.episode_number for t in disc2] == ["3", "4"]
+        assert jobs[1].season_auto == "1"
+        assert EpisodeClaim.query.count() == 4
+
+    def _claim(self, db, job, claims, tvdb_id=500):
+        """Give *job*'s tracks claims: [(disc_number, episode), ...]."""
+        from arm.models.episode_claim import EpisodeClaim
+
+        for track, (disc_number, ep) in zip(job.tracks, claims):
+            db.session.add(EpisodeClaim(tvdb_id=tvdb_id, season=1, episode_number=ep,
+                                        job_id=job.job_id, track_id=track.track_id,
+                                        disc_number=disc_number))
+        db.session.commit()
+
+    def test_earlier_rip_of_same_disc_does_not_exclude(self, app_context):
+        """Claims held by an older job for a disc in the set (e.g. a
+        per-disc match before the box-set run) must not block re-matching."""
+        from arm.database import db
+        from arm.services.tvdb_sync import match_box_set_for_api
+
+        older = self._jobs(db, count=1)[0]
+        self._claim(db, older, [(1, 1), (1, 2)])
+        jobs = self._jobs(db)
+        with unittest.mock.patch(
+            "arm.services.tvdb_cache.get_season_episodes",
+            new=unittest.mock.AsyncMock(return_value=_season(4)),
+        ):
+            out = match_box_set_for_api(jobs, season=1)
+
+        assert out["match_count"] == 4
+        assert _episodes(out, jobs[0].job_id) == [(1, 1), (1, 2)]
+
+    def test_claims_from_other_discs_still_exclude(self, app_context):
+        from arm.database import db
+        from arm.services.tvdb_sync import match_box_set_for_api
+
+        other, unnumbered = self._jobs(db)
+        self._claim(db, other, [(3, 1), (3, 2)])
+        self._claim(db, unnumbered, [(None, 3)])
+        jobs = self._jobs(db)
+        with unittest.mock.patch(
+            "arm.services.tvdb_cache.get_season_episodes",
+            new=unittest.mock.AsyncMock(return_value=_season(6)),
+        ):
+            out = match_box_set_for_api(jobs, season=1)
+
+        matched = _episodes(out, jobs[0].job_id) + _episodes(out, jobs[1].job_id)
+        assert not {(1, 1), (1, 2), (1, 3)} & set(matched)
+
+    def test_apply_is_all_or_nothing(self, app_context):
+        from arm.database import db
+        from arm.models.track import Track
+        from arm.services.tvdb_sync import match_box_set_for_api
+
+        jobs = self._jobs(db)
+        with unittest.mock.patch(
+            "arm.services.tvdb_cache.get_season_episodes",
+            new=unittest.mock.AsyncMock(return_value=_season(4)),
+        ), unittest.mock.patch(
+            "arm.services.episode_claims.sync_job_claims",
+            side_effect=[0, RuntimeError("disk full")],
+        ):
+            out = match_box_set_for_api(jobs, season=1, apply=True)
+
+        assert out["success"] is False
+        assert out["applied"] is False
+        assert Track.query.filter(Track.episode_number.isnot(None)).count() == 0
+
+    def test_apply_keeps_manual_season(self, app_context):
+        """A user-set season pins the disc: tracks and claims use it even
+        when another season fits more of the disc."""
+        from arm.database import db
+        from arm.models.episode_claim import EpisodeClaim
+        from arm.services.tvdb_sync import match_box_set_for_api
+
+        jobs = self._jobs(db, count=1)
+        jobs[0].season = "2"
+        db.session.commit()
+        seasons = {1: _season(2), 2: _season(1)}
+        with unittest.mock.patch(
+            "arm.services.tvdb_cache.get_all_season_episodes",
+            new=unittest.mock.AsyncMock(return_value=seasons),
+        ):
+            out = match_box_set_for_api(jobs, apply=True)
+
+        assert out["applied"] is True
+        assert out["discs"][0]["season"] == 2
+        claims = EpisodeClaim.query.all()
+        assert [(c.season, c.episode_number) for c in claims] == [(2, 1)]
+
+    def test_mixed_season_proposal_not_applied(self, app_context):
+        from arm.services.tvdb_sync import _apply_box_set
+        from arm.database import db
+        import pytest
+
+        jobs = self._jobs(db, count=1)
+        disc = {"job_id": jobs[0].job_id, "season": 1, "matches": [
+            {"track_number": "0", "season": 1, "episode_number": 4, "episode_name": "A"},
+            {"track_number": "1", "season": 2, "episode_number": 1, "episode_name": "B"},
+        ]}
+        with pytest.raises(ValueError, match="span seasons"):
+            _apply_box_set(jobs, 500, [disc])
+
+    def test_mixed_series_rejected(self, app_context):
+        from arm.database import db
+        from arm.services.tvdb_sync import match_box_set_for_api
+
+        jobs = self._jobs(db)
+        jobs[1].tvdb_id = 501
+        out = match_box_set_for_api(jobs, season=1)
+        assert out["success"] is False
+        assert "different TVDB series" in out["error"]
@@ -210,3 +210,44 @@ class TestProgressStateEndpoint:
         client, _ = jobs_client
         resp = client.get("/api/v1/jobs/99999/progress-state")
         assert resp.status_code == 404
+
+
+class TestProgressForJobs:
+    def test_matches_single_job_readers(self, progress_dir):
+        (progress_dir / "progress" / "1.log").write_text(
+            'PRGC:0,2,"Saving to MKV file"\n'
+            "PRGV:1000,2000,10000\n"
+        )
+        (progress_dir / "progress" / "2.copy.log").write_text("copy,42.5,3,a.mkv\n")
+        (progress_dir / "music.log").write_text("Encoding track 1 of 5\n")
+
+        batch = progress_reader.get_progress_for_jobs(
+            [(1, None, 0), (2, "music.log", 5), (3, None, 0)]
+        )
+        for job_id, logfile, total in [(1, None, 0), (2, "music.log", 5), (3, None, 0)]:
+            assert batch[job_id] == {
+                "rip": progress_reader.get_rip_progress(job_id),
+                "music": progress_reader.get_music_progress(logfile, total),
+                "copy": progress_reader.get_copy_progress(job_id),
+            }
+
+    def test_only_listed_files_are_opened(self, progress_dir, monkeypatch):
+        (progress_dir / "progress" / "1.log").write_text("PRGV:1,1,2\n")
+        import builtins
+        real_open = builtins.open
+        opened = []
+
+        def spy(path, *a, **kw):
+            opened.append(str(path))
+            return real_open(path, *a, **kw)
+
+        monkeypatch.setattr(builtins, "open", spy)
+        progress_reader.get_progress_for_jobs([(1, None, 0), (2, None, 0)])
+        assert opened == [str(progress_dir.resolve() / "progress" / "1.log")]
+
+    def test_missing_progress_dir(self, tmp_path):
+        with unittest.mock.patch("arm.config.config.arm_config",
+                                 {"LOGPATH": str(tmp_path / "nowhere")}):
+            batch = progress_reader.get_progress_for_jobs([(1, None, 0)])
+        assert batch[1]["rip"]["progress"] is None
+        assert batch[1]["copy"]["progress"] is None
@@ -0,0 +1,248 @@
+"""Query-plan regression tests for the hot job/track/notification paths.
+
+Each test runs the real code path, captures the SELECTs it issues and
+asks SQLite for their ``EXPLAIN QUERY PLAN``.  A plain ``SCAN <table>``
+(no index) on job, track, config or notifications fails the test, so a
+dropped index or a filter rewritten around one (e.g. wrapping the column
+in lower()) is caught before it reaches a large install.
+"""
+import asyncio
+import os
+import re
+import unittest.mock
+from contextlib import contextmanager
+
+import pytest
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from sqlalchemy import event
+
+_HOT_TABLES = {"job", "track", "config", "notifications"}
+_FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)$")
+
+
+@contextmanager
+def _capture_selects(db):
+    statements = []
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", before)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before)
+
+
+def _full_scans(db, statements):
+    """Return ``[(table, sql)]`` for every unindexed scan of a hot table."""
+    scans = []
+    with db.engine.connect() as conn:
+        for statement, parameters in statements:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            for row in rows:
+                match = _FULL_SCAN.match(row[-1])
+                if match and match.group(1) in _HOT_TABLES:
+                    scans.append((match.group(1), statement))
+    return scans
+
+
+def _assert_indexed(db, statements):
+    assert statements, "code path issued no SELECT"
+    scans = _full_scans(db, statements)
+    assert not scans, "full table scan:\n" + "\n\n".join(f"[{t}] {sql}" for t, sql in scans)
+
+
+def _seed(db, n=20):
+    from arm.models.config import Config
+    from arm.models.job import Job
+    from arm.models.notifications import Notifications
+    from arm.models.track import Track
+
+    statuses = ["success", "fail", "video_ripping", "transcoding", "waiting_transcode"]
+    jobs = []
+    for i in range(n):
+        with unittest.mock.patch.object(Job, 'parse_udev'), \
+             unittest.mock.patch.object(Job, 'get_pid'):
+            job = Job(f'/dev/sr{i % 3}')
+        job.status = statuses[i % len(statuses)]
+        job.label = f"LABEL_{i % 7}"
+        job.crc_id = f"crc{i}"
+        job.tvdb_id = 100 + i % 4
+        job.disctype = "dvd"
+        db.session.add(job)
+        jobs.append(job)
+    db.session.flush()
+    for job in jobs:
+        db.session.add(Config({"MINLENGTH": "600"}, job.job_id))
+        for t in range(3):
+            db.session.add(Track(
+                job.job_id, str(t), 3000, "16:9", 24.0, t == 0, "makemkv",
+                "title", f"title_t{t:02d}.mkv",
+            ))
+    for i in range(5):
+        db.session.add(Notifications(f"note {i}", "body"))
+    db.session.commit()
+    return jobs
+
+
+@pytest.fixture
+def seeded(app_context):
+    _, db = app_context
+    return db, _seed(db)
+
+
+class TestJobListPlans:
+    def test_active_jobs(self, seeded):
+        from arm.api.v1.jobs import get_active_jobs
+
+        db, _ = seeded
+        with _capture_selects(db) as statements:
+            asyncio.run(get_active_jobs())
+        _assert_indexed(db, statements)
+
+    @pytest.mark.parametrize("status", ["active", "waiting", "success"])
+    def test_paginated_with_status_filter(self, seeded, status):
+        from arm.api.v1.jobs import get_jobs_paginated
+
+        db, _ = seeded
+        with _capture_selects(db) as statements:
+            asyncio.run(get_jobs_paginated(page=1, per_page=10, status=status))
+        _assert_indexed(db, statements)
+
+    def test_paginated_default_sort_uses_start_time_index(self, seeded):
+        from arm.api.v1.jobs import get_jobs_paginated
+
+        db, _ = seeded
+        with _capture_selects(db) as statements:
+            asyncio.run(get_jobs_paginated(page=1, per_page=10))
+        _assert_indexed(db, statements)
+
+    def test_paginated_cursor_page(self, seeded):
+        from arm.api.v1.jobs import get_jobs_paginated
+
+        db, _ = seeded
+        first = asyncio.run(get_jobs_paginated(page=1, per_page=5))
+        assert first["next_cursor"]
+        with _capture_selects(db) as statements:
+            asyncio.run(get_jobs_paginated(per_page=5, cursor=first["next_cursor"]))
+        _assert_indexed(db, statements)
+
+    def test_stats(self, seeded):
+        from arm.api.v1 import jobs as jobs_api
+
+        db, _ = seeded
+        jobs_api._invalidate_stats()
+        with _capture_selects(db) as statements:
+            asyncio.run(jobs_api.get_jobs_stats())
+        _assert_indexed(db, statements)
+
+    def test_track_counts(self, seeded):
+        from arm.services.jobs import track_counts_by_job
+
+        db, jobs = seeded
+        with _capture_selects(db) as statements:
+            track_counts_by_job(j.job_id for j in jobs[:5])
+        _assert_indexed(db, statements)
+
+    def test_unknown_status_matches_nothing(self, seeded):
+        from arm.api.v1.jobs import get_jobs_paginated
+
+        result = asyncio.run(get_jobs_paginated(page=1, per_page=10, status="no_such_status"))
+        assert result["total"] == 0
+        assert result["jobs"] == []
+
+
+class TestRipperLookupPlans:
+    def test_duplicate_run_check(self, seeded):
+        from arm.models.job import Job
+
+        db, _ = seeded
+        with _capture_selects(db) as statements:
+            db.session.query(Job).filter(~Job.finished, Job.devpath == "/dev/sr0").all()
+        _assert_indexed(db, statements)
+
+    def test_label_dupe_check(self, seeded):
+        from arm.models.job import Job
+
+        db, _ = seeded
+        with _capture_selects(db) as statements:
+            Job.query.filter_by(label="LABEL_1", status="success").all()
+        _assert_indexed(db, statements)
+
+    @pytest.mark.parametrize("column,value", [("crc_id", "crc3"), ("tvdb_id", 101)])
+    def test_identity_lookups(self, seeded, column, value):
+        from arm.models.job import Job
+
+        db, _ = seeded
+        with _capture_selects(db) as statements:
+            Job.query.filter(getattr(Job, column) == value).all()
+        _assert_indexed(db, statements)
+
+
+class TestNotificationPlans:
+    def test_uncleared_list_and_unseen_count(self, seeded):
+        from arm.models.notifications import Notifications
+
+        db, _ = seeded
+        with _capture_selects(db) as statements:
+            (Notifications.query
+             .filter(Notifications.cleared == False)  # noqa: E712
+             .order_by(Notifications.trigger_time.desc()).all())
+            Notifications.query.filter(Notifications.seen == False).count()  # noqa: E712
+        _assert_indexed(db, statements)
+
+
+_MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'arm', 'migrations',
+)
+_BEFORE = 'z1a2b3c4d5'
+_AFTER = 'a2b3c4d5e6'
+
+
+def _make_config(db_path):
+    cfg = AlembicConfig()
+    cfg.set_main_option('script_location', _MIGRATIONS_DIR)
+    cfg.set_main_option('sqlalchemy.url', f'sqlite:///{db_path}')
+    return cfg
+
+
+class TestHotPathIndexMigration:
+    """The a2b3c4d5e6 migration creates exactly the indexes the models declare."""
+
+    @staticmethod
+    def _named_indexes(engine, table):
+        return {
+            ix['name']: ix['column_names']
+            for ix in sa.inspect(engine).get_indexes(table)
+            if ix['name'] and ix['name'].startswith('ix_')
+        }
+
+    def test_upgrade_matches_models_and_downgrade_drops(self, tmp_path):
+        from arm.database import Base
+        import arm.models  # noqa: F401  (register every table)
+
+        db_path = str(tmp_path / 'arm.db')
+        cfg = _make_config(db_path)
+        command.upgrade(cfg, _AFTER)
+        engine = sa.create_engine(f'sqlite:///{db_path}')
+        try:
+            for table in ('job', 'track', 'config', 'notifications'):
+                declared = {
+                    ix.name: [c.name for c in ix.columns]
+                    for ix in Base.metadata.tables[table].indexes
+                }
+                migrated = self._named_indexes(engine, table)
+                for name, columns in declared.items():
+                    assert migrated.get(name) == columns, (table, name)
+            engine.dispose()
+
+            command.downgrade(cfg, _BEFORE)
+            assert 'ix_job_status_start_time' not in self._named_indexes(engine, 'job')
+            assert 'ix_track_job_id' not in self._named_indexes(engine, 'track')
+        finally:
+            engine.dispose()
@@ -922,7 +922,7 @@ class TestTrackInfoProcessorIntegration:
         with unittest.mock.patch('arm.ripper.makemkv.utils.database_updater') as mock_upd:
             proc._process_message(Titles(count=5))
 
-        mock_upd.assert_called_once_with({"no_of_titles": 5}, sample_job)
+        mock_upd.assert_called_once_with({"no_of_titles": 5}, sample_job, coalesce=True)
 
     def test_process_messages_full_flow(self, app_context, sample_job):
         """process_messages() should parse all messages and flush final track."""
@@ -16,6 +16,14 @@ import pytest
 # tvdb_sync tests
 # ═══════════════════════════════════════════════════════════════════════
 
+@pytest.fixture
+def no_claim_sync():
+    """Skip the episode-claim ledger for MagicMock jobs (see test_episode_claims)."""
+    with patch("arm.services.episode_claims.sync_job_claims") as sync:
+        yield sync
+
+
+@pytest.mark.usefixtures("no_claim_sync")
 class TestApplyMatches:
     """Test _apply_matches helper."""
 
@@ -119,6 +127,7 @@ class TestApplyMatches:
         assert count == 0
 
 
+@pytest.mark.usefixtures("no_claim_sync")
 class TestMatchEpisodesSync:
     """Test match_episodes_sync."""
 
@@ -209,6 +218,7 @@ class TestMatchEpisodesSync:
         assert job.tvdb_id == 99999
 
 
+@pytest.mark.usefixtures("no_claim_sync")
 class TestMatchEpisodesForApi:
     """Test match_episodes_for_api."""
 
@@ -0,0 +1,143 @@
+"""Tests for arm.database.sqlite_tuning (pragma profiles, WAL checkpointer)."""
+import sqlite3
+import unittest.mock
+
+import pytest
+from sqlalchemy import text
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    from arm.database import db
+
+    db.dispose()
+    db.init_engine(f"sqlite:///{tmp_path / 'arm.db'}")
+    db.create_all()
+    yield db
+    db.dispose()
+
+
+def _pragma(db, name):
+    with db.engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def _write(db, n=50):
+    with db.engine.begin() as conn:
+        for i in range(n):
+            conn.execute(text("INSERT INTO notifications (title, message, seen, cleared, trigger_time) "
+                              "VALUES (:t, 'm', 0, 0, CURRENT_TIMESTAMP)"), {"t": f"n{i}"})
+
+
+class TestResolvePragmas:
+    def test_default_profile_is_balanced(self):
+        from arm.database import sqlite_tuning
+        assert sqlite_tuning.resolve_pragmas() == sqlite_tuning.PROFILES["balanced"]
+
+    def test_overrides_apply_on_top_of_profile(self):
+        from arm.database import sqlite_tuning
+        pragmas = sqlite_tuning.resolve_pragmas("low_memory", {"cache_size": -4000})
+        assert pragmas["synchronous"] == "NORMAL"
+        assert pragmas["cache_size"] == -4000
+
+    def test_overrides_from_config_string(self):
+        from arm.database import sqlite_tuning
+        pragmas = sqlite_tuning.resolve_pragmas("safe", "cache_size=-32000, mmap_size = 0, bogus")
+        assert pragmas == {"cache_size": "-32000", "mmap_size": "0"}
+
+    def test_unknown_profile_falls_back(self):
+        from arm.database import sqlite_tuning
+        assert sqlite_tuning.resolve_pragmas("turbo") == sqlite_tuning.PROFILES["balanced"]
+
+    @pytest.mark.parametrize("overrides", [
+        {"journal_mode": "DELETE"},
+        {"cache_size": "1; DROP TABLE job"},
+    ])
+    def test_disallowed_overrides_are_skipped(self, overrides):
+        from arm.database import sqlite_tuning
+        assert sqlite_tuning.resolve_pragmas("safe", overrides) == {}
+
+
+class TestEnginePragmas:
+    def test_balanced_profile_applied_to_connections(self, file_db):
+        assert _pragma(file_db, "journal_mode") == "wal"
+        assert _pragma(file_db, "synchronous") == 1  # NORMAL
+        assert _pragma(file_db, "cache_size") == -16000
+        assert _pragma(file_db, "temp_store") == 2  # MEMORY
+
+    def test_safe_profile_keeps_sqlite_defaults(self, tmp_path):
+        from arm.database import db
+
+        db.dispose()
+        db.init_engine(f"sqlite:///{tmp_path / 'arm.db'}", sqlite_profile="safe")
+        try:
+            assert _pragma(db, "synchronous") == 2  # FULL
+        finally:
+            db.dispose()
+
+
+class TestCheckpointer:
+    def test_passive_while_busy_then_truncate_when_idle(self, file_db):
+        from arm.database import sqlite_tuning
+
+        path = file_db.engine.url.database
+        _write(file_db)
+        checkpointer = sqlite_tuning._Checkpointer(path, 10)
+        try:
+            assert checkpointer.run_once() == "PASSIVE"
+            stats = checkpointer.stats()
+            assert stats["checkpoint_lag_frames"] == 0
+            assert stats["wal_bytes"] > 0
+
+            assert checkpointer.run_once() == "TRUNCATE"
+            assert sqlite_tuning._wal_size(path) == 0
+            assert checkpointer.run_once() is None
+            assert checkpointer.stats()["checkpoints"] == {"passive": 1, "truncate": 1, "busy": 0}
+        finally:
+            checkpointer.stop()
+
+    def test_open_reader_reports_lag(self, file_db):
+        from arm.database import sqlite_tuning
+
+        path = file_db.engine.url.database
+        _write(file_db)
+        reader = sqlite3.connect(path, isolation_level=None)
+        checkpointer = sqlite_tuning._Checkpointer(path, 10)
+        try:
+            reader.execute("BEGIN")
+            reader.execute("SELECT count(*) FROM notifications").fetchone()
+            _write(file_db)  # frames newer than the reader's snapshot
+            checkpointer.run_once()
+            stats = checkpointer.stats()
+            assert stats["checkpoint_lag_frames"] > 0
+            assert stats["checkpoint_lag_s"] is None
+        finally:
+            reader.close()
+            checkpointer.stop()
+
+    def test_not_started_for_in_memory_database(self, app_context):
+        from arm.database import sqlite_tuning
+
+        _, db = app_context
+        assert sqlite_tuning.start_checkpointer(db.engine, 10) is False
+        assert sqlite_tuning.wal_stats() is None
+
+
+class TestSystemStats:
+    def test_stats_include_wal_state(self, file_db):
+        from fastapi.testclient import TestClient
+
+        from arm.app import app
+
+        with unittest.mock.patch.dict("arm.config.config.arm_config",
+                                      {"SQLITE_CHECKPOINT_INTERVAL": 3600}), \
+             unittest.mock.patch("arm.api.v1.system.psutil") as psutil:
+            psutil.cpu_percent.return_value = 5.0
+            psutil.sensors_temperatures.return_value = {}
+            psutil.virtual_memory.return_value = unittest.mock.Mock(
+                total=8 << 30, used=4 << 30, available=4 << 30, percent=50.0)
+            with TestClient(app, raise_server_exceptions=True) as client:
+                database = client.get('/api/v1/system/stats').json()["database"]
+        assert database["interval_s"] == 3600
+        assert database["checkpoint_lag_frames"] is None
+        assert {"wal_bytes", "checkpoint_lag_s", "checkpoints"} <= set(database)
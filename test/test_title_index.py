@@ -0,0 +1,146 @@
+"""Tests for the local title index (arm.services.title_index)."""
+import unittest.mock
+
+import pytest
+
+from arm.services import title_index
+
+
+@pytest.fixture(autouse=True)
+def _fresh_index():
+    title_index.invalidate()
+    yield
+    title_index.invalidate()
+
+
+def _make_job(db, label, title=None, crc_id=None, imdb_id=None, year="1999",
+              confirmed=True, devpath='/dev/sr0'):
+    from arm.models.job import Job
+
+    with unittest.mock.patch.object(Job, 'parse_udev'), \
+         unittest.mock.patch.object(Job, 'get_pid'):
+        job = Job(devpath)
+    job.label = label
+    job.crc_id = crc_id
+    job.title = title
+    job.year = year
+    job.imdb_id = imdb_id
+    job.video_type = "movie"
+    if confirmed and title:
+        job.title_manual = title
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+class TestLookup:
+    """Tiered lookup against confirmed jobs."""
+
+    def test_crc_match_is_certain(self, app_context):
+        _, db = app_context
+        _make_job(db, "SOMETHING_ELSE", "The Matrix", crc_id="abc123", imdb_id="tt0133093")
+        hit = title_index.lookup("abc123", "UNRELATED")
+        assert hit["source"] == "crc"
+        assert hit["confidence"] == 1.0
+        assert hit["entry"].imdb_id == "tt0133093"
+
+    def test_normalised_label_match(self, app_context):
+        _, db = app_context
+        _make_job(db, "THE_MATRIX_DISC_1", "The Matrix", imdb_id="tt0133093")
+        hit = title_index.lookup(None, "The Matrix Disc 2")
+        assert hit["source"] == "label"
+        assert hit["confidence"] == 0.9
+        assert hit["entry"].title == "The Matrix"
+
+    def test_ambiguous_label_lowers_confidence(self, app_context):
+        _, db = app_context
+        _make_job(db, "DISC_VOLUME", "Film A", imdb_id="tt1")
+        _make_job(db, "DISC_VOLUME", "Film A", imdb_id="tt1", devpath='/dev/sr1')
+        _make_job(db, "DISC_VOLUME", "Film B", imdb_id="tt2", devpath='/dev/sr2')
+        hit = title_index.lookup(None, "DISC_VOLUME")
+        assert hit["entry"].imdb_id == "tt1"
+        assert hit["confidence"] == pytest.approx(0.9 * 2 / 3, abs=1e-3)
+
+    def test_fuzzy_label_match(self, app_context):
+        _, db = app_context
+        _make_job(db, "HOTEL_TRANSYLVANIA_3", "Hotel Transylvania 3", imdb_id="tt5220122")
+        hit = title_index.lookup(None, "HOTEL_TRANSYLVANIA_3_WS")
+        assert hit["source"] == "fuzzy"
+        assert 0.7 < hit["confidence"] < 0.8
+
+    def test_fuzzy_rejects_sequel(self, app_context):
+        _, db = app_context
+        _make_job(db, "THE_MATRIX_RELOADED", "The Matrix Reloaded")
+        assert title_index.lookup(None, "THE_MATRIX") is None
+
+    def test_unrelated_label_misses(self, app_context):
+        _, db = app_context
+        _make_job(db, "THE_MATRIX", "The Matrix")
+        assert title_index.lookup(None, "FINDING_NEMO") is None
+
+    def test_unconfirmed_jobs_ignored(self, app_context):
+        _, db = app_context
+        _make_job(db, "THE_MATRIX", "The Matrix", crc_id="abc123", confirmed=False)
+        assert title_index.lookup("abc123", "THE_MATRIX") is None
+
+    def test_excludes_the_job_itself(self, app_context):
+        _, db = app_context
+        job = _make_job(db, "THE_MATRIX", "The Matrix", crc_id="abc123")
+        assert title_index.lookup("abc123", "THE_MATRIX", exclude_job_id=job.job_id) is None
+
+    def test_index_rebuilds_when_jobs_confirmed(self, app_context):
+        _, db = app_context
+        assert title_index.lookup(None, "THE_MATRIX") is None
+        _make_job(db, "THE_MATRIX", "The Matrix")
+        assert title_index.lookup(None, "THE_MATRIX")["entry"].title == "The Matrix"
+
+
+class TestIdentifyFromHistory:
+    """identify._identify_from_history applies confident hits only."""
+
+    def test_applies_hit(self, app_context):
+        from arm.ripper.identify import _identify_from_history
+
+        _, db = app_context
+        _make_job(db, "THE_MATRIX", "The Matrix", imdb_id="tt0133093")
+        job = _make_job(db, "THE_MATRIX", devpath='/dev/sr1', year=None)
+
+        assert _identify_from_history(job) is True
+        assert job.title == "The Matrix"
+        assert job.imdb_id_auto == "tt0133093"
+        assert job.hasnicetitle is True
+
+    def test_movie_hit_writes_expected_title(self, app_context):
+        from arm.models.expected_title import ExpectedTitle
+        from arm.ripper.identify import _identify_from_history
+
+        _, db = app_context
+        _make_job(db, "THE_MATRIX", "The Matrix", imdb_id="tt0133093")
+        job = _make_job(db, "THE_MATRIX", devpath='/dev/sr1', year=None)
+
+        assert _identify_from_history(job) is True
+        rows = ExpectedTitle.query.filter_by(job_id=job.job_id).all()
+        assert [(r.title, r.external_id, r.source) for r in rows] == [
+            ("The Matrix", "tt0133093", "manual"),
+        ]
+
+    def test_low_confidence_ignored(self, app_context):
+        from arm.ripper.identify import _identify_from_history
+
+        _, db = app_context
+        _make_job(db, "HOTEL_TRANSYLVANIA_3", "Hotel Transylvania 3")
+        job = _make_job(db, "HOTEL_TRANSYLVANIA_3_WS", devpath='/dev/sr1')
+        with unittest.mock.patch.dict(
+            "arm.config.config.arm_config", {"LOCAL_TITLE_INDEX_MIN_CONFIDENCE": 0.95},
+        ):
+            assert _identify_from_history(job) is False
+        assert job.title is None
+
+    def test_disabled_by_config(self, app_context):
+        from arm.ripper.identify import _identify_from_history
+
+        _, db = app_context
+        _make_job(db, "THE_MATRIX", "The Matrix")
+        job = _make_job(db, "THE_MATRIX", devpath='/dev/sr1')
+        with unittest.mock.patch.dict("arm.config.config.arm_config", {"LOCAL_TITLE_INDEX": False}):
+            assert _identify_from_history(job) is False
@@ -295,6 +295,38 @@ class TestGetAllSeasonEpisodes:
             result = asyncio.run(tvdb.get_all_season_episodes(12345, max_season=3))
         assert set(result.keys()) == {1, 2, 3}
 
+    def test_gap_inside_concurrent_batch_truncates(self):
+        from arm.services import tvdb
+
+        async def mock_get_season_episodes(tvdb_id, season):
+            if season == 4:
+                return []
+            return [{"number": 1, "name": f"S{season}E1", "runtime": 3000}]
+
+        with unittest.mock.patch.object(
+            tvdb, 'get_season_episodes', side_effect=mock_get_season_episodes
+        ):
+            result = asyncio.run(tvdb.get_all_season_episodes(12345, max_season=10))
+        assert set(result.keys()) == {1, 2, 3}
+
+    def test_first_season_offset(self):
+        from arm.services import tvdb
+
+        seen = []
+
+        async def mock_get_season_episodes(tvdb_id, season):
+            seen.append(season)
+            return [{"number": 1, "name": f"S{season}E1", "runtime": 3000}]
+
+        with unittest.mock.patch.object(
+            tvdb, 'get_season_episodes', side_effect=mock_get_season_episodes
+        ):
+            result = asyncio.run(
+                tvdb.get_all_season_episodes(12345, max_season=5, first_season=3)
+            )
+        assert set(result.keys()) == {3, 4, 5}
+        assert sorted(seen) == [3, 4, 5]
+
 
 class TestTvdbAsync:
     """Test async TVDB functions with mocked HTTP."""
@@ -0,0 +1,162 @@
+"""Tests for the persistent TVDB season cache (arm.services.tvdb_cache)."""
+import asyncio
+import datetime
+import unittest.mock
+
+import httpx
+
+
+def _eps(season, count=2):
+    return [
+        {"number": n, "name": f"S{season}E{n}", "runtime": 2640, "aired": ""}
+        for n in range(1, count + 1)
+    ]
+
+
+def _age_rows(tvdb_id, hours):
+    from arm.database import db
+    from arm.models.tvdb_season_cache import TvdbSeasonCache
+
+    stamp = datetime.datetime.utcnow() - datetime.timedelta(hours=hours)
+    for row in TvdbSeasonCache.query.filter_by(tvdb_id=tvdb_id):
+        row.fetched_at = stamp
+    db.session.commit()
+
+
+class TestGetAllSeasonEpisodesCached:
+    """Best-season scans go through the cache."""
+
+    def test_cold_fetch_stores_seasons_and_end_marker(self, app_context):
+        from arm.models.tvdb_season_cache import TvdbSeasonCache
+        from arm.services import tvdb, tvdb_cache
+
+        fetched = {1: _eps(1), 2: _eps(2)}
+        with unittest.mock.patch.object(
+            tvdb, "get_all_season_episodes",
+            new=unittest.mock.AsyncMock(return_value=fetched),
+        ) as mock_fetch, unittest.mock.patch.object(
+            tvdb, "get_series_last_updated",
+            new=unittest.mock.AsyncMock(return_value="2026-01-01 00:00:00"),
+        ):
+            result = asyncio.run(tvdb_cache.get_all_season_episodes(100, 10))
+
+        assert result == fetched
+        mock_fetch.assert_awaited_once_with(100, 10, first_season=1)
+        rows = {r.season: r for r in TvdbSeasonCache.query.filter_by(tvdb_id=100)}
+        assert set(rows) == {1, 2, 3}
+        assert rows[3].episodes == []
+        assert rows[1].series_updated == "2026-01-01 00:00:00"
+
+    def test_warm_cache_is_offline(self, app_context):
+        from arm.services import tvdb, tvdb_cache
+
+        tvdb_cache.store_seasons(100, {1: _eps(1), 2: _eps(2), 3: []}, "stamp")
+        offline = unittest.mock.AsyncMock(side_effect=httpx.ConnectError("offline"))
+        with unittest.mock.patch.object(tvdb, "get_all_season_episodes", new=offline), \
+             unittest.mock.patch.object(tvdb, "get_series_last_updated", new=offline):
+            result = asyncio.run(tvdb_cache.get_all_season_episodes(100, 10))
+
+        assert set(result) == {1, 2}
+        offline.assert_not_awaited()
+
+    def test_partial_cache_resumes_from_first_uncached_season(self, app_context):
+        from arm.services import tvdb, tvdb_cache
+
+        tvdb_cache.store_seasons(100, {1: _eps(1)}, "stamp")
+        with unittest.mock.patch.object(
+            tvdb, "get_all_season_episodes",
+            new=unittest.mock.AsyncMock(return_value={2: _eps(2)}),
+        ) as mock_fetch:
+            result = asyncio.run(tvdb_cache.get_all_season_episodes(100, 10))
+
+        assert set(result) == {1, 2}
+        mock_fetch.assert_awaited_once_with(100, 10, first_season=2)
+
+    def test_stale_unchanged_series_is_revalidated_not_refetched(self, app_context):
+        from arm.models.tvdb_season_cache import TvdbSeasonCache
+        from arm.services import tvdb, tvdb_cache
+
+        tvdb_cache.store_seasons(100, {1: _eps(1), 2: []}, "stamp")
+        _age_rows(100, hours=48)
+        with unittest.mock.patch.object(
+            tvdb, "get_series_last_updated",
+            new=unittest.mock.AsyncMock(return_value="stamp"),
+        ), unittest.mock.patch.object(
+            tvdb, "get_all_season_episodes", new=unittest.mock.AsyncMock(),
+        ) as mock_fetch:
+            result = asyncio.run(tvdb_cache.get_all_season_episodes(100, 10))
+
+        assert set(result) == {1}
+        mock_fetch.assert_not_awaited()
+        row = TvdbSeasonCache.query.filter_by(tvdb_id=100, season=1).one()
+        assert datetime.datetime.utcnow() - row.fetched_at < datetime.timedelta(hours=1)
+
+    def test_stale_changed_series_is_refetched(self, app_context):
+        from arm.services import tvdb, tvdb_cache
+
+        tvdb_cache.store_seasons(100, {1: _eps(1, count=1), 2: []}, "old")
+        _age_rows(100, hours=48)
+        fresh = {1: _eps(1, count=3)}
+        with unittest.mock.patch.object(
+            tvdb, "get_series_last_updated",
+            new=unittest.mock.AsyncMock(return_value="new"),
+        ), unittest.mock.patch.object(
+            tvdb, "get_all_season_episodes",
+            new=unittest.mock.AsyncMock(return_value=fresh),
+        ):
+            result = asyncio.run(tvdb_cache.get_all_season_episodes(100, 10))
+
+        assert len(result[1]) == 3
+        rows = tvdb_cache.load_series(100)
+        assert rows[1].series_updated == "new"
+
+    def test_stale_cache_used_when_tvdb_unreachable(self, app_context):
+        from arm.services import tvdb, tvdb_cache
+
+        tvdb_cache.store_seasons(100, {1: _eps(1), 2: []}, "stamp")
+        _age_rows(100, hours=48)
+        with unittest.mock.patch.object(
+            tvdb, "get_series_last_updated",
+            new=unittest.mock.AsyncMock(side_effect=httpx.ConnectError("down")),
+        ):
+            result = asyncio.run(tvdb_cache.get_all_season_episodes(100, 10))
+
+        assert set(result) == {1}
+
+
+class TestGetSeasonEpisodesCached:
+    """Single-season lookups go through the cache."""
+
+    def test_miss_then_hit(self, app_context):
+        from arm.services import tvdb, tvdb_cache
+
+        with unittest.mock.patch.object(
+            tvdb, "get_season_episodes",
+            new=unittest.mock.AsyncMock(return_value=_eps(2)),
+        ) as mock_fetch, unittest.mock.patch.object(
+            tvdb, "get_series_last_updated",
+            new=unittest.mock.AsyncMock(return_value="stamp"),
+        ):
+            first = asyncio.run(tvdb_cache.get_season_episodes(100, 2))
+            second = asyncio.run(tvdb_cache.get_season_episodes(100, 2))
+
+        assert first == second == _eps(2)
+        assert mock_fetch.await_count == 1
+
+    def test_without_database_falls_through_to_network(self):
+        from arm.services import tvdb, tvdb_cache
+
+        with unittest.mock.patch.object(
+            tvdb, "get_season_episodes",
+            new=unittest.mock.AsyncMock(return_value=_eps(1)),
+        ), unittest.mock.patch.object(
+            tvdb, "get_series_last_updated",
+            new=unittest.mock.AsyncMock(return_value=None),
+        ), unittest.mock.patch.object(
+            tvdb_cache, "load_series", side_effect=RuntimeError("no db"),
+        ), unittest.mock.patch.object(
+            tvdb_cache, "store_seasons", side_effect=RuntimeError("no db"),
+        ):
+            result = asyncio.run(tvdb_cache.get_season_episodes(100, 1))
+
+        assert result == _eps(1)
@@ -0,0 +1,194 @@
+"""Tests for arm.database.write_buffer (coalesced ripper writes)."""
+import unittest.mock
+
+import pytest
+from sqlalchemy import event, text
+
+
+def _db_value(db, table, column, row_id):
+    pk = "job_id" if table == "job" else "track_id"
+    return db.session.execute(
+        text(f"SELECT {column} FROM {table} WHERE {pk} = :id"), {"id": row_id}
+    ).scalar()
+
+
+def _add_track(db, job, number="1"):
+    from arm.models.track import Track
+
+    track = Track(job.job_id, number, 3000, "16:9", 24.0, False, "makemkv",
+                  "title", f"title_t{number}.mkv")
+    db.session.add(track)
+    db.session.commit()
+    return track
+
+
+class _Updates:
+    """Collect UPDATE statements sent to the engine."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._collect)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._collect)
+
+    def _collect(self, conn, cursor, statement, *args):
+        if statement.startswith("UPDATE"):
+            self.statements.append(statement)
+
+
+class TestStage:
+    def test_staged_values_visible_in_process_not_in_db(self, app_context, sample_job):
+        from arm.database import write_buffer
+
+        _, db = app_context
+        write_buffer.stage(sample_job, {"stage": "ripping"})
+        assert sample_job.stage == "ripping"
+        assert write_buffer.pending_count() == 1
+        assert _db_value(db, "job", "stage", sample_job.job_id) == "170750493000"
+
+        write_buffer.flush()
+        assert write_buffer.pending_count() == 0
+        assert _db_value(db, "job", "stage", sample_job.job_id) == "ripping"
+
+    def test_updates_to_a_row_coalesce(self, app_context, sample_job):
+        from arm.database import write_buffer
+
+        _, db = app_context
+        track = _add_track(db, sample_job)
+        with _Updates(db.engine) as updates:
+            for status in ("ripping", "encoding", "success"):
+                write_buffer.stage(track, {"status": status})
+            write_buffer.stage(track, {"ripped": True})
+            write_buffer.stage(sample_job, {"stage": "tagging"})
+            write_buffer.flush()
+        assert len(updates.statements) == 2
+        assert _db_value(db, "track", "status", track.track_id) == "success"
+        assert _db_value(db, "track", "ripped", track.track_id) == 1
+
+    def test_interval_elapsed_commits(self, app_context, sample_job, monkeypatch):
+        from arm.database import write_buffer
+
+        _, db = app_context
+        monkeypatch.setattr(write_buffer, "FLUSH_INTERVAL", 0)
+        assert write_buffer.stage(sample_job, {"stage": "ripping"}) is True
+        assert _db_value(db, "job", "stage", sample_job.job_id) == "ripping"
+
+    def test_lone_staged_write_reaches_db_within_interval(self, app_context, sample_job):
+        from arm.database import write_buffer
+
+        _, db = app_context
+        clock = [1000.0]
+        with unittest.mock.patch.object(write_buffer.time, "monotonic", lambda: clock[0]):
+            assert write_buffer.stage(sample_job, {"stage": "ripping"}) is False
+            clock[0] += write_buffer.FLUSH_INTERVAL / 2
+            assert write_buffer.flush_if_due() is False
+            assert _db_value(db, "job", "stage", sample_job.job_id) == "170750493000"
+            clock[0] += write_buffer.FLUSH_INTERVAL / 2
+            assert write_buffer.flush_if_due() is True
+        assert write_buffer.pending_count() == 0
+        assert _db_value(db, "job", "stage", sample_job.job_id) == "ripping"
+
+    def test_flush_if_due_without_pending_is_noop(self, app_context):
+        from arm.database import write_buffer
+
+        assert write_buffer.flush_if_due() is False
+
+    def test_not_persistent_object_commits_immediately(self, app_context, sample_job):
+        from arm.database import write_buffer
+        from arm.models.track import Track
+
+        _, db = app_context
+        track = Track(sample_job.job_id, "2", 10, "16:9", 24.0, False, "makemkv", "t", "t.mkv")
+        db.session.add(track)
+        assert write_buffer.stage(track, {"status": "ripping"}) is True
+        assert _db_value(db, "track", "status", track.track_id) == "ripping"
+
+
+class TestOrdering:
+    def test_status_change_commits_after_earlier_staged_writes(self, app_context, sample_job):
+        from arm.database import write_buffer
+
+        _, db = app_context
+        track = _add_track(db, sample_job)
+        write_buffer.stage(track, {"status": "success", "ripped": True})
+        with _Updates(db.engine) as updates:
+            assert write_buffer.stage(sample_job, {"status": "success"}) is True
+        assert [s.split()[1] for s in updates.statements] == ["track", "job"]
+        assert _db_value(db, "job", "status", sample_job.job_id) == "success"
+        assert write_buffer.pending_count() == 0
+
+    def test_unrelated_commit_carries_staged_writes(self, app_context, sample_job):
+        from arm.database import write_buffer
+        from arm.models.notifications import Notifications
+
+        _, db = app_context
+        write_buffer.stage(sample_job, {"stage": "ripping"})
+        db.session.add(Notifications("t", "m"))
+        db.session.commit()
+        assert _db_value(db, "job", "stage", sample_job.job_id) == "ripping"
+
+    def test_later_orm_write_wins(self, app_context, sample_job):
+        from arm.database import write_buffer
+        from arm.models.job import Job
+
+        _, db = app_context
+        write_buffer.stage(sample_job, {"title": "Staged"})
+        sample_job.title = "Direct"
+        Job.query.count()  # autoflush writes the ORM value first
+        db.session.commit()
+        assert _db_value(db, "job", "title", sample_job.job_id) == "Direct"
+
+    def test_failed_commit_keeps_writes_pending(self, app_context, sample_job):
+        from arm.database import write_buffer
+
+        _, db = app_context
+        write_buffer.stage(sample_job, {"stage": "ripping"})
+        with unittest.mock.patch.object(write_buffer, "_write", side_effect=RuntimeError("boom")):
+            with pytest.raises(RuntimeError):
+                db.session.commit()
+        assert write_buffer.pending_count() == 1
+        write_buffer.flush()
+        assert _db_value(db, "job", "stage", sample_job.job_id) == "ripping"
+
+
+class TestDatabaseUpdater:
+    def test_coalesce_stages_instead_of_committing(self, app_context, sample_job):
+        from arm.database import write_buffer
+        from arm.ripper.utils import database_updater
+
+        _, db = app_context
+        assert database_updater({"no_of_titles": 7}, sample_job, coalesce=True)
+        assert sample_job.no_of_titles == 7
+        assert write_buffer.pending_count() == 1
+        write_buffer.flush()
+        assert _db_value(db, "job", "no_of_titles", sample_job.job_id) == 7
+
+
+class TestRipperCallers:
+    def test_file_added_commits_track_immediately(self, app_context, sample_job):
+        from arm.ripper.makemkv import _mark_track_ripped_by_message
+
+        _, db = app_context
+        track = _add_track(db, sample_job, "3")
+        _mark_track_ripped_by_message(sample_job, "File title_t07.mkv was added as title #0")
+        assert _db_value(db, "track", "ripped", track.track_id) == 1
+        assert _db_value(db, "track", "status", track.track_id) == "success"
+
+    def test_phase_tick_flushes_due_writes_without_new_changes(self, app_context, sample_job):
+        from arm.database import write_buffer
+        from arm.ripper.utils import _apply_track_phases
+
+        _, db = app_context
+        track = _add_track(db, sample_job, "1")
+        clock = [1000.0]
+        with unittest.mock.patch.object(write_buffer.time, "monotonic", lambda: clock[0]):
+            _apply_track_phases(sample_job, {1}, set(), set())
+            assert _db_value(db, "track", "status", track.track_id) != "ripping"
+            clock[0] += write_buffer.FLUSH_INTERVAL
+            _apply_track_phases(sample_job, {1}, set(), set())
+        assert _db_value(db, "track", "status", track.track_id) == "ripping"